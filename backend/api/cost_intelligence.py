@@ -40,8 +40,8 @@ def _get_cost_data_from_execution(execution_id: str) -> Optional[List[Dict]]:
         List of cost records or None if not found
     """
     try:
-        from backend.api.execution import _executions
-        execution = _executions.get(execution_id)
+        from backend.core.execution_store import get_execution_store
+        execution = get_execution_store().get(execution_id)
         
         if not execution or not execution.results:
             return None
@@ -294,8 +294,8 @@ async def predict_workflow_cost(
     # If no baseline from history, try to get from execution
     if baseline_cost == 0 and execution_id:
         try:
-            from backend.api.execution import _executions
-            execution = _executions.get(execution_id)
+            from backend.core.execution_store import get_execution_store
+            execution = get_execution_store().get(execution_id)
             if execution and execution.results:
                 baseline_cost = sum(node_result.cost for node_result in execution.results.values())
         except Exception as e:
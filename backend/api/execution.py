@@ -6,14 +6,18 @@ and retrieving execution results.
 """
 
 import asyncio
+import json
 import uuid
-from typing import Dict
+from typing import Dict, Optional
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
-from backend.core.engine import engine
+from backend.config import settings
 from backend.core.exceptions import WorkflowExecutionError, WorkflowValidationError
+from backend.core.execution_runner import run_execution
+from backend.core.execution_store import get_execution_store
+from backend.core.job_queue import get_job_queue
 from backend.core.models import Execution, ExecutionRequest, ExecutionResponse, ExecutionStatus, Workflow
 from backend.core.streaming import stream_manager
 from backend.core.security import limiter
@@ -24,9 +28,6 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["Execution"])
 
-# In-memory storage for executions (will be replaced with database later)
-_executions: Dict[str, Execution] = {}
-
 
 @router.post("/workflows/execute", response_model=ExecutionResponse)
 @limiter.limit("10/minute")
@@ -61,70 +62,36 @@ async def execute_workflow(request: Request, execution_request: ExecutionRequest
             status=ExecutionStatus.RUNNING,
             started_at=datetime.now(),
         )
-        _executions[execution_id] = placeholder_execution
         
         # Get user ID for observability
         user_id = get_user_id_from_request(request)
         
-        # Start workflow execution in background
-        # This allows the frontend to connect to SSE stream before execution completes
-        async def execute_in_background():
-            try:
-                execution = await engine.execute(
-                    workflow=execution_request.workflow,
-                    execution_id=execution_id,
-                    user_id=user_id,
-                    use_intelligent_routing=execution_request.use_intelligent_routing,
-                )
-                
-                # Update stored execution with results
-                _executions[execution_id] = execution
-                logger.info(f"Execution {execution_id} completed successfully")
-                
-                # Record metrics asynchronously (don't block)
-                # Note: We can't call the endpoint directly from background task,
-                # so we'll use the internal function instead
-                try:
-                    from backend.api.metrics import _save_execution_record, ExecutionRecord
-                    from datetime import datetime
-                    
-                    # Create execution record for metrics
-                    record = ExecutionRecord(
-                        execution_id=execution_id,
-                        workflow_id=execution.workflow_id,
-                        workflow_version=None,
-                        status=execution.status.value if hasattr(execution.status, 'value') else str(execution.status),
-                        started_at=execution.started_at.isoformat() if execution.started_at else datetime.now().isoformat(),
-                        completed_at=execution.completed_at.isoformat() if execution.completed_at else None,
-                        duration_ms=execution.duration_ms or 0,
-                        total_cost=execution.total_cost or 0.0,
-                        cost_breakdown={},  # Will be calculated if needed
-                        error=execution.error,
-                        metadata={},
-                    )
-                    _save_execution_record(record)
-                except Exception as metrics_error:
-                    logger.error(f"Failed to record metrics: {metrics_error}")
-                    
-            except Exception as e:
-                logger.error(f"Background execution failed for {execution_id}: {e}", exc_info=True)
-                # Update with error execution
-                from backend.core.models import Execution
-                from datetime import datetime
-                _executions[execution_id] = Execution(
-                    id=execution_id,
-                    workflow_id=execution_request.workflow.id or "unknown",
-                    status=ExecutionStatus.FAILED,
-                    started_at=placeholder_execution.started_at,
-                    completed_at=datetime.now(),
-                    error=str(e),
-                )
+        await asyncio.to_thread(get_execution_store().put, placeholder_execution, user_id=user_id)
         
-        # Start execution in background
-        asyncio.create_task(execute_in_background())
+        if settings.execution_mode == "queue":
+            # Execution workers claim the job; their events reach this
+            # process through the event channel relay
+            await stream_manager.create_stream(execution_id)
+            await asyncio.to_thread(get_job_queue().enqueue, execution_id, {
+                "workflow": execution_request.workflow.model_dump(mode="json"),
+                "user_id": user_id,
+                "use_intelligent_routing": execution_request.use_intelligent_routing,
+                "started_at": placeholder_execution.started_at.isoformat(),
+            })
+            logger.info(f"Enqueued execution {execution_id} for execution workers")
+        else:
+            # Start workflow execution in background
+            # This allows the frontend to connect to SSE stream before execution completes
+            asyncio.create_task(run_execution(
+                workflow=execution_request.workflow,
+                execution_id=execution_id,
+                started_at=placeholder_execution.started_at,
+                user_id=user_id,
+                use_intelligent_routing=execution_request.use_intelligent_routing,
+            ))
         
         # Return immediately so frontend can connect to stream
-        # The execution will populate _executions when it completes
+        # The execution will update the execution store when it completes
         return ExecutionResponse(
             execution_id=execution_id,
             status=ExecutionStatus.RUNNING,
@@ -176,14 +143,13 @@ async def get_execution(execution_id: str, request: Request) -> ExecutionRespons
     Raises:
         HTTPException: If execution not found
     """
-    if execution_id not in _executions:
+    execution = await asyncio.to_thread(get_execution_store().get, execution_id)
+    if execution is None:
         raise HTTPException(
             status_code=404,
             detail=f"Execution {execution_id} not found",
         )
     
-    execution = _executions[execution_id]
-    
     # Convert Execution to ExecutionResponse format
     return ExecutionResponse(
         execution_id=execution.id,
@@ -211,14 +177,13 @@ async def get_execution_trace(execution_id: str, request: Request) -> Dict:
     Raises:
         HTTPException: If execution not found
     """
-    if execution_id not in _executions:
+    execution = await asyncio.to_thread(get_execution_store().get, execution_id)
+    if execution is None:
         raise HTTPException(
             status_code=404,
             detail=f"Execution {execution_id} not found",
         )
     
-    execution = _executions[execution_id]
-    
     return {
         "execution_id": execution_id,
         "status": execution.status.value,
@@ -231,28 +196,30 @@ async def get_execution_trace(execution_id: str, request: Request) -> Dict:
 
 @router.get("/executions")
 @limiter.limit("30/minute")
-async def list_executions(request: Request, limit: int = 10, offset: int = 0) -> Dict:
+async def list_executions(
+    request: Request,
+    limit: int = 10,
+    offset: int = 0,
+    workflow_id: Optional[str] = None,
+) -> Dict:
     """
-    List all executions.
+    List executions, most recent first.
     
     Args:
         limit: Maximum number of executions to return
         offset: Number of executions to skip
+        workflow_id: Only list executions of this workflow
         
     Returns:
         List of executions with pagination
     """
-    executions_list = list(_executions.values())
-    
-    # Sort by started_at (most recent first)
-    executions_list.sort(key=lambda e: e.started_at, reverse=True)
-    
-    # Paginate
-    paginated = executions_list[offset : offset + limit]
+    paginated, total = await asyncio.to_thread(
+        get_execution_store().list, limit, offset, workflow_id
+    )
     
     return {
         "executions": [exec.model_dump() for exec in paginated],
-        "total": len(executions_list),
+        "total": total,
         "limit": limit,
         "offset": offset,
     }
@@ -260,24 +227,43 @@ async def list_executions(request: Request, limit: int = 10, offset: int = 0) ->
 
 @router.get("/executions/{execution_id}/stream")
 @limiter.limit("30/minute")
-async def stream_execution(execution_id: str, request: Request):
+async def stream_execution(execution_id: str, request: Request, last_event_id: Optional[int] = None):
     """
     Stream execution events using Server-Sent Events (SSE).
     
     This endpoint provides real-time updates about workflow execution,
     including node progress, agent actions, and intermediate outputs.
+    Every event carries an ID; reconnecting clients (which send the
+    Last-Event-ID header automatically, or pass ``last_event_id``) receive
+    only the events they missed, also for a while after the execution ended.
     
     Args:
         execution_id: The execution ID to stream
+        last_event_id: Resume after this event ID (the Last-Event-ID header takes precedence)
         
     Returns:
         SSE stream of execution events
     """
+    header_event_id = request.headers.get("last-event-id")
+    if header_event_id and header_event_id.isdigit():
+        last_event_id = int(header_event_id)
+    
     async def event_generator():
         """Generate SSE events from stream."""
         try:
             # Send initial connection event
-            yield "event: connected\ndata: {\"execution_id\": \"" + execution_id + "\"}\n\n"
+            yield "retry: 2000\nevent: connected\ndata: {\"execution_id\": \"" + execution_id + "\"}\n\n"
+            
+            # Events of executions that ended before the retention window are gone;
+            # report the final status instead of waiting on an empty stream
+            if not stream_manager.has_stream(execution_id):
+                execution = await asyncio.to_thread(get_execution_store().get, execution_id)
+                if execution is not None and execution.status not in (ExecutionStatus.PENDING, ExecutionStatus.RUNNING):
+                    yield "event: complete\ndata: " + json.dumps({
+                        "message": "Execution stream complete",
+                        "status": execution.status.value,
+                    }) + "\n\n"
+                    return
             
             # Track node events for logging
             started_nodes = set()
@@ -285,7 +271,7 @@ async def stream_execution(execution_id: str, request: Request):
             
             # Subscribe to stream - keep it open until execution is truly complete
             logger.info(f"Starting to stream events for execution {execution_id}")
-            async for event in stream_manager.subscribe(execution_id):
+            async for event in stream_manager.subscribe(execution_id, last_event_id or 0):
                 logger.debug(f"Streaming event: {event.event_type.value} for node {event.node_id}")
                 yield event.to_sse()
                 
@@ -308,9 +294,8 @@ async def stream_execution(execution_id: str, request: Request):
                     message = (event.data.get("message", "") or "").lower()
                     if "completed" in message or "failed" in message:
                         # Workflow completion event - this is the ONLY reliable signal
-                        # Wait a bit for any final events to be sent, then close
+                        # (events are delivered in publish order, so none can follow it)
                         logger.info(f"Workflow completion event received: {event.data.get('message')}. All {len(started_nodes)} nodes completed. Closing stream.")
-                        await asyncio.sleep(0.5)  # Small delay to ensure final events are sent
                         yield "event: complete\ndata: {\"message\": \"Execution stream complete\"}\n\n"
                         break
                     
@@ -318,10 +303,9 @@ async def stream_execution(execution_id: str, request: Request):
             logger.error(f"Error in SSE stream: {e}", exc_info=True)
             yield f"event: error\ndata: {{\"error\": \"{str(e)}\"}}\n\n"
         finally:
-            # Clean up stream - but only after a delay to ensure all events are sent
-            await asyncio.sleep(1.0)  # Wait a bit before removing stream
-            await stream_manager.remove_stream(execution_id)
-            logger.info(f"Stream {execution_id} cleaned up")
+            # The engine closes the stream when the execution ends; other
+            # subscribers may still be reading it
+            logger.info(f"Client stream for execution {execution_id} closed")
     
     return StreamingResponse(
         event_generator(),
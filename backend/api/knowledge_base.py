@@ -12,6 +12,7 @@ from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 
 from backend.core.security import limiter
+from backend.core.user_context import get_user_id_from_request
 from backend.core.knowledge_base import (
     KnowledgeBase,
     KnowledgeBaseVersion,
@@ -83,6 +84,24 @@ class ProcessKnowledgeBaseRequest(BaseModel):
     vector_store_config: Optional[VectorStoreConfig] = None
 
 
+class BatchSearchRequest(BaseModel):
+    """Request to search a knowledge base with many queries at once."""
+    queries: List[str] = Field(description="Query texts", min_length=1, max_length=1000)
+    version_number: Optional[int] = Field(default=None, description="Version to search (default: current)")
+    top_k: int = Field(default=5, ge=1, le=100)
+    score_threshold: float = Field(default=0.0, ge=0.0, le=1.0)
+    nprobe: Optional[int] = Field(default=None, ge=1, description="IVF lists to scan per query")
+    ef_search: Optional[int] = Field(default=None, ge=1, description="HNSW candidate list size per query")
+
+
+class BatchSearchResponse(BaseModel):
+    """Per-query results of a batched knowledge base search."""
+    kb_id: str
+    version_number: int
+    results: List[Dict[str, Any]]
+    embedding_cost: float
+
+
 @router.post("", response_model=KnowledgeBase)
 @limiter.limit("20/minute")
 async def create_knowledge_base(request_body: KnowledgeBaseCreateRequest, request: Request) -> KnowledgeBase:
@@ -455,3 +474,72 @@ async def rollback_to_version(
     logger.info(f"Rolled back knowledge base {kb_id} to version {version_number}")
     return kb
 
+
+
+@router.post("/{kb_id}/search", response_model=BatchSearchResponse)
+@limiter.limit("60/minute")
+async def batch_search_knowledge_base(
+    kb_id: str,
+    request_body: BatchSearchRequest,
+    request: Request,
+) -> BatchSearchResponse:
+    """
+    Search a knowledge base with many queries at once.
+    
+    All queries are embedded in one batched call with the version's embedding
+    configuration and searched with a single FAISS call over the query matrix.
+    """
+    from backend.nodes.embedding.embed import EmbedNode
+    from backend.nodes.retrieval.search import VectorSearchNode
+    
+    kb = load_knowledge_base(kb_id)
+    if not kb:
+        raise HTTPException(status_code=404, detail=f"Knowledge base {kb_id} not found")
+    
+    version_number = request_body.version_number or kb.current_version
+    version = next((v for v in kb.versions if v.version_number == version_number), None)
+    if not version:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Version {version_number} not found for knowledge base {kb_id}"
+        )
+    if version.vector_store_config.provider != "faiss":
+        raise HTTPException(status_code=400, detail="Batched search is only supported for FAISS knowledge bases")
+    
+    user_id = get_user_id_from_request(request)
+    try:
+        embed_result = await EmbedNode().execute(
+            {"chunks": request_body.queries},
+            {
+                "provider": version.embed_config.provider,
+                "model": version.embed_config.model,
+                "batch_size": version.embed_config.batch_size,
+                "use_finetuned_model": version.embed_config.use_finetuned_model,
+                "finetuned_model_id": version.embed_config.finetuned_model_id,
+                "_node_id": "kb_batch_search_embed",
+                "_user_id": user_id,
+            },
+        )
+        search_result = await VectorSearchNode().execute(
+            {"queries": request_body.queries, "query_embeddings": embed_result["embeddings"]},
+            {
+                "provider": "faiss",
+                "knowledge_base_id": kb_id,
+                "knowledge_base_version": version_number,
+                "top_k": request_body.top_k,
+                "score_threshold": request_body.score_threshold,
+                "nprobe": request_body.nprobe,
+                "ef_search": request_body.ef_search,
+                "_node_id": "kb_batch_search",
+                "_user_id": user_id,
+            },
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return BatchSearchResponse(
+        kb_id=kb_id,
+        version_number=version_number,
+        results=search_result["batch_results"],
+        embedding_cost=embed_result.get("cost", 0.0),
+    )
@@ -15,6 +15,7 @@ import uuid
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
+from backend.core.llm_response_cache import cached_llm_call, is_cacheable, llm_cache_key
 from backend.core.security import limiter
 from backend.utils.logger import get_logger
 
@@ -36,6 +37,7 @@ class PromptTestRequest(BaseModel):
     temperature: float = 0.7
     max_tokens: Optional[int] = None
     test_inputs: Optional[List[str]] = None  # Multiple test inputs for batch testing
+    cache_response: Optional[bool] = None  # None: cache at temperature 0; True: always; False: never
 
 
 class PromptTestResult(BaseModel):
@@ -50,6 +52,7 @@ class PromptTestResult(BaseModel):
     cost: float
     latency_ms: int
     created_at: str
+    cached: bool = False  # Served from the LLM response cache (cost is 0)
 
 
 class PromptVersion(BaseModel):
@@ -108,7 +111,7 @@ async def test_prompt(request_body: PromptTestRequest, request: Request) -> Prom
     # Use first test input or empty string
     test_input = request_body.test_inputs[0] if request_body.test_inputs and len(request_body.test_inputs) > 0 else ""
     
-    try:
+    async def run_prompt() -> Dict[str, Any]:
         # Execute prompt based on provider
         if request_body.provider == "openai":
             output, tokens, cost = await _test_openai_prompt(
@@ -142,6 +145,26 @@ async def test_prompt(request_body: PromptTestRequest, request: Request) -> Prom
                 status_code=400,
                 detail=f"Unsupported provider: {request_body.provider}"
             )
+        return {"output": output, "tokens": tokens, "cost": cost}
+    
+    cache_key = None
+    if request_body.cache_response is not False and is_cacheable(
+        request_body.temperature, bool(request_body.cache_response)
+    ):
+        cache_key = llm_cache_key(
+            request_body.provider,
+            request_body.model,
+            [
+                {"role": "system", "content": request_body.system_prompt or ""},
+                {"role": "user", "content": request_body.prompt, "input": test_input},
+            ],
+            {"temperature": request_body.temperature, "max_tokens": request_body.max_tokens},
+        )
+    
+    try:
+        response, cached = await cached_llm_call(cache_key, run_prompt)
+        output, tokens = response["output"], response["tokens"]
+        cost = 0.0 if cached else response["cost"]
         
         latency_ms = int((time.time() - start_time) * 1000)
         
@@ -156,6 +179,7 @@ async def test_prompt(request_body: PromptTestRequest, request: Request) -> Prom
             cost=cost,
             latency_ms=latency_ms,
             created_at=datetime.now().isoformat(),
+            cached=cached,
         )
         
         _prompt_tests[test_id] = result.dict()
@@ -192,6 +216,7 @@ async def test_prompt_batch(request_body: PromptTestRequest, request: Request) -
             temperature=request_body.temperature,
             max_tokens=request_body.max_tokens,
             test_inputs=[test_input],
+            cache_response=request_body.cache_response,
         )
         
         result = await test_prompt(single_request, request)
@@ -220,6 +245,7 @@ async def ab_test_prompts(request_body: ABTestRequest, request: Request) -> ABTe
             temperature=request_body.temperature,
             max_tokens=request_body.max_tokens,
             test_inputs=[test_input],
+            cache_response=False,  # Cost and latency are compared, so both prompts run live
         )
         result_a = await test_prompt(request_a, request)
         results_a.append(result_a)
@@ -233,6 +259,7 @@ async def ab_test_prompts(request_body: ABTestRequest, request: Request) -> ABTe
             temperature=request_body.temperature,
             max_tokens=request_body.max_tokens,
             test_inputs=[test_input],
+            cache_response=False,
         )
         result_b = await test_prompt(request_b, request)
         results_b.append(result_b)
@@ -346,15 +373,15 @@ async def _test_openai_prompt(
     max_tokens: Optional[int],
 ) -> Tuple[str, Dict[str, int], float]:
     """Test a prompt using OpenAI."""
-    import openai
     import os
     from backend.config import settings
+    from backend.core.client_pool import get_openai_client
     
     api_key = os.getenv("OPENAI_API_KEY") or getattr(settings, "openai_api_key", None)
     if not api_key:
         raise ValueError("OPENAI_API_KEY not set")
     
-    client = openai.OpenAI(api_key=api_key)
+    client = get_openai_client(api_key)
     
     # Format prompt with input
     formatted_prompt = prompt.format(input=input_text) if "{input}" in prompt else f"{prompt}\n\n{input_text}"
@@ -364,7 +391,7 @@ async def _test_openai_prompt(
         messages.append({"role": "system", "content": system_prompt})
     messages.append({"role": "user", "content": formatted_prompt})
     
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model=model,
         messages=messages,
         temperature=temperature,
@@ -393,20 +420,20 @@ async def _test_anthropic_prompt(
     max_tokens: Optional[int],
 ) -> Tuple[str, Dict[str, int], float]:
     """Test a prompt using Anthropic."""
-    import anthropic
     import os
     from backend.config import settings
+    from backend.core.client_pool import get_anthropic_client
     
     api_key = os.getenv("ANTHROPIC_API_KEY") or getattr(settings, "anthropic_api_key", None)
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY not set")
     
-    client = anthropic.Anthropic(api_key=api_key)
+    client = get_anthropic_client(api_key)
     
     # Format prompt with input
     formatted_prompt = prompt.format(input=input_text) if "{input}" in prompt else f"{prompt}\n\n{input_text}"
     
-    message = client.messages.create(
+    message = await client.messages.create(
         model=model,
         max_tokens=max_tokens or 1024,
         temperature=temperature,
@@ -438,19 +465,15 @@ async def _test_gemini_prompt(
     max_tokens: Optional[int],
 ) -> Tuple[str, Dict[str, int], float]:
     """Test a prompt using Google Gemini."""
-    try:
-        from google import genai
-    except ImportError:
-        raise ValueError("google-genai not installed. Install with: pip install google-genai")
-    
     import os
     from backend.config import settings
+    from backend.core.client_pool import get_gemini_client
     
     api_key = os.getenv("GEMINI_API_KEY") or getattr(settings, "gemini_api_key", None)
     if not api_key:
         raise ValueError("GEMINI_API_KEY not set")
     
-    client = genai.Client(api_key=api_key)
+    client = get_gemini_client(api_key)
     
     # Format prompt with input
     formatted_prompt = prompt.format(input=input_text) if "{input}" in prompt else f"{prompt}\n\n{input_text}"
@@ -461,7 +484,7 @@ async def _test_gemini_prompt(
         messages.append({"role": "user", "parts": [{"text": system_prompt}]})
     messages.append({"role": "user", "parts": [{"text": formatted_prompt}]})
     
-    response = client.models.generate_content(
+    response = await client.aio.models.generate_content(
         model=model,
         contents=messages,
         config={
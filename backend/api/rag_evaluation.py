@@ -15,7 +15,9 @@ import time
 from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Request
 from pydantic import BaseModel
 
+from backend.core.model_residency import get_model_manager
 from backend.core.security import limiter
+from backend.core.user_context import get_user_id_from_request
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -393,6 +395,15 @@ async def evaluate_rag_workflow(request_body: EvaluationRequest, request: Reques
                 detail="No output node found. Please specify output_node_id or add a chat/llm node."
             )
         
+        # Retrieval for all questions runs as one batched search up front; each
+        # per-question run then reuses its slice instead of searching again
+        prefetch_start = time.time()
+        user_id = get_user_id_from_request(request)
+        prefetched = await _prefetch_retrieval(
+            workflow, input_node_id, [pair["question"] for pair in test_pairs], user_id=user_id
+        )
+        prefetch_ms_per_query = int((time.time() - prefetch_start) * 1000) // len(test_pairs) if prefetched and test_pairs else 0
+        
         # Execute workflow for each Q&A pair
         results: List[EvaluationResult] = []
         total_cost = 0.0
@@ -436,10 +447,14 @@ async def evaluate_rag_workflow(request_body: EvaluationRequest, request: Reques
                         logger.debug(f"Injected question into {node.type} node {node.id}: {pair['question'][:50]}...")
                         break
                 
+                for node in workflow_copy.nodes:
+                    if node.id in prefetched:
+                        _node_config(node)["_precomputed_results"] = prefetched[node.id][idx]
+                
                 # Execute workflow
                 start_time = time.time()
-                execution = await engine.execute(workflow_copy, execution_id=f"{evaluation_id}-{idx}")
-                latency_ms = int((time.time() - start_time) * 1000)
+                execution = await engine.execute(workflow_copy, execution_id=f"{evaluation_id}-{idx}", user_id=user_id)
+                latency_ms = int((time.time() - start_time) * 1000) + prefetch_ms_per_query
                 
                 # Extract answer from output node
                 actual_answer = ""
@@ -764,6 +779,78 @@ async def get_quality_trends(
     }
 
 
+def _node_config(node: Any) -> Dict[str, Any]:
+    """Return a node's settings the way NodeExecutor reads them (``data.config`` or flat ``data``)."""
+    if isinstance(node.data.get("config"), dict):
+        return node.data["config"]
+    return node.data
+
+
+async def _prefetch_retrieval(
+    workflow: Any,
+    input_node_id: str,
+    questions: List[str],
+    user_id: Optional[str] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run the vector searches of all questions as one batched search per node.
+    
+    Only vector_search nodes whose query is exactly the injected question are
+    prefetched: the input node itself, or a node fed by text_input → embed.
+    The search must target a configured index or knowledge base, so it does
+    not depend on anything built during the per-question run.
+    
+    Returns:
+        vector_search node ID -> per-question search outputs
+    """
+    from backend.nodes.embedding.embed import EmbedNode
+    from backend.nodes.retrieval.search import VectorSearchNode
+    
+    if not questions:
+        return {}
+    
+    nodes = {node.id: node for node in workflow.nodes}
+    sources: Dict[str, List[str]] = {}
+    for edge in workflow.edges:
+        sources.setdefault(edge.target, []).append(edge.source)
+    input_node = nodes.get(input_node_id)
+    
+    prefetched: Dict[str, List[Dict[str, Any]]] = {}
+    for node in workflow.nodes:
+        if node.type != "vector_search":
+            continue
+        config = {**_node_config(node), "_node_id": f"{node.id}_prefetch", "_user_id": user_id}
+        if not (config.get("knowledge_base_id") or config.get("index_id")):
+            continue
+        
+        search_inputs: Dict[str, Any] = {"queries": questions}
+        if node.id == input_node_id:
+            pass
+        elif input_node is not None and input_node.type == "text_input" and len(sources.get(node.id, [])) == 1:
+            embed_node = nodes.get(sources[node.id][0])
+            if embed_node is None or embed_node.type != "embed" or sources.get(embed_node.id) != [input_node_id]:
+                continue
+            try:
+                embed_config = {**_node_config(embed_node), "_node_id": f"{embed_node.id}_prefetch", "_user_id": user_id}
+                # Also warms the embedding cache for the per-question embed runs
+                embed_result = await EmbedNode().execute({"chunks": questions}, embed_config)
+            except Exception as e:
+                logger.warning(f"Could not batch-embed questions for {node.id}, searching per question: {e}")
+                continue
+            search_inputs["query_embeddings"] = embed_result["embeddings"]
+        else:
+            continue
+        
+        try:
+            search_result = await VectorSearchNode().execute(search_inputs, config)
+            prefetched[node.id] = search_result["batch_results"]
+            logger.info(f"Prefetched retrieval for {len(questions)} questions on node {node.id}")
+        except Exception as e:
+            logger.warning(f"Batched search failed for {node.id}, searching per question: {e}")
+    
+    return prefetched
+
+
 async def _calculate_relevance(
     expected: str,
     actual: str,
@@ -777,14 +864,10 @@ async def _calculate_relevance(
     """
     try:
         # Try to use embeddings for better relevance scoring
-        from sentence_transformers import SentenceTransformer
         import numpy as np
         
-        # Load model (cache it if possible)
-        if not hasattr(_calculate_relevance, '_model'):
-            _calculate_relevance._model = SentenceTransformer('all-MiniLM-L6-v2')
-        
-        model = _calculate_relevance._model
+        # Shared, process-wide model (loaded once)
+        model = await get_model_manager().aget("sentence_transformer", "all-MiniLM-L6-v2")
         
         # Encode both texts
         embeddings = model.encode([expected, actual])
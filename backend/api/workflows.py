@@ -13,11 +13,12 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, HTTPException, Query, Header, Request
 from pydantic import BaseModel, Field
 
-from backend.core.models import Workflow, Node, Edge, ExecutionResponse
+from backend.core.models import Workflow, Node, Edge, ExecutionResponse, ExecutionStatus, NodeResult
 from backend.core.engine import engine
 from backend.core.engine.workflow_validator import WorkflowValidator
 from backend.core.exceptions import WorkflowValidationError, WorkflowExecutionError
 from backend.core.deployment import DeploymentManager
+from backend.core.semantic_cache import get_semantic_cache, semantic_query_for
 from backend.core.security import validate_workflow_id, validate_node_id, limiter
 from backend.core.cache import get_cache
 from backend.core.workflow_permissions import (
@@ -677,6 +678,9 @@ async def deploy_workflow(workflow_id: str, request: Request) -> Workflow:
             description=f"Deployment of {workflow.name}",
         )
         
+        # Answers cached for the previous deployment no longer apply
+        get_semantic_cache().invalidate(workflow_id)
+        
         logger.info(f"Deployed workflow {workflow_id} as version {deployment_version.version_number}")
         return workflow
         
@@ -741,6 +745,7 @@ async def undeploy_workflow(workflow_id: str, request: Request) -> Workflow:
         
         # Save workflow
         _save_workflow(workflow)
+        get_semantic_cache().invalidate(workflow_id)
         
         logger.info(f"Undeployed workflow {workflow_id}")
         return workflow
@@ -822,6 +827,7 @@ async def rollback_deployment(workflow_id: str, version_number: int, request: Re
     workflow.is_deployed = True
     workflow.updated_at = datetime.now()
     _save_workflow(workflow)
+    get_semantic_cache().invalidate(workflow_id)
     
     logger.info(f"Rolled back workflow {workflow_id} to version {version_number}")
     return {
@@ -847,6 +853,37 @@ async def get_deployment_health(workflow_id: str, request: Request) -> Dict[str,
     return health
 
 
+@router.get("/workflows/{workflow_id}/semantic-cache")
+@limiter.limit("30/minute")
+async def get_semantic_cache_stats(workflow_id: str, request: Request) -> Dict[str, Any]:
+    """
+    Get semantic cache statistics for a deployed workflow.
+    
+    Args:
+        workflow_id: The workflow ID
+        
+    Returns:
+        Hit/miss counts, cached entries and the histogram of best-match similarities
+    """
+    return {"workflow_id": workflow_id, **get_semantic_cache().stats(workflow_id)}
+
+
+@router.delete("/workflows/{workflow_id}/semantic-cache")
+@limiter.limit("10/minute")
+async def clear_semantic_cache(workflow_id: str, request: Request) -> Dict[str, Any]:
+    """
+    Drop the semantically cached answers of a workflow.
+    
+    Args:
+        workflow_id: The workflow ID
+        
+    Returns:
+        Number of cached answers dropped
+    """
+    dropped = get_semantic_cache().invalidate(workflow_id)
+    return {"workflow_id": workflow_id, "dropped": dropped}
+
+
 @router.post("/workflows/validate")
 @limiter.limit("30/minute")
 async def validate_workflow_template(request: Request, workflow_data: WorkflowCreateRequest) -> Dict[str, Any]:
@@ -1050,6 +1087,66 @@ class WorkflowQueryRequest(BaseModel):
         default_factory=dict,
         description="Input data to pass to the workflow (e.g., query, file_id, etc.)"
     )
+    timeout_ms: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Deadline for the query in milliseconds; nodes still running when it expires fail (default: server setting)"
+    )
+    semantic_cache: bool = Field(
+        default=True,
+        description="Allow the cached answer of a similar earlier query (when the semantic cache is enabled)"
+    )
+
+
+def _semantic_cache_response(workflow_id: str, semantic_query: Any, api_key_obj: Any) -> Optional[ExecutionResponse]:
+    """Answer a deployed workflow query from the semantic cache, or return None on a miss."""
+    started_at = datetime.now()
+    cached_results, similarity = get_semantic_cache().lookup(semantic_query)
+    if cached_results is None:
+        return None
+    
+    execution_id = str(uuid.uuid4())
+    completed_at = datetime.now()
+    duration_ms = int((completed_at - started_at).total_seconds() * 1000)
+    logger.info(f"Query of workflow {workflow_id} answered from semantic cache (similarity {similarity:.3f})")
+    
+    if api_key_obj:
+        try:
+            from backend.core.usage_tracking import record_usage
+            record_usage(
+                key_id=api_key_obj.key_id,
+                workflow_id=workflow_id,
+                execution_id=execution_id,
+                cost=0.0,
+                duration_ms=duration_ms,
+                status="completed",
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record API key usage: {e}")
+    DeploymentManager.record_query_metrics(
+        workflow_id=workflow_id,
+        success=True,
+        response_time_ms=duration_ms,
+        cost=0.0,
+    )
+    
+    # Reused answers cost nothing
+    results = {}
+    for node_id, result in cached_results.items():
+        result["cost"] = 0.0
+        results[node_id] = NodeResult(**result)
+    
+    return ExecutionResponse(
+        execution_id=execution_id,
+        status=ExecutionStatus.COMPLETED,
+        started_at=started_at.isoformat(),
+        completed_at=completed_at.isoformat(),
+        total_cost=0.0,
+        duration_ms=duration_ms,
+        results=results,
+        cached=True,
+        cache_similarity=round(similarity, 4),
+    )
 
 
 @router.post("/workflows/{workflow_id}/query", response_model=ExecutionResponse)
@@ -1141,6 +1238,17 @@ async def query_workflow(
         # Note: We don't require API keys yet, but validate if provided
     
     try:
+        # Semantic cache: a paraphrase of an answered query skips retrieval and generation
+        semantic_query = None
+        if query_request.semantic_cache:
+            semantic_query = await semantic_query_for(
+                workflow, query_request.input, user_id=get_user_id_from_request(request)
+            )
+        if semantic_query is not None:
+            cached_response = _semantic_cache_response(workflow_id, semantic_query, api_key_obj)
+            if cached_response is not None:
+                return cached_response
+        
         # Create a copy of the workflow with merged input data
         # Merge query input with node configs
         # OPTIMIZATION: Skip file processing nodes if vector store already exists
@@ -1242,6 +1350,7 @@ async def query_workflow(
             workflow=query_workflow,
             execution_id=execution_id,
             user_id=user_id,
+            timeout_ms=query_request.timeout_ms or settings.query_timeout_ms,
         )
         
         # Record metrics asynchronously (don't block response)
@@ -1280,6 +1389,15 @@ async def query_workflow(
             cost=execution.total_cost,
         )
         
+        if semantic_query is not None and success and execution.results:
+            try:
+                get_semantic_cache().store(
+                    semantic_query,
+                    {node_id: result.model_dump(mode="json") for node_id, result in execution.results.items()},
+                )
+            except Exception as e:
+                logger.warning(f"Failed to cache answer of workflow {workflow_id}: {e}")
+        
         # Convert to ExecutionResponse
         return ExecutionResponse(
             execution_id=execution_id,
@@ -321,6 +321,378 @@ class Settings(BaseSettings):
         description="Maximum file upload size in bytes",
     )
 
+    # ============================================
+    # Provider Client Pool
+    # ============================================
+    provider_client_pool_size: int = Field(
+        default=64,
+        ge=1,
+        description="Maximum number of pooled provider SDK clients (one per provider/API key/base URL)",
+    )
+    provider_client_idle_seconds: float = Field(
+        default=600.0,
+        ge=1.0,
+        description="Evict pooled provider clients unused for this many seconds",
+    )
+    provider_client_max_connections: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum HTTP connections per pooled provider client",
+    )
+    provider_client_max_keepalive: int = Field(
+        default=20,
+        ge=0,
+        description="Maximum idle keep-alive connections per pooled provider client",
+    )
+    provider_client_keepalive_seconds: float = Field(
+        default=60.0,
+        ge=0.0,
+        description="How long idle keep-alive connections are kept open",
+    )
+    provider_client_http2: bool = Field(
+        default=True,
+        description="Use HTTP/2 for pooled provider clients when the h2 package is installed",
+    )
+
+    # ============================================
+    # Embedding Throughput
+    # ============================================
+    embedding_max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum embedding batches in flight per embed call",
+    )
+    embedding_requests_per_minute: int = Field(
+        default=3000,
+        ge=0,
+        description="Default embedding request budget per provider API key (0 = unlimited)",
+    )
+    embedding_tokens_per_minute: int = Field(
+        default=1000000,
+        ge=0,
+        description="Default embedding token budget per provider API key (0 = unlimited)",
+    )
+    embedding_max_retries: int = Field(
+        default=5,
+        ge=0,
+        description="Retries per embedding batch on rate limits and transient errors",
+    )
+    enable_embedding_cache: bool = Field(
+        default=True,
+        description="Cache embeddings on disk by content hash so identical text is embedded once",
+    )
+    embedding_cache_memory_items: int = Field(
+        default=20000,
+        ge=0,
+        description="Number of embeddings kept in the in-memory LRU tier of the embedding cache",
+    )
+
+    # ============================================
+    # FAISS Index Management
+    # ============================================
+    faiss_index_memory_mb: int = Field(
+        default=2048,
+        ge=1,
+        description="Memory budget for resident FAISS indexes; least recently used indexes are evicted beyond it",
+    )
+    faiss_use_mmap: bool = Field(
+        default=True,
+        description="Memory-map FAISS indexes opened for search instead of reading them fully",
+    )
+
+    # ============================================
+    # Local Model Residency
+    # ============================================
+    model_memory_budget_mb: int = Field(
+        default=4096,
+        ge=1,
+        description="RAM budget for resident local ML models; least recently used models are unloaded beyond it",
+    )
+    model_preload_str: Optional[str] = Field(
+        default=None,
+        description="Models to load at startup (comma-separated kind:name, e.g. sentence_transformer:all-MiniLM-L6-v2,whisper:base,transformers:summarization:facebook/bart-large-cnn)",
+    )
+
+    @property
+    def model_preload(self) -> List[str]:
+        """Parse the startup model preload list."""
+        if not self.model_preload_str:
+            return []
+        return [spec.strip() for spec in self.model_preload_str.split(",") if spec.strip()]
+
+    # ============================================
+    # Node Result Memoization
+    # ============================================
+    enable_node_memoization: bool = Field(
+        default=True,
+        description="Reuse results of pure nodes (file loading, chunking, embedding) for identical inputs and config",
+    )
+    node_memo_memory_mb: int = Field(
+        default=256,
+        ge=0,
+        description="Memory budget for memoized node results; older results spill to disk",
+    )
+    node_memo_disk_mb: int = Field(
+        default=2048,
+        ge=0,
+        description="Disk budget for spilled memoized node results",
+    )
+
+    # ============================================
+    # LLM Response Cache
+    # ============================================
+    enable_llm_response_cache: bool = Field(
+        default=True,
+        description="Answer repeated deterministic LLM calls (temperature 0, or opted in) from an exact-match cache",
+    )
+    llm_response_cache_ttl_seconds: int = Field(
+        default=3600,
+        ge=1,
+        description="Seconds a cached LLM response stays valid",
+    )
+    llm_response_cache_memory_mb: int = Field(
+        default=64,
+        ge=0,
+        description="Memory budget for cached LLM responses; least recently used responses are evicted beyond it",
+    )
+
+    # ============================================
+    # Provider Prompt Caching
+    # ============================================
+    enable_prompt_caching: bool = Field(
+        default=True,
+        description="Mark stable prompt prefixes (system prompts, pinned context) cacheable for providers that need explicit breakpoints (Anthropic)",
+    )
+    prompt_cache_min_tokens: int = Field(
+        default=1024,
+        ge=0,
+        description="Estimated tokens a prompt prefix needs before it is marked cacheable (providers do not cache shorter prefixes)",
+    )
+
+    # ============================================
+    # RAG Context Packing
+    # ============================================
+    enable_context_packing: bool = Field(
+        default=True,
+        description="Deduplicate retrieved chunks and fit them to a token budget before they are rendered into {context}",
+    )
+    context_token_budget: int = Field(
+        default=6000,
+        ge=0,
+        description="Default token budget for retrieved context in a prompt (0 = limited only by the model's context window)",
+    )
+    context_dedup_threshold: float = Field(
+        default=0.85,
+        ge=0.0,
+        le=1.0,
+        description="Word-shingle Jaccard similarity at or above which a chunk counts as a near-duplicate of a higher-scored one",
+    )
+
+    # ============================================
+    # Semantic Response Cache
+    # ============================================
+    enable_semantic_cache: bool = Field(
+        default=False,
+        description="Answer deployed workflow queries from the cached answer of a sufficiently similar earlier query",
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.95,
+        ge=0.0,
+        le=1.0,
+        description="Minimum cosine similarity between query embeddings for a semantic cache hit",
+    )
+    semantic_cache_embedding_model: str = Field(
+        default="text-embedding-3-small",
+        description="OpenAI embedding model used to embed queries for the semantic cache",
+    )
+    semantic_cache_max_entries: int = Field(
+        default=10000,
+        ge=1,
+        description="Cached answers kept across all deployments; least recently used answers are evicted beyond it",
+    )
+    semantic_cache_ttl_seconds: int = Field(
+        default=86400,
+        ge=1,
+        description="Seconds a semantically cached answer stays valid",
+    )
+    semantic_cache_unscoped_inputs_str: str = Field(
+        default="session_id,conversation_id,thread_id,request_id",
+        description="Query inputs that do not partition the semantic cache (comma-separated); per-request identifiers would otherwise give every session its own cache",
+    )
+
+    @property
+    def semantic_cache_unscoped_inputs(self) -> List[str]:
+        """Parse the query inputs ignored when scoping semantic cache entries."""
+        return [name.strip() for name in self.semantic_cache_unscoped_inputs_str.split(",") if name.strip()]
+
+    # ============================================
+    # Streaming Edges
+    # ============================================
+    enable_streaming_edges: bool = Field(
+        default=False,
+        description="Pass records (pages, chunks, embedding batches) incrementally between ingest nodes that support streaming",
+    )
+    stream_edge_buffer_size: int = Field(
+        default=8,
+        ge=1,
+        description="Records a streaming node may produce ahead of its consumer",
+    )
+
+    # ============================================
+    # Execution Event Streams
+    # ============================================
+    stream_buffer_size: int = Field(
+        default=1000,
+        ge=1,
+        description="Events buffered per execution stream for its SSE subscribers (progress is kept as the latest per node)",
+    )
+    stream_retention_seconds: int = Field(
+        default=300,
+        ge=0,
+        description="How long a finished execution's events stay available for late or reconnecting SSE clients",
+    )
+
+    # ============================================
+    # Execution History
+    # ============================================
+    execution_store_hot_size: int = Field(
+        default=256,
+        ge=1,
+        description="Finished executions kept in memory; older ones are read back from the on-disk store",
+    )
+    execution_store_max_rows: int = Field(
+        default=100000,
+        ge=1,
+        description="Executions kept in the on-disk store; the oldest are pruned beyond it",
+    )
+
+    # ============================================
+    # Execution Workers
+    # ============================================
+    execution_mode: str = Field(
+        default="inline",
+        description="Where workflows run: 'inline' (in the API process) or 'queue' (enqueued for execution workers)",
+    )
+    job_queue_backend: str = Field(
+        default="sqlite",
+        description="Job queue broker for the queue execution mode (sqlite)",
+    )
+    job_queue_path: Optional[str] = Field(
+        default=None,
+        description="SQLite job queue database shared by the API and workers (default: executions_dir/queue.db)",
+    )
+    job_lease_seconds: int = Field(
+        default=60,
+        ge=5,
+        description="Lease a worker holds on a claimed job; renewed while it runs, reclaimed by other workers if it expires",
+    )
+    job_max_attempts: int = Field(
+        default=3,
+        ge=1,
+        description="Times a job is started before it is failed (a job is retried when its worker dies)",
+    )
+    worker_processes: int = Field(
+        default=2,
+        ge=1,
+        description="Worker processes started by python -m backend.worker",
+    )
+    worker_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Executions each worker process runs concurrently",
+    )
+    worker_poll_interval_ms: int = Field(
+        default=500,
+        ge=10,
+        description="How often an idle worker polls the job queue",
+    )
+    stream_relay_interval_ms: int = Field(
+        default=100,
+        ge=10,
+        description="How often worker stream events are flushed to and relayed from the event channel",
+    )
+
+    # ============================================
+    # CPU Offload
+    # ============================================
+    compute_process_workers: int = Field(
+        default=2,
+        ge=0,
+        description="Processes for CPU-bound node work (document parsing, chunking, index building); 0 runs it in threads",
+    )
+    compute_thread_workers: int = Field(
+        default=4,
+        ge=1,
+        description="Threads for blocking node work in GIL-releasing libraries (OpenCV, Tesseract, NumPy)",
+    )
+    compute_task_timeout_seconds: float = Field(
+        default=300.0,
+        gt=0,
+        description="Default timeout of one offloaded CPU-bound task",
+    )
+    compute_shared_memory_min_bytes: int = Field(
+        default=1024 * 1024,
+        ge=0,
+        description="Buffers at least this large are passed to and from process workers through shared memory",
+    )
+
+    # ============================================
+    # Deadlines and Hedged Requests
+    # ============================================
+    node_timeout_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Default timeout of a single node (a node's timeout_ms config overrides it; unset = none)",
+    )
+    query_timeout_ms: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Default deadline of deployed workflow queries (a request's timeout_ms overrides it; unset = none)",
+    )
+    enable_hedged_requests: bool = Field(
+        default=False,
+        description="Send a duplicate of slow idempotent provider calls (embeddings, reranks, temperature-0 chat) and keep the first answer",
+    )
+    hedge_percentile: float = Field(
+        default=95.0,
+        ge=50.0,
+        le=99.9,
+        description="Latency percentile of recent calls to an endpoint after which a hedge request is sent",
+    )
+    hedge_min_samples: int = Field(
+        default=20,
+        ge=1,
+        description="Calls to an endpoint observed before its requests are hedged",
+    )
+
+    # ============================================
+    # Write-Behind Persistence
+    # ============================================
+    enable_write_behind: bool = Field(
+        default=True,
+        description="Buffer cost and API key usage records in memory and write them in batches from a background thread",
+    )
+    write_behind_batch_size: int = Field(
+        default=200,
+        ge=1,
+        description="Records written per batch (multi-row INSERT or one file append per log)",
+    )
+    write_behind_flush_interval_seconds: float = Field(
+        default=2.0,
+        gt=0,
+        description="Longest time a record waits in the buffer before its batch is written",
+    )
+    write_behind_max_pending: int = Field(
+        default=20000,
+        ge=1,
+        description="Records held in memory at most; further records are dropped while the store is failing",
+    )
+    write_behind_max_retries: int = Field(
+        default=5,
+        ge=0,
+        description="Retries of a failed batch (with exponential backoff) before it is dropped",
+    )
+
     # ============================================
     # Feature Flags
     # ============================================
@@ -328,6 +700,16 @@ class Settings(BaseSettings):
         default=True,
         description="Enable parallel node execution",
     )
+    max_parallel_nodes: int = Field(
+        default=8,
+        ge=1,
+        description="Maximum number of nodes executed concurrently within one workflow execution",
+    )
+    workflow_plan_cache_size: int = Field(
+        default=256,
+        ge=1,
+        description="Number of compiled workflow execution plans kept in memory",
+    )
     enable_caching: bool = Field(
         default=True,
         description="Enable result caching",
@@ -0,0 +1,375 @@
+"""
+Persistent BM25 inverted index.
+
+The index is a CSR matrix in term-major order: for every term, ``indptr``
+delimits a posting list of document IDs and precomputed BM25 weights
+(IDF times the saturated, length-normalized term frequency). A query only
+touches the posting lists of its own terms: the weights are summed per
+document with ``np.bincount`` and the top-k are selected with
+``np.argpartition``, so no per-document Python objects are created.
+
+Terms are stored as sorted 64-bit hashes, so the vocabulary is looked up
+with ``np.searchsorted`` instead of a Python dict. All arrays are saved as
+``.npy`` files and loaded memory-mapped; document records live in the same
+binary sidecar format used for FAISS metadata.
+
+Scores match ``rank_bm25.BM25Okapi`` with the same ``k1``, ``b`` and
+``epsilon``.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from backend.config import settings
+from backend.core.faiss_index_manager import IndexMetadata
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_FORMAT_VERSION = 1
+_ARRAYS = ("term_hashes", "indptr", "doc_ids", "weights")
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokenize text into lowercase word tokens."""
+    return re.findall(r"\b\w+\b", text.lower())
+
+
+def _term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _term_hashes(terms: Iterable[str]) -> np.ndarray:
+    return np.fromiter((_term_hash(term) for term in terms), dtype=np.uint64)
+
+
+def build_postings(
+    texts: List[str],
+    k1: float = 1.5,
+    b: float = 0.75,
+    epsilon: float = 0.25,
+) -> Dict[str, Any]:
+    """
+    Tokenize documents and compute the index arrays of ``BM25Index``.
+
+    A module-level function returning only arrays and numbers, so it can
+    run in the compute pool (see core/compute_pool.py).
+    """
+    num_docs = len(texts)
+    doc_lengths = np.zeros(num_docs, dtype=np.float64)
+    vocabulary: Dict[str, int] = {}
+    term_ids: List[np.ndarray] = []
+    doc_columns: List[np.ndarray] = []
+    for doc_id, text in enumerate(texts):
+        tokens = tokenize(text)
+        doc_lengths[doc_id] = len(tokens)
+        if not tokens:
+            continue
+        ids = np.fromiter((vocabulary.setdefault(token, len(vocabulary)) for token in tokens), dtype=np.int64)
+        term_ids.append(ids)
+        doc_columns.append(np.full(len(ids), doc_id, dtype=np.int64))
+
+    num_terms = len(vocabulary)
+    if term_ids:
+        all_terms = np.concatenate(term_ids)
+        all_docs = np.concatenate(doc_columns)
+        # Term frequencies: count each (term, doc) pair once
+        pairs, tf = np.unique(all_terms * max(num_docs, 1) + all_docs, return_counts=True)
+        posting_terms = pairs // max(num_docs, 1)
+        posting_docs = (pairs % max(num_docs, 1)).astype(np.int32)
+    else:
+        posting_terms = np.zeros(0, dtype=np.int64)
+        posting_docs = np.zeros(0, dtype=np.int32)
+        tf = np.zeros(0, dtype=np.int64)
+
+    df = np.bincount(posting_terms, minlength=num_terms).astype(np.float64)
+    idf = np.log(num_docs - df + 0.5) - np.log(df + 0.5)
+    if num_terms:
+        floor = epsilon * idf.mean()
+        idf = np.where(idf < 0, floor, idf)
+
+    avgdl = doc_lengths.mean() if num_docs else 0.0
+    norm = k1 * (1 - b + b * doc_lengths / avgdl) if avgdl else np.full(num_docs, k1)
+    weights = idf[posting_terms] * tf * (k1 + 1) / (tf + norm[posting_docs])
+
+    # Reorder terms by hash so lookups can binary search the vocabulary
+    hashes = _term_hashes(vocabulary.keys())
+    order = np.argsort(hashes, kind="stable")
+    rank = np.empty(num_terms, dtype=np.int64)
+    rank[order] = np.arange(num_terms)
+    posting_order = np.lexsort((posting_docs, rank[posting_terms]))
+    indptr = np.zeros(num_terms + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(rank[posting_terms], minlength=num_terms))
+
+    return {
+        "term_hashes": hashes[order],
+        "indptr": indptr,
+        "doc_ids": posting_docs[posting_order],
+        "weights": weights[posting_order].astype(np.float32),
+        "num_docs": num_docs,
+        "params": {"k1": k1, "b": b, "epsilon": epsilon, "avgdl": float(avgdl)},
+    }
+
+
+class BM25Index:
+    """
+    BM25 (Okapi) index over a CSR term-document matrix.
+
+    Build with ``BM25Index.build``, query with ``search``, and persist with
+    ``save`` / ``BM25Index.load``.
+    """
+
+    def __init__(
+        self,
+        term_hashes: np.ndarray,
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        weights: np.ndarray,
+        num_docs: int,
+        documents: IndexMetadata,
+        params: Dict[str, float],
+    ):
+        self.term_hashes = term_hashes
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.num_docs = num_docs
+        self.documents = documents
+        self.params = params
+        self.readers = 0  # Open leases (BM25IndexStore.lease)
+        self.retired = False  # Replaced in its store; closed once no lease holds it
+
+    @classmethod
+    def build(
+        cls,
+        texts: List[str],
+        records: Optional[List[Dict[str, Any]]] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+    ) -> "BM25Index":
+        """
+        Build an index from document texts.
+
+        Args:
+            texts: Document texts
+            records: Per-document records returned with results (default: ``{"text": text}``)
+            k1: Term frequency saturation
+            b: Length normalization
+            epsilon: Floor for negative IDFs, as a fraction of the average IDF
+        """
+        return cls.from_postings(build_postings(texts, k1=k1, b=b, epsilon=epsilon), texts, records)
+
+    @classmethod
+    def from_postings(
+        cls,
+        postings: Dict[str, Any],
+        texts: List[str],
+        records: Optional[List[Dict[str, Any]]] = None,
+    ) -> "BM25Index":
+        """Create an index from the output of ``build_postings`` for the same texts."""
+        documents = IndexMetadata()
+        for i, text in enumerate(texts):
+            documents.append(records[i] if records else {"text": text})
+
+        return cls(
+            term_hashes=postings["term_hashes"],
+            indptr=postings["indptr"],
+            doc_ids=postings["doc_ids"],
+            weights=postings["weights"],
+            num_docs=postings["num_docs"],
+            documents=documents,
+            params=postings["params"],
+        )
+
+    @property
+    def num_terms(self) -> int:
+        return len(self.term_hashes)
+
+    def scores(self, query: str) -> np.ndarray:
+        """Return BM25 scores of every document for a query (dense, for debugging and tests)."""
+        doc_ids, weights = self._postings(query)
+        return np.bincount(doc_ids, weights=weights, minlength=self.num_docs)
+
+    def _postings(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Concatenate the posting lists of the query terms (repeated terms count repeatedly)."""
+        tokens = tokenize(query)
+        if not tokens or not self.num_terms:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        hashes = _term_hashes(tokens)
+        positions = np.minimum(np.searchsorted(self.term_hashes, hashes), self.num_terms - 1)
+        positions = positions[self.term_hashes[positions] == hashes]
+        if not len(positions):
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        slices = [(int(self.indptr[p]), int(self.indptr[p + 1])) for p in positions]
+        doc_ids = np.concatenate([self.doc_ids[start:end] for start, end in slices])
+        weights = np.concatenate([self.weights[start:end] for start, end in slices])
+        return doc_ids, weights
+
+    def search(self, query: str, top_k: int = 10, score_threshold: float = 0.0) -> List[Tuple[int, float]]:
+        """
+        Return the top-k (doc_id, score) pairs for a query, best first.
+
+        Documents containing a query term are scored from their postings. As
+        with ``rank_bm25``, a threshold of 0 or below admits zero-score
+        documents, which fill the remaining top-k slots in doc_id order.
+        """
+        doc_ids, weights = self._postings(query)
+        if not len(doc_ids):
+            candidates, scores = np.zeros(0, dtype=np.int64), np.zeros(0)
+        elif len(doc_ids) * 8 > self.num_docs:
+            # Long posting lists: accumulate densely, which avoids a sort
+            dense = np.bincount(doc_ids, weights=weights, minlength=self.num_docs)
+            candidates = np.flatnonzero(dense)
+            scores = dense[candidates]
+        else:
+            candidates, inverse = np.unique(doc_ids, return_inverse=True)
+            scores = np.bincount(inverse, weights=weights)
+        if score_threshold <= 0 and len(candidates) < min(top_k, self.num_docs):
+            unscored = np.ones(self.num_docs, dtype=bool)
+            unscored[candidates] = False
+            fill = np.flatnonzero(unscored)[:top_k]
+            candidates = np.concatenate([candidates, fill])
+            scores = np.concatenate([scores, np.zeros(len(fill))])
+        keep = scores >= score_threshold
+        candidates, scores = candidates[keep], scores[keep]
+        if len(scores) > top_k:
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            candidates, scores = candidates[top], scores[top]
+        order = np.lexsort((candidates, -scores))
+        return [(int(candidates[i]), float(scores[i])) for i in order]
+
+    def save(self, directory: Path) -> None:
+        """Write the index to ``directory`` atomically."""
+        directory = Path(directory)
+        tmp_dir = directory.with_name(directory.name + ".tmp")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+        for name in _ARRAYS:
+            np.save(tmp_dir / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        self.documents.save(str(tmp_dir / "documents.meta"))
+        with open(tmp_dir / "index.json", "w", encoding="utf-8") as f:
+            json.dump({"version": _FORMAT_VERSION, "num_docs": self.num_docs, **self.params}, f)
+
+        self.documents.close()
+        if directory.exists():
+            old_dir = directory.with_name(directory.name + ".old")
+            if old_dir.exists():
+                shutil.rmtree(old_dir)
+            os.replace(directory, old_dir)
+            os.replace(tmp_dir, directory)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        else:
+            os.replace(tmp_dir, directory)
+        self.documents = IndexMetadata(str(directory / "documents.meta"))
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "BM25Index":
+        """Load an index saved with ``save``; arrays are memory-mapped by default."""
+        directory = Path(directory)
+        with open(directory / "index.json", "r", encoding="utf-8") as f:
+            info = json.load(f)
+        if info.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported BM25 index format in {directory}: {info.get('version')}")
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None)
+            for name in _ARRAYS
+        }
+        return cls(
+            num_docs=int(info["num_docs"]),
+            documents=IndexMetadata(str(directory / "documents.meta")),
+            params={key: info[key] for key in ("k1", "b", "epsilon", "avgdl")},
+            **arrays,
+        )
+
+    def close(self) -> None:
+        self.documents.close()
+
+
+class BM25IndexStore:
+    """Named BM25 indexes, persisted under ``data_dir/bm25`` and loaded on first use."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._indexes: Dict[str, BM25Index] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, index_id: str) -> Path:
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", index_id)
+        if name != index_id or len(name) > 100:
+            name = hashlib.sha256(index_id.encode("utf-8")).hexdigest()[:32]
+        return self.directory / name
+
+    def _get(self, index_id: str) -> Optional[BM25Index]:
+        index = self._indexes.get(index_id)
+        if index is None:
+            path = self._path(index_id)
+            if not (path / "index.json").exists():
+                return None
+            index = BM25Index.load(path)
+            self._indexes[index_id] = index
+        return index
+
+    def get(self, index_id: str) -> Optional[BM25Index]:
+        """
+        Return a stored index, loading it from disk if needed.
+
+        The index is closed when a ``put`` replaces it; readers that may
+        outlive a replacement (e.g. across awaits) should use ``lease``.
+        """
+        with self._lock:
+            return self._get(index_id)
+
+    @contextmanager
+    def lease(self, index_id: str) -> Iterator[Optional[BM25Index]]:
+        """Keep a stored index (None if there is none) open for a ``with`` block."""
+        with self._lock:
+            index = self._get(index_id)
+            if index is not None:
+                index.readers += 1
+        try:
+            yield index
+        finally:
+            if index is not None:
+                with self._lock:
+                    index.readers -= 1
+                    if index.retired and index.readers <= 0:
+                        index.close()
+
+    def put(self, index_id: str, index: BM25Index, persist: bool = True) -> None:
+        """Store an index under ``index_id``, replacing (and retiring) any previous one."""
+        with self._lock:
+            old = self._indexes.pop(index_id, None)
+            if old is not None and old is not index:
+                # Queries reading the old index keep it open until they finish
+                old.retired = True
+                if old.readers <= 0:
+                    old.close()
+            if persist:
+                index.save(self._path(index_id))
+            self._indexes[index_id] = index
+
+
+# Global store instance
+_store: Optional[BM25IndexStore] = None
+_store_lock = threading.Lock()
+
+
+def get_bm25_index_store() -> BM25IndexStore:
+    """Get the global BM25 index store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = BM25IndexStore(settings.data_dir / "bm25")
+    return _store
@@ -0,0 +1,347 @@
+"""
+Shared provider client pool.
+
+Every SDK client (OpenAI, Anthropic, Gemini, Cohere, Voyage AI) owns its own
+HTTP connection pool, so constructing one per node call pays a fresh TLS
+handshake each time. This module keeps one client per
+(provider, API key, base URL, options) for the whole process and hands the
+same instance to every caller, so keep-alive connections (HTTP/2 when the
+optional ``h2`` package is installed) are reused across executions.
+
+The pool is bounded: idle clients are evicted after a TTL and the least
+recently used client is dropped when the pool is full. Evicted clients are
+closed (after a grace period, since a caller may still be using one) so
+their connections are released.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Time an evicted client stays open for requests already started on it
+_CLOSE_GRACE_SECONDS = 60.0
+
+ClientKey = Tuple[str, str, Optional[str], str]
+
+
+def _httpx_limits():
+    """Connection limits shared by all pooled HTTP clients."""
+    import httpx
+
+    return httpx.Limits(
+        max_connections=settings.provider_client_max_connections,
+        max_keepalive_connections=settings.provider_client_max_keepalive,
+        keepalive_expiry=settings.provider_client_keepalive_seconds,
+    )
+
+
+def _use_http2() -> bool:
+    return settings.provider_client_http2 and _HTTP2_AVAILABLE
+
+
+def _build_openai(api_key: str, base_url: Optional[str], options: Dict[str, Any]) -> Any:
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=DefaultAsyncHttpxClient(http2=_use_http2(), limits=_httpx_limits()),
+        **options,
+    )
+
+
+def _build_anthropic(api_key: str, base_url: Optional[str], options: Dict[str, Any]) -> Any:
+    try:
+        from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+    except ImportError:
+        raise ValueError("anthropic not installed. Install it with: pip install anthropic")
+
+    return AsyncAnthropic(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=DefaultAsyncHttpxClient(http2=_use_http2(), limits=_httpx_limits()),
+        **options,
+    )
+
+
+def _build_gemini(api_key: str, base_url: Optional[str], options: Dict[str, Any]) -> Any:
+    try:
+        from google import genai
+    except ImportError:
+        raise ValueError("google-genai not installed. Install it with: pip install google-genai")
+
+    return genai.Client(api_key=api_key, **options)
+
+
+def _build_cohere(api_key: str, base_url: Optional[str], options: Dict[str, Any]) -> Any:
+    try:
+        import cohere
+    except ImportError:
+        raise ValueError("cohere not installed. Install it with: pip install cohere")
+
+    return cohere.AsyncClient(api_key=api_key, **options)
+
+
+def _build_voyage(api_key: str, base_url: Optional[str], options: Dict[str, Any]) -> Any:
+    try:
+        import voyageai
+    except ImportError:
+        raise ValueError("voyageai not installed. Install it with: pip install voyageai")
+
+    return voyageai.AsyncClient(api_key=api_key, **options)
+
+
+_FACTORIES: Dict[str, Callable[[str, Optional[str], Dict[str, Any]], Any]] = {
+    "openai": _build_openai,
+    "anthropic": _build_anthropic,
+    "gemini": _build_gemini,
+    "cohere": _build_cohere,
+    "voyage_ai": _build_voyage,
+}
+
+
+class _PooledClient:
+    """A cached client with its last-use timestamp."""
+
+    __slots__ = ("client", "last_used")
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.last_used = time.monotonic()
+
+
+class ProviderClientPool:
+    """
+    Process-wide pool of provider SDK clients.
+
+    Clients are keyed by (provider, hashed API key, base URL, options) so
+    different tenants and Azure deployments never share a client, while
+    repeated calls with the same credentials reuse one connection pool.
+    """
+
+    def __init__(self, max_size: int = 64, idle_seconds: float = 600.0):
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self._clients: "OrderedDict[ClientKey, _PooledClient]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # Evicted clients waiting to be closed, and the tasks closing them
+        self._retired: List[Any] = []
+        self._closing: Dict["asyncio.Task", Any] = {}
+
+    @staticmethod
+    def _make_key(
+        provider: str,
+        api_key: str,
+        base_url: Optional[str],
+        options: Dict[str, Any],
+    ) -> ClientKey:
+        key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+        options_repr = json.dumps(options, sort_keys=True, default=str)
+        return (provider, key_hash, base_url, options_repr)
+
+    def get(
+        self,
+        provider: str,
+        api_key: str,
+        base_url: Optional[str] = None,
+        **options: Any,
+    ) -> Any:
+        """
+        Get a shared client, creating it on first use.
+
+        Args:
+            provider: One of "openai", "anthropic", "gemini", "cohere", "voyage_ai"
+            api_key: Provider API key
+            base_url: Optional base URL (e.g. Azure OpenAI deployment URL)
+            **options: Extra constructor options (default_headers, default_query, ...)
+
+        Returns:
+            SDK client instance
+        """
+        factory = _FACTORIES.get(provider)
+        if factory is None:
+            raise ValueError(f"Unsupported provider for client pool: {provider}")
+        if not api_key:
+            raise ValueError(f"API key required for {provider} client")
+
+        key = self._make_key(provider, api_key, base_url, options)
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                entry.last_used = now
+                self._clients.move_to_end(key)
+                self._hits += 1
+        if entry is not None:
+            self._close_retired()
+            return entry.client
+
+        client = factory(api_key, base_url, dict(options))
+
+        with self._lock:
+            # Another caller may have created the same client concurrently
+            entry = self._clients.get(key)
+            if entry is not None:
+                entry.last_used = now
+                self._clients.move_to_end(key)
+                self._hits += 1
+                return entry.client
+
+            self._misses += 1
+            self._clients[key] = _PooledClient(client)
+            while len(self._clients) > self.max_size:
+                _, evicted = self._clients.popitem(last=False)
+                self._retired.append(evicted.client)
+                self._evictions += 1
+
+        self._close_retired()
+        logger.debug(f"Created pooled {provider} client (pool size: {len(self._clients)})")
+        return client
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop clients unused for longer than the idle TTL (lock must be held)."""
+        cutoff = now - self.idle_seconds
+        while self._clients:
+            key, entry = next(iter(self._clients.items()))
+            if entry.last_used >= cutoff:
+                break
+            # Entries are ordered by last use, so the oldest is first
+            del self._clients[key]
+            self._retired.append(entry.client)
+            self._evictions += 1
+
+    def _close_retired(self) -> None:
+        """
+        Schedule closing of evicted clients on the running event loop.
+
+        Without a running loop (a synchronous caller) they stay retired until
+        the next call from async code, or ``close_all``.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        with self._lock:
+            retired, self._retired = self._retired, []
+        for client in retired:
+            task = loop.create_task(self._close_client(client, _CLOSE_GRACE_SECONDS))
+            self._closing[task] = client
+            task.add_done_callback(lambda done: self._closing.pop(done, None))
+
+    @staticmethod
+    async def _close_client(client: Any, delay: float = 0.0) -> None:
+        """Close a client's transport, after ``delay`` seconds."""
+        if delay:
+            await asyncio.sleep(delay)
+        close = getattr(client, "close", None)
+        if close is None:
+            return
+        try:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.debug(f"Error closing pooled client: {e}")
+
+    async def close_all(self) -> None:
+        """Close every pooled client (call on application shutdown)."""
+        with self._lock:
+            clients = [entry.client for entry in self._clients.values()] + self._retired
+            self._clients.clear()
+            self._retired = []
+            closing = dict(self._closing)
+
+        # Evicted clients still in their grace period are closed now
+        for task in closing:
+            task.cancel()
+        await asyncio.gather(*closing, return_exceptions=True)
+        clients += [client for task, client in closing.items() if task.cancelled()]
+        for client in clients:
+            await self._close_client(client)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool statistics."""
+        with self._lock:
+            return {
+                "size": len(self._clients),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "http2": _use_http2(),
+            }
+
+
+# Global client pool instance
+_client_pool: Optional[ProviderClientPool] = None
+_client_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> ProviderClientPool:
+    """Get the global provider client pool."""
+    global _client_pool
+    if _client_pool is None:
+        with _client_pool_lock:
+            if _client_pool is None:
+                _client_pool = ProviderClientPool(
+                    max_size=settings.provider_client_pool_size,
+                    idle_seconds=settings.provider_client_idle_seconds,
+                )
+    return _client_pool
+
+
+def get_openai_client(
+    api_key: str,
+    base_url: Optional[str] = None,
+    **options: Any,
+) -> Any:
+    """Get a shared AsyncOpenAI client."""
+    return get_client_pool().get("openai", api_key, base_url, **options)
+
+
+def get_azure_openai_client(api_key: str, endpoint: str, api_version: str) -> Any:
+    """Get a shared AsyncOpenAI client configured for an Azure OpenAI endpoint."""
+    return get_openai_client(
+        api_key,
+        base_url=f"{endpoint.rstrip('/')}/openai/deployments",
+        default_headers={"api-key": api_key},
+        default_query={"api-version": api_version},
+    )
+
+
+def get_anthropic_client(api_key: str, **options: Any) -> Any:
+    """Get a shared AsyncAnthropic client."""
+    return get_client_pool().get("anthropic", api_key, **options)
+
+
+def get_gemini_client(api_key: str) -> Any:
+    """Get a shared google-genai client (use ``client.aio`` for async calls)."""
+    return get_client_pool().get("gemini", api_key)
+
+
+def get_cohere_client(api_key: str) -> Any:
+    """Get a shared Cohere AsyncClient."""
+    return get_client_pool().get("cohere", api_key)
+
+
+def get_voyage_client(api_key: str) -> Any:
+    """Get a shared Voyage AI AsyncClient."""
+    return get_client_pool().get("voyage_ai", api_key)
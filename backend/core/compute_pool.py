@@ -0,0 +1,323 @@
+"""
+Offload of CPU-bound node work.
+
+Nodes run blocking work (document parsing, chunking, index building, OCR,
+frame decoding, table parsing) through ``BaseNode.run_cpu_bound`` instead
+of on the event loop thread. ``ComputePool`` keeps two executors:
+
+- a process pool for pure-Python work that holds the GIL. Functions must
+  be importable (module-level) and their arguments and results picklable.
+- a thread pool for libraries that release the GIL (NumPy, OpenCV,
+  Tesseract), and the fallback when process workers are disabled
+  (``compute_process_workers = 0``) or cannot be started.
+
+Large ``bytes``, ``str`` and NumPy array arguments and results of process
+tasks (top-level values, and the items of a returned tuple, list or dict)
+are handed over through ``multiprocessing.shared_memory`` instead of being
+pickled through the pool's pipe.
+
+Every task has a timeout, shortened to the time left before the current
+execution deadline (see core/deadline.py). Work running in a process
+cannot be interrupted, so a process task that exceeds its own timeout
+replaces the pool: the old workers are terminated and the other tasks that
+were running on them are resubmitted once to the new pool. A task cut
+short by the deadline, or whose caller is cancelled, is only abandoned;
+the shared memory blocks of its result are unlinked when it finishes.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.config import settings
+from backend.core.deadline import bounded_timeout
+from backend.core.exceptions import ComputeTimeoutError
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROCESS = "process"
+THREAD = "thread"
+
+
+@dataclass(frozen=True)
+class _SharedValue:
+    """Reference to a value placed in a shared memory block."""
+
+    name: str
+    kind: str  # "bytes", "str" or "ndarray"
+    size: int
+    dtype: Optional[str] = None
+    shape: Optional[Tuple[int, ...]] = None
+
+
+def _share(value: Any, min_bytes: int, owned: List[shared_memory.SharedMemory]) -> Any:
+    """Move a large buffer into shared memory; other values are returned unchanged."""
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        data, kind = np.ascontiguousarray(value), "ndarray"
+        size = data.nbytes
+    elif isinstance(value, (bytes, bytearray)):
+        data, kind, size = value, "bytes", len(value)
+    elif isinstance(value, str) and len(value) >= min_bytes:
+        data = value.encode("utf-8", "surrogatepass")
+        kind, size = "str", len(data)
+    else:
+        return value
+    if size < max(min_bytes, 1):
+        return value
+
+    block = shared_memory.SharedMemory(create=True, size=size)
+    if kind == "ndarray":
+        np.ndarray(data.shape, dtype=data.dtype, buffer=block.buf)[...] = data
+    else:
+        block.buf[:size] = data
+    owned.append(block)
+    return _SharedValue(
+        name=block.name,
+        kind=kind,
+        size=size,
+        dtype=data.dtype.str if kind == "ndarray" else None,
+        shape=data.shape if kind == "ndarray" else None,
+    )
+
+
+def _unshare(value: Any, unlink: bool) -> Any:
+    """Copy a shared value back out of its block (other values are returned unchanged)."""
+    if not isinstance(value, _SharedValue):
+        return value
+    block = shared_memory.SharedMemory(name=value.name)
+    try:
+        if value.kind == "ndarray":
+            return np.ndarray(value.shape, dtype=np.dtype(value.dtype), buffer=block.buf).copy()
+        data = bytes(block.buf[:value.size])
+        return data.decode("utf-8", "surrogatepass") if value.kind == "str" else data
+    finally:
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+def _share_result(result: Any, min_bytes: int, owned: List[shared_memory.SharedMemory]) -> Any:
+    if isinstance(result, tuple):
+        return tuple(_share(item, min_bytes, owned) for item in result)
+    if isinstance(result, list):
+        return [_share(item, min_bytes, owned) for item in result]
+    if isinstance(result, dict):
+        return {key: _share(item, min_bytes, owned) for key, item in result.items()}
+    return _share(result, min_bytes, owned)
+
+
+def _unshare_result(result: Any) -> Any:
+    if isinstance(result, tuple):
+        return tuple(_unshare(item, unlink=True) for item in result)
+    if isinstance(result, list):
+        return [_unshare(item, unlink=True) for item in result]
+    if isinstance(result, dict):
+        return {key: _unshare(item, unlink=True) for key, item in result.items()}
+    return _unshare(result, unlink=True)
+
+
+def _discard_result(future: Future) -> None:
+    """Done-callback for abandoned process tasks: unlink the result's shared blocks."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    result = future.result()
+    if isinstance(result, dict):
+        items = list(result.values())
+    elif isinstance(result, (tuple, list)):
+        items = list(result)
+    else:
+        items = [result]
+    for item in items:
+        if not isinstance(item, _SharedValue):
+            continue
+        try:
+            block = shared_memory.SharedMemory(name=item.name)
+        except FileNotFoundError:
+            continue
+        block.close()
+        block.unlink()
+
+
+def _run_in_worker(fn: Callable, args: tuple, kwargs: Dict[str, Any], min_bytes: int) -> Any:
+    """Process-pool entry point: read shared arguments, run ``fn``, share large results."""
+    args = tuple(_unshare(arg, unlink=False) for arg in args)
+    kwargs = {key: _unshare(value, unlink=False) for key, value in kwargs.items()}
+    owned: List[shared_memory.SharedMemory] = []
+    result = _share_result(fn(*args, **kwargs), min_bytes, owned)
+    for block in owned:
+        # The parent unlinks result blocks once it has read them
+        resource_tracker.unregister(block._name, "shared_memory")
+        block.close()
+    return result
+
+
+class ComputePool:
+    """Process and thread executors for CPU-bound work."""
+
+    def __init__(
+        self,
+        process_workers: int,
+        thread_workers: int,
+        task_timeout: float,
+        shared_memory_min_bytes: int,
+    ):
+        self.process_workers = process_workers
+        self.task_timeout = task_timeout
+        self.shared_memory_min_bytes = shared_memory_min_bytes
+        self._lock = threading.Lock()
+        self._threads = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="compute")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._processes_available = process_workers > 0
+
+    def _process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Return the process pool, starting it on first use (None if unavailable)."""
+        with self._lock:
+            if self._processes is None and self._processes_available:
+                try:
+                    self._processes = ProcessPoolExecutor(
+                        max_workers=self.process_workers,
+                        # Forking a process with running threads and an event loop is unsafe
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                except (OSError, NotImplementedError, ValueError) as e:
+                    logger.warning(f"Process pool unavailable, running CPU-bound work in threads: {e}")
+                    self._processes_available = False
+            return self._processes
+
+    def _replace_process_pool(self, broken: Executor) -> None:
+        """Discard a broken or stuck process pool; the next task starts a new one."""
+        with self._lock:
+            if self._processes is not broken:
+                return
+            self._processes = None
+        # Terminate workers that may still be running timed-out work
+        for process in list((getattr(broken, "_processes", None) or {}).values()):
+            process.terminate()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def run(
+        self,
+        fn: Callable,
+        *args: Any,
+        executor: str = PROCESS,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` off the event loop and return its result.
+
+        Args:
+            fn: Function to run (module-level for the process executor)
+            executor: "process" for GIL-bound work, "thread" for GIL-releasing libraries
+            timeout: Seconds before ComputeTimeoutError (default: compute_task_timeout_seconds)
+
+        Raises:
+            ComputeTimeoutError: If the task does not finish in time
+        """
+        task_timeout = self.task_timeout if timeout is None else timeout
+        timeout = bounded_timeout(task_timeout)
+        task_name = getattr(fn, "__qualname__", repr(fn))
+        if executor == PROCESS:
+            for attempt in range(2):
+                pool = self._process_pool()
+                if pool is None:
+                    break
+                try:
+                    return await self._run_in_process(
+                        pool, fn, args, kwargs, timeout, task_name, restart_on_timeout=timeout >= task_timeout
+                    )
+                except BrokenProcessPool:
+                    # A worker died (or the pool was replaced after another task's timeout)
+                    self._replace_process_pool(pool)
+                    if attempt:
+                        raise
+                    logger.warning(f"Process pool broke while running {task_name}, retrying once")
+        elif executor != THREAD:
+            raise ValueError(f"Unknown executor: {executor}")
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._threads, functools.partial(fn, *args, **kwargs))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # The thread keeps running until fn returns; its result is discarded
+            raise ComputeTimeoutError(task_name, round(timeout, 3)) from None
+
+    async def _run_in_process(
+        self,
+        pool: ProcessPoolExecutor,
+        fn: Callable,
+        args: tuple,
+        kwargs: Dict[str, Any],
+        timeout: float,
+        task_name: str,
+        restart_on_timeout: bool = True,
+    ) -> Any:
+        owned: List[shared_memory.SharedMemory] = []
+        try:
+            shared_args = tuple(_share(arg, self.shared_memory_min_bytes, owned) for arg in args)
+            shared_kwargs = {key: _share(value, self.shared_memory_min_bytes, owned) for key, value in kwargs.items()}
+            submitted = pool.submit(_run_in_worker, fn, shared_args, shared_kwargs, self.shared_memory_min_bytes)
+            try:
+                result = await asyncio.wait_for(asyncio.wrap_future(submitted), timeout)
+            except asyncio.CancelledError:
+                # The worker still finishes; nobody will read its result blocks
+                submitted.add_done_callback(_discard_result)
+                raise
+            except asyncio.TimeoutError:
+                submitted.add_done_callback(_discard_result)
+                if restart_on_timeout:
+                    logger.error(f"{task_name} timed out after {timeout:g}s; restarting the process pool")
+                    self._replace_process_pool(pool)
+                raise ComputeTimeoutError(task_name, round(timeout, 3)) from None
+            return _unshare_result(result)
+        finally:
+            for block in owned:
+                block.close()
+                block.unlink()
+
+    def shutdown(self) -> None:
+        """Stop both executors without waiting for running work."""
+        with self._lock:
+            processes, self._processes = self._processes, None
+        if processes is not None:
+            processes.shutdown(wait=False, cancel_futures=True)
+        self._threads.shutdown(wait=False, cancel_futures=True)
+
+
+# Global compute pool instance
+_compute_pool: Optional[ComputePool] = None
+_compute_pool_lock = threading.Lock()
+
+
+def get_compute_pool() -> ComputePool:
+    """Get the global compute pool."""
+    global _compute_pool
+    if _compute_pool is None:
+        with _compute_pool_lock:
+            if _compute_pool is None:
+                _compute_pool = ComputePool(
+                    process_workers=settings.compute_process_workers,
+                    thread_workers=settings.compute_thread_workers,
+                    task_timeout=settings.compute_task_timeout_seconds,
+                    shared_memory_min_bytes=settings.compute_shared_memory_min_bytes,
+                )
+    return _compute_pool
+
+
+def shutdown_compute_pool() -> None:
+    """Stop the global compute pool (on application shutdown)."""
+    global _compute_pool
+    with _compute_pool_lock:
+        pool, _compute_pool = _compute_pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,190 @@
+"""
+Token-budgeted packing of retrieved context for RAG prompts.
+
+Search and rerank nodes hand the chat node every result they found, and
+without packing all of them were pasted into ``{context}``: overlapping
+chunks from neighbouring windows of the same document, and on large top-k
+settings more text than the model can take. Prompt size drives both
+latency and cost, so the chat node packs results before rendering:
+
+1. Results are ordered by score, best first.
+2. A chunk whose word shingles mostly match an already selected chunk
+   (``context_dedup_threshold``) is dropped as a near-duplicate.
+3. Chunks are added greedily while they fit the token budget. A chunk that
+   does not fit is skipped; a smaller, lower-scored one may still fit.
+
+The budget is the smaller of the configured ``context_token_budget`` and
+what the model's context window (its ``context_window`` pricing metadata,
+else ``max_tokens``) leaves after the rest of the prompt and ``max_tokens``
+of output. Tokens are counted with tiktoken when it is
+installed (encoders and chunk counts are cached), otherwise estimated.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from backend.config import settings
+from backend.utils.logger import get_logger
+from backend.utils.model_pricing import ModelType, get_model_pricing
+
+logger = get_logger(__name__)
+
+# Tokens of the "[n] " label and blank-line separator around each chunk
+_CHUNK_OVERHEAD_TOKENS = 4
+_SHINGLE_SIZE = 3
+
+
+@lru_cache(maxsize=32)
+def _encoding(model: str) -> Any:
+    """Return the tiktoken encoding of a model, or None when tiktoken is not installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Non-OpenAI models: cl100k_base is a close enough approximation
+        return tiktoken.get_encoding("cl100k_base")
+
+
+@lru_cache(maxsize=4096)
+def _count_tokens(text: str, model: str) -> int:
+    encoding = _encoding(model)
+    if encoding is None:
+        # Rough: 1 token ≈ 4 chars
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_tokens(text: Optional[str], model: str = "") -> int:
+    """Count the tokens of a text for a model."""
+    if not text:
+        return 0
+    return _count_tokens(text, model or "gpt-4o")
+
+
+def _shingles(text: str) -> FrozenSet[Tuple[str, ...]]:
+    """Word shingles of a text, for near-duplicate detection."""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) <= _SHINGLE_SIZE:
+        return frozenset([tuple(words)]) if words else frozenset()
+    return frozenset(tuple(words[i:i + _SHINGLE_SIZE]) for i in range(len(words) - _SHINGLE_SIZE + 1))
+
+
+def _similarity(a: FrozenSet, b: FrozenSet) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _item_text(item: Any) -> str:
+    return str(item.get("text", "")) if isinstance(item, dict) else str(item)
+
+
+def _item_score(item: Any) -> Optional[float]:
+    score = item.get("score") if isinstance(item, dict) else None
+    return float(score) if isinstance(score, (int, float)) else None
+
+
+def context_budget(
+    provider: str,
+    model: str,
+    max_tokens: int,
+    prompt_tokens: int,
+    budget: Optional[int] = None,
+) -> Optional[int]:
+    """
+    Return the token budget for retrieved context, or None when unbounded.
+
+    Args:
+        provider: LLM provider
+        model: Model identifier, used to look up the context window
+        max_tokens: Tokens reserved for the response
+        prompt_tokens: Tokens of the rest of the prompt (system prompt, template, query)
+        budget: Configured budget (defaults to ``settings.context_token_budget``; 0 = no limit)
+    """
+    configured = settings.context_token_budget if budget is None else budget
+    limits = [configured] if configured > 0 else []
+
+    pricing = get_model_pricing(provider, model)
+    if pricing and pricing.model_type == ModelType.LLM:
+        # max_tokens is the output limit for some models (e.g. Claude); prefer the window
+        context_window = (pricing.metadata or {}).get("context_window") or pricing.max_tokens
+        if context_window:
+            limits.append(max(0, context_window - max_tokens - prompt_tokens))
+
+    return min(limits) if limits else None
+
+
+@dataclass
+class PackedContext:
+    """Result of packing retrieved chunks into a token budget."""
+    items: List[Any] = field(default_factory=list)
+    tokens: int = 0
+    budget: Optional[int] = None
+    dropped_duplicates: int = 0
+    dropped_over_budget: int = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Packed and dropped counts, as reported in the node output and span."""
+        return {
+            "packed": len(self.items),
+            "dropped_duplicates": self.dropped_duplicates,
+            "dropped_over_budget": self.dropped_over_budget,
+            "tokens": self.tokens,
+            "budget": self.budget,
+        }
+
+
+def pack_context(
+    items: List[Any],
+    budget: Optional[int],
+    model: str = "",
+    dedup_threshold: Optional[float] = None,
+) -> PackedContext:
+    """
+    Select retrieved chunks for a prompt.
+
+    Args:
+        items: Search results (dicts with ``text`` and ``score``) or plain strings
+        budget: Token budget for the packed chunks (None = no limit)
+        model: Model whose tokenizer counts the chunks
+        dedup_threshold: Near-duplicate similarity threshold (defaults to
+            ``settings.context_dedup_threshold``)
+
+    Returns:
+        PackedContext with the selected items, best-scored first
+    """
+    threshold = settings.context_dedup_threshold if dedup_threshold is None else dedup_threshold
+    # Stable sort: unscored items keep their order, after the scored ones
+    ordered = sorted(items, key=lambda item: (_item_score(item) is None, -(_item_score(item) or 0.0)))
+
+    packed = PackedContext(budget=budget)
+    selected_shingles: List[FrozenSet] = []
+    for item in ordered:
+        text = _item_text(item)
+        shingles = _shingles(text)
+        # Empty chunks add nothing and count with the duplicates
+        if not shingles or any(_similarity(shingles, seen) >= threshold for seen in selected_shingles):
+            packed.dropped_duplicates += 1
+            continue
+
+        tokens = count_tokens(text, model) + _CHUNK_OVERHEAD_TOKENS
+        if budget is not None and packed.tokens + tokens > budget:
+            packed.dropped_over_budget += 1
+            continue
+
+        packed.items.append(item)
+        packed.tokens += tokens
+        selected_shingles.append(shingles)
+
+    if packed.dropped_duplicates or packed.dropped_over_budget:
+        logger.info(
+            f"Packed {len(packed.items)}/{len(items)} context chunks ({packed.tokens} tokens, budget {budget}): "
+            f"{packed.dropped_duplicates} near-duplicates, {packed.dropped_over_budget} over budget"
+        )
+    return packed
@@ -3,18 +3,50 @@ Persistent cost storage for historical cost tracking.
 
 This module provides functions for storing and retrieving cost data from the database,
 enabling historical cost analysis (daily, weekly, monthly stats).
+
+Cost records are written behind (see core/write_behind.py): ``record_cost``
+queues the row and a background thread inserts queued rows in multi-row
+batches, so statistics include a record once its batch is written (within
+``write_behind_flush_interval_seconds``).
 """
 
-from typing import List, Optional, Dict, Any
+import json
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from psycopg2.extras import execute_values
+
+from backend.config import settings
 from backend.core.database import get_db_connection, is_database_configured
+from backend.core.write_behind import get_write_behind_buffer
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _insert_cost_rows(rows: List[Tuple]) -> None:
+    """Insert cost record rows with one multi-row INSERT and commit."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            execute_values(
+                cur,
+                """
+                INSERT INTO cost_records (
+                    execution_id, workflow_id, user_id, node_id, node_type,
+                    cost, tokens_used, duration_ms, provider, model, category,
+                    config, metadata, created_at
+                )
+                VALUES %s
+                """,
+                rows,
+                page_size=max(len(rows), 1),
+            )
+        # Explicit commit to ensure data is persisted immediately
+        conn.commit()
+    logger.debug(f"Recorded {len(rows)} cost record(s)")
+
+
 def record_cost(
     execution_id: str,
     workflow_id: Optional[str],
@@ -34,6 +66,9 @@ def record_cost(
     """
     Record a cost entry in the database.
     
+    The row is queued and inserted with the next batch unless
+    ``enable_write_behind`` is off.
+    
     Args:
         execution_id: Execution ID
         workflow_id: Workflow ID (UUID)
@@ -57,41 +92,31 @@ def record_cost(
     if cost <= 0:
         return  # Don't store zero-cost records
     
-    import json
-    
     timestamp = timestamp or datetime.now()
     
+    row = (
+        execution_id,
+        workflow_id,
+        user_id,
+        node_id,
+        node_type,
+        Decimal(str(cost)),
+        json.dumps(tokens_used) if tokens_used else '{}',
+        duration_ms,
+        provider,
+        model,
+        category,
+        json.dumps(config, default=str) if config else '{}',
+        json.dumps(metadata, default=str) if metadata else '{}',
+        timestamp,
+    )
+    
+    if settings.enable_write_behind:
+        get_write_behind_buffer("cost_records", _insert_cost_rows).submit(row)
+        return
+    
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO cost_records (
-                        execution_id, workflow_id, user_id, node_id, node_type,
-                        cost, tokens_used, duration_ms, provider, model, category,
-                        config, metadata, created_at
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        execution_id,
-                        workflow_id,
-                        user_id,
-                        node_id,
-                        node_type,
-                        Decimal(str(cost)),
-                        json.dumps(tokens_used) if tokens_used else '{}',
-                        duration_ms,
-                        provider,
-                        model,
-                        category,
-                        json.dumps(config) if config else '{}',
-                        json.dumps(metadata) if metadata else '{}',
-                        timestamp,
-                    ),
-                )
-            # Explicit commit to ensure data is persisted immediately
-            conn.commit()
+        _insert_cost_rows([row])
         logger.info(f"✅ Recorded cost: ${cost:.6f} for node {node_id} in execution {execution_id} (workflow_id: {workflow_id}, user_id: {user_id})")
     except Exception as e:
         logger.error(f"Failed to record cost to database: {e}", exc_info=True)
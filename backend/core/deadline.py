@@ -0,0 +1,54 @@
+"""
+Execution deadlines.
+
+A deadline is the point in time by which work must finish. It is kept in a
+context variable, so it follows the work into every task spawned while it
+is set: the engine sets the deadline of a request (e.g. the ``timeout_ms``
+of a deployed workflow query) around node scheduling, ``NodeExecutor``
+narrows it to each node's own timeout, and code deeper down (retries,
+offloaded CPU work, hedged requests) asks how much of the budget is left
+with ``remaining_time``.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("execution_deadline", default=None)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline (None without a deadline, never negative)."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def bounded_timeout(timeout: Optional[float]) -> Optional[float]:
+    """Return ``timeout`` capped by the time left before the current deadline."""
+    remaining = remaining_time()
+    if remaining is None:
+        return timeout
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Set a deadline ``timeout`` seconds from now for the enclosed work.
+
+    An enclosing deadline that expires earlier is kept. Yields the time
+    budget of the scope (None if there is no deadline).
+    """
+    current = _deadline.get()
+    deadline = current
+    if timeout is not None:
+        requested = time.monotonic() + timeout
+        deadline = requested if current is None else min(current, requested)
+    token = _deadline.set(deadline)
+    try:
+        yield None if deadline is None else max(0.0, deadline - time.monotonic())
+    finally:
+        _deadline.reset(token)
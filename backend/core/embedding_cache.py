@@ -0,0 +1,339 @@
+"""
+Content-addressed embedding cache.
+
+Embeddings are keyed by hash(provider, model, dimension, text), so re-embedding
+identical chunk text (re-processing a knowledge base version, re-running a RAG
+workflow, repeated search queries) is served locally instead of by the provider.
+
+Two tiers:
+- An in-memory LRU of recently used vectors.
+- A persistent on-disk store with one segment per (provider, model, dimension).
+  Each segment is an append-only file of float32 rows, read through a memory
+  map, plus an append-only index of 16-byte keys (row N of the index is row N
+  of the vectors file). Segments may be shared by several processes.
+
+New embeddings go into the memory tier immediately and are appended to disk
+by a background thread, so fsync never runs on the event loop.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within a process
+    fcntl = None
+
+from backend.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_KEY_BYTES = 16
+
+
+def embedding_cache_key(provider: str, model: str, dimension: Optional[int], text: str) -> bytes:
+    """Return the 16-byte content key for an embedding."""
+    digest = hashlib.sha256()
+    for part in (provider, model, str(dimension or "")):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    digest.update(text.encode("utf-8"))
+    return digest.digest()[:_KEY_BYTES]
+
+
+class _Segment:
+    """
+    On-disk vectors for one (provider, model, dimension) namespace.
+
+    Several processes (API workers, execution workers) may share a segment.
+    Appends hold an exclusive ``fcntl`` lock on the segment's lock file and
+    take row numbers from the index file's size at write time, so every
+    process sees the same key-to-row mapping. Rows appended by other
+    processes are picked up when a lookup misses.
+    """
+
+    def __init__(self, directory: Path, meta: Dict[str, Any]):
+        self.directory = directory
+        self.vectors_path = directory / "vectors.f32"
+        self.index_path = directory / "index.bin"
+        self.meta_path = directory / "meta.json"
+        self.lock_path = directory / "lock"
+        self.meta = meta
+        self.dim: Optional[int] = meta.get("vector_dim")
+        self.rows: Dict[bytes, int] = {}
+        self._row_count = 0  # Rows of the index read so far (a key may repeat)
+        self._rows_lock = threading.Lock()  # Guards rows, _row_count and the memory map
+        self._append_lock = threading.Lock()  # One append at a time in this process
+        self._mmap: Optional[np.memmap] = None
+        self._mapped_rows = 0
+        if self.directory.exists():
+            with self._file_lock():
+                self._load_meta()
+                self._repair_tail()
+                self._refresh()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock on the segment across processes."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _load_meta(self) -> None:
+        if self.dim is None and self.meta_path.exists():
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.meta.update(json.load(f))
+            self.dim = self.meta.get("vector_dim")
+
+    def _complete_rows(self) -> int:
+        """Rows present in both files (vectors are written before keys)."""
+        if not self.dim or not self.index_path.exists() or not self.vectors_path.exists():
+            return 0
+        key_rows = self.index_path.stat().st_size // _KEY_BYTES
+        vector_rows = self.vectors_path.stat().st_size // (4 * self.dim)
+        return min(key_rows, vector_rows)
+
+    def _repair_tail(self) -> None:
+        """Truncate a torn tail so appends stay aligned (file lock must be held)."""
+        if not self.dim:
+            return
+        count = self._complete_rows()
+        for path, row_bytes in ((self.vectors_path, 4 * self.dim), (self.index_path, _KEY_BYTES)):
+            if path.exists() and path.stat().st_size != count * row_bytes:
+                with open(path, "r+b") as f:
+                    f.truncate(count * row_bytes)
+
+    def _refresh(self) -> None:
+        """Read keys appended since the last refresh, by this or another process."""
+        self._load_meta()
+        count = self._complete_rows()
+        with self._rows_lock:
+            if count <= self._row_count:
+                return
+            with open(self.index_path, "rb") as f:
+                f.seek(self._row_count * _KEY_BYTES)
+                keys = f.read((count - self._row_count) * _KEY_BYTES)
+            for offset in range(len(keys) // _KEY_BYTES):
+                key = keys[offset * _KEY_BYTES:(offset + 1) * _KEY_BYTES]
+                self.rows.setdefault(key, self._row_count + offset)
+            self._row_count = count
+
+    def _ensure_mapped(self, row: int) -> np.memmap:
+        if self._mmap is None or row >= self._mapped_rows:
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self._row_count, self.dim))
+            self._mapped_rows = self._row_count
+        return self._mmap
+
+    def read_many(self, keys: Sequence[bytes]) -> List[Optional[List[float]]]:
+        with self._rows_lock:
+            known = all(key in self.rows for key in keys)
+        if not known:
+            # Another process may have appended them; one refresh covers the batch
+            self._refresh()
+        vectors: List[Optional[List[float]]] = []
+        with self._rows_lock:
+            for key in keys:
+                row = self.rows.get(key)
+                vectors.append(None if row is None else self._ensure_mapped(row)[row].tolist())
+        return vectors
+
+    def append(self, items: List[Tuple[bytes, Sequence[float]]]) -> None:
+        vectors = np.asarray([vector for _, vector in items], dtype=np.float32)
+        if not items or vectors.ndim != 2:
+            return
+
+        with self._append_lock, self._file_lock():
+            self._load_meta()
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self.meta["vector_dim"] = self.dim
+                with open(self.meta_path, "w", encoding="utf-8") as f:
+                    json.dump(self.meta, f)
+            elif vectors.shape[1] != self.dim:
+                logger.warning(
+                    f"Embedding cache dimension mismatch in {self.directory.name}: "
+                    f"expected {self.dim}, got {vectors.shape[1]}; not caching"
+                )
+                return
+
+            self._repair_tail()
+            self._refresh()
+            with self._rows_lock:
+                keep = [i for i, (key, _) in enumerate(items) if key not in self.rows]
+            if not keep:
+                return
+
+            with open(self.vectors_path, "ab") as f:
+                f.write(vectors[keep].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.index_path, "ab") as f:
+                f.write(b"".join(items[i][0] for i in keep))
+                f.flush()
+                os.fsync(f.fileno())
+            self._refresh()
+
+
+class EmbeddingCache:
+    """
+    Two-tier (memory LRU + memory-mapped disk) embedding cache.
+
+    Safe to share across threads; the memory tier and segment table are
+    guarded by one lock. Disk appends run on a single writer thread.
+    """
+
+    def __init__(self, cache_dir: Path, memory_items: int = 20000):
+        self.cache_dir = Path(cache_dir)
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[bytes, List[float]]" = OrderedDict()
+        self._segments: Dict[str, _Segment] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: List[Future] = []
+
+    def _segment(self, provider: str, model: str, dimension: Optional[int]) -> _Segment:
+        name = hashlib.sha256(f"{provider}\x00{model}\x00{dimension or ''}".encode("utf-8")).hexdigest()[:24]
+        segment = self._segments.get(name)
+        if segment is None:
+            meta = {"provider": provider, "model": model, "dimension": dimension}
+            segment = _Segment(self.cache_dir / name, meta)
+            self._segments[name] = segment
+        return segment
+
+    def _remember(self, key: bytes, vector: List[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(
+        self,
+        provider: str,
+        model: str,
+        dimension: Optional[int],
+        texts: Sequence[str],
+    ) -> List[Optional[List[float]]]:
+        """
+        Look up embeddings for texts.
+
+        Returns:
+            A list aligned with ``texts``; cache misses are None.
+        """
+        keys = [embedding_cache_key(provider, model, dimension, text) for text in texts]
+        results: List[Optional[List[float]]] = []
+        with self._lock:
+            segment = self._segment(provider, model, dimension)
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                results.append(vector)
+
+            missing = [i for i, vector in enumerate(results) if vector is None]
+            if missing:
+                for i, vector in zip(missing, segment.read_many([keys[i] for i in missing])):
+                    if vector is not None:
+                        self._remember(keys[i], vector)
+                        results[i] = vector
+            hits = sum(vector is not None for vector in results)
+            self._hits += hits
+            self._misses += len(results) - hits
+        return results
+
+    def put_many(
+        self,
+        provider: str,
+        model: str,
+        dimension: Optional[int],
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+    ) -> None:
+        """Store embeddings for texts (existing entries are left untouched)."""
+        if len(texts) != len(embeddings):
+            raise ValueError(f"Got {len(embeddings)} embeddings for {len(texts)} texts")
+
+        items = []
+        seen = set()
+        for text, embedding in zip(texts, embeddings):
+            key = embedding_cache_key(provider, model, dimension, text)
+            if key in seen:
+                continue
+            seen.add(key)
+            items.append((key, [float(x) for x in embedding]))
+
+        with self._lock:
+            segment = self._segment(provider, model, dimension)
+            for key, vector in items:
+                self._remember(key, vector)
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-cache-writer")
+            self._pending_writes = [f for f in self._pending_writes if not f.done()]
+            self._pending_writes.append(self._writer.submit(self._persist, segment, items))
+
+    @staticmethod
+    def _persist(segment: _Segment, items: List[Tuple[bytes, List[float]]]) -> None:
+        try:
+            segment.append(items)
+        except OSError as e:
+            logger.warning(f"Could not persist embeddings to cache: {e}")
+
+    def flush(self) -> None:
+        """Wait until embeddings stored so far are written to disk."""
+        with self._lock:
+            pending = list(self._pending_writes)
+        for future in pending:
+            future.result()
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory tier (the disk tier is kept)."""
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "memory_items": len(self._memory),
+                "disk_items": sum(len(segment.rows) for segment in self._segments.values()),
+                "segments": len(self._segments),
+            }
+
+
+# Global embedding cache instance
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the global embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(
+                    cache_dir=settings.data_dir / "embedding_cache",
+                    memory_items=settings.embedding_cache_memory_items,
+                )
+    return _embedding_cache
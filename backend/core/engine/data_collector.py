@@ -8,10 +8,12 @@ This module handles:
 - Supporting intelligent routing
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from backend.core.models import Node, Workflow
 from backend.core.node_registry import NodeRegistry
+from backend.core.record_stream import RecordStream
+from backend.core.engine.execution_plan import MERGE_NONE, ExecutionPlan
 from backend.core.engine.workflow_validator import WorkflowValidator
 from backend.utils.logger import get_logger
 
@@ -26,11 +28,15 @@ class DataCollector:
         workflow: Workflow,
         node_id: str,
         node_outputs: Dict[str, Dict[str, Any]],
+        plan: Optional[ExecutionPlan] = None,
     ) -> Dict[str, Dict[str, Any]]:
         """
         Collect source data from all source nodes WITHOUT merging.
         Preserves all source data separately to avoid data loss.
         
+        With a compiled plan, sources come from its adjacency lists instead
+        of a scan over all workflow edges.
+        
         Returns:
             Dictionary mapping source_id -> {
                 "outputs": {...},
@@ -41,18 +47,24 @@ class DataCollector:
         """
         source_data: Dict[str, Dict[str, Any]] = {}
         
-        # Find all edges that target this node
-        for edge in workflow.edges:
-            if edge.target == node_id:
-                source_outputs = node_outputs.get(edge.source, {})
-                source_node = WorkflowValidator.get_node_by_id(workflow, edge.source)
-                
-                source_data[edge.source] = {
-                    "outputs": source_outputs.copy(),  # Preserve original outputs
-                    "node_type": source_node.type if source_node else "unknown",
-                    "node_label": source_node.data.get("label", "").lower() if (source_node and source_node.data) else "",
-                    "node": source_node,
-                }
+        # Find all nodes with an edge into this node
+        if plan is not None:
+            source_nodes = [plan.get_node(workflow, source_id) for source_id in plan.sources[node_id]]
+        else:
+            source_nodes = [
+                WorkflowValidator.get_node_by_id(workflow, edge.source)
+                for edge in workflow.edges
+                if edge.target == node_id
+            ]
+        
+        for source_node in source_nodes:
+            source_outputs = node_outputs.get(source_node.id, {})
+            source_data[source_node.id] = {
+                "outputs": source_outputs.copy(),  # Preserve original outputs
+                "node_type": source_node.type if source_node else "unknown",
+                "node_label": source_node.data.get("label", "").lower() if (source_node and source_node.data) else "",
+                "node": source_node,
+            }
         
         return source_data
     
@@ -62,6 +74,7 @@ class DataCollector:
         target_node_type: str,
         workflow: Workflow,
         target_node_id: str,
+        direct_sources: Optional[FrozenSet[str]] = None,
     ) -> Dict[str, Any]:
         """
         Smart merging of source data when intelligent routing is OFF.
@@ -76,6 +89,7 @@ class DataCollector:
             target_node_type: Type of target node (e.g., "blog_generator", "email")
             workflow: The workflow (to check edge connections)
             target_node_id: ID of the target node (to identify direct sources)
+            direct_sources: Precomputed direct source IDs (from a compiled plan)
             
         Returns:
             Merged inputs dictionary
@@ -86,15 +100,18 @@ class DataCollector:
         # STEP 1: Separate direct vs indirect sources
         # Direct source = one hop away (edge directly connects to target)
         # Indirect source = multiple hops away or conflicting
+        direct_ids = direct_sources
+        if direct_ids is None:
+            direct_ids = frozenset(
+                edge.source for edge in workflow.edges if edge.target == target_node_id
+            )
+        
         direct_sources: List[tuple] = []
         indirect_sources: List[tuple] = []
         
         for source_id, source_info in source_data.items():
             # Check if this is a direct source (edge directly to target)
-            is_direct = any(
-                edge.source == source_id and edge.target == target_node_id
-                for edge in workflow.edges
-            )
+            is_direct = source_id in direct_ids
             
             if is_direct:
                 direct_sources.append((source_id, source_info))
@@ -541,6 +558,7 @@ class DataCollector:
         node_id: str,
         node_outputs: Dict[str, Dict[str, Any]],
         use_intelligent_routing: Optional[bool] = None,
+        plan: Optional[ExecutionPlan] = None,
     ) -> Dict[str, Any]:
         """
         Collect inputs for a node from its source nodes.
@@ -553,6 +571,7 @@ class DataCollector:
             node_id: The target node ID
             node_outputs: Outputs from previously executed nodes
             use_intelligent_routing: Whether to use intelligent routing (None = auto-detect from settings)
+            plan: Compiled execution plan for the workflow (optional)
             
         Returns:
             Combined inputs dictionary
@@ -563,10 +582,17 @@ class DataCollector:
         logger.debug(f"Intelligent routing DISABLED - using enhanced smart merge instead")
         
         # STEP 1: Collect source data WITHOUT merging (preserve all sources)
-        source_data = DataCollector.collect_source_data(workflow, node_id, node_outputs)
+        if plan is not None and plan.merge_strategies[node_id] == MERGE_NONE:
+            source_data: Dict[str, Dict[str, Any]] = {}
+        else:
+            source_data = DataCollector.collect_source_data(workflow, node_id, node_outputs, plan=plan)
+        direct_sources = plan.direct_sources[node_id] if plan is not None else None
         
         # STEP 2: Apply routing strategy
-        target_node = WorkflowValidator.get_node_by_id(workflow, node_id)
+        if plan is not None:
+            target_node = plan.get_node(workflow, node_id)
+        else:
+            target_node = WorkflowValidator.get_node_by_id(workflow, node_id)
         target_node_type = target_node.type if target_node else "unknown"
         
         # STEP 2.5: For vector_search nodes, ensure query from config is available in inputs
@@ -612,7 +638,9 @@ class DataCollector:
                     }
                     logger.warning(f"⚠️ Could not get schema for {target_node_type}, using smart fallback. Context: {schema_error_context}")
                     # Fall through to smart fallback merging
-                    inputs = DataCollector.smart_merge_sources(source_data, target_node_type, workflow, node_id)
+                    inputs = DataCollector.smart_merge_sources(
+                        source_data, target_node_type, workflow, node_id, direct_sources=direct_sources
+                    )
                     logger.debug(f"📋 Smart fallback for {node_id} ({target_node_type}): Merged keys: {list(inputs.keys())}")
                     return inputs
                 
@@ -859,11 +887,19 @@ class DataCollector:
             logger.info(f"📋 Intelligent routing OFF for {node_id}, using smart fallback merging")
         
         # STEP 2B: Use smart fallback merging (when intelligent routing is OFF or failed)
-        inputs = DataCollector.smart_merge_sources(source_data, target_node_type, workflow, node_id)
+        inputs = DataCollector.smart_merge_sources(
+            source_data, target_node_type, workflow, node_id, direct_sources=direct_sources
+        )
         
         # STEP 2C: Extract critical fields from prefixed keys (same as intelligent routing does)
         # This ensures nodes receive properly named inputs even when routing is OFF
         
+        # 0) Streaming edges: expose upstream streams under their input names
+        for value in list(inputs.values()):
+            if isinstance(value, RecordStream) and value.name not in inputs:
+                inputs[value.name] = value
+                logger.info(f"   🌊 Streaming '{value.name}' into {node_id}")
+        
         # 1) Embedding nodes: extract 'chunks' from prefixed keys
         if target_node_type == "embed":
             if "chunks" not in inputs:
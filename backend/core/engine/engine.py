@@ -4,25 +4,29 @@ Workflow execution engine for NodeAI.
 This module contains the core engine that executes workflows by:
 1. Parsing workflow structure
 2. Building execution graph
-3. Executing nodes in correct order
+3. Executing nodes as soon as their dependencies complete (in parallel)
 4. Passing data between nodes
 5. Tracking execution results and costs
 """
 
+import asyncio
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
+from backend.config import settings
+from backend.core.deadline import deadline_scope
 from backend.core.exceptions import WorkflowExecutionError
 from backend.core.models import Execution, ExecutionStatus, ExecutionStep, NodeResult, NodeStatus, Workflow
-from backend.core.streaming import StreamEventType, stream_manager
+from backend.core.streaming import StreamEvent, StreamEventType, stream_manager
 from backend.core.query_tracer import QueryTracer
 from backend.core.observability import get_observability_manager
 from backend.core.observability_adapter import get_observability_adapter
-from backend.core.engine.workflow_validator import WorkflowValidator
+from backend.core.engine.execution_plan import ExecutionPlan, get_execution_plan
 from backend.core.engine.data_collector import DataCollector
 from backend.core.engine.node_executor import NodeExecutor
 from backend.core.engine.tracing import Tracing
 from backend.core.engine.cost_tracker import CostTracker
+from backend.core.record_stream import RecordStream, describe_streams, has_streams
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -35,7 +39,7 @@ class WorkflowEngine:
     Orchestrates the execution of workflows by:
     - Validating workflow structure
     - Building dependency graph
-    - Executing nodes in topological order
+    - Executing independent nodes concurrently once their dependencies complete
     - Passing data between nodes
     - Tracking execution state and costs
     """
@@ -50,6 +54,8 @@ class WorkflowEngine:
         execution_id: str | None = None,
         user_id: str | None = None,
         use_intelligent_routing: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
+        timeout_ms: Optional[int] = None,
     ) -> Execution:
         """
         Execute a workflow.
@@ -59,6 +65,11 @@ class WorkflowEngine:
             execution_id: Optional execution ID (generated if not provided)
             user_id: Optional user ID for authentication
             use_intelligent_routing: Whether to use intelligent routing
+            max_concurrency: Optional cap on nodes running at the same time
+                (defaults to settings.max_parallel_nodes)
+            timeout_ms: Optional deadline for the nodes of this execution; nodes
+                still running when it expires fail with NodeTimeoutError, and
+                nodes started later only get the remaining budget
             
         Returns:
             Execution object with results and trace
@@ -79,11 +90,9 @@ class WorkflowEngine:
         logger.info(f"Starting workflow execution: {execution_id}")
 
         try:
-            # Validate workflow
-            WorkflowValidator.validate_workflow(workflow)
-
-            # Build execution graph
-            execution_order = WorkflowValidator.build_execution_order(workflow)
+            # Validate and compile the workflow graph (cached per workflow structure)
+            plan = get_execution_plan(workflow)
+            execution_order = plan.execution_order
 
             # Initialize execution
             execution = Execution(
@@ -137,7 +146,6 @@ class WorkflowEngine:
             await stream_manager.create_stream(execution_id)
             
             # Stream workflow start event
-            from backend.core.streaming import StreamEvent
             await stream_manager.publish(StreamEvent(
                 event_type=StreamEventType.LOG,
                 node_id="workflow",
@@ -145,145 +153,23 @@ class WorkflowEngine:
                 data={"message": f"Workflow execution started: {execution_id}"},
             ))
 
-            # Execute nodes in order
+            # Execute nodes as soon as their dependencies have completed
             node_outputs: Dict[str, Dict[str, Any]] = {}
 
             logger.info(f"Execution order: {execution_order}")
-            for node_id in execution_order:
-                node = WorkflowValidator.get_node_by_id(workflow, node_id)
-                
-                logger.info(f"Executing node: {node_id} ({node.type}) - {node.data.get('label', '')}")
-                
-                try:
-                    # Stream node started event
-                    await stream_manager.publish(StreamEvent(
-                        event_type=StreamEventType.NODE_STARTED,
-                        node_id=node_id,
-                        execution_id=execution_id,
-                        data={"node_type": node.type, "node_name": node.data.get("name", node_id)},
-                    ))
-
-                    # Collect inputs from previous nodes
-                    inputs = await DataCollector.collect_node_inputs(
-                        workflow,
-                        node_id,
-                        node_outputs,
-                        use_intelligent_routing=self._use_intelligent_routing,
-                    )
-                    logger.info(f"Collected inputs for {node_id}: {list(inputs.keys()) if inputs else 'no inputs'}")
-
-                    # Start observability span for this node
-                    span = None
-                    if trace:
-                        span_type = Tracing.map_node_type_to_span_type(node.type)
-                        span = observability_manager.start_span(
-                            trace_id=trace.trace_id,
-                            span_type=span_type,
-                            name=f"{node.type}:{node.id}",
-                            inputs=Tracing.sanitize_inputs_for_trace(inputs),
-                        )
-                    
-                    # Execute node
-                    node_result = await NodeExecutor.execute_node(
-                        node,
-                        inputs,
-                        execution,
-                        execution_id,
-                        user_id=self._user_id,
-                        span=span,
-                    )
-                except Exception as node_error:
-                    logger.error(f"Node {node_id} ({node.type}) execution failed: {node_error}", exc_info=True)
-                    # Create failed node result
-                    node_result = NodeResult(
-                        status=NodeStatus.FAILED,
-                        output={},
-                        error=str(node_error),
-                        cost=0.0,
-                        duration_ms=0,
-                        completed_at=datetime.now(),
-                    )
-                    # Stream node failure event
-                    await stream_manager.publish(StreamEvent(
-                        event_type=StreamEventType.NODE_FAILED,
-                        node_id=node_id,
-                        execution_id=execution_id,
-                        data={
-                            "status": "failed",
-                            "error": str(node_error),
-                        },
-                    ))
-
-                # Store result (even if failed)
-                node_outputs[node_id] = node_result.output or {}
-                execution.results[node_id] = node_result
-
-                # Update total cost
-                execution.total_cost += node_result.cost
-
-                # Add to trace
-                execution.trace.append(
-                    ExecutionStep(
-                        node_id=node_id,
-                        timestamp=node_result.completed_at or datetime.now(),
-                        action="completed",
-                        data={"status": node_result.status.value},
-                    )
-                )
-                
-                # Complete observability span
-                if span:
-                    Tracing.complete_observability_span(
-                        span=span,
-                        node=node,
-                        node_result=node_result,
-                        inputs=inputs,
-                    )
-                
-                # Add to query tracer if this is a RAG-relevant node (legacy)
-                Tracing.add_to_query_trace(
-                    execution_id=execution_id,
-                    node=node,
-                    node_result=node_result,
-                    inputs=inputs,
+            with deadline_scope(timeout_ms / 1000 if timeout_ms else None):
+                await self._schedule_nodes(
+                    workflow,
+                    plan,
+                    node_outputs,
+                    execution,
+                    execution_id,
+                    trace,
+                    observability_manager,
+                    user_id=user_id,
+                    use_intelligent_routing=use_intelligent_routing,
+                    max_concurrency=max_concurrency,
                 )
-                
-                # Stream node completion event with output data
-                event_type = StreamEventType.NODE_COMPLETED if node_result.status == NodeStatus.COMPLETED else StreamEventType.NODE_FAILED
-                
-                # Include output in completion event (but sanitize large outputs)
-                output_data = node_result.output
-                if output_data:
-                    # Don't truncate outputs for nodes that need full data (like auto_chart_generator)
-                    # These nodes will have their full output available via polling/GET endpoint
-                    node_type = node.node_type if hasattr(node, 'node_type') else None
-                    should_preserve_full_output = node_type in ['auto_chart_generator', 'chart_generator']
-                    
-                    if not should_preserve_full_output:
-                        # For large outputs, send a summary instead of full data
-                        output_size = len(str(output_data))
-                        if output_size > 10000:  # If output is larger than 10KB, send summary
-                            # Create a summary of the output
-                            if isinstance(output_data, dict):
-                                summary = {k: f"<{type(v).__name__}>" if not isinstance(v, (str, int, float, bool, type(None))) else v 
-                                         for k, v in list(output_data.items())[:5]}  # First 5 keys
-                                if len(output_data) > 5:
-                                    summary["_truncated"] = f"... and {len(output_data) - 5} more keys"
-                                output_data = summary
-                            else:
-                                output_data = f"<{type(output_data).__name__} with {output_size} bytes>"
-                
-                await stream_manager.publish(StreamEvent(
-                    event_type=event_type,
-                    node_id=node_id,
-                    execution_id=execution_id,
-                    data={
-                        "status": node_result.status.value,
-                        "cost": node_result.cost,
-                        "duration_ms": node_result.duration_ms,
-                        "output": output_data,  # Include output in completion event
-                    },
-                ))
 
             # Mark as completed
             execution.status = ExecutionStatus.COMPLETED
@@ -304,8 +190,8 @@ class WorkflowEngine:
                 data={"message": f"Workflow execution completed: {execution_id}"},
             ))
             
-            # Clean up stream after completion
-            await stream_manager.remove_stream(execution_id)
+            # Close the stream; it stays available for replay for a while
+            await stream_manager.close_stream(execution_id)
 
             # Record all costs for intelligence system (only if completed successfully)
             if execution.status == ExecutionStatus.COMPLETED:
@@ -337,9 +223,15 @@ class WorkflowEngine:
             except Exception as obs_error:
                 logger.warning(f"Failed to mark trace as failed: {obs_error}")
             
-            # Clean up stream on failure
+            # Stream workflow failure and close the stream
             try:
-                await stream_manager.remove_stream(execution_id)
+                await stream_manager.publish(StreamEvent(
+                    event_type=StreamEventType.LOG,
+                    node_id="workflow",
+                    execution_id=execution_id,
+                    data={"message": f"Workflow execution failed: {execution_id}", "level": "error", "error": str(e)},
+                ))
+                await stream_manager.close_stream(execution_id)
             except Exception as cleanup_error:
                 logger.warning(f"Failed to cleanup stream on execution failure: {cleanup_error}")
             
@@ -362,6 +254,315 @@ class WorkflowEngine:
             ) from e
 
 
+    def _resolve_max_concurrency(self, max_concurrency: Optional[int]) -> int:
+        """Resolve the per-execution node concurrency cap."""
+        if not settings.enable_parallel_execution:
+            return 1
+        if max_concurrency is None:
+            max_concurrency = settings.max_parallel_nodes
+        return max(1, int(max_concurrency))
+
+    async def _schedule_nodes(
+        self,
+        workflow: Workflow,
+        plan: ExecutionPlan,
+        node_outputs: Dict[str, Dict[str, Any]],
+        execution: Execution,
+        execution_id: str,
+        trace: Any,
+        observability_manager: Any,
+        user_id: Optional[str] = None,
+        use_intelligent_routing: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        """
+        Run workflow nodes as a DAG.
+        
+        Every node whose dependencies have completed is started immediately,
+        so independent branches (e.g. BM25 and vector search feeding a hybrid
+        retriever) overlap instead of running back-to-back. A semaphore caps
+        how many nodes run at once. Failed nodes still count as completed,
+        matching sequential semantics where downstream nodes run with empty
+        inputs from a failed source.
+        
+        Args:
+            workflow: The workflow being executed
+            plan: Compiled plan (dependency graph; topological order as a stable tie-breaker)
+            node_outputs: Shared dict receiving each node's output
+            execution: Execution object to populate
+            execution_id: Execution ID for streaming
+            trace: Observability trace (may be None)
+            observability_manager: Observability manager for spans
+            user_id: Optional user ID for vault access
+            use_intelligent_routing: Whether to use intelligent routing
+            max_concurrency: Optional cap on concurrently running nodes
+        """
+        execution_order = plan.execution_order
+        successors = plan.successors
+        order_index = {node_id: index for index, node_id in enumerate(execution_order)}
+        remaining = {node_id: len(plan.predecessors[node_id]) for node_id in execution_order}
+        limit = self._resolve_max_concurrency(max_concurrency)
+        semaphore = asyncio.Semaphore(limit)
+
+        logger.info(f"Scheduling {len(execution_order)} nodes with max concurrency {limit}")
+
+        async def run(node_id: str) -> None:
+            async with semaphore:
+                await self._execute_workflow_node(
+                    workflow,
+                    plan,
+                    node_id,
+                    node_outputs,
+                    execution,
+                    execution_id,
+                    trace,
+                    observability_manager,
+                    user_id=user_id,
+                    use_intelligent_routing=use_intelligent_routing,
+                )
+
+        running: Dict[asyncio.Task, str] = {}
+
+        def launch(node_ids: List[str]) -> None:
+            for node_id in sorted(node_ids, key=order_index.__getitem__):
+                running[asyncio.create_task(run(node_id))] = node_id
+
+        launch([node_id for node_id, count in remaining.items() if count == 0])
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                ready: List[str] = []
+                for task in done:
+                    node_id = running.pop(task)
+                    # Node-level failures are captured as NodeResults; anything raised
+                    # here is an engine error and aborts the execution.
+                    task.result()
+                    for successor in successors[node_id]:
+                        remaining[successor] -= 1
+                        if remaining[successor] == 0:
+                            ready.append(successor)
+                launch(ready)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+
+    async def _execute_workflow_node(
+        self,
+        workflow: Workflow,
+        plan: ExecutionPlan,
+        node_id: str,
+        node_outputs: Dict[str, Dict[str, Any]],
+        execution: Execution,
+        execution_id: str,
+        trace: Any,
+        observability_manager: Any,
+        user_id: Optional[str] = None,
+        use_intelligent_routing: Optional[bool] = None,
+    ) -> None:
+        """Execute one node and record its result, trace, span and stream events."""
+        node = plan.get_node(workflow, node_id)
+
+        logger.info(f"Executing node: {node_id} ({node.type}) - {node.data.get('label', '')}")
+
+        inputs: Dict[str, Any] = {}
+        span = None
+        started_at = datetime.now()
+        try:
+            # Stream node started event
+            await stream_manager.publish(StreamEvent(
+                event_type=StreamEventType.NODE_STARTED,
+                node_id=node_id,
+                execution_id=execution_id,
+                data={"node_type": node.type, "node_name": node.data.get("name", node_id)},
+            ))
+
+            # Collect inputs from previous nodes
+            inputs = await DataCollector.collect_node_inputs(
+                workflow,
+                node_id,
+                node_outputs,
+                use_intelligent_routing=use_intelligent_routing,
+                plan=plan,
+            )
+            logger.info(f"Collected inputs for {node_id}: {list(inputs.keys()) if inputs else 'no inputs'}")
+
+            # Start observability span for this node
+            if trace:
+                span_type = Tracing.map_node_type_to_span_type(node.type)
+                span = observability_manager.start_span(
+                    trace_id=trace.trace_id,
+                    span_type=span_type,
+                    name=f"{node.type}:{node.id}",
+                    inputs=Tracing.sanitize_inputs_for_trace(inputs),
+                )
+
+            # Execute node
+            node_result = await NodeExecutor.execute_node(
+                node,
+                inputs,
+                execution,
+                execution_id,
+                user_id=user_id,
+                span=span,
+                node_class=plan.node_classes[node_id],
+                stream_output=node_id in plan.streaming_nodes,
+            )
+        except Exception as node_error:
+            logger.error(f"Node {node_id} ({node.type}) execution failed: {node_error}", exc_info=True)
+            # Create failed node result
+            node_result = NodeResult(
+                node_id=node_id,
+                status=NodeStatus.FAILED,
+                output={},
+                error=str(node_error),
+                cost=0.0,
+                duration_ms=0,
+                started_at=started_at,
+                completed_at=datetime.now(),
+            )
+            # Stream node failure event
+            await stream_manager.publish(StreamEvent(
+                event_type=StreamEventType.NODE_FAILED,
+                node_id=node_id,
+                execution_id=execution_id,
+                data={
+                    "status": "failed",
+                    "error": str(node_error),
+                },
+            ))
+
+        # Store result (even if failed). Streams go to the consumer as-is;
+        # results, traces and events get a serializable description instead.
+        node_outputs[node_id] = node_result.output or {}
+        if has_streams(node_result.output):
+            node_result.output = describe_streams(node_result.output)
+        execution.results[node_id] = node_result
+
+        # Streams this node consumed are finished now: account for their work.
+        # A node that returned a stream of its own (e.g. chunk) has not read
+        # its inputs yet; they are finalized with its stream instead.
+        if not has_streams(node_outputs[node_id]):
+            await self._finalize_stream_sources(plan, node_id, node_outputs, execution)
+
+        # Update total cost
+        execution.total_cost += node_result.cost
+
+        # Add to trace
+        execution.trace.append(
+            ExecutionStep(
+                node_id=node_id,
+                timestamp=node_result.completed_at or datetime.now(),
+                action="completed",
+                data={"status": node_result.status.value},
+            )
+        )
+        
+        # Complete observability span
+        if span:
+            Tracing.complete_observability_span(
+                span=span,
+                node=node,
+                node_result=node_result,
+                inputs=inputs,
+            )
+        
+        # Add to query tracer if this is a RAG-relevant node (legacy)
+        Tracing.add_to_query_trace(
+            execution_id=execution_id,
+            node=node,
+            node_result=node_result,
+            inputs=inputs,
+        )
+        
+        # Stream node completion event with output data
+        event_type = StreamEventType.NODE_COMPLETED if node_result.status == NodeStatus.COMPLETED else StreamEventType.NODE_FAILED
+        
+        # Include output in completion event (but sanitize large outputs)
+        output_data = node_result.output
+        if output_data:
+            # Don't truncate outputs for nodes that need full data (like auto_chart_generator)
+            # These nodes will have their full output available via polling/GET endpoint
+            node_type = node.node_type if hasattr(node, 'node_type') else None
+            should_preserve_full_output = node_type in ['auto_chart_generator', 'chart_generator']
+            
+            if not should_preserve_full_output:
+                # For large outputs, send a summary instead of full data
+                output_size = len(str(output_data))
+                if output_size > 10000:  # If output is larger than 10KB, send summary
+                    # Create a summary of the output
+                    if isinstance(output_data, dict):
+                        summary = {k: f"<{type(v).__name__}>" if not isinstance(v, (str, int, float, bool, type(None))) else v 
+                                 for k, v in list(output_data.items())[:5]}  # First 5 keys
+                        if len(output_data) > 5:
+                            summary["_truncated"] = f"... and {len(output_data) - 5} more keys"
+                        output_data = summary
+                    else:
+                        output_data = f"<{type(output_data).__name__} with {output_size} bytes>"
+        
+        await stream_manager.publish(StreamEvent(
+            event_type=event_type,
+            node_id=node_id,
+            execution_id=execution_id,
+            data={
+                "status": node_result.status.value,
+                "cost": node_result.cost,
+                "duration_ms": node_result.duration_ms,
+                "output": output_data,  # Include output in completion event
+            },
+        ))
+
+    async def _finalize_stream_sources(
+        self,
+        plan: ExecutionPlan,
+        node_id: str,
+        node_outputs: Dict[str, Dict[str, Any]],
+        execution: Execution,
+    ) -> None:
+        """Finalize the streaming sources of a finished consumer, walking up chains of streaming nodes."""
+        for source_id in plan.sources[node_id]:
+            if source_id in plan.streaming_nodes:
+                if await self._finalize_stream_source(source_id, node_outputs, execution):
+                    # The source streamed too, so finalizing its own inputs was deferred
+                    await self._finalize_stream_sources(plan, source_id, node_outputs, execution)
+
+    async def _finalize_stream_source(
+        self,
+        source_id: str,
+        node_outputs: Dict[str, Dict[str, Any]],
+        execution: Execution,
+    ) -> bool:
+        """
+        Close the streams a node produced and fold their stats into its result.
+        
+        A streaming node completes when it returns its stream, before any work
+        is done; the cost and errors of that work are known only once the
+        consumer has drained (or abandoned) the stream.
+        
+        Returns:
+            True if the node had produced streams
+        """
+        streams = [value for value in node_outputs.get(source_id, {}).values() if isinstance(value, RecordStream)]
+        source_result = execution.results.get(source_id)
+        for stream in streams:
+            await stream.aclose()
+            if source_result is None:
+                continue
+            stream_cost = float(stream.summary.get("cost", 0.0) or 0.0)
+            source_result.cost += stream_cost
+            execution.total_cost += stream_cost
+            if stream.error is not None:
+                source_result.status = NodeStatus.FAILED
+                source_result.error = str(stream.error)
+        if source_result is not None and streams:
+            source_result.output = describe_streams(node_outputs[source_id])
+            source_result.completed_at = datetime.now()
+            source_result.duration_ms = int((source_result.completed_at - source_result.started_at).total_seconds() * 1000)
+        return bool(streams)
+
+
 # Global engine instance
 engine = WorkflowEngine()
 
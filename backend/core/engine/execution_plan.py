@@ -0,0 +1,202 @@
+"""
+Compiled workflow execution plans.
+
+Validation, cycle detection, topological sorting and edge scans depend only on
+a workflow's structure, not on its node configs. ``compile_plan`` performs
+them once and stores the result in an ``ExecutionPlan``; ``get_execution_plan``
+caches plans per (workflow id, structural hash), so repeated executions of the
+same workflow (e.g. a deployed workflow queried many times) skip graph
+analysis entirely and collect node inputs from precomputed adjacency lists
+instead of scanning every edge.
+
+The structural hash covers node IDs and types and the edges between them.
+Node configs are deliberately excluded: they are read from the workflow being
+executed, so per-query config changes (such as an injected query text) reuse
+the same plan.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Type
+
+from backend.config import settings
+from backend.core.models import Node, Workflow
+from backend.core.node_registry import NodeRegistry
+from backend.core.engine.workflow_validator import WorkflowValidator
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Merge strategies for collecting a node's inputs
+MERGE_NONE = "none"  # No incoming edges: inputs come from the node's own config
+MERGE_SMART = "smart_merge"  # Pattern-based merge of source outputs
+
+
+def workflow_content_hash(workflow: Workflow) -> str:
+    """Hash the structure of a workflow (node IDs/types and edges)."""
+    structure = {
+        "nodes": [(node.id, node.type) for node in workflow.nodes],
+        "edges": [
+            (edge.source, edge.target, edge.sourceHandle, edge.targetHandle)
+            for edge in workflow.edges
+        ],
+    }
+    return hashlib.sha256(json.dumps(structure, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class ExecutionPlan:
+    """Precomputed graph analysis for one workflow structure."""
+
+    def __init__(
+        self,
+        workflow_id: Optional[str],
+        content_hash: str,
+        execution_order: List[str],
+        node_index: Dict[str, int],
+        node_classes: Dict[str, Type],
+        predecessors: Dict[str, Set[str]],
+        successors: Dict[str, List[str]],
+        sources: Dict[str, List[str]],
+        merge_strategies: Dict[str, str],
+        streaming_nodes: FrozenSet[str] = frozenset(),
+    ):
+        self.workflow_id = workflow_id
+        self.content_hash = content_hash
+        self.execution_order = execution_order
+        self.node_index = node_index
+        self.node_classes = node_classes
+        self.predecessors = predecessors
+        self.successors = successors
+        self.sources = sources
+        self.direct_sources: Dict[str, FrozenSet[str]] = {
+            node_id: frozenset(node_sources) for node_id, node_sources in sources.items()
+        }
+        self.merge_strategies = merge_strategies
+        self.streaming_nodes = streaming_nodes
+
+    def get_node(self, workflow: Workflow, node_id: str) -> Node:
+        """Return a node of ``workflow`` (which must have this plan's structure) by ID."""
+        try:
+            return workflow.nodes[self.node_index[node_id]]
+        except KeyError:
+            raise ValueError(f"Node {node_id} not found in workflow")
+
+
+def compile_plan(workflow: Workflow, content_hash: Optional[str] = None) -> ExecutionPlan:
+    """
+    Validate a workflow and compile its execution plan.
+
+    Raises:
+        WorkflowValidationError: If workflow is invalid
+        CircularDependencyError: If the workflow graph has a cycle
+    """
+    WorkflowValidator.validate_workflow(workflow)
+    execution_order = WorkflowValidator.build_execution_order(workflow)
+    predecessors, successors = WorkflowValidator.build_dependency_graph(workflow)
+
+    # Distinct sources per target, in edge order (the order inputs are merged in)
+    sources: Dict[str, List[str]] = {node.id: [] for node in workflow.nodes}
+    for edge in workflow.edges:
+        if edge.source not in sources[edge.target]:
+            sources[edge.target].append(edge.source)
+
+    node_classes = {node.id: NodeRegistry.get(node.type) for node in workflow.nodes}
+
+    # A stream can be consumed once, so a node streams its output only into
+    # a single downstream node that accepts streams
+    streaming_nodes: Set[str] = set()
+    if settings.enable_streaming_edges:
+        for node_id, targets in successors.items():
+            if (
+                len(targets) == 1
+                and getattr(node_classes[node_id], "emits_streams", False)
+                and getattr(node_classes[targets[0]], "accepts_streams", False)
+            ):
+                streaming_nodes.add(node_id)
+
+    return ExecutionPlan(
+        workflow_id=workflow.id,
+        content_hash=content_hash or workflow_content_hash(workflow),
+        execution_order=execution_order,
+        node_index={node.id: index for index, node in enumerate(workflow.nodes)},
+        node_classes=node_classes,
+        predecessors=predecessors,
+        successors=successors,
+        sources=sources,
+        merge_strategies={
+            node_id: MERGE_SMART if node_sources else MERGE_NONE
+            for node_id, node_sources in sources.items()
+        },
+        streaming_nodes=frozenset(streaming_nodes),
+    )
+
+
+class ExecutionPlanCache:
+    """LRU cache of compiled plans keyed by (workflow id, structural hash)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._plans: "OrderedDict[Tuple[Optional[str], str], ExecutionPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, workflow: Workflow) -> ExecutionPlan:
+        """Return the plan for a workflow, compiling it on first use."""
+        content_hash = workflow_content_hash(workflow)
+        key = (workflow.id, content_hash)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self._hits += 1
+                return plan
+            self._misses += 1
+
+        # Compiled outside the lock; invalid workflows raise and are not cached
+        plan = compile_plan(workflow, content_hash)
+        logger.debug(f"Compiled execution plan for workflow {workflow.id} ({content_hash[:12]})")
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+        return plan
+
+    def invalidate(self, workflow_id: Optional[str]) -> int:
+        """Drop all plans of a workflow. Returns the number removed."""
+        with self._lock:
+            keys = [key for key in self._plans if key[0] == workflow_id]
+            for key in keys:
+                del self._plans[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._plans), "max_size": self.max_size, "hits": self._hits, "misses": self._misses}
+
+
+# Global plan cache instance
+_plan_cache: Optional[ExecutionPlanCache] = None
+_plan_cache_lock = threading.Lock()
+
+
+def get_plan_cache() -> ExecutionPlanCache:
+    """Get the global execution plan cache."""
+    global _plan_cache
+    if _plan_cache is None:
+        with _plan_cache_lock:
+            if _plan_cache is None:
+                _plan_cache = ExecutionPlanCache(max_size=settings.workflow_plan_cache_size)
+    return _plan_cache
+
+
+def get_execution_plan(workflow: Workflow) -> ExecutionPlan:
+    """Get the (cached) compiled execution plan for a workflow."""
+    return get_plan_cache().get(workflow)
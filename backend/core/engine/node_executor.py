@@ -8,13 +8,20 @@ This module handles:
 - Adding display metadata
 """
 
+import asyncio
 import time
 import traceback
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Type
 
+from backend.config import settings
+from backend.core.deadline import deadline_scope
+from backend.core.exceptions import NodeTimeoutError
+from backend.core.llm_response_cache import LLMCacheUsage, llm_cache_usage
 from backend.core.models import Execution, ExecutionStep, Node, NodeResult, NodeStatus
+from backend.core.node_memo import get_node_result_cache, node_memo_key
 from backend.core.node_registry import NodeRegistry
+from backend.core.record_stream import RecordStream, has_streams
 from backend.core.observability import get_observability_manager
 from backend.core.streaming import StreamEventType
 from backend.core.engine.tracing import Tracing
@@ -26,6 +33,57 @@ logger = get_logger(__name__)
 class NodeExecutor:
     """Executes individual workflow nodes."""
 
+    @staticmethod
+    def _memoization_key(
+        node_instance: Any,
+        node_type: str,
+        inputs: Dict[str, Any],
+        node_config: Dict[str, Any],
+    ) -> Optional[str]:
+        """
+        Return the result-cache key for a pure node, or None if it must run.
+        
+        ``_skip_if_store_exists`` makes ingest nodes return placeholders
+        instead of their real output, and streams can only be consumed once,
+        so such runs are never memoized.
+        """
+        if not settings.enable_node_memoization or not getattr(node_instance, "pure", False):
+            return None
+        if node_config.get("_skip_if_store_exists") or node_config.get("_stream_output"):
+            return None
+        if any(isinstance(value, RecordStream) for value in inputs.values()):
+            return None
+        try:
+            extra = node_instance.memoization_key_extra(inputs, node_config)
+            return node_memo_key(node_type, inputs, node_config, extra)
+        except Exception as e:
+            logger.debug(f"Not memoizing {node_type}: {e}")
+            return None
+
+    @staticmethod
+    def _node_timeout(node_config: Dict[str, Any]) -> Optional[float]:
+        """Return a node's own timeout in seconds (its ``timeout_ms`` config or the default)."""
+        timeout_ms = node_config.get("timeout_ms")
+        if timeout_ms:
+            return float(timeout_ms) / 1000
+        return settings.node_timeout_seconds
+
+    @staticmethod
+    async def _run_with_deadline(node_instance: Any, node: Node, inputs: Dict[str, Any], node_config: Dict[str, Any]) -> Any:
+        """
+        Run a node within its timeout and the remaining execution deadline.
+        
+        The node sees the narrower of the two as the current deadline (see
+        core/deadline.py), so its retries and offloaded work stay within it.
+        """
+        with deadline_scope(NodeExecutor._node_timeout(node_config)) as budget:
+            if budget is None:
+                return await node_instance.execute_safe(inputs, node_config)
+            try:
+                return await asyncio.wait_for(node_instance.execute_safe(inputs, node_config), budget)
+            except asyncio.TimeoutError:
+                raise NodeTimeoutError(node.id, node.type, round(budget, 3)) from None
+
     @staticmethod
     async def execute_node(
         node: Node,
@@ -34,6 +92,8 @@ class NodeExecutor:
         execution_id: str,
         user_id: Optional[str] = None,
         span: Optional[Any] = None,
+        node_class: Optional[Type] = None,
+        stream_output: bool = False,
     ) -> NodeResult:
         """
         Execute a single node.
@@ -45,6 +105,8 @@ class NodeExecutor:
             execution_id: Execution ID for streaming
             user_id: Optional user ID for vault access
             span: Optional observability span
+            node_class: Resolved node class (looked up in the registry if omitted)
+            stream_output: Let the node return RecordStream outputs (streaming edge)
             
         Returns:
             NodeResult with output, cost, duration, etc.
@@ -62,8 +124,9 @@ class NodeExecutor:
         )
 
         try:
-            # Get node class from registry
-            node_class = NodeRegistry.get(node.type)
+            # Get node class from registry (already resolved by compiled plans)
+            if node_class is None:
+                node_class = NodeRegistry.get(node.type)
 
             # Create node instance
             node_instance = node_class()
@@ -87,6 +150,8 @@ class NodeExecutor:
             # Add user_id for vault access
             if user_id:
                 node_config["_user_id"] = user_id
+            if stream_output:
+                node_config["_stream_output"] = True
 
             # Publish node_started event for streaming (so UI shows node is working)
             # This ensures all nodes show progress, not just chat nodes
@@ -97,13 +162,42 @@ class NodeExecutor:
                     {"type": node.type, "provider": node_config.get("provider", "")},
                 )
 
+            # Pure nodes: reuse the result of an identical earlier invocation
+            memo_key = NodeExecutor._memoization_key(node_instance, node.type, inputs, node_config)
+            memo_hit = False
+            llm_cache = LLMCacheUsage()
+
             # Execute node
             start_time = time.time()
             try:
-                logger.info(f"Executing node {node.type} with inputs: {list(inputs.keys()) if inputs else 'no inputs'}")
-                output = await node_instance.execute_safe(inputs, node_config)
-                duration_ms = int((time.time() - start_time) * 1000)
-                logger.info(f"Node {node.type} produced output with keys: {list(output.keys()) if isinstance(output, dict) else 'non-dict output'}")
+                output = get_node_result_cache().get(memo_key) if memo_key else None
+                if output is not None:
+                    # The hit is recorded on the result and billed as free below, and the
+                    # output is left as stored: outputs flow into downstream inputs, and
+                    # any change would alter their memoization keys
+                    memo_hit = True
+                    duration_ms = int((time.time() - start_time) * 1000)
+                    logger.info(f"Node {node.type} served from memoized result {memo_key[:12]}")
+                    execution.trace.append(
+                        ExecutionStep(
+                            node_id=node.id,
+                            timestamp=datetime.now(),
+                            action="cache_hit",
+                            data={"type": node.type, "memo_key": memo_key[:16]},
+                        )
+                    )
+                    if hasattr(node_instance, 'stream_log'):
+                        await node_instance.stream_log(node.id, "Reused memoized result (inputs and config unchanged)")
+                else:
+                    logger.info(f"Executing node {node.type} with inputs: {list(inputs.keys()) if inputs else 'no inputs'}")
+                    with llm_cache_usage() as llm_cache:
+                        output = await NodeExecutor._run_with_deadline(node_instance, node, inputs, node_config)
+                    duration_ms = int((time.time() - start_time) * 1000)
+                    logger.info(f"Node {node.type} produced output with keys: {list(output.keys()) if isinstance(output, dict) else 'non-dict output'}")
+                    if memo_key and isinstance(output, dict):
+                        get_node_result_cache().put(memo_key, output)
+                    if llm_cache.hits:
+                        logger.info(f"Node {node.type} reused {llm_cache.hits} cached LLM response(s)")
             except Exception as e:
                 # Track error in span if available
                 if span:
@@ -121,11 +215,18 @@ class NodeExecutor:
                 await node_instance.stream_progress(node.id, 1.0, "Node execution completed")
 
             # Extract cost from output if available, otherwise estimate
+            # Memoized results, nodes answered from the LLM response cache and nodes
+            # that flag a full cache hit (e.g. embeddings all in the embedding cache) cost nothing
+            served_from_cache = (
+                memo_hit
+                or llm_cache.served_from_cache
+                or (isinstance(output, dict) and output.get("cache_hit") is True)
+            )
             cost = 0.0
             if isinstance(output, dict):
                 # Cost might be in the output (e.g., from CrewAI node)
-                cost = output.get("cost", 0.0)
-                if cost == 0.0:
+                cost = 0.0 if served_from_cache else output.get("cost", 0.0)
+                if cost == 0.0 and not served_from_cache and not has_streams(output):
                     # Fallback to estimation if not in output
                     cost = node_instance.estimate_cost(inputs, node.data)
                 # Add node metadata for cost tracking
@@ -171,7 +272,8 @@ class NodeExecutor:
                     }
             else:
                 # No cost in output, estimate
-                cost = node_instance.estimate_cost(inputs, node.data)
+                if not served_from_cache:
+                    cost = node_instance.estimate_cost(inputs, node.data)
                 # Convert to dict and add metadata
                 output = {"output": output, "_node_type": node.type, "_node_config": node.data}
                 
@@ -206,11 +308,23 @@ class NodeExecutor:
 
             # Extract tokens if available
             tokens = {}
-            if isinstance(output, dict):
+            if isinstance(output, dict) and not served_from_cache:
                 tokens = output.get("tokens_used", {})
 
             # Update span with metadata if available
             if span:
+                span_metadata = {
+                    "node_type": node.type,
+                    "node_id": node.id,
+                    "memoized": memo_hit,
+                    "llm_cache_hits": llm_cache.hits,
+                    "llm_cache_saved_cost": round(llm_cache.saved_cost, 6),
+                    # Prompt tokens the provider served from its prompt cache
+                    "cached_input_tokens": tokens.get("cached_input", 0) if isinstance(tokens, dict) else 0,
+                }
+                # Retrieved chunks packed into / dropped from the prompt (chat node)
+                if isinstance(output, dict) and output.get("context_packing"):
+                    span_metadata["context_packing"] = output["context_packing"]
                 observability_manager = get_observability_manager()
                 observability_manager.update_span_metadata(
                     span_id=span.span_id,
@@ -218,10 +332,7 @@ class NodeExecutor:
                     cost=cost,
                     model=node.data.get("openai_model") or node.data.get("anthropic_model") or node.data.get("gemini_model"),
                     provider=node.data.get("provider"),
-                    metadata={
-                        "node_type": node.type,
-                        "node_id": node.id,
-                    },
+                    metadata=span_metadata,
                 )
             
             return NodeResult(
@@ -234,6 +345,7 @@ class NodeExecutor:
                 started_at=started_at,
                 completed_at=completed_at,
                 tokens_used=tokens if tokens else None,
+                memoized=memo_hit,
             )
 
         except Exception as e:
@@ -8,7 +8,7 @@ This module handles:
 """
 
 from collections import defaultdict, deque
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
 
 from backend.core.exceptions import (
     CircularDependencyError,
@@ -124,6 +124,30 @@ class WorkflowValidator:
 
         return execution_order
 
+    @staticmethod
+    def build_dependency_graph(
+        workflow: Workflow,
+    ) -> Tuple[Dict[str, Set[str]], Dict[str, List[str]]]:
+        """
+        Build predecessor and successor maps for scheduling.
+        
+        Duplicate edges between the same pair of nodes count once, so a node
+        becomes ready exactly when all of its distinct sources have completed.
+        
+        Returns:
+            Tuple of (predecessors, successors) keyed by node ID
+        """
+        predecessors: Dict[str, Set[str]] = {node.id: set() for node in workflow.nodes}
+        successors: Dict[str, List[str]] = {node.id: [] for node in workflow.nodes}
+
+        for edge in workflow.edges:
+            if edge.source in predecessors[edge.target]:
+                continue
+            predecessors[edge.target].add(edge.source)
+            successors[edge.source].append(edge.target)
+
+        return predecessors, successors
+
     @staticmethod
     def has_circular_dependency(workflow: Workflow) -> bool:
         """Check for circular dependencies using DFS."""
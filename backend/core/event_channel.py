@@ -0,0 +1,174 @@
+"""
+Cross-process channel for execution stream events.
+
+Execution workers run workflows in other processes than the API, so their
+stream events cannot reach the API's ``StreamManager`` directly. A worker
+attaches an event channel to its stream manager; every published event
+(and the close of each stream) is buffered and written to the channel in
+batches, with superseded progress events of a node dropped before writing.
+The API runs ``relay_events``, which tails the channel and republishes the
+events to its own stream manager, where SSE clients subscribe as usual.
+
+``SQLiteEventChannel`` stores the events in the same SQLite database as
+the job queue.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config import settings
+from backend.core.streaming import StreamEvent, StreamEventType, StreamManager
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_KIND_EVENT = "event"
+_KIND_CLOSE = "close"
+
+
+class SQLiteEventChannel:
+    """Append-only table of stream events written by workers and read by the API."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()  # Guards the pending buffer
+        self._db_lock = threading.Lock()  # Guards the connection
+        self._pending: List[Tuple[str, str, Optional[Dict[str, Any]]]] = []
+        self._pending_progress: Dict[Tuple[str, str], int] = {}
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS stream_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                execution_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_stream_events_created ON stream_events (created_at);
+            """
+        )
+
+    def publish(self, event: StreamEvent) -> None:
+        """Buffer an event for the next flush (never blocks on the database)."""
+        with self._lock:
+            entry = (event.execution_id, _KIND_EVENT, event.to_dict())
+            if event.event_type == StreamEventType.NODE_PROGRESS and event.node_id:
+                key = (event.execution_id, event.node_id)
+                position = self._pending_progress.get(key)
+                if position is not None:
+                    # Only the latest unflushed progress of a node is sent
+                    self._pending[position] = entry
+                    return
+                self._pending_progress[key] = len(self._pending)
+            self._pending.append(entry)
+
+    def close(self, execution_id: str) -> None:
+        """Buffer the end of an execution's stream."""
+        with self._lock:
+            self._pending.append((execution_id, _KIND_CLOSE, None))
+
+    def flush(self) -> int:
+        """Write buffered events in one transaction. Returns the number written."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._pending_progress = {}
+        if not pending:
+            return 0
+        now = time.time()
+        rows = [
+            (execution_id, kind, json.dumps(payload, default=str) if payload is not None else None, now)
+            for execution_id, kind, payload in pending
+        ]
+        with self._db_lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO stream_events (execution_id, kind, payload, created_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    async def run_flusher(self, interval: float) -> None:
+        """Flush buffered events every ``interval`` seconds until cancelled."""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                await asyncio.to_thread(self.flush)
+        finally:
+            await asyncio.to_thread(self.flush)
+
+    def latest_id(self) -> int:
+        with self._db_lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM stream_events").fetchone()[0]
+
+    def read_after(self, cursor: int, limit: int = 1000) -> List[Tuple[int, str, str, Optional[str]]]:
+        """Return (id, execution_id, kind, payload) rows after ``cursor``."""
+        with self._db_lock:
+            return self._conn.execute(
+                "SELECT id, execution_id, kind, payload FROM stream_events WHERE id > ? ORDER BY id LIMIT ?",
+                (cursor, limit),
+            ).fetchall()
+
+    def prune(self, older_than_seconds: float) -> int:
+        """Delete events older than the given age. Returns the number removed."""
+        with self._db_lock:
+            cursor = self._conn.execute(
+                "DELETE FROM stream_events WHERE created_at < ?", (time.time() - older_than_seconds,)
+            )
+            return cursor.rowcount
+
+
+async def relay_events(channel: SQLiteEventChannel, manager: StreamManager, interval: float) -> None:
+    """
+    Republish events written by workers to the local stream manager until cancelled.
+
+    Starts at the end of the channel; events published before the API
+    started are not replayed.
+    """
+    cursor = await asyncio.to_thread(channel.latest_id)
+    last_prune = time.monotonic()
+    while True:
+        try:
+            rows = await asyncio.to_thread(channel.read_after, cursor)
+            for event_id, execution_id, kind, payload in rows:
+                cursor = event_id
+                if kind == _KIND_CLOSE:
+                    await manager.close_stream(execution_id)
+                    continue
+                await manager.create_stream(execution_id)
+                await manager.publish(StreamEvent.from_dict(json.loads(payload)))
+            if time.monotonic() - last_prune > settings.stream_retention_seconds:
+                last_prune = time.monotonic()
+                await asyncio.to_thread(channel.prune, settings.stream_retention_seconds)
+            if not rows:
+                await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error relaying worker stream events: {e}", exc_info=True)
+            await asyncio.sleep(interval)
+
+
+# Global event channel instance
+_event_channel: Optional[SQLiteEventChannel] = None
+_event_channel_lock = threading.Lock()
+
+
+def get_event_channel() -> SQLiteEventChannel:
+    """Get the global event channel (stored next to the job queue)."""
+    global _event_channel
+    if _event_channel is None:
+        with _event_channel_lock:
+            if _event_channel is None:
+                from backend.core.job_queue import queue_db_path
+
+                _event_channel = SQLiteEventChannel(queue_db_path())
+    return _event_channel
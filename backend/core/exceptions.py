@@ -101,6 +101,19 @@ class NodeValidationError(NodeError):
         self.errors = errors or []
 
 
+class NodeTimeoutError(NodeError):
+    """Raised when a node exceeds its timeout or the execution deadline."""
+
+    def __init__(self, node_id: str, node_type: str, timeout_seconds: float):
+        super().__init__(
+            f"Node {node_id} ({node_type}) timed out after {timeout_seconds:g} seconds",
+            {"node_id": node_id, "node_type": node_type, "timeout_seconds": timeout_seconds},
+        )
+        self.node_id = node_id
+        self.node_type = node_type
+        self.timeout_seconds = timeout_seconds
+
+
 # ============================================
 # Execution Exceptions
 # ============================================
@@ -132,6 +145,18 @@ class ExecutionTimeoutError(ExecutionError):
         self.timeout_seconds = timeout_seconds
 
 
+class ComputeTimeoutError(ExecutionError):
+    """Raised when offloaded CPU-bound work exceeds its timeout."""
+
+    def __init__(self, task: str, timeout_seconds: float):
+        super().__init__(
+            f"{task} timed out after {timeout_seconds:g} seconds",
+            {"task": task, "timeout_seconds": timeout_seconds},
+        )
+        self.task = task
+        self.timeout_seconds = timeout_seconds
+
+
 # ============================================
 # Graph/Edge Exceptions
 # ============================================
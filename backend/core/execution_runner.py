@@ -0,0 +1,91 @@
+"""
+Run a workflow execution and record its outcome.
+
+Shared by the API (inline execution mode) and by execution workers (job
+queue mode), so an execution is stored and reported the same way wherever
+it runs.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from backend.core.engine import engine
+from backend.core.execution_store import get_execution_store
+from backend.core.models import Execution, ExecutionStatus, Workflow
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+async def run_execution(
+    workflow: Workflow,
+    execution_id: str,
+    started_at: datetime,
+    user_id: Optional[str] = None,
+    use_intelligent_routing: Optional[bool] = None,
+) -> Execution:
+    """
+    Execute a workflow and store the resulting execution.
+
+    Failures are stored as a failed execution rather than raised.
+    """
+    store = get_execution_store()
+    try:
+        execution = await engine.execute(
+            workflow=workflow,
+            execution_id=execution_id,
+            user_id=user_id,
+            use_intelligent_routing=use_intelligent_routing,
+        )
+
+        # Update stored execution with results (off the event loop: outputs can be large)
+        await asyncio.to_thread(store.put, execution, user_id)
+        logger.info(f"Execution {execution_id} completed successfully")
+
+        # Record metrics (failures here must not fail the execution)
+        try:
+            from backend.api.metrics import _save_execution_record, ExecutionRecord
+
+            record = ExecutionRecord(
+                execution_id=execution_id,
+                workflow_id=execution.workflow_id,
+                workflow_version=None,
+                status=execution.status.value if hasattr(execution.status, 'value') else str(execution.status),
+                started_at=execution.started_at.isoformat() if execution.started_at else datetime.now().isoformat(),
+                completed_at=execution.completed_at.isoformat() if execution.completed_at else None,
+                duration_ms=execution.duration_ms or 0,
+                total_cost=execution.total_cost or 0.0,
+                cost_breakdown={},  # Will be calculated if needed
+                error=execution.error,
+                metadata={},
+            )
+            _save_execution_record(record)
+        except Exception as metrics_error:
+            logger.error(f"Failed to record metrics: {metrics_error}")
+
+        return execution
+
+    except Exception as e:
+        logger.error(f"Background execution failed for {execution_id}: {e}", exc_info=True)
+        return mark_execution_failed(execution_id, workflow.id or "unknown", started_at, str(e), user_id)
+
+
+def mark_execution_failed(
+    execution_id: str,
+    workflow_id: str,
+    started_at: datetime,
+    error: str,
+    user_id: Optional[str] = None,
+) -> Execution:
+    """Store an execution as failed and return it."""
+    execution = Execution(
+        id=execution_id,
+        workflow_id=workflow_id,
+        status=ExecutionStatus.FAILED,
+        started_at=started_at,
+        completed_at=datetime.now(),
+        error=error,
+    )
+    get_execution_store().put(execution, user_id=user_id)
+    return execution
@@ -0,0 +1,252 @@
+"""
+Bounded, persistent store for workflow executions.
+
+Executions (with their full node outputs and traces) are written through to
+an embedded SQLite database in WAL mode, indexed by workflow, user and start
+time, so history survives restarts and listings page through an index
+instead of sorting every execution in memory. A small LRU of recently used
+``Execution`` objects serves polling of running and just-finished
+executions without touching the database; running executions are never
+evicted from it. Since execution workers in other processes may update a
+running execution, running executions are always read from the database.
+
+The database is bounded as well: beyond ``execution_store_max_rows`` the
+oldest executions are pruned.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config import settings
+from backend.core.models import Execution, ExecutionStatus
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_ACTIVE_STATUSES = {ExecutionStatus.PENDING, ExecutionStatus.RUNNING}
+
+# Prune old rows every this many writes rather than on every write
+_PRUNE_INTERVAL = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    id TEXT PRIMARY KEY,
+    workflow_id TEXT,
+    user_id TEXT,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    completed_at TEXT,
+    total_cost REAL NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_executions_started ON executions (started_at);
+CREATE INDEX IF NOT EXISTS idx_executions_workflow ON executions (workflow_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_executions_user ON executions (user_id, started_at);
+"""
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _serialize(execution: Execution) -> str:
+    try:
+        return execution.model_dump_json()
+    except Exception:
+        # Node outputs may hold values pydantic cannot serialize (e.g. numpy types)
+        return json.dumps(execution.model_dump(), default=_json_default)
+
+
+class ExecutionStore:
+    """Execution history with a hot in-memory LRU over a SQLite store."""
+
+    def __init__(self, db_path: Path, hot_size: int = 256, max_rows: int = 100000):
+        """
+        Args:
+            db_path: SQLite database file
+            hot_size: Finished executions kept in memory (running ones are always kept)
+            max_rows: Executions kept on disk; the oldest are pruned beyond it
+        """
+        self.db_path = Path(db_path)
+        self.hot_size = hot_size
+        self.max_rows = max_rows
+        self._hot: "OrderedDict[str, Execution]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._hits = 0
+        self._misses = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _remember(self, execution: Execution) -> None:
+        self._hot[execution.id] = execution
+        self._hot.move_to_end(execution.id)
+        finished = [
+            execution_id
+            for execution_id, cached in self._hot.items()
+            if cached.status not in _ACTIVE_STATUSES
+        ]
+        # Evict least recently used finished executions; active ones stay
+        for execution_id in finished[: max(0, len(finished) - self.hot_size)]:
+            del self._hot[execution_id]
+
+    def put(self, execution: Execution, user_id: Optional[str] = None) -> None:
+        """Insert or replace an execution."""
+        data = _serialize(execution)
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO executions (id, workflow_id, user_id, status, started_at, completed_at, total_cost, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    workflow_id = excluded.workflow_id,
+                    user_id = COALESCE(excluded.user_id, executions.user_id),
+                    status = excluded.status,
+                    started_at = excluded.started_at,
+                    completed_at = excluded.completed_at,
+                    total_cost = excluded.total_cost,
+                    data = excluded.data
+                """,
+                (
+                    execution.id,
+                    execution.workflow_id,
+                    user_id,
+                    execution.status.value,
+                    execution.started_at.isoformat(),
+                    execution.completed_at.isoformat() if execution.completed_at else None,
+                    execution.total_cost or 0.0,
+                    data,
+                ),
+            )
+            self._remember(execution)
+            self._writes += 1
+            if self._writes % _PRUNE_INTERVAL == 0:
+                self._prune()
+
+    def _prune(self) -> None:
+        """Delete the oldest executions beyond ``max_rows``."""
+        rows = self._conn.execute(
+            "SELECT id FROM executions ORDER BY started_at DESC LIMIT -1 OFFSET ?",
+            (self.max_rows,),
+        ).fetchall()
+        if not rows:
+            return
+        self._conn.executemany("DELETE FROM executions WHERE id = ?", rows)
+        for (execution_id,) in rows:
+            self._hot.pop(execution_id, None)
+        logger.info(f"Pruned {len(rows)} old executions from history")
+
+    def get(self, execution_id: str) -> Optional[Execution]:
+        """Return an execution by ID, or None."""
+        with self._lock:
+            execution = self._hot.get(execution_id)
+            if execution is not None and execution.status not in _ACTIVE_STATUSES:
+                self._hot.move_to_end(execution_id)
+                self._hits += 1
+                return execution
+            self._misses += 1
+            row = self._conn.execute("SELECT data FROM executions WHERE id = ?", (execution_id,)).fetchone()
+        if row is None:
+            return execution
+        execution = Execution.model_validate_json(row[0])
+        with self._lock:
+            self._remember(execution)
+        return execution
+
+    def __contains__(self, execution_id: str) -> bool:
+        with self._lock:
+            if execution_id in self._hot:
+                return True
+            return self._conn.execute(
+                "SELECT 1 FROM executions WHERE id = ?", (execution_id,)
+            ).fetchone() is not None
+
+    def list(
+        self,
+        limit: int = 10,
+        offset: int = 0,
+        workflow_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> Tuple[List[Execution], int]:
+        """
+        Return one page of executions (most recent first) and the total count.
+
+        Filtering by workflow or user uses the matching (column, started_at) index.
+        """
+        conditions = []
+        params: List[Any] = []
+        if workflow_id is not None:
+            conditions.append("workflow_id = ?")
+            params.append(workflow_id)
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM executions {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT id, data FROM executions {where} ORDER BY started_at DESC LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+            hot = {execution_id: self._hot.get(execution_id) for execution_id, _ in rows}
+
+        executions = [
+            hot[execution_id] or Execution.model_validate_json(data)
+            for execution_id, data in rows
+        ]
+        return executions, total
+
+    def delete(self, execution_id: str) -> bool:
+        """Delete an execution. Returns True if it existed."""
+        with self._lock:
+            self._hot.pop(execution_id, None)
+            cursor = self._conn.execute("DELETE FROM executions WHERE id = ?", (execution_id,))
+            return cursor.rowcount > 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return store statistics."""
+        with self._lock:
+            rows = self._conn.execute("SELECT COUNT(*) FROM executions").fetchone()[0]
+            return {
+                "hot_items": len(self._hot),
+                "hot_size": self.hot_size,
+                "rows": rows,
+                "max_rows": self.max_rows,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Global execution store instance
+_execution_store: Optional[ExecutionStore] = None
+_execution_store_lock = threading.Lock()
+
+
+def get_execution_store() -> ExecutionStore:
+    """Get the global execution store."""
+    global _execution_store
+    if _execution_store is None:
+        with _execution_store_lock:
+            if _execution_store is None:
+                _execution_store = ExecutionStore(
+                    db_path=settings.executions_dir / "executions.db",
+                    hot_size=settings.execution_store_hot_size,
+                    max_rows=settings.execution_store_max_rows,
+                )
+    return _execution_store
@@ -0,0 +1,259 @@
+"""
+FAISS index construction, training and tuning.
+
+Builds the index types offered by VectorStoreNode:
+
+- ``flat``: exact search, no training
+- ``ivf``: inverted lists over full vectors (IVF-Flat)
+- ``ivf_pq``: inverted lists over product-quantized codes (IVF-PQ)
+- ``opq_ivf_pq``: IVF-PQ behind a learned OPQ rotation
+- ``hnsw``: HNSW graph over full vectors
+- ``hnsw_sq``: HNSW graph over 8-bit scalar-quantized vectors
+
+Trained types are trained on a random sample of the first batch of vectors.
+Parameters that the sample cannot support (too many IVF lists, too many PQ
+bits, a PQ sub-quantizer count that does not divide the dimension) are
+clamped, and corpora too small to train on fall back to a flat index.
+
+``recall_latency_report`` measures recall@k and per-query latency against an
+exact flat baseline for a range of ``nprobe`` / ``efSearch`` values, so the
+search-time knobs of VectorSearchNode can be tuned for a given corpus.
+"""
+
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+import faiss
+import numpy as np
+
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_TYPES = ["flat", "ivf", "ivf_pq", "opq_ivf_pq", "hnsw", "hnsw_sq"]
+TRAINED_INDEX_TYPES = {"ivf", "ivf_pq", "opq_ivf_pq"}
+
+# k-means wants ~39 training points per centroid
+_POINTS_PER_CENTROID = 39
+# Below this many vectors, brute force is fast and training is unreliable
+MIN_TRAINING_VECTORS = 1000
+
+_NPROBE_SWEEP = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+_EF_SEARCH_SWEEP = [16, 32, 64, 128, 256, 512]
+# When no value reaches the target, recall this close to the best counts as the best
+_RECALL_EPSILON = 0.01
+
+
+def _largest_divisor_at_most(n: int, limit: int) -> int:
+    for m in range(max(1, min(limit, n)), 0, -1):
+        if n % m == 0:
+            return m
+    return 1
+
+
+def index_factory_string(
+    index_type: str,
+    dimension: int,
+    num_vectors: int,
+    config: Dict[str, Any],
+) -> str:
+    """
+    Return the ``faiss.index_factory`` description for an index type.
+
+    Args:
+        index_type: One of ``INDEX_TYPES``
+        dimension: Vector dimension
+        num_vectors: Number of vectors available for training
+        config: Node config (``faiss_nlist``, ``faiss_M``, ``faiss_pq_m``,
+            ``faiss_pq_nbits``, ``faiss_training_samples``)
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unsupported FAISS index type: {index_type}")
+
+    M = int(config.get("faiss_M", 32))
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "hnsw":
+        return f"HNSW{M},Flat"
+    if index_type == "hnsw_sq":
+        return f"HNSW{M},SQ8"
+
+    training_vectors = min(num_vectors, int(config.get("faiss_training_samples", 100000)))
+    if training_vectors < MIN_TRAINING_VECTORS:
+        logger.info(
+            f"{index_type} index needs at least {MIN_TRAINING_VECTORS} training vectors, "
+            f"got {training_vectors}; using a flat index"
+        )
+        return "Flat"
+
+    nlist = int(config.get("faiss_nlist", 100))
+    max_nlist = max(1, training_vectors // _POINTS_PER_CENTROID)
+    if nlist > max_nlist:
+        logger.info(f"Clamping nlist from {nlist} to {max_nlist} for {training_vectors} training vectors")
+        nlist = max_nlist
+    if index_type == "ivf":
+        return f"IVF{nlist},Flat"
+
+    pq_m = _largest_divisor_at_most(dimension, int(config.get("faiss_pq_m", 16)))
+    nbits = int(config.get("faiss_pq_nbits", 8))
+    max_nbits = int(math.log2(max(2, training_vectors // _POINTS_PER_CENTROID)))
+    if nbits > max_nbits:
+        logger.info(f"Clamping PQ nbits from {nbits} to {max_nbits} for {training_vectors} training vectors")
+        nbits = max_nbits
+    if index_type == "ivf_pq":
+        return f"IVF{nlist},PQ{pq_m}x{nbits}"
+    return f"OPQ{pq_m},IVF{nlist},PQ{pq_m}x{nbits}"
+
+
+def create_index(index_type: str, dimension: int, num_vectors: int, config: Dict[str, Any]) -> Any:
+    """Create an (untrained) FAISS index of the given type."""
+    description = index_factory_string(index_type, dimension, num_vectors, config)
+    return faiss.index_factory(dimension, description, faiss.METRIC_L2)
+
+
+def train_index(index: Any, vectors: np.ndarray, max_samples: int = 100000, seed: int = 0) -> int:
+    """
+    Train an index on a uniform random sample of ``vectors``.
+
+    Returns:
+        Number of vectors used for training (0 if the index needed none)
+    """
+    if index.is_trained:
+        return 0
+    if len(vectors) > max_samples:
+        rng = np.random.default_rng(seed)
+        sample = vectors[np.sort(rng.choice(len(vectors), size=max_samples, replace=False))]
+    else:
+        sample = vectors
+    sample = np.ascontiguousarray(sample, dtype=np.float32)
+    index.train(sample)
+    return len(sample)
+
+
+def _find_tunable(index: Any) -> Optional[str]:
+    """Return "nprobe", "efSearch" or None depending on the index structure."""
+    try:
+        faiss.extract_index_ivf(index)
+        return "nprobe"
+    except Exception:
+        pass
+    inner = index
+    while True:
+        inner = faiss.downcast_index(inner)
+        if isinstance(inner, faiss.IndexHNSW):
+            return "efSearch"
+        if isinstance(inner, (faiss.IndexIDMap, faiss.IndexIDMap2, faiss.IndexPreTransform)):
+            inner = inner.index
+            continue
+        return None
+
+
+def search_parameters(
+    index: Any,
+    nprobe: Optional[int] = None,
+    ef_search: Optional[int] = None,
+) -> Optional[Any]:
+    """
+    Build per-call search parameters for an index.
+
+    Passing parameters per call (instead of setting ``index.nprobe``) keeps
+    concurrent searches with different settings on a shared index isolated.
+    Returns None when nothing applies, so the index defaults are used.
+    """
+    tunable = _find_tunable(index)
+    if tunable == "nprobe" and nprobe:
+        return faiss.SearchParametersIVF(nprobe=int(nprobe))
+    if tunable == "efSearch" and ef_search:
+        return faiss.SearchParametersHNSW(efSearch=int(ef_search))
+    return None
+
+
+def set_default_search_parameter(index: Any, value: int) -> None:
+    """Store ``nprobe`` / ``efSearch`` on the index itself (persisted with it)."""
+    tunable = _find_tunable(index)
+    if tunable:
+        faiss.ParameterSpace().set_index_parameter(index, tunable, value)
+
+
+def recall_latency_report(
+    index: Any,
+    vectors: np.ndarray,
+    ids: Optional[np.ndarray] = None,
+    k: int = 10,
+    num_queries: int = 100,
+    target_recall: float = 0.95,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Measure recall@k and latency of ``index`` against an exact flat baseline.
+
+    Queries are sampled from ``vectors``, which must be exactly the vectors
+    stored in ``index``; ``ids`` are their IDs in the index (positions if
+    omitted).
+
+    Returns:
+        Report with one entry per swept ``nprobe`` / ``efSearch`` value and the
+        smallest value reaching ``target_recall`` as ``recommended``. When no
+        value reaches it, ``target_met`` is False and ``recommended`` is the
+        smallest value within ``_RECALL_EPSILON`` of the best recall measured,
+        rather than an exhaustive scan
+    """
+    n = len(vectors)
+    if n == 0:
+        return {"parameter": None, "points": [], "recommended": None, "target_met": False}
+    k = min(k, n)
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    queries = vectors[rng.choice(n, size=min(num_queries, n), replace=False)]
+
+    baseline = faiss.IndexFlatL2(vectors.shape[1])
+    baseline.add(vectors)
+    start = time.perf_counter()
+    _, truth = baseline.search(queries, k)
+    flat_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    if ids is not None:
+        truth = np.asarray(ids, dtype=np.int64)[truth]
+
+    tunable = _find_tunable(index)
+    if tunable == "nprobe":
+        nlist = faiss.extract_index_ivf(index).nlist
+        values: List[Optional[int]] = [v for v in _NPROBE_SWEEP if v < nlist] + [nlist]
+    elif tunable == "efSearch":
+        values = [v for v in _EF_SEARCH_SWEEP if v >= k] or [k]
+    else:
+        values = [None]
+
+    points = []
+    for value in values:
+        params = search_parameters(index, nprobe=value, ef_search=value) if value else None
+        start = time.perf_counter()
+        _, found = index.search(queries, k, params=params)
+        latency_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        hits = sum(len(set(row_found.tolist()) & set(row_truth.tolist())) for row_found, row_truth in zip(found, truth))
+        points.append({
+            "value": value,
+            "recall": round(hits / (len(queries) * k), 4),
+            "latency_ms": round(latency_ms, 4),
+        })
+
+    reaching = [p for p in points if p["recall"] >= target_recall]
+    target_met = bool(reaching)
+    if not target_met:
+        best_recall = max(p["recall"] for p in points)
+        reaching = [p for p in points if p["recall"] >= best_recall - _RECALL_EPSILON]
+        logger.warning(
+            f"No {tunable} value reached recall {target_recall}; best was {best_recall}, "
+            f"recommending {reaching[0]['value']}"
+        )
+    recommended = reaching[0]["value"]
+    return {
+        "parameter": tunable,
+        "k": k,
+        "queries": len(queries),
+        "flat_latency_ms": round(flat_ms, 4),
+        "target_recall": target_recall,
+        "points": points,
+        "recommended": recommended,
+        "target_met": target_met,
+    }
@@ -0,0 +1,602 @@
+"""
+FAISS index manager.
+
+Owns the lifecycle of every FAISS index used by VectorStoreNode and
+VectorSearchNode:
+
+- Indexes are loaded lazily on first use. Read-only users get a memory-mapped
+  index (``faiss.IO_FLAG_MMAP``) so loading is cheap and pages are shared
+  through the OS page cache; writers get a fully loaded, mutable index.
+- Resident indexes are kept in LRU order and evicted when their estimated
+  size exceeds the configured memory budget. Indexes with an active lease
+  (a search or write in progress) are never evicted.
+- Every index has a backing file. Indexes created without an explicit path
+  are spilled to ``vectors_dir/index_cache`` before eviction, so evicting
+  them loses nothing and they reload transparently.
+- Chunk metadata lives in a compact binary sidecar (``.meta``) that is
+  memory-mapped and decoded per record, instead of one indented JSON file
+  that had to be parsed in full.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from backend.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_META_MAGIC = b"NFMETA02"
+_META_HEADER = len(_META_MAGIC) + 8  # magic + uint64 record count
+_ID_MASK = 0x7FFFFFFFFFFFFFFF  # FAISS ids are signed 64-bit; -1 means "no result"
+
+
+def _hash64(*parts: str) -> int:
+    digest = hashlib.sha256("\x00".join(parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little") & _ID_MASK
+
+
+def file_group_id(file_id: Optional[str]) -> int:
+    """Return the 64-bit group key used to find all vectors of a file."""
+    return _hash64("file", file_id) if file_id else 0
+
+
+def stable_chunk_ids(
+    file_ids: List[Optional[str]],
+    texts: List[Optional[str]],
+    seen: Optional[Dict[int, int]] = None,
+) -> List[int]:
+    """
+    Derive stable 64-bit vector IDs from (file_id, chunk text).
+
+    The same chunk of the same file always maps to the same ID, so a
+    re-ingest only has to touch chunks that changed. Repeated identical
+    chunks within one file get distinct IDs via an occurrence counter;
+    pass the same ``seen`` dict to keep counting across batches.
+    """
+    seen = {} if seen is None else seen
+    ids = []
+    for file_id, text in zip(file_ids, texts):
+        text_hash = hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+        chunk_id = _hash64("chunk", file_id or "", text_hash)
+        occurrence = seen.get(chunk_id, 0)
+        seen[chunk_id] = occurrence + 1
+        if occurrence:
+            chunk_id = _hash64("chunk", file_id or "", text_hash, str(occurrence))
+        ids.append(chunk_id)
+    return ids
+
+
+def metadata_path_for(index_path: str) -> str:
+    """Return the binary metadata sidecar path for an index file."""
+    if index_path.endswith(".faiss"):
+        return index_path[: -len(".faiss")] + ".meta"
+    return index_path + ".meta"
+
+
+def legacy_metadata_path_for(index_path: str) -> str:
+    """Return the pre-sidecar JSON metadata path for an index file."""
+    return index_path.replace(".faiss", "_metadata.json")
+
+
+class IndexMetadata:
+    """
+    Per-vector metadata records keyed by vector ID, backed by a binary sidecar.
+
+    File layout: 8-byte magic, uint64 record count N, N+1 uint64 offsets,
+    N int64 vector IDs, N int64 file group keys, then the records as compact
+    UTF-8 JSON. Records on disk are decoded only when accessed; records added
+    or removed since the last save are tracked in memory. For indexes without
+    an ID map the vector ID is simply the insertion position.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._mm: Optional[mmap.mmap] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._ids: Optional[np.ndarray] = None
+        self._groups: Optional[np.ndarray] = None
+        self._id_order: Optional[np.ndarray] = None
+        self._base_count = 0
+        self._live_base_count = 0  # Base records neither deleted nor replaced
+        self._deleted: set = set()
+        self._appended: "OrderedDict[int, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        if path:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        if os.path.exists(path) and os.path.getsize(path) >= _META_HEADER:
+            with open(path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mm[: len(_META_MAGIC)] != _META_MAGIC:
+                self._mm.close()
+                self._mm = None
+                raise ValueError(f"Not a metadata sidecar: {path}")
+            count = int(np.frombuffer(self._mm, dtype="<u8", count=1, offset=len(_META_MAGIC))[0])
+            position = _META_HEADER
+            self._offsets = np.frombuffer(self._mm, dtype="<u8", count=count + 1, offset=position)
+            position += 8 * (count + 1)
+            self._ids = np.frombuffer(self._mm, dtype="<i8", count=count, offset=position)
+            position += 8 * count
+            self._groups = np.frombuffer(self._mm, dtype="<i8", count=count, offset=position)
+            self._base_count = count
+            self._live_base_count = count
+            return
+
+        # Fall back to the legacy indented JSON file (migrated on next save)
+        legacy_path = legacy_metadata_path_for(path[: -len(".meta")] + ".faiss") if path.endswith(".meta") else None
+        if legacy_path and os.path.exists(legacy_path):
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                for record in json.load(f):
+                    self.append(record)
+
+    def _blob_start(self) -> int:
+        return _META_HEADER + 8 * (self._base_count + 1) + 16 * self._base_count
+
+    def _base_position(self, vector_id: int) -> Optional[int]:
+        if not self._base_count:
+            return None
+        if self._id_order is None:
+            self._id_order = np.argsort(self._ids, kind="stable")
+        pos = int(np.searchsorted(self._ids, vector_id, sorter=self._id_order))
+        if pos < self._base_count and int(self._ids[self._id_order[pos]]) == vector_id:
+            return int(self._id_order[pos])
+        return None
+
+    def _decode(self, position: int) -> Dict[str, Any]:
+        start = self._blob_start() + int(self._offsets[position])
+        end = self._blob_start() + int(self._offsets[position + 1])
+        return json.loads(self._mm[start:end].decode("utf-8"))
+
+    def _live_base_positions(self) -> List[int]:
+        if not self._deleted and not self._appended:
+            return list(range(self._base_count))
+        return [
+            i for i in range(self._base_count)
+            if int(self._ids[i]) not in self._deleted and int(self._ids[i]) not in self._appended
+        ]
+
+    def _is_live_base(self, vector_id: int) -> bool:
+        return (
+            vector_id not in self._deleted
+            and vector_id not in self._appended
+            and self._base_position(vector_id) is not None
+        )
+
+    def __len__(self) -> int:
+        return self._live_base_count + len(self._appended)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in self._live_base_positions():
+            yield self._decode(i)
+        for record, _ in self._appended.values():
+            yield record
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        record = self.get(i)
+        if record is None:
+            raise KeyError(i)
+        return record
+
+    def get(self, vector_id: int, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Return the record for a vector ID, or ``default`` if there is none."""
+        vector_id = int(vector_id)
+        if vector_id in self._appended:
+            return self._appended[vector_id][0]
+        if vector_id in self._deleted:
+            return default
+        position = self._base_position(vector_id)
+        if position is None:
+            return default
+        return self._decode(position)
+
+    def append(self, record: Dict[str, Any], vector_id: Optional[int] = None) -> int:
+        """
+        Add (or replace) a record.
+
+        Args:
+            record: Metadata record
+            vector_id: Vector ID; defaults to the next insertion position
+
+        Returns:
+            The vector ID the record was stored under
+        """
+        if vector_id is None:
+            vector_id = self._base_count + len(self._appended)
+        vector_id = int(vector_id)
+        if self._is_live_base(vector_id):
+            self._live_base_count -= 1  # Replaced by the appended record
+        self._appended[vector_id] = (record, file_group_id(record.get("file_id")))
+        return vector_id
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.append(record)
+
+    def remove(self, vector_ids: Iterable[int]) -> None:
+        """Remove the records of the given vector IDs."""
+        for vector_id in vector_ids:
+            vector_id = int(vector_id)
+            if self._appended.pop(vector_id, None) is None and self._is_live_base(vector_id):
+                self._live_base_count -= 1
+            self._deleted.add(vector_id)
+
+    def ids_for_files(self, file_ids: Iterable[str]) -> List[int]:
+        """Return the vector IDs of every record belonging to the given files."""
+        groups = np.array([file_group_id(file_id) for file_id in file_ids], dtype="<i8")
+        ids: List[int] = []
+        if self._base_count:
+            mask = np.isin(self._groups, groups)
+            ids.extend(int(vector_id) for vector_id in self._ids[mask] if int(vector_id) not in self._deleted)
+        group_set = set(groups.tolist())
+        ids.extend(vector_id for vector_id, (_, group) in self._appended.items() if group in group_set)
+        return list(dict.fromkeys(ids))
+
+    @property
+    def pending_bytes(self) -> int:
+        """Rough in-memory size of records not yet written to the sidecar."""
+        return sum(len(str(record.get("text") or "")) + 64 for record, _ in self._appended.values())
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write all live records to the sidecar atomically and re-map it."""
+        path = path or self.path
+        if not path:
+            raise ValueError("No metadata path to save to")
+
+        ids: List[int] = []
+        groups: List[int] = []
+        blobs: List[bytes] = []
+        blob_start = self._blob_start()
+        for i in self._live_base_positions():
+            start = blob_start + int(self._offsets[i])
+            end = blob_start + int(self._offsets[i + 1])
+            blobs.append(self._mm[start:end])
+            ids.append(int(self._ids[i]))
+            groups.append(int(self._groups[i]))
+        for vector_id, (record, group) in self._appended.items():
+            blobs.append(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8"))
+            ids.append(vector_id)
+            groups.append(group)
+
+        count = len(blobs)
+        offsets = np.zeros(count + 1, dtype="<u8")
+        if count:
+            offsets[1:] = np.cumsum([len(blob) for blob in blobs])
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_META_MAGIC)
+            f.write(np.array([count], dtype="<u8").tobytes())
+            f.write(offsets.tobytes())
+            f.write(np.array(ids, dtype="<i8").tobytes())
+            f.write(np.array(groups, dtype="<i8").tobytes())
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+
+        self.close()
+        self.path = path
+        self._open(path)
+
+    def close(self) -> None:
+        self._offsets = None
+        self._ids = None
+        self._groups = None
+        self._id_order = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._base_count = 0
+        self._live_base_count = 0
+        self._deleted = set()
+        self._appended = OrderedDict()
+
+
+class ManagedIndex:
+    """A resident FAISS index with its metadata and bookkeeping."""
+
+    def __init__(self, index_id: str, index: Any, metadata: IndexMetadata, path: str, mmapped: bool):
+        self.index_id = index_id
+        self.index = index
+        self.metadata = metadata
+        self.path = path
+        self.mmapped = mmapped
+        self.refcount = 0
+        self.retired = False  # Replaced or dropped; metadata is closed once no lease holds it
+        # Held while the index or metadata change (writers may run in worker threads)
+        # and by readers that must not see a half-applied add, upsert or delete
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.nbytes = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def id_mapped(self) -> bool:
+        """True if the index stores caller-supplied vector IDs (IndexIDMap2)."""
+        return isinstance(self.index, faiss.IndexIDMap2)
+
+    def mark_dirty(self) -> None:
+        """Record that the index or its metadata changed since the last save."""
+        self.dirty = True
+
+    def add(self, vectors: np.ndarray, records: List[Dict[str, Any]]) -> None:
+        """Append vectors with positional IDs (plain, non ID-mapped indexes)."""
+        with self.lock:
+            start = int(self.index.ntotal)
+            if self.id_mapped:
+                self.index.add_with_ids(vectors, np.arange(start, start + len(vectors), dtype=np.int64))
+            else:
+                self.index.add(vectors)
+            for offset, record in enumerate(records):
+                self.metadata.append(record, start + offset)
+            self.mark_dirty()
+
+    def upsert(self, vector_ids: List[int], vectors: np.ndarray, records: List[Dict[str, Any]]) -> int:
+        """
+        Insert or replace vectors by ID.
+
+        Returns:
+            Number of existing vectors that were replaced
+        """
+        if not self.id_mapped:
+            raise ValueError(f"FAISS index '{self.index_id}' is not ID-mapped; upserts need an IndexIDMap2 store")
+        ids = np.asarray(vector_ids, dtype=np.int64)
+        replaced = 0
+        with self.lock:
+            existing = [int(vector_id) for vector_id in ids if self.metadata.get(int(vector_id)) is not None]
+            if existing:
+                replaced = self.delete(existing)
+            self.index.add_with_ids(vectors, ids)
+            for vector_id, record in zip(vector_ids, records):
+                self.metadata.append(record, int(vector_id))
+            self.mark_dirty()
+        return replaced
+
+    def delete(self, vector_ids: List[int]) -> int:
+        """Delete vectors by ID. Returns the number of vectors removed."""
+        if not vector_ids:
+            return 0
+        if not self.id_mapped:
+            raise ValueError(f"FAISS index '{self.index_id}' is not ID-mapped; deletes need an IndexIDMap2 store")
+        with self.lock:
+            try:
+                removed = int(self.index.remove_ids(np.asarray(vector_ids, dtype=np.int64)))
+            except RuntimeError as e:
+                raise ValueError(f"FAISS index '{self.index_id}' does not support deletes (HNSW): {e}")
+            self.metadata.remove(vector_ids)
+            self.mark_dirty()
+        return removed
+
+    def delete_files(self, file_ids: List[str]) -> int:
+        """Delete every vector that belongs to the given files."""
+        with self.lock:
+            return self.delete(self.metadata.ids_for_files(file_ids))
+
+
+class FaissIndexManager:
+    """
+    Process-wide registry of FAISS indexes with lazy loading and LRU eviction.
+
+    Use ``lease()`` for every access; it loads the index if needed and pins it
+    in memory until the ``with`` block exits.
+    """
+
+    def __init__(self, memory_budget_bytes: int, cache_dir: Path, use_mmap: bool = True):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.cache_dir = Path(cache_dir)
+        self.use_mmap = use_mmap
+        self._entries: "OrderedDict[str, ManagedIndex]" = OrderedDict()
+        self._paths: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self._loads = 0
+        self._evictions = 0
+
+    def _default_path(self, index_id: str) -> str:
+        if re.fullmatch(r"[A-Za-z0-9_.-]{1,128}", index_id):
+            name = index_id
+        else:
+            name = hashlib.sha256(index_id.encode("utf-8")).hexdigest()[:32]
+        return str(self.cache_dir / f"{name}.faiss")
+
+    def _resolve_path(self, index_id: str, path: Optional[str]) -> str:
+        if path:
+            self._paths[index_id] = path
+            return path
+        return self._paths.get(index_id) or self._default_path(index_id)
+
+    @staticmethod
+    def _estimate_bytes(entry: ManagedIndex) -> int:
+        index = entry.index
+        if not entry.dirty and os.path.exists(entry.path):
+            index_bytes = os.path.getsize(entry.path)
+        else:
+            index_bytes = int(index.ntotal) * int(index.d) * 4
+        return index_bytes + entry.metadata.pending_bytes
+
+    def _load(self, index_id: str, path: str, writable: bool) -> ManagedIndex:
+        if not os.path.exists(path):
+            raise ValueError(f"FAISS index '{index_id}' not found")
+
+        mmapped = False
+        index = None
+        if self.use_mmap and not writable:
+            try:
+                index = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                mmapped = True
+            except Exception as e:
+                logger.debug(f"mmap load failed for {path}, reading fully: {e}")
+        if index is None:
+            index = faiss.read_index(path)
+
+        entry = ManagedIndex(index_id, index, IndexMetadata(metadata_path_for(path)), path, mmapped)
+        entry.nbytes = self._estimate_bytes(entry)
+        self._loads += 1
+        logger.info(
+            f"Loaded FAISS index {index_id} from {path} "
+            f"({index.ntotal} vectors{', mmap' if mmapped else ''})"
+        )
+        return entry
+
+    def _persist_entry(self, entry: ManagedIndex) -> None:
+        os.makedirs(os.path.dirname(entry.path) or ".", exist_ok=True)
+        tmp_path = f"{entry.path}.tmp"
+        with entry.lock:
+            faiss.write_index(entry.index, tmp_path)
+            os.replace(tmp_path, entry.path)
+            entry.metadata.save(metadata_path_for(entry.path))
+            entry.dirty = False
+
+    def _evict_over_budget(self) -> None:
+        total = sum(entry.nbytes for entry in self._entries.values())
+        if total <= self.memory_budget_bytes:
+            return
+        for index_id in list(self._entries):
+            if total <= self.memory_budget_bytes:
+                break
+            entry = self._entries[index_id]
+            if entry.refcount > 0:
+                continue
+            if entry.dirty:
+                try:
+                    self._persist_entry(entry)
+                except Exception as e:
+                    logger.warning(f"Could not persist FAISS index {index_id} before eviction: {e}")
+                    continue
+            del self._entries[index_id]
+            self._retire(entry)
+            total -= entry.nbytes
+            self._evictions += 1
+            logger.info(f"Evicted FAISS index {index_id} ({entry.nbytes / 1e6:.1f} MB)")
+
+    @staticmethod
+    def _retire(entry: ManagedIndex) -> None:
+        """Close a replaced entry's metadata now, or when its last lease ends."""
+        entry.retired = True
+        if entry.refcount <= 0:
+            entry.metadata.close()
+
+    def contains(self, index_id: str, path: Optional[str] = None) -> bool:
+        """Return True if the index is resident or exists on disk."""
+        with self._lock:
+            if index_id in self._entries:
+                return True
+            return os.path.exists(self._resolve_path(index_id, path))
+
+    def register(self, index_id: str, index: Any, path: Optional[str] = None) -> None:
+        """Register a newly created (empty or populated) index, replacing any existing one."""
+        with self._lock:
+            path = self._resolve_path(index_id, path)
+            old = self._entries.pop(index_id, None)
+            if old is not None:
+                self._retire(old)
+            entry = ManagedIndex(index_id, index, IndexMetadata(), path, mmapped=False)
+            entry.mark_dirty()
+            entry.nbytes = self._estimate_bytes(entry)
+            self._entries[index_id] = entry
+
+    @contextmanager
+    def lease(self, index_id: str, path: Optional[str] = None, writable: bool = False) -> Iterator[ManagedIndex]:
+        """
+        Pin an index in memory for the duration of a ``with`` block.
+
+        Args:
+            index_id: Index identifier
+            path: Backing file (remembered for later leases without a path)
+            writable: Load a mutable copy instead of a memory-mapped one
+
+        Raises:
+            ValueError: If the index is neither resident nor on disk
+        """
+        with self._lock:
+            resolved = self._resolve_path(index_id, path)
+            entry = self._entries.get(index_id)
+            if entry is not None and path and entry.path != path and not entry.dirty:
+                # Caller points at a different file than the resident copy
+                del self._entries[index_id]
+                self._retire(entry)
+                entry = None
+            if entry is None:
+                entry = self._load(index_id, resolved, writable)
+                self._entries[index_id] = entry
+            elif writable and entry.mmapped:
+                self._retire(entry)
+                entry = self._load(index_id, entry.path, writable=True)
+                self._entries[index_id] = entry
+            self._entries.move_to_end(index_id)
+            entry.refcount += 1
+            entry.last_used = time.monotonic()
+
+        try:
+            yield entry
+        finally:
+            with self._lock:
+                entry.refcount -= 1
+                if entry.retired:
+                    # Searches that started on a replaced copy keep it until they finish
+                    if entry.refcount <= 0:
+                        entry.metadata.close()
+                    return
+                entry.nbytes = self._estimate_bytes(entry)
+                self._evict_over_budget()
+
+    def persist(self, index_id: str) -> None:
+        """Write a resident index and its metadata to its backing file."""
+        with self._lock:
+            entry = self._entries.get(index_id)
+            if entry is None:
+                return
+            self._persist_entry(entry)
+            entry.nbytes = self._estimate_bytes(entry)
+            logger.info(f"FAISS index persisted to {entry.path}")
+
+    def drop(self, index_id: str) -> None:
+        """Forget a resident index without persisting pending changes."""
+        with self._lock:
+            entry = self._entries.pop(index_id, None)
+            if entry is not None:
+                self._retire(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return manager statistics."""
+        with self._lock:
+            return {
+                "resident_indexes": len(self._entries),
+                "resident_bytes": sum(entry.nbytes for entry in self._entries.values()),
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "leased": sum(1 for entry in self._entries.values() if entry.refcount > 0),
+                "mmapped": sum(1 for entry in self._entries.values() if entry.mmapped),
+                "loads": self._loads,
+                "evictions": self._evictions,
+            }
+
+
+# Global index manager instance
+_index_manager: Optional[FaissIndexManager] = None
+_index_manager_lock = threading.Lock()
+
+
+def get_faiss_index_manager() -> FaissIndexManager:
+    """Get the global FAISS index manager."""
+    global _index_manager
+    if _index_manager is None:
+        with _index_manager_lock:
+            if _index_manager is None:
+                _index_manager = FaissIndexManager(
+                    memory_budget_bytes=settings.faiss_index_memory_mb * 1024 * 1024,
+                    cache_dir=settings.vectors_dir / "index_cache",
+                    use_mmap=settings.faiss_use_mmap,
+                )
+    return _index_manager
@@ -0,0 +1,170 @@
+"""
+Hedged provider requests.
+
+A single slow provider response dominates tail latency. For idempotent
+calls (embeddings, reranks, deterministic chat completions) ``hedged``
+starts a duplicate request when the first has not answered within a
+latency percentile of recent calls to the same endpoint, takes whichever
+answers first and cancels the other. With the default 95th percentile at
+most about one call in twenty is duplicated.
+
+Latencies are tracked per key (provider and operation, e.g.
+``"openai:embeddings:text-embedding-3-small"``) whether or not hedging is
+enabled; a key is hedged only once it has ``hedge_min_samples`` samples.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from backend.config import settings
+from backend.core.deadline import remaining_time
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Recent latencies kept per key
+_WINDOW = 256
+
+
+class LatencyTracker:
+    """Recent call latencies per key, and hedging counters."""
+
+    def __init__(self, window: int = _WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._hedges: Dict[str, int] = {}
+        self._hedge_wins: Dict[str, int] = {}
+
+    def record(self, key: str, latency: float) -> None:
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def percentile(self, key: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """Return the given percentile (0-100) of recent latencies, or None with too few samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        index = min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def record_hedge(self, key: str, won: bool) -> None:
+        with self._lock:
+            self._hedges[key] = self._hedges.get(key, 0) + 1
+            if won:
+                self._hedge_wins[key] = self._hedge_wins.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return sample counts, hedge threshold and hedge counts per key."""
+        with self._lock:
+            keys = list(self._samples)
+        return {
+            key: {
+                "samples": len(self._samples[key]),
+                "p50_ms": round((self.percentile(key, 50) or 0.0) * 1000, 1),
+                "hedge_after_ms": round((self.percentile(key, settings.hedge_percentile) or 0.0) * 1000, 1),
+                "hedges": self._hedges.get(key, 0),
+                "hedge_wins": self._hedge_wins.get(key, 0),
+            }
+            for key in keys
+        }
+
+
+# Global latency tracker instance
+_latency_tracker: Optional[LatencyTracker] = None
+_latency_tracker_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Get the global latency tracker."""
+    global _latency_tracker
+    if _latency_tracker is None:
+        with _latency_tracker_lock:
+            if _latency_tracker is None:
+                _latency_tracker = LatencyTracker()
+    return _latency_tracker
+
+
+async def hedged(
+    key: str,
+    func: Callable[[], Awaitable[T]],
+    idempotent: bool = True,
+    discard: Optional[Callable[[T], Awaitable[None]]] = None,
+) -> T:
+    """
+    Await ``func()``, starting one duplicate if it is slower than usual.
+
+    Args:
+        key: Latency tracking key of the endpoint
+        func: Makes the request; called once per attempt
+        idempotent: False for calls that must not be duplicated (only tracked)
+        discard: Releases a result that lost the race (e.g. closes a stream)
+
+    Returns:
+        The result of the first attempt that succeeds. If every attempt
+        fails, the first error is raised.
+    """
+    tracker = get_latency_tracker()
+    delay = None
+    if idempotent and settings.enable_hedged_requests:
+        delay = tracker.percentile(key, settings.hedge_percentile, settings.hedge_min_samples)
+        remaining = remaining_time()
+        if delay is not None and remaining is not None and delay >= remaining:
+            # The deadline expires before a hedge would be sent
+            delay = None
+
+    async def attempt() -> Tuple[T, float]:
+        started = time.monotonic()
+        result = await func()
+        return result, time.monotonic() - started
+
+    if delay is None:
+        result, latency = await attempt()
+        tracker.record(key, latency)
+        return result
+
+    tasks: List[asyncio.Task] = [asyncio.create_task(attempt())]
+    winner: Optional[asyncio.Task] = None
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            logger.debug(f"Hedging {key}: no response after {delay * 1000:.0f}ms")
+            tasks.append(asyncio.create_task(attempt()))
+
+        errors: List[BaseException] = []
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=tasks.index):
+                if task.exception() is None:
+                    winner = task
+                    break
+                errors.append(task.exception())
+            if winner is not None:
+                result, latency = winner.result()
+                tracker.record(key, latency)
+                if len(tasks) > 1:
+                    tracker.record_hedge(key, won=winner is tasks[1])
+                return result
+        raise errors[0]
+    finally:
+        losers = [task for task in tasks if task is not winner]
+        for task in losers:
+            task.cancel()
+        await asyncio.gather(*losers, return_exceptions=True)
+        if discard is not None:
+            for task in losers:
+                if not task.cancelled() and task.exception() is None:
+                    try:
+                        await discard(task.result()[0])
+                    except Exception as e:
+                        logger.debug(f"Failed to discard hedged result of {key}: {e}")
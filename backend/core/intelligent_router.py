@@ -14,6 +14,7 @@ This makes Nodeflow truly "agentic" - agents decide what to pass where.
 from typing import Any, Dict, List, Optional
 from backend.utils.logger import get_logger
 from backend.core.secret_resolver import resolve_api_key
+from backend.core.llm_response_cache import cached_llm_call, is_cacheable, llm_cache_key
 from backend.config import settings
 
 logger = get_logger(__name__)
@@ -233,17 +234,28 @@ Return JSON mapping only:"""
             provider = self.provider.lower()
             model = self.model
             
-            # Route to appropriate provider (same pattern as ChatNode)
-            if provider == "openai":
-                return await self._call_openai(prompt, model)
-            elif provider == "anthropic":
-                return await self._call_anthropic(prompt, model)
-            elif provider == "gemini" or provider == "google":
-                return await self._call_gemini(prompt, model)
-            else:
-                # Fallback to OpenAI if provider not supported
-                logger.warning(f"Provider {provider} not supported for routing, falling back to OpenAI")
-                return await self._call_openai(prompt, "gpt-4o-mini")
+            async def request() -> Dict[str, Any]:
+                # Route to appropriate provider (same pattern as ChatNode)
+                if provider == "openai":
+                    return await self._call_openai(prompt, model)
+                elif provider == "anthropic":
+                    return await self._call_anthropic(prompt, model)
+                elif provider == "gemini" or provider == "google":
+                    return await self._call_gemini(prompt, model)
+                else:
+                    # Fallback to OpenAI if provider not supported
+                    logger.warning(f"Provider {provider} not supported for routing, falling back to OpenAI")
+                    return await self._call_openai(prompt, "gpt-4o-mini")
+            
+            # Routing decisions are meant to be consistent: the same prompt
+            # (target schema and available data) reuses the earlier decision
+            cache_key = None
+            if is_cacheable(0.1, opt_in=True):
+                cache_key = llm_cache_key(
+                    f"router:{provider}", model, [{"role": "user", "content": prompt}], {"temperature": 0.1, "max_tokens": 500}
+                )
+            routing_decision, _ = await cached_llm_call(cache_key, request)
+            return routing_decision
             
         except Exception as e:
             llm_error_context = {
@@ -258,7 +270,7 @@ Return JSON mapping only:"""
     
     async def _call_openai(self, prompt: str, model: str) -> Dict[str, Any]:
         """Call OpenAI for routing decision."""
-        import openai
+        from backend.core.client_pool import get_openai_client
         from backend.core.secret_resolver import resolve_api_key
         from backend.config import settings
         
@@ -266,9 +278,9 @@ Return JSON mapping only:"""
         if not api_key:
             raise ValueError("OpenAI API key not found")
         
-        client = openai.OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": "You are a data routing assistant. Return only valid JSON."},
@@ -283,13 +295,7 @@ Return JSON mapping only:"""
     
     async def _call_anthropic(self, prompt: str, model: str) -> Dict[str, Any]:
         """Call Anthropic Claude for routing decision."""
-        try:
-            from anthropic import Anthropic
-        except ImportError:
-            raise ValueError(
-                "anthropic not installed. Install it with: pip install anthropic"
-            )
-        
+        from backend.core.client_pool import get_anthropic_client
         from backend.core.secret_resolver import resolve_api_key
         from backend.config import settings
         
@@ -297,9 +303,9 @@ Return JSON mapping only:"""
         if not api_key:
             raise ValueError("Anthropic API key not found")
         
-        client = Anthropic(api_key=api_key)
+        client = get_anthropic_client(api_key)
         
-        response = client.messages.create(
+        response = await client.messages.create(
             model=model,
             max_tokens=500,
             temperature=0.1,
@@ -0,0 +1,241 @@
+"""
+Durable job queue for the job-queue execution mode.
+
+In ``execution_mode = "queue"`` the API enqueues workflow executions here
+instead of running them in its own event loop, and execution workers
+(``python -m backend.worker``) claim and run them. A claim is a lease:
+the worker renews it while the execution runs, and if the worker dies the
+lease expires and another worker picks the job up again, up to
+``job_max_attempts`` times.
+
+``JobQueue`` is the broker interface; ``SQLiteJobQueue`` implements it on
+an embedded SQLite database (WAL mode) that every process on the host
+opens, which is enough for single-host deployments.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A claimed unit of work."""
+
+    id: int
+    execution_id: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class JobQueue(ABC):
+    """Interface of execution job brokers."""
+
+    @abstractmethod
+    def enqueue(self, execution_id: str, payload: Dict[str, Any]) -> int:
+        """Add a job. Returns its ID."""
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        """Lease the oldest runnable job (queued, or running with an expired lease)."""
+
+    @abstractmethod
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        """Extend a lease. Returns False if the worker no longer holds it."""
+
+    @abstractmethod
+    def complete(self, job_id: int, worker_id: str) -> None:
+        """Mark a leased job as done."""
+
+    @abstractmethod
+    def fail(self, job_id: int, worker_id: str, error: str) -> None:
+        """Mark a leased job as failed (it is not retried)."""
+
+    @abstractmethod
+    def reap_expired(self) -> List[Job]:
+        """Fail jobs whose lease expired after their last attempt; returns them."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Return the number of jobs per status."""
+
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue stored in a SQLite database shared by the API and workers."""
+
+    def __init__(self, db_path: Path, max_attempts: int = 3):
+        self.db_path = Path(db_path)
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; claims use explicit IMMEDIATE transactions
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                execution_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                worker_id TEXT,
+                lease_expires_at REAL,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs (status, lease_expires_at);
+            """
+        )
+
+    def enqueue(self, execution_id: str, payload: Dict[str, Any]) -> int:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT INTO jobs (execution_id, payload, status, max_attempts, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (execution_id, json.dumps(payload), JOB_QUEUED, self.max_attempts, now, now),
+            )
+            return cursor.lastrowid
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, execution_id, payload, attempts FROM jobs WHERE status = ? ORDER BY id LIMIT 1",
+                    (JOB_QUEUED,),
+                ).fetchone()
+                if row is None:
+                    # Jobs of workers that died (lease expired) are retried
+                    row = self._conn.execute(
+                        """
+                        SELECT id, execution_id, payload, attempts FROM jobs
+                        WHERE status = ? AND lease_expires_at < ? AND attempts < max_attempts
+                        ORDER BY id LIMIT 1
+                        """,
+                        (JOB_RUNNING, now),
+                    ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        """
+                        UPDATE jobs SET status = ?, attempts = attempts + 1, worker_id = ?,
+                            lease_expires_at = ?, updated_at = ?
+                        WHERE id = ?
+                        """,
+                        (JOB_RUNNING, worker_id, now + lease_seconds, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        job_id, execution_id, payload, attempts = row
+        if attempts:
+            logger.warning(f"Retrying job {job_id} (execution {execution_id}) after an expired lease")
+        return Job(id=job_id, execution_id=execution_id, payload=json.loads(payload), attempts=attempts + 1)
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE jobs SET lease_expires_at = ?, updated_at = ?
+                WHERE id = ? AND worker_id = ? AND status = ?
+                """,
+                (now + lease_seconds, now, job_id, worker_id, JOB_RUNNING),
+            )
+            return cursor.rowcount > 0
+
+    def _finish(self, job_id: int, worker_id: str, status: str, error: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, lease_expires_at = NULL, updated_at = ?
+                WHERE id = ? AND worker_id = ?
+                """,
+                (status, error, time.time(), job_id, worker_id),
+            )
+
+    def complete(self, job_id: int, worker_id: str) -> None:
+        self._finish(job_id, worker_id, JOB_COMPLETED, None)
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> None:
+        self._finish(job_id, worker_id, JOB_FAILED, error)
+
+    def reap_expired(self) -> List[Job]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    """
+                    SELECT id, execution_id, payload, attempts FROM jobs
+                    WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts
+                    """,
+                    (JOB_RUNNING, now),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE jobs SET status = ?, error = ?, lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+                    [(JOB_FAILED, "Worker lease expired on the last attempt", now, row[0]) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [
+            Job(id=job_id, execution_id=execution_id, payload=json.loads(payload), attempts=attempts)
+            for job_id, execution_id, payload, attempts in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in (JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED)}
+        counts.update(dict(rows))
+        return counts
+
+
+def queue_db_path() -> Path:
+    """Return the path of the SQLite database shared by the API and workers."""
+    return Path(settings.job_queue_path) if settings.job_queue_path else settings.executions_dir / "queue.db"
+
+
+# Global job queue instance
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Get the global job queue for the configured backend."""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                if settings.job_queue_backend != "sqlite":
+                    raise ValueError(f"Unsupported job queue backend: {settings.job_queue_backend}")
+                _job_queue = SQLiteJobQueue(queue_db_path(), max_attempts=settings.job_max_attempts)
+    return _job_queue
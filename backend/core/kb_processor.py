@@ -4,11 +4,14 @@ Knowledge Base Processing Pipeline.
 Processes files in a knowledge base: chunk, embed, and store vectors.
 """
 
+import shutil
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import faiss
+
 from backend.core.knowledge_base import (
     KnowledgeBase,
     KnowledgeBaseVersion,
@@ -19,6 +22,7 @@ from backend.core.knowledge_base import (
     load_knowledge_base,
     save_knowledge_base,
 )
+from backend.core.faiss_index_manager import metadata_path_for
 from backend.core.node_registry import NodeRegistry
 from backend.nodes.input.file_loader import FileLoaderNode
 from backend.nodes.processing.chunk import ChunkNode
@@ -38,6 +42,50 @@ class KnowledgeBaseProcessor:
         self.embed_node = EmbedNode()
         self.vector_store = VectorStoreNode()
 
+    def _find_base_version(
+        self,
+        kb: KnowledgeBase,
+        version: KnowledgeBaseVersion,
+    ) -> Optional[KnowledgeBaseVersion]:
+        """
+        Find a previous version whose FAISS index can be updated incrementally.
+
+        The base must be a completed, persisted FAISS version built with the
+        same chunk, embed and vector store configuration, and its index must
+        be ID-mapped so that chunks can be upserted and deleted by file.
+        """
+        if version.vector_store_config.provider != "faiss" or not version.vector_store_config.persist:
+            return None
+        if version.vector_store_config.index_type.startswith("hnsw"):
+            # HNSW graphs do not support removing vectors
+            return None
+
+        candidates = sorted(
+            (
+                v for v in kb.versions
+                if v.id != version.id
+                and v.version_number < version.version_number
+                and v.status == ProcessingStatus.COMPLETED
+                and v.chunk_config == version.chunk_config
+                and v.embed_config == version.embed_config
+                and v.vector_store_config == version.vector_store_config
+                and v.vector_store_path
+                and Path(v.vector_store_path).exists()
+                and Path(metadata_path_for(v.vector_store_path)).exists()
+            ),
+            key=lambda v: v.version_number,
+            reverse=True,
+        )
+        for candidate in candidates:
+            try:
+                index = faiss.read_index(candidate.vector_store_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            except Exception as e:
+                logger.warning(f"Could not inspect index of version {candidate.version_number}: {e}")
+                continue
+            if isinstance(index, faiss.IndexIDMap2):
+                return candidate
+        return None
+
     async def process_knowledge_base(
         self,
         kb_id: str,
@@ -71,11 +119,38 @@ class KnowledgeBaseProcessor:
             all_embeddings = []
             total_cost = 0.0
             
+            # Set vector store path
+            if not version.vector_store_path:
+                vector_store_dir = Path("backend/data/vectors")
+                vector_store_dir.mkdir(parents=True, exist_ok=True)
+                version.vector_store_path = str(vector_store_dir / f"{version.vector_store_id}.faiss")
+            
+            # Start from the previous version's index when possible and only
+            # apply the file diff instead of re-embedding every file
+            base_version = self._find_base_version(kb, version)
+            files_to_process = list(version.file_ids)
+            files_to_remove: List[str] = []
+            if base_version:
+                base_files = set(base_version.file_ids)
+                current_files = set(version.file_ids)
+                files_to_process = [f for f in version.file_ids if f not in base_files]
+                files_to_remove = [f for f in base_version.file_ids if f not in current_files]
+                if Path(version.vector_store_path).resolve() != Path(base_version.vector_store_path).resolve():
+                    shutil.copyfile(base_version.vector_store_path, version.vector_store_path)
+                    shutil.copyfile(
+                        metadata_path_for(base_version.vector_store_path),
+                        metadata_path_for(version.vector_store_path),
+                    )
+                logger.info(
+                    f"Updating KB {kb_id} version {version.version_number} from version {base_version.version_number}: "
+                    f"{len(files_to_process)} added, {len(files_to_remove)} removed file(s)"
+                )
+            
             # Step 1: Load and extract text from all files
-            logger.info(f"Loading {len(version.file_ids)} files for KB {kb_id} version {version.version_number}")
-            version.processing_log = f"Loading {len(version.file_ids)} files..."
+            logger.info(f"Loading {len(files_to_process)} files for KB {kb_id} version {version.version_number}")
+            version.processing_log = f"Loading {len(files_to_process)} files..."
             
-            for file_id in version.file_ids:
+            for file_id in files_to_process:
                 try:
                     # Load file
                     file_inputs = {}
@@ -132,7 +207,7 @@ class KnowledgeBaseProcessor:
                     # Continue with other files
                     continue
             
-            if not all_chunks:
+            if not all_chunks and not base_version:
                 error_msg = "No chunks created from any files. This usually means:\n"
                 error_msg += "1. Files were empty or couldn't be read\n"
                 error_msg += "2. Text extraction failed (check file format)\n"
@@ -140,61 +215,58 @@ class KnowledgeBaseProcessor:
                 error_msg += f"Processed {len(version.file_ids)} file(s) but no text was extracted."
                 raise ValueError(error_msg)
             
-            # Step 3: Create embeddings
-            logger.info(f"Creating embeddings for {len(all_chunks)} chunks")
-            version.processing_log = f"Creating embeddings for {len(all_chunks)} chunks..."
-            
-            # Extract text from chunks for embedding
-            chunk_texts = [chunk["text"] for chunk in all_chunks]
-            
-            # Double-check we have text to embed
-            if not chunk_texts or not any(chunk_texts):
-                raise ValueError("No text or chunks provided in inputs - all chunks are empty")
-            
-            logger.info(f"Preparing to embed {len(chunk_texts)} chunks, first chunk length: {len(chunk_texts[0]) if chunk_texts else 0}")
-            
-            # Embed node expects "text" or "chunks" key, not "texts"
-            # Use "chunks" since we have a list of text chunks
-            embed_inputs = {"chunks": chunk_texts}
-            embed_config = {
-                "provider": version.embed_config.provider,
-                "model": version.embed_config.model,
-                "batch_size": version.embed_config.batch_size,
-                "use_finetuned_model": version.embed_config.use_finetuned_model,
-                "finetuned_model_id": version.embed_config.finetuned_model_id,
-                "_node_id": "embed_kb",
-            }
+            # Step 3: Create embeddings (an incremental update may only remove files)
+            if all_chunks:
+                logger.info(f"Creating embeddings for {len(all_chunks)} chunks")
+                version.processing_log = f"Creating embeddings for {len(all_chunks)} chunks..."
+            
+                # Extract text from chunks for embedding
+                chunk_texts = [chunk["text"] for chunk in all_chunks]
+            
+                # Double-check we have text to embed
+                if not chunk_texts or not any(chunk_texts):
+                    raise ValueError("No text or chunks provided in inputs - all chunks are empty")
+            
+                logger.info(f"Preparing to embed {len(chunk_texts)} chunks, first chunk length: {len(chunk_texts[0]) if chunk_texts else 0}")
+            
+                # Embed node expects "text" or "chunks" key, not "texts"
+                # Use "chunks" since we have a list of text chunks
+                embed_inputs = {"chunks": chunk_texts}
+                embed_config = {
+                    "provider": version.embed_config.provider,
+                    "model": version.embed_config.model,
+                    "batch_size": version.embed_config.batch_size,
+                    "use_finetuned_model": version.embed_config.use_finetuned_model,
+                    "finetuned_model_id": version.embed_config.finetuned_model_id,
+                    "_node_id": "embed_kb",
+                }
             
-            logger.info(f"Embed config: provider={embed_config['provider']}, model={embed_config['model']}, batch_size={embed_config['batch_size']}")
-            logger.debug(f"Embed inputs keys: {list(embed_inputs.keys())}, chunks count: {len(embed_inputs['chunks'])}")
+                logger.info(f"Embed config: provider={embed_config['provider']}, model={embed_config['model']}, batch_size={embed_config['batch_size']}")
+                logger.debug(f"Embed inputs keys: {list(embed_inputs.keys())}, chunks count: {len(embed_inputs['chunks'])}")
             
-            embed_result = await self.embed_node.execute(embed_inputs, embed_config)
-            all_embeddings = embed_result.get("embeddings", [])
-            embed_cost = embed_result.get("cost", 0.0)
-            total_cost += embed_cost
+                embed_result = await self.embed_node.execute(embed_inputs, embed_config)
+                all_embeddings = embed_result.get("embeddings", [])
+                embed_cost = embed_result.get("cost", 0.0)
+                total_cost += embed_cost
             
-            if not all_embeddings:
-                raise ValueError("No embeddings created")
+                if not all_embeddings:
+                    raise ValueError("No embeddings created")
             
-            if len(all_embeddings) != len(all_chunks):
-                raise ValueError(f"Mismatch: {len(all_chunks)} chunks but {len(all_embeddings)} embeddings")
+                if len(all_embeddings) != len(all_chunks):
+                    raise ValueError(f"Mismatch: {len(all_chunks)} chunks but {len(all_embeddings)} embeddings")
             
             # Step 4: Store in vector store
             logger.info(f"Storing {len(all_embeddings)} vectors")
             version.processing_log = f"Storing {len(all_embeddings)} vectors..."
             
-            # Set vector store path
-            if not version.vector_store_path:
-                vector_store_dir = Path("backend/data/vectors")
-                vector_store_dir.mkdir(parents=True, exist_ok=True)
-                version.vector_store_path = str(vector_store_dir / f"{version.vector_store_id}.faiss")
-            
             # Vector store expects chunks as list of strings
             chunk_texts_for_store = [chunk["text"] for chunk in all_chunks]
             
             store_inputs = {
                 "embeddings": all_embeddings,
                 "chunks": chunk_texts_for_store,  # Vector store expects "chunks" key
+                "chunk_file_ids": [chunk["file_id"] for chunk in all_chunks],
+                "delete_file_ids": files_to_remove,
             }
             store_config = {
                 "provider": version.vector_store_config.provider,
@@ -202,6 +274,8 @@ class KnowledgeBaseProcessor:
                 "faiss_index_type": version.vector_store_config.index_type,
                 "faiss_persist": version.vector_store_config.persist,
                 "faiss_file_path": version.vector_store_path,
+                # Stable chunk IDs let the next version apply just its diff
+                "faiss_operation": ("upsert" if all_embeddings else "delete") if version.vector_store_config.persist else "add",
                 "_node_id": "vector_store_kb",
             }
             
@@ -212,7 +286,12 @@ class KnowledgeBaseProcessor:
             version.vector_count = vectors_stored
             version.total_cost = total_cost
             version.status = ProcessingStatus.COMPLETED
-            version.processing_log = f"Successfully processed {len(version.file_ids)} files, created {len(all_chunks)} chunks, stored {vectors_stored} vectors"
+            version.processing_log = f"Successfully processed {len(files_to_process)} files, created {len(all_chunks)} chunks, stored {vectors_stored} vectors"
+            if base_version:
+                version.processing_log += (
+                    f" (incremental update of version {base_version.version_number}, "
+                    f"removed {len(files_to_remove)} file(s))"
+                )
             version.processing_duration_ms = int((time.time() - start_time) * 1000)
             
             logger.info(f"KB {kb_id} version {version.version_number} processed successfully: {vectors_stored} vectors stored")
@@ -0,0 +1,217 @@
+"""
+Exact-match cache of LLM responses.
+
+Repeated prompts (FAQ questions answered by a RAG workflow, lead scoring of
+the same record, routing decisions for the same data) are answered from
+this cache instead of the provider. Entries are keyed by provider, model,
+normalized messages and sampling parameters (``llm_cache_key``). Only
+deterministic calls are cached: temperature 0, or callers that opt in
+(``cache_response`` in a node's config). Entries expire after a TTL, and
+the least recently used are evicted beyond a byte budget.
+
+A hit costs nothing. Lookups made while a node runs are counted in the
+``llm_cache_usage`` scope that ``NodeExecutor`` opens around it, so a node
+answered entirely from the cache is recorded at $0 and its span shows the
+hits.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from backend.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize message content: line endings and surrounding whitespace of strings."""
+    if isinstance(value, str):
+        return value.replace("\r\n", "\n").strip()
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def llm_cache_key(provider: str, model: str, messages: Any, params: Optional[Dict[str, Any]] = None) -> str:
+    """Return the cache key of an LLM call."""
+    payload = {
+        "provider": provider,
+        "model": model,
+        "messages": _normalize(messages),
+        "params": params or {},
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(temperature: Optional[float], opt_in: bool = False) -> bool:
+    """Return whether a call with this temperature may be served from the cache."""
+    if not settings.enable_llm_response_cache:
+        return False
+    return opt_in or temperature == 0
+
+
+@dataclass
+class LLMCacheUsage:
+    """Cache lookups made within one ``llm_cache_usage`` scope."""
+
+    hits: int = 0
+    misses: int = 0
+    saved_cost: float = 0.0
+
+    @property
+    def served_from_cache(self) -> bool:
+        """True if LLM calls were made and every one was a cache hit."""
+        return self.hits > 0 and self.misses == 0
+
+
+_usage: ContextVar[Optional[LLMCacheUsage]] = ContextVar("llm_cache_usage", default=None)
+
+
+@contextmanager
+def llm_cache_usage() -> Iterator[LLMCacheUsage]:
+    """Count the cache hits and misses of the enclosed work."""
+    usage = LLMCacheUsage()
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+class LLMResponseCache:
+    """
+    In-memory LRU cache of LLM responses with a TTL and a byte budget.
+
+    Entries are JSON-serializable dicts (response text, token usage and the
+    cost of the original call), stored encoded so callers always get a
+    private copy. Safe to share across threads.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._saved_cost = 0.0
+
+    def _drop(self, key: str) -> None:
+        _, data = self._entries.pop(key)
+        self._bytes -= len(data)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response, or None."""
+        usage = _usage.get()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                if usage is not None:
+                    usage.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        value = json.loads(entry[1])
+        saved = float(value.get("cost") or 0.0)
+        with self._lock:
+            self._saved_cost += saved
+        if usage is not None:
+            usage.hits += 1
+            usage.saved_cost += saved
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> bool:
+        """Store a response. Returns False if it is not JSON-serializable or exceeds the budget."""
+        try:
+            data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            logger.debug(f"LLM response not cacheable: {e}")
+            return False
+        if len(data) > self.max_bytes:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, data)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+        return True
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "saved_cost": round(self._saved_cost, 6),
+                "items": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+# Global LLM response cache instance
+_llm_response_cache: Optional[LLMResponseCache] = None
+_llm_response_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Get the global LLM response cache."""
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        with _llm_response_cache_lock:
+            if _llm_response_cache is None:
+                _llm_response_cache = LLMResponseCache(
+                    max_bytes=settings.llm_response_cache_memory_mb * 1024 * 1024,
+                    ttl_seconds=settings.llm_response_cache_ttl_seconds,
+                )
+    return _llm_response_cache
+
+
+async def cached_llm_call(
+    key: Optional[str],
+    call: Callable[[], Awaitable[Dict[str, Any]]],
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Return the cached response for ``key``, or make the call and cache its result.
+
+    Args:
+        key: Cache key from ``llm_cache_key``, or None if the call is not cacheable
+        call: Makes the request and returns a JSON-serializable response dict
+
+    Returns:
+        The response and whether it came from the cache
+    """
+    if key is None:
+        return await call(), False
+    cache = get_llm_response_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, True
+    response = await call()
+    cache.put(key, response)
+    return response, False
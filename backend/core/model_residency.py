@@ -0,0 +1,245 @@
+"""
+Process-wide residency manager for local ML models.
+
+SentenceTransformer embedders, CrossEncoder rerankers, Whisper and
+``transformers`` pipelines take seconds to load and hundreds of MB of RAM.
+Instead of loading them inside every node call, nodes ask this manager for a
+model; it is loaded once (off the event loop, with concurrent requests for
+the same model waiting on a single load) and shared by every later call.
+
+Resident models are kept in LRU order. When their estimated size exceeds the
+configured RAM budget, least recently used models are dropped; callers that
+still hold a reference keep using it until they finish. A set of models can
+be preloaded at startup via ``MODEL_PRELOAD`` (e.g.
+``sentence_transformer:all-MiniLM-L6-v2,whisper:base,transformers:summarization:facebook/bart-large-cnn``).
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ModelKey = Tuple[str, str, Tuple[Tuple[str, Any], ...]]
+
+
+def _load_sentence_transformer(name: str, **kwargs: Any) -> Any:
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(name, **kwargs)
+
+
+def _load_cross_encoder(name: str, **kwargs: Any) -> Any:
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(name, **kwargs)
+
+
+def _load_whisper(name: str, **kwargs: Any) -> Any:
+    import whisper
+
+    return whisper.load_model(name, **kwargs)
+
+
+def _load_transformers_pipeline(name: str, task: str, **kwargs: Any) -> Any:
+    from transformers import pipeline
+
+    return pipeline(task, model=name, **kwargs)
+
+
+_LOADERS: Dict[str, Callable[..., Any]] = {
+    "sentence_transformer": _load_sentence_transformer,
+    "cross_encoder": _load_cross_encoder,
+    "whisper": _load_whisper,
+    "transformers": _load_transformers_pipeline,
+}
+
+
+def estimate_model_bytes(model: Any) -> int:
+    """
+    Estimate the RAM held by a model from its torch parameters and buffers.
+
+    Looks through common wrappers (pipelines and CrossEncoder expose the
+    underlying module as ``.model``). Returns 0 if no torch module is found.
+    """
+    try:
+        import torch
+    except ImportError:
+        return 0
+
+    for candidate in (model, getattr(model, "model", None)):
+        if isinstance(candidate, torch.nn.Module):
+            tensors = list(candidate.parameters()) + list(candidate.buffers())
+            return sum(t.numel() * t.element_size() for t in tensors)
+    return 0
+
+
+class _Resident:
+    __slots__ = ("model", "nbytes", "load_seconds", "hits", "last_used")
+
+    def __init__(self, model: Any, nbytes: int, load_seconds: float):
+        self.model = model
+        self.nbytes = nbytes
+        self.load_seconds = load_seconds
+        self.hits = 0
+        self.last_used = time.monotonic()
+
+
+class ModelResidencyManager:
+    """LRU cache of loaded models under a RAM budget."""
+
+    def __init__(self, memory_budget_bytes: int, loaders: Optional[Dict[str, Callable[..., Any]]] = None):
+        self.memory_budget_bytes = memory_budget_bytes
+        self._loaders = dict(loaders or _LOADERS)
+        self._models: "OrderedDict[ModelKey, _Resident]" = OrderedDict()
+        self._load_locks: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._loads = 0
+        self._evictions = 0
+        self._load_errors = 0
+        self._load_seconds = 0.0
+
+    @staticmethod
+    def _key(kind: str, name: str, options: Dict[str, Any]) -> ModelKey:
+        return kind, name, tuple(sorted((k, repr(v)) for k, v in options.items()))
+
+    def _resident_bytes(self) -> int:
+        return sum(entry.nbytes for entry in self._models.values())
+
+    def _evict_over_budget(self, keep: ModelKey) -> None:
+        """Drop least recently used models until the budget fits (caller holds the lock)."""
+        for key in list(self._models):
+            if self._resident_bytes() <= self.memory_budget_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self._models.pop(key)
+            self._evictions += 1
+            logger.info(f"Evicted model {key[0]}:{key[1]} ({entry.nbytes / 1e6:.0f} MB)")
+
+    def get(self, kind: str, name: str, **options: Any) -> Any:
+        """
+        Return a resident model, loading it on first use.
+
+        Args:
+            kind: Loader kind ("sentence_transformer", "cross_encoder", "whisper", "transformers")
+            name: Model name or path
+            **options: Extra loader arguments (part of the cache key), e.g. ``task`` for pipelines
+        """
+        if kind not in self._loaders:
+            raise ValueError(f"Unknown model kind: {kind}")
+        key = self._key(kind, name, options)
+
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                entry.hits += 1
+                entry.last_used = time.monotonic()
+                self._hits += 1
+                return entry.model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # One load per model; concurrent callers wait for it instead of loading again
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    entry.hits += 1
+                    self._hits += 1
+                    return entry.model
+
+            logger.info(f"Loading model {kind}:{name}...")
+            start = time.perf_counter()
+            try:
+                model = self._loaders[kind](name, **options)
+            except Exception:
+                with self._lock:
+                    self._load_errors += 1
+                raise
+            load_seconds = time.perf_counter() - start
+            nbytes = estimate_model_bytes(model)
+            logger.info(f"Loaded model {kind}:{name} in {load_seconds:.1f}s ({nbytes / 1e6:.0f} MB)")
+
+            with self._lock:
+                self._models[key] = _Resident(model, nbytes, load_seconds)
+                self._loads += 1
+                self._load_seconds += load_seconds
+                self._load_locks.pop(key, None)
+                self._evict_over_budget(keep=key)
+            return model
+
+    async def aget(self, kind: str, name: str, **options: Any) -> Any:
+        """Async ``get``: loads run in a worker thread so the event loop keeps serving."""
+        with self._lock:
+            entry = self._models.get(self._key(kind, name, options))
+        if entry is not None:
+            return self.get(kind, name, **options)
+        return await asyncio.to_thread(self.get, kind, name, **options)
+
+    async def preload(self, specs: List[str]) -> None:
+        """
+        Load models from ``kind:name`` specs (``transformers:task:name`` for pipelines).
+
+        Failures are logged and skipped so a bad spec does not block startup.
+        """
+        for spec in specs:
+            kind, _, rest = spec.partition(":")
+            options: Dict[str, Any] = {}
+            if kind == "transformers":
+                task, _, rest = rest.partition(":")
+                options["task"] = task
+            try:
+                await self.aget(kind, rest, **options)
+            except Exception as e:
+                logger.warning(f"Failed to preload model '{spec}': {e}")
+
+    def evict(self, kind: str, name: str, **options: Any) -> bool:
+        """Drop a resident model. Returns True if it was resident."""
+        with self._lock:
+            return self._models.pop(self._key(kind, name, options), None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return load/hit/eviction statistics and the resident models."""
+        with self._lock:
+            return {
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "resident_bytes": self._resident_bytes(),
+                "resident_models": [
+                    {
+                        "kind": key[0],
+                        "name": key[1],
+                        "bytes": entry.nbytes,
+                        "hits": entry.hits,
+                        "load_seconds": round(entry.load_seconds, 3),
+                    }
+                    for key, entry in self._models.items()
+                ],
+                "loads": self._loads,
+                "hits": self._hits,
+                "evictions": self._evictions,
+                "load_errors": self._load_errors,
+                "total_load_seconds": round(self._load_seconds, 3),
+            }
+
+
+# Global manager instance
+_manager: Optional[ModelResidencyManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_model_manager() -> ModelResidencyManager:
+    """Get the global model residency manager."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ModelResidencyManager(memory_budget_bytes=settings.model_memory_budget_mb * 1024 * 1024)
+    return _manager
@@ -173,6 +173,7 @@ class NodeResult(BaseModel):
         default=None,
         description="Token usage (input, output, total)",
     )
+    memoized: bool = Field(default=False, description="Output reused from an identical earlier invocation")
 
 
 class ExecutionStep(BaseModel):
@@ -269,6 +270,14 @@ class ExecutionResponse(BaseModel):
         default=None,
         description="Node execution results"
     )
+    cached: bool = Field(
+        default=False,
+        description="Results reused from a similar earlier query (semantic cache) instead of executing",
+    )
+    cache_similarity: Optional[float] = Field(
+        default=None,
+        description="Similarity between this query and the cached one, for semantic cache hits",
+    )
 
 
 # ============================================
@@ -0,0 +1,190 @@
+"""
+Memoization of pure node results across executions.
+
+Node classes that set ``pure = True`` (file loading, chunking, embedding,
+data conversion) produce the same output for the same inputs and config.
+``NodeExecutor`` keys their results by a stable hash of node type, inputs,
+config (without ``_``-prefixed runtime keys such as ``_node_id`` or
+``_execution_id``) and any extra state the node declares via
+``memoization_key_extra`` (e.g. the stat of an uploaded file), and serves
+repeat runs from this cache.
+
+Results are stored pickled, so callers always get a private copy. Recently
+used results are kept in memory up to a byte budget; older ones spill to
+files under ``data_dir/node_memo``, which is bounded as well.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from backend.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def node_memo_key(node_type: str, inputs: Dict[str, Any], config: Dict[str, Any], extra: Any = None) -> str:
+    """Return the memoization key for a node invocation."""
+    payload = {
+        "type": node_type,
+        "inputs": inputs,
+        "config": {key: value for key, value in config.items() if not str(key).startswith("_")},
+        "extra": extra,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class NodeResultCache:
+    """
+    Two-tier (memory LRU + disk spill) cache of node outputs.
+
+    Safe to share across threads; all tiers are guarded by one lock.
+    """
+
+    def __init__(self, cache_dir: Path, max_memory_bytes: int, max_disk_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._load_disk_index()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def _load_disk_index(self) -> None:
+        """Index spilled entries left by previous processes (oldest first)."""
+        if not self.cache_dir.exists():
+            return
+        entries = []
+        for path in self.cache_dir.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _drop_from_disk(self, key: str) -> None:
+        size = self._disk.pop(key, None)
+        if size is None:
+            return
+        self._disk_bytes -= size
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _spill(self, key: str, data: bytes) -> None:
+        """Write an entry evicted from memory to disk, evicting the oldest spilled entries."""
+        if len(data) > self.max_disk_bytes:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path(key).with_suffix(".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not spill node result to disk: {e}")
+            return
+        self._disk_bytes -= self._disk.pop(key, 0)
+        self._disk[key] = len(data)
+        self._disk_bytes += len(data)
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            self._drop_from_disk(next(iter(self._disk)))
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            old_key, old_data = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old_data)
+            self._spill(old_key, old_data)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of a cached result, or None."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+            elif key in self._disk:
+                try:
+                    data = self._path(key).read_bytes()
+                except OSError:
+                    self._drop_from_disk(key)
+                else:
+                    self._drop_from_disk(key)
+                    self._remember(key, data)
+            if data is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return pickle.loads(data)
+
+    def put(self, key: str, value: Any) -> bool:
+        """Store a result. Returns False if it cannot be pickled."""
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"Node result not memoizable: {e}")
+            return False
+        with self._lock:
+            self._remember(key, data)
+        return True
+
+    def clear(self) -> None:
+        """Drop all cached results (memory and disk)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for key in list(self._disk):
+                self._drop_from_disk(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_items": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
+
+
+# Global node result cache instance
+_node_result_cache: Optional[NodeResultCache] = None
+_node_result_cache_lock = threading.Lock()
+
+
+def get_node_result_cache() -> NodeResultCache:
+    """Get the global node result cache."""
+    global _node_result_cache
+    if _node_result_cache is None:
+        with _node_result_cache_lock:
+            if _node_result_cache is None:
+                _node_result_cache = NodeResultCache(
+                    cache_dir=settings.data_dir / "node_memo",
+                    max_memory_bytes=settings.node_memo_memory_mb * 1024 * 1024,
+                    max_disk_bytes=settings.node_memo_disk_mb * 1024 * 1024,
+                )
+    return _node_result_cache
@@ -0,0 +1,145 @@
+"""
+Provider rate limiting for batched API calls.
+
+Embedding providers enforce per-key quotas on requests per minute (RPM) and
+tokens per minute (TPM). ``ProviderRateLimiter`` tracks both over a sliding
+60 second window so that concurrent batches are admitted as fast as the quota
+allows, and can be paused for everyone when the provider answers with a rate
+limit error.
+
+Limiters are shared per (scope, API key) so that concurrent executions that
+use the same key draw from one budget.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_WINDOW_SECONDS = 60.0
+
+
+class ProviderRateLimiter:
+    """
+    Sliding-window RPM/TPM limiter.
+
+    A limit of 0 (or None) disables that dimension. A single request larger
+    than the whole TPM budget is still admitted once the window is empty, so
+    oversized batches slow down instead of deadlocking.
+
+    All bookkeeping happens between awaits on the event loop thread, so no
+    lock is needed for coroutine callers.
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.rpm = rpm or 0
+        self.tpm = tpm or 0
+        self._requests: Deque[Tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+        self._paused_until = 0.0
+        self._waits = 0
+        self._pauses = 0
+
+    def _purge(self, now: float) -> None:
+        cutoff = now - _WINDOW_SECONDS
+        while self._requests and self._requests[0][0] <= cutoff:
+            _, tokens = self._requests.popleft()
+            self._tokens_in_window -= tokens
+
+    def _delay_for(self, tokens: int, now: float) -> float:
+        """Seconds to wait before a request of ``tokens`` fits (0 if it fits now)."""
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        self._purge(now)
+        if not self._requests:
+            return 0.0
+
+        delays = [0.0]
+        if self.rpm and len(self._requests) + 1 > self.rpm:
+            # Wait until enough of the oldest requests leave the window
+            idx = len(self._requests) - self.rpm
+            delays.append(self._requests[idx][0] + _WINDOW_SECONDS - now)
+        if self.tpm and self._tokens_in_window + tokens > self.tpm:
+            excess = self._tokens_in_window + tokens - self.tpm
+            released = 0
+            for timestamp, used in self._requests:
+                released += used
+                if released >= excess:
+                    delays.append(timestamp + _WINDOW_SECONDS - now)
+                    break
+            else:
+                delays.append(self._requests[-1][0] + _WINDOW_SECONDS - now)
+        return max(delays)
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until a request of ``tokens`` tokens fits the budget, then record it."""
+        while True:
+            now = time.monotonic()
+            delay = self._delay_for(tokens, now)
+            if delay <= 0:
+                self._requests.append((now, tokens))
+                self._tokens_in_window += tokens
+                return
+            self._waits += 1
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all callers for ``seconds`` (e.g. after a 429 response)."""
+        until = time.monotonic() + max(seconds, 0.0)
+        if until > self._paused_until:
+            self._paused_until = until
+            self._pauses += 1
+            logger.info(f"Rate limiter paused for {seconds:.1f}s")
+
+    def update_limits(self, rpm: Optional[int] = None, tpm: Optional[int] = None) -> None:
+        """Change the RPM/TPM budget in place."""
+        self.rpm = rpm or 0
+        self.tpm = tpm or 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return limiter statistics for the current window."""
+        self._purge(time.monotonic())
+        return {
+            "rpm_limit": self.rpm,
+            "tpm_limit": self.tpm,
+            "requests_in_window": len(self._requests),
+            "tokens_in_window": self._tokens_in_window,
+            "waits": self._waits,
+            "pauses": self._pauses,
+        }
+
+
+# Global limiter registry
+_limiters: Dict[Tuple[str, str], ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    scope: str,
+    api_key: Optional[str] = None,
+    rpm: Optional[int] = None,
+    tpm: Optional[int] = None,
+) -> ProviderRateLimiter:
+    """
+    Get the shared limiter for a scope (e.g. "embed:openai") and API key.
+
+    The limits of an existing limiter are updated to the values passed in,
+    so changing a node's configuration takes effect on the next call.
+    """
+    key_hash = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+    key = (scope, key_hash)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = ProviderRateLimiter(rpm=rpm, tpm=tpm)
+            _limiters[key] = limiter
+        else:
+            limiter.update_limits(rpm=rpm, tpm=tpm)
+        return limiter
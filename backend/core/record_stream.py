@@ -0,0 +1,157 @@
+"""
+Streaming edges between workflow nodes.
+
+Normally a node returns a fully materialized output dict. A node that
+declares ``emits_streams`` may instead return a ``RecordStream`` (an async
+iterator of records such as document pages, chunks or embedding batches)
+when the engine sets ``_stream_output`` in its config. The engine only does
+so when ``enable_streaming_edges`` is on and the node's single downstream
+node declares ``accepts_streams``, because a stream can be consumed once.
+
+A ``RecordStream`` runs its source in a background task that stays at most
+``stream_edge_buffer_size`` records ahead of the consumer, so consecutive
+stages overlap (e.g. embedding starts while extraction is still running)
+while memory stays bounded regardless of corpus size.
+
+The producer node completes as soon as it returns the stream. Its source
+records the work it does (records, cost, ...) in ``summary``; the engine
+folds that summary into the producer's result once the consumer is done.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from backend.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_RECORD = 0
+_ERROR = 1
+_END = 2
+
+
+class RecordStream:
+    """Single-consumer async stream of records with a bounded read-ahead buffer."""
+
+    def __init__(
+        self,
+        source: AsyncIterator[Any],
+        name: str,
+        summary: Optional[Dict[str, Any]] = None,
+        buffer_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            source: Async iterator producing the records
+            name: Input name downstream nodes read the stream from (e.g. "chunk_stream")
+            summary: Dict the source updates with stats (e.g. "cost"); reported with results
+            buffer_size: Records the source may run ahead (default: settings.stream_edge_buffer_size)
+        """
+        self.name = name
+        self.summary: Dict[str, Any] = summary if summary is not None else {}
+        self.records = 0
+        self.error: Optional[BaseException] = None
+        self._source = source
+        self._buffer_size = buffer_size or settings.stream_edge_buffer_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._consumed = False
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    async def _pump(self) -> None:
+        """Move records from the source into the bounded queue."""
+        try:
+            async for record in self._source:
+                await self._queue.put((_RECORD, record))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.error = e
+            await self._queue.put((_ERROR, e))
+        else:
+            await self._queue.put((_END, None))
+        finally:
+            self._finished_at = time.perf_counter()
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        if self._consumed:
+            raise RuntimeError(f"Stream '{self.name}' can only be consumed once")
+        self._consumed = True
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        self._queue = asyncio.Queue(maxsize=self._buffer_size)
+        self._started_at = time.perf_counter()
+        self._task = asyncio.create_task(self._pump())
+        try:
+            while True:
+                kind, value = await self._queue.get()
+                if kind == _END:
+                    return
+                if kind == _ERROR:
+                    raise value
+                self.records += 1
+                yield value
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop the source (if still running) and release it."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        aclose = getattr(self._source, "aclose", None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception as e:
+                logger.debug(f"Error closing stream '{self.name}': {e}")
+
+    def describe(self) -> Dict[str, Any]:
+        """Return a JSON-serializable description of the stream and its stats."""
+        description: Dict[str, Any] = {"stream": self.name, "records": self.records, **self.summary}
+        if self._started_at is not None and self._finished_at is not None:
+            description["duration_ms"] = int((self._finished_at - self._started_at) * 1000)
+        if self.error is not None:
+            description["error"] = str(self.error)
+        return description
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "RecordStream":
+        # A stream is a shared handle, not data; copies refer to the same stream
+        return self
+
+    def __repr__(self) -> str:
+        return f"<RecordStream {self.name}>"
+
+
+def has_streams(output: Any) -> bool:
+    """Return True if an output dict holds any RecordStream values."""
+    return isinstance(output, dict) and any(isinstance(value, RecordStream) for value in output.values())
+
+
+def describe_streams(output: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of an output dict with streams replaced by their descriptions."""
+    return {
+        key: value.describe() if isinstance(value, RecordStream) else value
+        for key, value in output.items()
+    }
+
+
+async def collect(stream: AsyncIterator[Any]) -> List[Any]:
+    """Materialize a stream into a list."""
+    return [record async for record in stream]
+
+
+async def rebatch(stream: AsyncIterator[Any], size: int) -> AsyncIterator[List[Any]]:
+    """Group the records of a stream into lists of at most ``size``."""
+    batch: List[Any] = []
+    async for record in stream:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
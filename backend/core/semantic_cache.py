@@ -0,0 +1,380 @@
+"""
+Semantic response cache for deployed workflow queries.
+
+A deployed support bot receives many paraphrases of the same question.
+``/workflows/{workflow_id}/query`` embeds the incoming ``query`` and looks
+up earlier answered queries of the same deployment in a small FAISS
+inner-product index of normalized embeddings (cosine similarity). When the
+closest one is at least ``semantic_cache_threshold`` similar, its results
+are returned and retrieval and generation are skipped.
+
+Entries are partitioned by workflow and by the other query inputs (a
+different ``file_id`` never shares answers), except per-request
+identifiers such as ``session_id`` (``semantic_cache_unscoped_inputs``),
+which would give every session a partition of its own. Workflows with
+conversation memory (``use_memory``) bypass the cache: their answers depend
+on the session's history, and every turn must be recorded in it, as with
+the exact-match LLM response cache. Entries are tagged
+with a fingerprint of the deployment: the deployed workflow definition,
+its deployment time, and the versions of the knowledge bases and
+persisted FAISS indexes it reads. A redeploy, rollback or knowledge base
+update changes the fingerprint and drops the partition's entries.
+
+``semantic_cache_max_entries`` bounds the entries of all partitions
+together, evicting the least recently used; a partition left without
+entries is dropped along with its index.
+
+Hit/miss counts and the distribution of best-match similarities are kept
+per workflow, so the threshold can be tuned from real traffic.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from backend.config import settings
+from backend.core.client_pool import get_openai_client
+from backend.core.embedding_cache import get_embedding_cache
+from backend.core.secret_resolver import resolve_api_key
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Similarity histogram resolution (buckets of 0.05 between 0 and 1)
+_SIMILARITY_BUCKETS = 20
+# Nearest neighbours examined per lookup (skips expired entries)
+_SEARCH_K = 4
+
+
+def _node_settings(node: Any) -> Dict[str, Any]:
+    data = node.data or {}
+    return {**data, **(data.get("config") or {})}
+
+
+def uses_memory(workflow: Any, query_input: Dict[str, Any]) -> bool:
+    """Return True if a node keeps conversation memory (query inputs fill unset node settings)."""
+    for node in workflow.nodes:
+        node_settings = _node_settings(node)
+        if node_settings.get("use_memory", query_input.get("use_memory")):
+            return True
+    return False
+
+
+def _file_version(path: Optional[str]) -> Optional[int]:
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def deployment_fingerprint(workflow: Any) -> str:
+    """
+    Return a fingerprint of everything a deployed workflow's answers depend on.
+
+    Covers the node and edge definitions, the deployment time, the selected
+    version of every knowledge base and the modification time of every
+    persisted FAISS index the workflow reads.
+    """
+    from backend.core.knowledge_base import load_knowledge_base
+
+    sources = {}
+    for node in workflow.nodes:
+        node_settings = _node_settings(node)
+        kb_id = node_settings.get("knowledge_base_id")
+        if kb_id:
+            kb = load_knowledge_base(kb_id)
+            if kb is not None:
+                version_number = node_settings.get("knowledge_base_version") or kb.current_version
+                version = next((v for v in kb.versions if v.version_number == version_number), None)
+                sources[f"kb:{kb_id}"] = [
+                    version_number,
+                    version.status.value if version else None,
+                    _file_version(version.vector_store_path if version else None),
+                ]
+        faiss_path = node_settings.get("faiss_file_path")
+        if faiss_path:
+            sources[f"faiss:{faiss_path}"] = _file_version(faiss_path)
+
+    payload = {
+        "workflow_id": workflow.id,
+        "deployed_at": workflow.deployed_at.isoformat() if workflow.deployed_at else None,
+        "nodes": [node.model_dump(mode="json") for node in workflow.nodes],
+        "edges": [edge.model_dump(mode="json") for edge in workflow.edges],
+        "sources": sources,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SemanticQuery:
+    """An embedded deployed-workflow query, ready for lookup and store."""
+
+    workflow_id: str
+    scope: str
+    fingerprint: str
+    query: str
+    embedding: np.ndarray
+
+
+async def _embed_query(query: str, user_id: Optional[str]) -> Optional[List[float]]:
+    model = settings.semantic_cache_embedding_model
+    cache = get_embedding_cache() if settings.enable_embedding_cache else None
+    if cache:
+        embedding = cache.get_many("openai", model, None, [query])[0]
+        if embedding is not None:
+            return embedding
+    api_key = resolve_api_key({}, "openai_api_key", user_id=user_id) or settings.openai_api_key
+    if not api_key:
+        return None
+    response = await get_openai_client(api_key).embeddings.create(model=model, input=[query])
+    embedding = response.data[0].embedding
+    if cache:
+        cache.put_many("openai", model, None, [query], [embedding])
+    return embedding
+
+
+async def semantic_query_for(
+    workflow: Any,
+    query_input: Dict[str, Any],
+    user_id: Optional[str] = None,
+) -> Optional[SemanticQuery]:
+    """
+    Embed a deployed workflow query for the semantic cache.
+
+    Returns None when the cache does not apply: it is disabled, the input
+    has no text ``query``, the workflow keeps conversation memory, or the
+    query cannot be embedded.
+    """
+    if not settings.enable_semantic_cache:
+        return None
+    query = query_input.get("query")
+    if not isinstance(query, str) or not query.strip():
+        return None
+    if uses_memory(workflow, query_input):
+        return None
+    unscoped = set(settings.semantic_cache_unscoped_inputs)
+    other_inputs = {
+        key: value for key, value in query_input.items() if key != "query" and key not in unscoped
+    }
+    scope = hashlib.sha256(
+        json.dumps(other_inputs, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    ).hexdigest()[:16]
+    try:
+        embedding = await _embed_query(query.strip(), user_id)
+    except Exception as e:
+        logger.warning(f"Semantic cache skipped, could not embed query: {e}")
+        return None
+    if embedding is None:
+        return None
+    vector = np.asarray([embedding], dtype=np.float32)
+    faiss.normalize_L2(vector)
+    return SemanticQuery(
+        workflow_id=workflow.id,
+        scope=scope,
+        fingerprint=deployment_fingerprint(workflow),
+        query=query,
+        embedding=vector,
+    )
+
+
+@dataclass
+class _Partition:
+    """Cached answers of one deployment for one set of non-query inputs."""
+
+    fingerprint: str
+    index: Any
+    # entry id -> (expires_at, query, encoded results), least recently used first
+    entries: "OrderedDict[int, Tuple[float, str, str]]" = field(default_factory=OrderedDict)
+    next_id: int = 0
+
+    def remove(self, entry_id: int) -> None:
+        self.entries.pop(entry_id, None)
+        self.index.remove_ids(np.asarray([entry_id], dtype=np.int64))
+
+
+@dataclass
+class _WorkflowStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    similarity_histogram: List[int] = field(default_factory=lambda: [0] * _SIMILARITY_BUCKETS)
+
+
+class SemanticResponseCache:
+    """
+    Per-deployment FAISS indexes of answered queries.
+
+    Safe to share across threads; all partitions are guarded by one lock.
+    ``max_entries`` applies to all partitions together.
+    """
+
+    def __init__(self, threshold: float, max_entries: int, ttl_seconds: float):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._partitions: Dict[Tuple[str, str], _Partition] = {}
+        # (partition key, entry id) of every entry, least recently used first
+        self._lru: "OrderedDict[Tuple[Tuple[str, str], int], None]" = OrderedDict()
+        self._stats: Dict[str, _WorkflowStats] = {}
+        self._lock = threading.Lock()
+
+    def _workflow_stats(self, workflow_id: str) -> _WorkflowStats:
+        stats = self._stats.get(workflow_id)
+        if stats is None:
+            stats = self._stats[workflow_id] = _WorkflowStats()
+        return stats
+
+    def _drop_partition(self, key: Tuple[str, str]) -> int:
+        """Drop a partition and its entries. Returns the number of entries dropped."""
+        partition = self._partitions.pop(key)
+        for entry_id in partition.entries:
+            self._lru.pop((key, entry_id), None)
+        return len(partition.entries)
+
+    def _remove_entry(self, key: Tuple[str, str], entry_id: int) -> None:
+        """Remove one entry, and its partition once that is empty."""
+        partition = self._partitions[key]
+        partition.remove(entry_id)
+        self._lru.pop((key, entry_id), None)
+        if not partition.entries:
+            del self._partitions[key]
+
+    def _partition(self, query: SemanticQuery, create: bool) -> Optional[_Partition]:
+        """Return the query's partition, dropping it if the deployment changed since."""
+        key = (query.workflow_id, query.scope)
+        partition = self._partitions.get(key)
+        dimension = query.embedding.shape[1]
+        if partition is not None and (partition.fingerprint != query.fingerprint or partition.index.d != dimension):
+            self._drop_partition(key)
+            self._workflow_stats(query.workflow_id).invalidations += 1
+            partition = None
+        if partition is None and create:
+            partition = _Partition(
+                fingerprint=query.fingerprint,
+                index=faiss.IndexIDMap2(faiss.IndexFlatIP(dimension)),
+            )
+            self._partitions[key] = partition
+        return partition
+
+    def lookup(self, query: SemanticQuery) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+        """
+        Find the cached results of the most similar earlier query.
+
+        Returns:
+            (results, similarity): results are None on a miss; similarity is
+            that of the closest live entry (None if there is none)
+        """
+        key = (query.workflow_id, query.scope)
+        with self._lock:
+            stats = self._workflow_stats(query.workflow_id)
+            partition = self._partition(query, create=False)
+            best: Optional[Tuple[int, float]] = None
+            if partition is not None and partition.index.ntotal:
+                now = time.monotonic()
+                k = min(_SEARCH_K, partition.index.ntotal)
+                scores, ids = partition.index.search(query.embedding, k)
+                for score, entry_id in zip(scores[0], ids[0]):
+                    entry = partition.entries.get(int(entry_id))
+                    if entry is None:
+                        continue
+                    if entry[0] <= now:
+                        self._remove_entry(key, int(entry_id))
+                        continue
+                    best = (int(entry_id), float(score))
+                    break
+            if best is None:
+                stats.misses += 1
+                return None, None
+
+            entry_id, similarity = best
+            bucket = min(_SIMILARITY_BUCKETS - 1, max(0, int(similarity * _SIMILARITY_BUCKETS)))
+            stats.similarity_histogram[bucket] += 1
+            if similarity < self.threshold:
+                stats.misses += 1
+                return None, similarity
+            stats.hits += 1
+            partition.entries.move_to_end(entry_id)
+            self._lru.move_to_end((key, entry_id))
+            encoded = partition.entries[entry_id][2]
+        return json.loads(encoded), similarity
+
+    def store(self, query: SemanticQuery, results: Dict[str, Any]) -> bool:
+        """Cache the results of a query. Returns False if they are not JSON-serializable."""
+        try:
+            encoded = json.dumps(results, separators=(",", ":"))
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Query results not cacheable: {e}")
+            return False
+        key = (query.workflow_id, query.scope)
+        with self._lock:
+            partition = self._partition(query, create=True)
+            entry_id = partition.next_id
+            partition.next_id += 1
+            partition.index.add_with_ids(query.embedding, np.asarray([entry_id], dtype=np.int64))
+            partition.entries[entry_id] = (time.monotonic() + self.ttl_seconds, query.query, encoded)
+            self._lru[(key, entry_id)] = None
+            while len(self._lru) > self.max_entries:
+                self._remove_entry(*next(iter(self._lru)))
+        return True
+
+    def invalidate(self, workflow_id: str) -> int:
+        """Drop every cached answer of a workflow. Returns the number of entries dropped."""
+        with self._lock:
+            keys = [key for key in self._partitions if key[0] == workflow_id]
+            dropped = sum(self._drop_partition(key) for key in keys)
+            if keys:
+                self._workflow_stats(workflow_id).invalidations += 1
+        return dropped
+
+    def stats(self, workflow_id: str) -> Dict[str, Any]:
+        """Return hit/miss counts, entries and the best-match similarity histogram of a workflow."""
+        with self._lock:
+            stats = self._workflow_stats(workflow_id)
+            total = stats.hits + stats.misses
+            entries = sum(
+                len(partition.entries) for key, partition in self._partitions.items() if key[0] == workflow_id
+            )
+            width = 1 / _SIMILARITY_BUCKETS
+            return {
+                "enabled": settings.enable_semantic_cache,
+                "threshold": self.threshold,
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "hit_rate": stats.hits / total if total else 0.0,
+                "entries": entries,
+                "invalidations": stats.invalidations,
+                "similarity_histogram": [
+                    {"min": round(i * width, 2), "max": round((i + 1) * width, 2), "count": count}
+                    for i, count in enumerate(stats.similarity_histogram)
+                ],
+            }
+
+
+# Global semantic response cache instance
+_semantic_cache: Optional[SemanticResponseCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticResponseCache:
+    """Get the global semantic response cache."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                _semantic_cache = SemanticResponseCache(
+                    threshold=settings.semantic_cache_threshold,
+                    max_entries=settings.semantic_cache_max_entries,
+                    ttl_seconds=settings.semantic_cache_ttl_seconds,
+                )
+    return _semantic_cache
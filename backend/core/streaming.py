@@ -7,10 +7,12 @@ to send real-time updates during execution.
 
 import asyncio
 import json
+from collections import deque
 from datetime import datetime
 from enum import Enum
-from typing import Any, AsyncIterator, Dict, Optional
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
 
+from backend.config import settings
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -62,6 +64,7 @@ class StreamEvent:
         self.task = task
         self.data = data
         self.timestamp = datetime.now().isoformat()
+        self.id: Optional[int] = None  # Position in the execution's event log, set on publish
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to dictionary for JSON serialization."""
@@ -91,50 +94,173 @@ class StreamEvent:
         
         return result
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreamEvent":
+        """Rebuild an event from ``to_dict`` output (e.g. relayed from a worker process)."""
+        event = cls(
+            event_type=StreamEventType(data["event_type"]),
+            node_id=data.get("node_id"),
+            data=data.get("data") or {},
+            execution_id=data.get("execution_id"),
+            agent=data.get("agent"),
+            task=data.get("task"),
+        )
+        event.timestamp = data.get("timestamp") or event.timestamp
+        return event
+    
     def to_sse(self) -> str:
         """Convert event to Server-Sent Events format."""
         data = json.dumps(self.to_dict())
+        if self.id is not None:
+            # Lets clients resume after this event via Last-Event-ID
+            return f"id: {self.id}\ndata: {data}\n\n"
         return f"data: {data}\n\n"
 
 
+class _ExecutionStream:
+    """
+    Events of one execution, shared by all of its subscribers.
+    
+    Events are numbered in publish order and kept in a bounded ring buffer;
+    each subscriber reads from its own position, so one slow client never
+    holds events back for others and memory stays bounded. Progress events
+    are kept apart, one per node: a newer progress event replaces the
+    previous one, so a lagging subscriber only sees each node's latest
+    progress and progress never pushes other events out of the buffer.
+    """
+    
+    def __init__(self, execution_id: str, buffer_size: int):
+        self.execution_id = execution_id
+        self.events: Deque[Tuple[int, StreamEvent]] = deque(maxlen=buffer_size)
+        self.progress: Dict[str, Tuple[int, StreamEvent]] = {}
+        self.last_event_id = 0
+        self.subscribers = 0
+        self.closed = False
+        self.created_at = datetime.now()
+        self.updated_at = self.created_at
+        self.wakeup = asyncio.Event()
+    
+    def append(self, event: StreamEvent) -> None:
+        self.last_event_id += 1
+        event.id = self.last_event_id
+        item = (self.last_event_id, event)
+        if event.event_type == StreamEventType.NODE_PROGRESS and event.node_id:
+            self.progress[event.node_id] = item
+        else:
+            self.events.append(item)
+        self.updated_at = datetime.now()
+        self._notify()
+    
+    def close(self) -> None:
+        self.closed = True
+        self._notify()
+    
+    def _notify(self) -> None:
+        # Wake every waiting subscriber; later waits use a fresh event
+        wakeup, self.wakeup = self.wakeup, asyncio.Event()
+        wakeup.set()
+    
+    def read_after(self, event_id: int) -> List[Tuple[int, StreamEvent]]:
+        """Return the buffered events published after ``event_id``, in order."""
+        pending = []
+        for item in reversed(self.events):
+            if item[0] <= event_id:
+                break
+            pending.append(item)
+        pending.reverse()
+        progress = [item for item in self.progress.values() if item[0] > event_id]
+        if progress:
+            pending = sorted(pending + progress, key=lambda item: item[0])
+        return pending
+
+
 class StreamManager:
     """
     Manages streaming events for executions.
     
     This is a singleton that tracks all active streams and allows
     nodes to publish events that will be sent to connected clients.
+    
+    Publishing never waits: events are appended to the execution's bounded
+    buffer and subscribers are woken up. Any number of subscribers can read
+    the same execution's events, and each can resume after the last event
+    ID it received. Once an execution ends its stream is closed but kept
+    for ``stream_retention_seconds``, so late or reconnecting clients can
+    still replay it.
     """
     
     _instance: Optional["StreamManager"] = None
-    _streams: Dict[str, asyncio.Queue] = {}
-    _stream_timestamps: Dict[str, datetime] = {}  # Track creation time for cleanup
-    _lock = asyncio.Lock()
+    _streams: Dict[str, _ExecutionStream] = {}
+    _channel: Optional[Any] = None  # Forwards events to another process (execution workers)
     _cleanup_interval = 300  # 5 minutes in seconds
+    _subscribe_timeout = 30.0  # Re-check that an idle stream still exists this often
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
     
+    def set_channel(self, channel: Optional[Any]) -> None:
+        """
+        Also forward all events and stream closes to ``channel``.
+        
+        Used by execution workers to send their events to the API process
+        (see ``backend.core.event_channel``).
+        """
+        StreamManager._channel = channel
+    
     async def create_stream(self, execution_id: str) -> None:
         """Create a new stream for an execution."""
-        async with self._lock:
-            if execution_id not in self._streams:
-                self._streams[execution_id] = asyncio.Queue()
-                self._stream_timestamps[execution_id] = datetime.now()
-                logger.info(f"Created stream for execution: {execution_id}")
-                
-                # Schedule automatic cleanup for old streams
-                asyncio.create_task(self._schedule_cleanup())
+        self._get_or_create(execution_id)
+    
+    def _get_or_create(self, execution_id: str) -> _ExecutionStream:
+        stream = self._streams.get(execution_id)
+        if stream is None:
+            stream = _ExecutionStream(execution_id, settings.stream_buffer_size)
+            self._streams[execution_id] = stream
+            logger.info(f"Created stream for execution: {execution_id}")
+            
+            # Schedule automatic cleanup for abandoned streams
+            asyncio.create_task(self._schedule_cleanup())
+        return stream
+    
+    def has_stream(self, execution_id: str) -> bool:
+        """Return True if events of an execution can be subscribed to."""
+        return execution_id in self._streams
+    
+    async def close_stream(self, execution_id: str) -> None:
+        """
+        Mark an execution's stream as complete.
+        
+        Subscribers receive the remaining events and then end. The stream
+        stays available for replay for ``stream_retention_seconds``.
+        """
+        if self._channel is not None:
+            self._channel.close(execution_id)
+        stream = self._streams.get(execution_id)
+        if stream is None or stream.closed:
+            return
+        stream.close()
+        asyncio.get_running_loop().call_later(
+            settings.stream_retention_seconds, self._expire, execution_id, stream
+        )
+        logger.info(f"Closed stream for execution: {execution_id}")
+    
+    def _expire(self, execution_id: str, stream: _ExecutionStream) -> None:
+        if self._streams.get(execution_id) is stream:
+            del self._streams[execution_id]
+            logger.info(f"Expired stream for execution: {execution_id}")
     
     async def remove_stream(self, execution_id: str) -> None:
-        """Remove a stream for an execution."""
-        async with self._lock:
-            if execution_id in self._streams:
-                del self._streams[execution_id]
-                if execution_id in self._stream_timestamps:
-                    del self._stream_timestamps[execution_id]
-                logger.info(f"Removed stream for execution: {execution_id}")
+        """
+        Remove a stream for an execution immediately.
+        
+        Current subscribers still receive the events buffered so far.
+        """
+        stream = self._streams.pop(execution_id, None)
+        if stream is not None:
+            stream.close()
+            logger.info(f"Removed stream for execution: {execution_id}")
     
     async def publish(self, event: StreamEvent) -> None:
         """Publish an event to the appropriate stream."""
@@ -142,48 +268,48 @@ class StreamManager:
             logger.warning(f"Event {event.event_type} has no execution_id, skipping")
             return
         
-        async with self._lock:
-            if event.execution_id in self._streams:
-                await self._streams[event.execution_id].put(event)
-            else:
-                logger.debug(f"No stream found for execution: {event.execution_id}")
-    
-    async def subscribe(self, execution_id: str) -> AsyncIterator[StreamEvent]:
-        """Subscribe to events for an execution."""
-        await self.create_stream(execution_id)
-
-        while True:
-            try:
-                # Check if stream still exists before trying to access it
-                async with self._lock:
-                    if execution_id not in self._streams:
-                        logger.info(f"Stream {execution_id} was removed, ending subscription")
-                        break
-                    queue = self._streams[execution_id]
-
-                # Wait for event with timeout to allow checking if stream still exists
-                # Use a longer timeout to avoid premature closure
-                event = await asyncio.wait_for(
-                    queue.get(),
-                    timeout=30.0  # 30 second timeout - execution might take time
-                )
-                yield event
-            except asyncio.TimeoutError:
-                # Check if stream still exists - if it does, continue waiting
-                async with self._lock:
-                    if execution_id not in self._streams:
+        if self._channel is not None:
+            self._channel.publish(event)
+        
+        stream = self._streams.get(event.execution_id)
+        if stream is not None:
+            stream.append(event)
+        else:
+            logger.debug(f"No stream found for execution: {event.execution_id}")
+    
+    async def subscribe(self, execution_id: str, last_event_id: int = 0) -> AsyncIterator[StreamEvent]:
+        """
+        Subscribe to events for an execution.
+        
+        Args:
+            execution_id: Execution to follow
+            last_event_id: Resume after this event ID (0 replays all buffered events)
+        """
+        stream = self._get_or_create(execution_id)
+        stream.subscribers += 1
+        try:
+            while True:
+                # Taken before reading so no event published meanwhile is missed
+                wakeup = stream.wakeup
+                pending = stream.read_after(last_event_id)
+                for event_id, event in pending:
+                    last_event_id = event_id
+                    yield event
+                if pending:
+                    continue
+                if stream.closed:
+                    logger.info(f"Stream {execution_id} was removed, ending subscription")
+                    break
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=self._subscribe_timeout)
+                except asyncio.TimeoutError:
+                    # Stop waiting on a stream that was cleaned up, otherwise keep waiting
+                    if self._streams.get(execution_id) is not stream:
                         logger.info(f"Stream {execution_id} was removed, ending subscription")
                         break
-                # Stream still exists, continue waiting for events
-                logger.debug(f"Stream {execution_id} timeout, but stream still exists, continuing...")
-                continue
-            except KeyError:
-                # Stream was removed between check and access - this is expected on completion
-                logger.info(f"Stream {execution_id} was removed during subscription, ending gracefully")
-                break
-            except Exception as e:
-                logger.error(f"Error in stream subscription: {e}", exc_info=True)
-                break
+                    logger.debug(f"Stream {execution_id} timeout, but stream still exists, continuing...")
+        finally:
+            stream.subscribers -= 1
     
     async def _schedule_cleanup(self) -> None:
         """Schedule automatic cleanup of old streams."""
@@ -194,22 +320,20 @@ class StreamManager:
             logger.warning(f"Error in scheduled stream cleanup: {e}")
     
     async def _cleanup_old_streams(self) -> None:
-        """Clean up streams that are older than the cleanup interval."""
+        """Clean up streams without subscribers that saw no events for the cleanup interval."""
         from datetime import timedelta
         cutoff_time = datetime.now() - timedelta(seconds=self._cleanup_interval)
-        streams_to_remove = []
+        streams_to_remove = [
+            execution_id
+            for execution_id, stream in self._streams.items()
+            if stream.updated_at < cutoff_time and stream.subscribers == 0
+        ]
         
-        async with self._lock:
-            for execution_id, created_at in self._stream_timestamps.items():
-                if created_at < cutoff_time:
-                    streams_to_remove.append(execution_id)
-            
-            for execution_id in streams_to_remove:
-                if execution_id in self._streams:
-                    del self._streams[execution_id]
-                if execution_id in self._stream_timestamps:
-                    del self._stream_timestamps[execution_id]
-                logger.info(f"Auto-cleaned up old stream: {execution_id}")
+        for execution_id in streams_to_remove:
+            stream = self._streams.pop(execution_id, None)
+            if stream is not None:
+                stream.close()
+            logger.info(f"Auto-cleaned up old stream: {execution_id}")
         
         if streams_to_remove:
             logger.info(f"Cleaned up {len(streams_to_remove)} old streams")
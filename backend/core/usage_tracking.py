@@ -2,6 +2,11 @@
 Usage Tracking for API Keys
 
 Tracks requests, costs, and rate limiting per API key.
+
+Usage records are written behind (see core/write_behind.py): a background
+thread appends queued records to the daily log files in batches, and
+``get_usage_stats`` counts records still in the buffer so rate and cost
+limits apply immediately.
 """
 
 from datetime import datetime, timedelta
@@ -10,6 +15,8 @@ from pathlib import Path
 import json
 from collections import defaultdict
 
+from backend.config import settings
+from backend.core.write_behind import get_write_behind_buffer
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -66,6 +73,33 @@ class UsageRecord:
         )
 
 
+def _usage_log_file(key_id: str, day) -> Path:
+    return USAGE_DIR / f"{key_id}_{day.isoformat()}.jsonl"
+
+
+def _append_usage_records(records: List[UsageRecord]) -> List[UsageRecord]:
+    """Append usage records to their daily log files, one write per file. Returns the records not written."""
+    by_file: Dict[Path, List[UsageRecord]] = defaultdict(list)
+    for record in records:
+        by_file[_usage_log_file(record.key_id, record.timestamp.date())].append(record)
+    
+    unwritten: List[UsageRecord] = []
+    for log_file, file_records in by_file.items():
+        try:
+            with open(log_file, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(record.to_dict()) + "\n" for record in file_records))
+        except Exception as e:
+            logger.error(f"Error recording usage to {log_file}: {e}")
+            unwritten.extend(file_records)
+    if len(unwritten) == len(records):
+        raise OSError(f"Could not append {len(records)} usage record(s)")
+    return unwritten
+
+
+def _usage_buffer():
+    return get_write_behind_buffer("api_usage", _append_usage_records)
+
+
 def record_usage(
     key_id: str,
     workflow_id: str,
@@ -85,13 +119,13 @@ def record_usage(
         status=status,
     )
     
-    # Append to daily log file
-    today = datetime.now().date()
-    log_file = USAGE_DIR / f"{key_id}_{today.isoformat()}.jsonl"
+    if settings.enable_write_behind:
+        _usage_buffer().submit(record)
+        return
     
+    # Append to daily log file
     try:
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record.to_dict()) + "\n")
+        _append_usage_records([record])
     except Exception as e:
         logger.error(f"Error recording usage for key {key_id}: {e}")
 
@@ -122,10 +156,26 @@ def get_usage_stats(
     start_date_only = start_date.date()
     end_date_only = end_date.date()
     
+    def count(record: UsageRecord) -> None:
+        nonlocal total_requests, total_cost, requests_today, cost_today, last_used_at
+        # Check if within time range
+        if start_date <= record.timestamp <= end_date:
+            total_requests += 1
+            total_cost += record.cost
+            
+            # Check if today
+            if record.timestamp.date() == today:
+                requests_today += 1
+                cost_today += record.cost
+            
+            # Track last used
+            if not last_used_at or record.timestamp > last_used_at:
+                last_used_at = record.timestamp
+    
     # Iterate through date range
     current_date = start_date_only
     while current_date <= end_date_only:
-        log_file = USAGE_DIR / f"{key_id}_{current_date.isoformat()}.jsonl"
+        log_file = _usage_log_file(key_id, current_date)
         
         if log_file.exists():
             try:
@@ -134,27 +184,19 @@ def get_usage_stats(
                         if not line.strip():
                             continue
                         record_data = json.loads(line)
-                        record = UsageRecord.from_dict(record_data)
-                        
-                        # Check if within time range
-                        if start_date <= record.timestamp <= end_date:
-                            total_requests += 1
-                            total_cost += record.cost
-                            
-                            # Check if today
-                            if record.timestamp.date() == today:
-                                requests_today += 1
-                                cost_today += record.cost
-                            
-                            # Track last used
-                            if not last_used_at or record.timestamp > last_used_at:
-                                last_used_at = record.timestamp
+                        count(UsageRecord.from_dict(record_data))
             except Exception as e:
                 logger.error(f"Error reading usage log {log_file}: {e}")
         
         # Move to next day
         current_date += timedelta(days=1)
     
+    # Records not yet appended to the logs
+    if settings.enable_write_behind:
+        for record in _usage_buffer().snapshot():
+            if record.key_id == key_id:
+                count(record)
+    
     return {
         "total_requests": total_requests,
         "total_cost": total_cost,
@@ -0,0 +1,242 @@
+"""
+Write-behind buffering of cost and usage records.
+
+Cost records (one database INSERT and commit per costed node) and API key
+usage records (one file append per request) used to be written inline, on
+the event loop of the execution that produced them. They are now handed
+to a ``WriteBehindBuffer``, which keeps them in memory and writes them in
+batches from a background thread:
+
+- a batch is written once ``write_behind_batch_size`` records are pending,
+  or ``write_behind_flush_interval_seconds`` after the first one arrived;
+- a failed batch stays at the head of the buffer and is retried with
+  exponential backoff, and dropped after ``write_behind_max_retries``
+  failed attempts;
+- the buffer holds at most ``write_behind_max_pending`` records; when it
+  is full (the sink has been failing for a while) new records are dropped
+  and counted instead of growing memory without bound;
+- ``shutdown_write_behind`` (FastAPI shutdown, worker exit, and atexit)
+  flushes what is left.
+
+Records are visible to readers of the database or log files only after
+their batch is written. ``snapshot`` exposes pending records to readers
+that must see them sooner (API key rate and cost limits).
+"""
+
+import atexit
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from backend.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_MAX_BACKOFF_SECONDS = 30.0
+
+
+class WriteBehindBuffer:
+    """
+    Bounded in-memory buffer of records, written in batches by a background thread.
+
+    ``write_batch`` writes a list of records. It raises when nothing was
+    written, and may return the records it could not write after a partial
+    write; only those are retried.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        write_batch: Callable[[List[Any]], Optional[List[Any]]],
+        batch_size: int,
+        flush_interval: float,
+        max_pending: int,
+        max_retries: int,
+    ):
+        self.name = name
+        self._write_batch = write_batch
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max(self.batch_size, max_pending)
+        self.max_retries = max_retries
+
+        self._pending: Deque[Any] = deque()
+        self._in_flight: List[Any] = []
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()  # One batch write at a time
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._failures = 0
+        self._retry_at = 0.0
+
+        self.written = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+
+    def submit(self, record: Any) -> bool:
+        """Queue a record for writing. Returns False when the buffer is full and the record was dropped."""
+        with self._condition:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                if self.dropped == 1 or self.dropped % 1000 == 0:
+                    logger.error(f"{self.name} write-behind buffer full; {self.dropped} record(s) dropped")
+                return False
+            self._pending.append(record)
+            if self._thread is None and not self._stopped:
+                self._start()
+            # Wakes the writer for the first record of a batch and for a full one
+            if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+                self._condition.notify()
+        return True
+
+    def snapshot(self) -> List[Any]:
+        """Records not yet written, including a batch being written right now."""
+        with self._condition:
+            return list(self._in_flight) + list(self._pending)
+
+    def flush(self) -> int:
+        """
+        Write every pending record now, in batches. Returns the number written.
+
+        Stops at the first failed batch; it stays queued for the background retry.
+        """
+        written_before = self.written
+        while self._flush_batch() > 0:
+            pass
+        return self.written - written_before
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            pending = len(self._pending) + len(self._in_flight)
+        return {
+            "pending": pending,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_flushes": self.failed_flushes,
+        }
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the background thread and write what is left."""
+        with self._condition:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+            self._condition.notify()
+        if thread is not None:
+            thread.join(timeout)
+        self._retry_at = 0.0
+        self.flush()
+        remaining = len(self.snapshot())
+        if remaining:
+            logger.error(f"{self.name} write-behind buffer stopped with {remaining} unwritten record(s)")
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name=f"write-behind-{self.name}", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                if now < self._retry_at:
+                    self._condition.wait(self._retry_at - now)
+                    continue
+                while not self._stopped and not self._pending:
+                    self._condition.wait()
+                # Write once a batch is full or the interval has passed since the first record
+                deadline = time.monotonic() + self.flush_interval
+                while not self._stopped and len(self._pending) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._stopped:
+                    return
+            self.flush()
+
+    def _flush_batch(self) -> int:
+        """Write one batch. Returns the records it took off the buffer, 0 when empty, or -1 when retried."""
+        with self._flush_lock:
+            with self._condition:
+                if not self._pending:
+                    return 0
+                count = min(self.batch_size, len(self._pending))
+                self._in_flight = [self._pending.popleft() for _ in range(count)]
+                batch = self._in_flight
+            try:
+                unwritten = self._write_batch(batch) or []
+                error: Optional[Exception] = None
+            except Exception as e:
+                unwritten, error = batch, e
+            self.written += len(batch) - len(unwritten)
+            if not unwritten:
+                with self._condition:
+                    self._in_flight = []
+                self._failures = 0
+                self._retry_at = 0.0
+                return len(batch)
+
+            reason = error or "partial write"
+            self.failed_flushes += 1
+            self._failures += 1
+            with self._condition:
+                self._in_flight = []
+                if self._failures > self.max_retries:
+                    self.dropped += len(unwritten)
+                    self._failures = 0
+                    logger.error(
+                        f"Dropping {len(unwritten)} {self.name} record(s) after {self.max_retries} failed retries: {reason}"
+                    )
+                    return len(batch)
+                # Keep the unwritten records at the head of the buffer for the retry
+                self._pending.extendleft(reversed(unwritten))
+                backoff = min(_MAX_BACKOFF_SECONDS, self.flush_interval * (2 ** (self._failures - 1)))
+                self._retry_at = time.monotonic() + backoff
+            logger.warning(
+                f"Failed to write {len(unwritten)} {self.name} record(s), retrying in {backoff:.1f}s: {reason}"
+            )
+            return -1
+
+
+_buffers: Dict[str, WriteBehindBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def get_write_behind_buffer(
+    name: str, write_batch: Callable[[List[Any]], Optional[List[Any]]]
+) -> WriteBehindBuffer:
+    """Get or create the named write-behind buffer, configured from settings."""
+    buffer = _buffers.get(name)
+    if buffer is None:
+        with _buffers_lock:
+            buffer = _buffers.get(name)
+            if buffer is None:
+                buffer = WriteBehindBuffer(
+                    name,
+                    write_batch,
+                    batch_size=settings.write_behind_batch_size,
+                    flush_interval=settings.write_behind_flush_interval_seconds,
+                    max_pending=settings.write_behind_max_pending,
+                    max_retries=settings.write_behind_max_retries,
+                )
+                _buffers[name] = buffer
+    return buffer
+
+
+def shutdown_write_behind() -> None:
+    """Flush and stop every write-behind buffer."""
+    with _buffers_lock:
+        buffers = list(_buffers.values())
+        _buffers.clear()
+    for buffer in buffers:
+        try:
+            buffer.stop()
+        except Exception as e:
+            logger.warning(f"Error flushing {buffer.name} write-behind buffer: {e}")
+
+
+# Worker processes and scripts exit without the FastAPI shutdown hook
+atexit.register(shutdown_write_behind)
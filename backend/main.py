@@ -9,6 +9,7 @@ To run this application:
     Or: python -m backend.main
 """
 
+import asyncio
 import sys
 import os
 from contextlib import asynccontextmanager
@@ -40,6 +41,10 @@ from backend.config import settings
 from backend.utils.logger import get_logger
 from backend.core.database import initialize_database, close_database, is_database_configured, is_supabase_configured
 from backend.middleware.auth import AuthMiddleware
+from backend.core.client_pool import get_client_pool
+from backend.core.compute_pool import shutdown_compute_pool
+from backend.core.write_behind import shutdown_write_behind
+from backend.core.model_residency import get_model_manager
 from backend.core.error_middleware import ErrorHandlingMiddleware, RequestIDMiddleware
 
 # Initialize logger first
@@ -125,6 +130,21 @@ async def lifespan(app: FastAPI):
     
     logger.info(f"Registered {NodeRegistry.get_count()} node types")
 
+    # Preload declared local models in the background (startup is not blocked)
+    if settings.model_preload:
+        app.state.model_preload_task = asyncio.create_task(get_model_manager().preload(settings.model_preload))
+        logger.info(f"Preloading {len(settings.model_preload)} local model(s)")
+
+    # In queue mode executions run in worker processes; relay their stream events
+    if settings.execution_mode == "queue":
+        from backend.core.event_channel import get_event_channel, relay_events
+        from backend.core.streaming import stream_manager
+
+        app.state.event_relay_task = asyncio.create_task(
+            relay_events(get_event_channel(), stream_manager, settings.stream_relay_interval_ms / 1000)
+        )
+        logger.info("Queue execution mode: executions run in workers (python -m backend.worker)")
+
     # Log configuration (without sensitive data)
     logger.info(f"Configuration loaded: {settings}")
 
@@ -132,6 +152,13 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down NodeAI backend...")
+
+    relay_task = getattr(app.state, "event_relay_task", None)
+    if relay_task is not None:
+        relay_task.cancel()
+    
+    # Write buffered cost and usage records while the database is still open
+    await asyncio.to_thread(shutdown_write_behind)
     
     # Close database connections
     try:
@@ -140,6 +167,16 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error closing database connections: {e}")
 
+    # Close pooled provider SDK clients
+    try:
+        await get_client_pool().close_all()
+        logger.info("Provider client pool closed")
+    except Exception as e:
+        logger.warning(f"Error closing provider client pool: {e}")
+
+    # Stop CPU offload workers
+    shutdown_compute_pool()
+
 
 # Create FastAPI application instance
 app = FastAPI(
@@ -373,6 +410,9 @@ async def health_check() -> Dict[str, Any]:
     if is_database_configured():
         health_data["database"]["pool_stats"] = get_pool_stats()
     
+    # Local model residency (loads, hits, evictions, resident models)
+    health_data["models"] = get_model_manager().stats()
+    
     return health_data
 
 
@@ -23,6 +23,7 @@ from backend.core.secret_resolver import resolve_api_key
 from backend.core.agent_lightning import get_agent_lightning_wrapper, calculate_simple_reward
 from backend.utils.model_pricing import (
     calculate_llm_cost,
+    calculate_llm_cost_with_cache,
     get_available_models,
     ModelType,
 )
@@ -481,6 +482,7 @@ class CrewAINode(BaseNode):
             total_tokens = getattr(usage, 'total_tokens', None) or getattr(usage, 'total', 0) or 0
             prompt_tokens = getattr(usage, 'prompt_tokens', None) or getattr(usage, 'input_tokens', None) or getattr(usage, 'prompt', 0) or 0
             completion_tokens = getattr(usage, 'completion_tokens', None) or getattr(usage, 'output_tokens', None) or getattr(usage, 'completion', 0) or 0
+            cached_tokens = getattr(usage, 'cached_prompt_tokens', 0) or 0
             
             # If we have total but not breakdown, estimate 70/30 split
             if total_tokens > 0 and prompt_tokens == 0 and completion_tokens == 0:
@@ -491,6 +493,7 @@ class CrewAINode(BaseNode):
                 "input": prompt_tokens,
                 "output": completion_tokens,
                 "total": total_tokens or (prompt_tokens + completion_tokens),
+                "cached_input": cached_tokens,
             }
             logger.info(f"CrewAI token usage extracted: {tokens_used}")
             
@@ -513,7 +516,9 @@ class CrewAINode(BaseNode):
         
         # Calculate cost using actual token usage if available
         if tokens_used["total"] > 0:
-            cost = self._calculate_cost_from_tokens(provider, model, tokens_used["input"], tokens_used["output"])
+            cost = self._calculate_cost_from_tokens(
+                provider, model, tokens_used["input"], tokens_used["output"], tokens_used.get("cached_input", 0)
+            )
             logger.info(f"CrewAI cost calculated from tokens: ${cost:.4f}")
         else:
             # Fallback to estimation if no metrics available
@@ -1186,9 +1191,11 @@ Look for the actual content in your task - it will contain the data you need to
             logger.warning(f"Failed to get Gemini models from pricing system: {e}", exc_info=True)
             return ["gemini-2.5-pro", "gemini-2.5-flash", "gemini-2.5-flash-lite", "gemini-2.0-flash"]
 
-    def _calculate_cost_from_tokens(self, provider: str, model: str, input_tokens: int, output_tokens: int) -> float:
+    def _calculate_cost_from_tokens(
+        self, provider: str, model: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0
+    ) -> float:
         """Calculate cost from actual token usage using centralized pricing."""
-        return calculate_llm_cost(provider, model, input_tokens, output_tokens)
+        return calculate_llm_cost_with_cache(provider, model, input_tokens, output_tokens, cached_tokens)
 
     def _calculate_cost(self, provider: str, model: str, result: Any, max_iterations: int) -> float:
         """Calculate execution cost."""
@@ -28,10 +28,11 @@ from backend.core.secret_resolver import resolve_api_key
 from backend.utils.logger import get_logger
 from backend.core.agent_lightning import get_agent_lightning_wrapper, calculate_simple_reward
 from backend.utils.model_pricing import (
-    calculate_llm_cost,
+    calculate_llm_cost_with_cache,
     get_available_models,
     ModelType,
 )
+from backend.utils.prompt_caching import openai_cached_tokens
 
 logger = get_logger(__name__)
 
@@ -171,7 +172,9 @@ class LangChainAgentNode(BaseNode):
             # Try to get token usage from result (set by _run_agent)
             if result.get("_token_usage"):
                 tokens_used = result["_token_usage"]
-                cost = self._calculate_cost(provider, model, tokens_used["input"], tokens_used["output"])
+                cost = self._calculate_cost(
+                    provider, model, tokens_used["input"], tokens_used["output"], tokens_used.get("cached_input", 0)
+                )
             else:
                 # Fallback: Try to extract from llm_output
                 if result.get("llm_output") and isinstance(result.get("llm_output"), dict):
@@ -182,8 +185,11 @@ class LangChainAgentNode(BaseNode):
                             "input": token_usage.get("prompt_tokens", 0),
                             "output": token_usage.get("completion_tokens", 0),
                             "total": token_usage.get("total_tokens", 0),
+                            "cached_input": openai_cached_tokens(token_usage),
                         }
-                        cost = self._calculate_cost(provider, model, tokens_used["input"], tokens_used["output"])
+                        cost = self._calculate_cost(
+                            provider, model, tokens_used["input"], tokens_used["output"], tokens_used["cached_input"]
+                        )
                 else:
                     # Last resort: Estimate from input/output length
                     output_text = str(result.get("output", ""))
@@ -458,7 +464,7 @@ Thought: {agent_scratchpad}
         import asyncio
         
         # Track token usage
-        token_usage = {"input": 0, "output": 0, "total": 0}
+        token_usage = {"input": 0, "output": 0, "total": 0, "cached_input": 0}
         step_count = 0
         events_to_stream = []  # Collect events to stream after execution
         
@@ -527,6 +533,7 @@ Thought: {agent_scratchpad}
                             token_usage['input'] = usage.get('prompt_tokens', 0)
                             token_usage['output'] = usage.get('completion_tokens', 0)
                             token_usage['total'] = usage.get('total_tokens', 0)
+                            token_usage['cached_input'] = openai_cached_tokens(usage)
                     # Also check intermediate_steps for token usage
                     if 'intermediate_steps' in result:
                         for step in result.get('intermediate_steps', []):
@@ -539,6 +546,7 @@ Thought: {agent_scratchpad}
                                         token_usage['input'] += usage.get('prompt_tokens', 0)
                                         token_usage['output'] += usage.get('completion_tokens', 0)
                                         token_usage['total'] += usage.get('total_tokens', 0)
+                                        token_usage['cached_input'] += openai_cached_tokens(usage)
                 return result
             # Try old API (run)
             elif hasattr(agent, 'run'):
@@ -711,9 +719,11 @@ Thought: {agent_scratchpad}
             logger.warning(f"Failed to get Gemini models from pricing system: {e}")
             return ["gemini-2.5-pro", "gemini-2.5-flash", "gemini-2.5-flash-lite", "gemini-2.0-flash", "gemini-3-flash-preview", "gemini-3-pro-preview"]
 
-    def _calculate_cost(self, provider: str, model: str, input_tokens: int, output_tokens: int) -> float:
+    def _calculate_cost(
+        self, provider: str, model: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0
+    ) -> float:
         """Calculate cost based on provider and model using centralized pricing."""
-        return calculate_llm_cost(provider, model, input_tokens, output_tokens)
+        return calculate_llm_cost_with_cache(provider, model, input_tokens, output_tokens, cached_tokens)
 
     def estimate_cost(
         self,
@@ -6,7 +6,7 @@ must inherit from. It provides the common interface and shared functionality.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from backend.core.exceptions import NodeExecutionError, NodeValidationError
 from backend.core.models import NodeMetadata
@@ -35,6 +35,14 @@ class BaseNode(ABC):
     name: str = ""
     description: str = ""
     category: str = ""
+    # Pure nodes return the same output for the same inputs and config, so
+    # their results may be reused across executions (see core/node_memo.py)
+    pure: bool = False
+    # Streaming edges (see core/record_stream.py): nodes that can return
+    # RecordStream outputs when config["_stream_output"] is set, and nodes
+    # that can consume RecordStream inputs
+    emits_streams: bool = False
+    accepts_streams: bool = False
 
     def __init__(self):
         """Initialize the base node."""
@@ -236,6 +244,27 @@ class BaseNode(ABC):
         """
         return 0.0
 
+    def memoization_key_extra(
+        self,
+        inputs: Dict[str, Any],
+        config: Dict[str, Any],
+    ) -> Any:
+        """
+        Return external state the output of a pure node depends on.
+        
+        The value is part of the memoization key. Override for pure nodes
+        that read state outside their inputs and config, e.g. return the
+        size and modification time of a file they load.
+        
+        Args:
+            inputs: Input data
+            config: Node configuration
+            
+        Returns:
+            JSON-serializable value (default: None)
+        """
+        return None
+
     def get_metadata(self) -> NodeMetadata:
         """
         Get metadata about this node type.
@@ -386,6 +415,28 @@ class BaseNode(ABC):
             {"message": message, "level": level},
         )
 
+    async def run_cpu_bound(
+        self,
+        fn: Callable,
+        *args: Any,
+        executor: str = "process",
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run blocking work off the event loop (see core/compute_pool.py).
+        
+        Use executor="process" for pure-Python work (``fn`` must be a
+        module-level function) and executor="thread" for libraries that
+        release the GIL.
+        
+        Raises:
+            ComputeTimeoutError: If the work exceeds ``timeout`` seconds
+        """
+        from backend.core.compute_pool import get_compute_pool
+        
+        return await get_compute_pool().run(fn, *args, executor=executor, timeout=timeout, **kwargs)
+
     async def execute_safe(
         self,
         inputs: Dict[str, Any],
@@ -8,21 +8,39 @@ This node supports multiple embedding providers:
 - (More can be added later)
 """
 
-from typing import Any, Dict, List
-
-from openai import OpenAI
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from backend.config import settings
+from backend.core.client_pool import (
+    get_azure_openai_client,
+    get_cohere_client,
+    get_gemini_client,
+    get_openai_client,
+    get_voyage_client,
+)
+from backend.core.embedding_cache import get_embedding_cache
+from backend.core.hedging import hedged
+from backend.core.model_residency import get_model_manager
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
+from backend.core.record_stream import RecordStream, rebatch
+from backend.core.rate_limiter import get_rate_limiter
 from backend.core.secret_resolver import resolve_api_key
 from backend.nodes.base import BaseNode
 from backend.utils.logger import get_logger
 from backend.utils.model_pricing import (
     calculate_embedding_cost_from_texts,
+    estimate_tokens_from_texts,
     get_model_pricing,
     ModelType,
 )
+from backend.utils.retry import (
+    classify_provider_error,
+    get_retry_after,
+    is_rate_limit_error,
+    retry_with_backoff,
+)
 
 logger = get_logger(__name__)
 
@@ -39,6 +57,9 @@ class EmbedNode(BaseNode):
     name = "Embed"
     description = "Create embeddings from text using various providers (OpenAI, HuggingFace, Cohere, etc.)"
     category = "embedding"
+    pure = True
+    accepts_streams = True
+    emits_streams = True
 
     async def execute(
         self,
@@ -63,6 +84,11 @@ class EmbedNode(BaseNode):
             }
         
         provider = config.get("provider", "openai")
+        
+        chunk_stream = inputs.get("chunk_stream")
+        if isinstance(chunk_stream, RecordStream):
+            return await self._embed_stream(chunk_stream, inputs, config, node_id, provider)
+        
         text_input = inputs.get("text") or inputs.get("chunks")
         
         if not text_input:
@@ -78,7 +104,85 @@ class EmbedNode(BaseNode):
         
         await self.stream_progress(node_id, 0.1, f"Preparing to embed {len(texts)} text(s) using {provider}...")
         
-        # Route to appropriate provider
+        return await self._embed_texts(provider, texts, inputs, config, node_id)
+
+    async def _embed_texts(
+        self,
+        provider: str,
+        texts: List[str],
+        inputs: Dict[str, Any],
+        config: Dict[str, Any],
+        node_id: str,
+    ) -> Dict[str, Any]:
+        """Embed texts through the embedding cache when possible, else the provider."""
+        namespace = self._cache_namespace(provider, config)
+        if namespace and settings.enable_embedding_cache and config.get("use_embedding_cache", True):
+            return await self._embed_with_cache(texts, inputs, config, node_id, provider, namespace)
+        
+        return await self._embed_with_provider(provider, texts, inputs, config, node_id)
+
+    async def _embed_stream(
+        self,
+        chunk_stream: RecordStream,
+        inputs: Dict[str, Any],
+        config: Dict[str, Any],
+        node_id: str,
+        provider: str,
+    ) -> Dict[str, Any]:
+        """
+        Embed streamed chunks batch by batch.
+        
+        Emits an ``embedding_stream`` of {"chunks", "embeddings"} batches when
+        the engine streams this node's output, otherwise returns all embeddings.
+        """
+        batch_size = max(1, int(config.get("batch_size", 100)))
+        base_inputs = {key: value for key, value in inputs.items() if not isinstance(value, RecordStream)}
+        summary: Dict[str, Any] = {"count": 0, "dimension": 0, "cost": 0.0}
+        
+        async def batches():
+            async for texts in rebatch(chunk_stream, batch_size):
+                result = await self._embed_texts(provider, texts, {**base_inputs, "chunks": texts}, config, node_id)
+                summary["count"] += len(texts)
+                summary["dimension"] = result.get("dimension") or summary["dimension"]
+                summary["cost"] += result.get("cost", 0.0) or 0.0
+                summary["model"] = result.get("model")
+                yield {"chunks": texts, "embeddings": result["embeddings"]}
+        
+        if config.get("_stream_output"):
+            return {
+                "embedding_stream": RecordStream(batches(), "embedding_stream", summary=summary),
+                "provider": provider,
+            }
+        
+        embeddings: List[List[float]] = []
+        chunks: List[str] = []
+        async for batch in batches():
+            chunks.extend(batch["chunks"])
+            embeddings.extend(batch["embeddings"])
+        
+        if not chunks:
+            raise ValueError("No text or chunks provided in inputs")
+        
+        await self.stream_progress(node_id, 1.0, f"Created {len(embeddings)} embeddings (cost: ${summary['cost']:.6f})")
+        return {
+            "embeddings": embeddings,
+            "chunks": chunks,
+            "provider": provider,
+            "model": summary.get("model"),
+            "count": len(embeddings),
+            "dimension": summary["dimension"],
+            "cost": summary["cost"],
+        }
+
+    async def _embed_with_provider(
+        self,
+        provider: str,
+        texts: List[str],
+        inputs: Dict[str, Any],
+        config: Dict[str, Any],
+        node_id: str,
+    ) -> Dict[str, Any]:
+        """Route texts to the selected provider."""
         if provider == "openai":
             return await self._embed_openai(texts, inputs, config, node_id)
         elif provider == "azure_openai" or provider == "azure":
@@ -94,6 +198,108 @@ class EmbedNode(BaseNode):
         else:
             raise ValueError(f"Unsupported embedding provider: {provider}")
 
+    def _cache_namespace(self, provider: str, config: Dict[str, Any]) -> Optional[Tuple[str, str, Optional[int]]]:
+        """
+        Return the (provider, model, dimension) an embedding depends on, or None
+        if the provider is unknown.
+        
+        The model part includes every option that changes the vectors
+        (fine-tuned model, Azure deployment, input/task type).
+        """
+        dimension = config.get("dimensions")
+        if provider == "openai":
+            if config.get("use_finetuned_model") and config.get("finetuned_model_id"):
+                model = f"finetuned:{config['finetuned_model_id']}"
+            else:
+                model = config.get("openai_model", "text-embedding-3-small")
+        elif provider == "azure_openai" or provider == "azure":
+            provider = "azure_openai"
+            endpoint = config.get("azure_openai_endpoint") or config.get("azure_endpoint") or ""
+            deployment = config.get("azure_openai_deployment") or config.get("azure_deployment") or ""
+            model = f"{endpoint.rstrip('/')}|{deployment}"
+            if config.get("use_finetuned_model") and config.get("finetuned_model_id"):
+                model = f"{model}|finetuned:{config['finetuned_model_id']}"
+        elif provider == "huggingface":
+            model = config.get("hf_model", "sentence-transformers/all-MiniLM-L6-v2")
+        elif provider == "cohere":
+            model = f"{config.get('cohere_model', 'embed-english-v3.0')}|{config.get('cohere_input_type', 'search_document')}"
+        elif provider == "voyage_ai" or provider == "voyageai":
+            provider = "voyage_ai"
+            model = f"{config.get('voyage_model', 'voyage-3.5')}|{config.get('voyage_input_type', 'document')}"
+        elif provider == "gemini" or provider == "google":
+            provider = "gemini"
+            model = f"{config.get('gemini_model', 'gemini-embedding-001')}|{config.get('gemini_task_type', 'RETRIEVAL_DOCUMENT')}"
+            dimension = config.get("gemini_output_dimensionality", 768)
+        else:
+            return None
+        return provider, model, dimension
+
+    async def _embed_with_cache(
+        self,
+        texts: List[str],
+        inputs: Dict[str, Any],
+        config: Dict[str, Any],
+        node_id: str,
+        provider: str,
+        namespace: Tuple[str, str, Optional[int]],
+    ) -> Dict[str, Any]:
+        """
+        Serve embeddings from the content-addressed cache and send only the
+        misses to the provider. The reported cost covers the misses only.
+        """
+        cache = get_embedding_cache()
+        cached = cache.get_many(*namespace, texts)
+        miss_texts = list(dict.fromkeys(text for text, vector in zip(texts, cached) if vector is None))
+        cache_hits = len(texts) - sum(1 for vector in cached if vector is None)
+        
+        if miss_texts:
+            if cache_hits:
+                await self.stream_log(node_id, f"Embedding cache: {cache_hits}/{len(texts)} hits, embedding {len(miss_texts)} new text(s)")
+            result = await self._embed_with_provider(provider, miss_texts, inputs, config, node_id)
+            new_embeddings = result.get("embeddings", [])
+            if len(new_embeddings) != len(miss_texts):
+                raise ValueError(f"Expected {len(miss_texts)} embeddings, got {len(new_embeddings)}")
+            cache.put_many(*namespace, miss_texts, new_embeddings)
+            embedded = dict(zip(miss_texts, new_embeddings))
+        else:
+            result = {
+                "provider": namespace[0],
+                "model": self._display_model(provider, config),
+                "cost": 0.0,
+                # Every text was cached: the executor must not estimate a provider cost
+                "cache_hit": True,
+            }
+            if "chunks" in inputs:
+                result["chunks"] = inputs["chunks"]
+            embedded = {}
+        
+        embeddings = [vector if vector is not None else embedded[text] for text, vector in zip(texts, cached)]
+        result["embeddings"] = embeddings
+        result["count"] = len(embeddings)
+        if embeddings and not result.get("dimension"):
+            result["dimension"] = len(embeddings[0])
+        result["cache_hits"] = cache_hits
+        result["cache_misses"] = len(miss_texts)
+        
+        if not miss_texts:
+            await self.stream_progress(node_id, 1.0, f"Loaded {len(embeddings)} embeddings from cache (cost: $0.000000)")
+        
+        return result
+
+    def _display_model(self, provider: str, config: Dict[str, Any]) -> str:
+        """Return the model name reported in outputs for a provider."""
+        if provider == "openai":
+            return config.get("openai_model", "text-embedding-3-small")
+        elif provider == "azure_openai" or provider == "azure":
+            return config.get("azure_openai_model") or config.get("azure_openai_deployment") or config.get("azure_deployment")
+        elif provider == "huggingface":
+            return config.get("hf_model", "sentence-transformers/all-MiniLM-L6-v2")
+        elif provider == "cohere":
+            return config.get("cohere_model", "embed-english-v3.0")
+        elif provider == "voyage_ai" or provider == "voyageai":
+            return config.get("voyage_model", "voyage-3.5")
+        return config.get("gemini_model", "gemini-embedding-001")
+
     async def _embed_openai(
         self,
         texts: List[str],
@@ -124,35 +330,22 @@ class EmbedNode(BaseNode):
         api_key = resolve_api_key(config, "openai_api_key", user_id=user_id)
         if not api_key:
             raise ValueError("OpenAI API key not found. Please configure it in the node settings or environment variables.")
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         
-        # Process in batches
-        all_embeddings = []
         total_batches = (len(texts) + batch_size - 1) // batch_size
         use_batch_pricing = total_batches > 1  # Use batch pricing if multiple batches
         
-        for batch_num, i in enumerate(range(0, len(texts), batch_size)):
-            batch = texts[i : i + batch_size]
-            progress = 0.2 + (batch_num / total_batches) * 0.7
-            
-            await self.stream_progress(
-                node_id, 
-                progress, 
-                f"Embedding batch {batch_num + 1}/{total_batches} ({len(batch)} texts)..."
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            response = await client.embeddings.create(
+                model=model,
+                input=batch,
             )
-            
-            try:
-                response = client.embeddings.create(
-                    model=model,
-                    input=batch,
-                )
-                
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
-                
-            except Exception as e:
-                logger.error(f"OpenAI embedding error: {e}")
-                raise
+            return [item.embedding for item in response.data]
+        
+        all_embeddings = await self._embed_in_batches(
+            texts, batch_size, embed_batch, config, node_id,
+            provider="openai", api_key=api_key, provider_label="OpenAI",
+        )
         
         # Calculate cost using centralized pricing
         cost = calculate_embedding_cost_from_texts("openai", model, texts, use_batch_pricing)
@@ -196,9 +389,8 @@ class EmbedNode(BaseNode):
         # For now, we'll use sentence-transformers library
         # In production, you might want to use HuggingFace Inference API
         try:
-            from sentence_transformers import SentenceTransformer
-            
-            model = SentenceTransformer(model_name)
+            # Loaded once per process and shared across executions
+            model = await get_model_manager().aget("sentence_transformer", model_name)
             await self.stream_progress(node_id, 0.4, f"Encoding {len(texts)} texts...")
             embeddings = model.encode(texts, show_progress_bar=False)
             
@@ -260,44 +452,25 @@ class EmbedNode(BaseNode):
         
         batch_size = config.get("batch_size", 100)
         
-        # Create Azure OpenAI client
+        # Get shared Azure OpenAI client
         # Azure OpenAI uses the same OpenAI SDK but with different base URL
         # The base_url should be the endpoint, and deployment name is used as the model parameter
-        from openai import OpenAI
-        client = OpenAI(
-            api_key=api_key,
-            base_url=f"{endpoint.rstrip('/')}/openai/deployments",
-            default_headers={"api-key": api_key},
-            default_query={"api-version": api_version},
-        )
+        client = get_azure_openai_client(api_key, endpoint, api_version)
         
-        # Process in batches
-        all_embeddings = []
         total_batches = (len(texts) + batch_size - 1) // batch_size
         use_batch_pricing = total_batches > 1
         
-        for batch_num, i in enumerate(range(0, len(texts), batch_size)):
-            batch = texts[i : i + batch_size]
-            progress = 0.2 + (batch_num / total_batches) * 0.7
-            
-            await self.stream_progress(
-                node_id, 
-                progress, 
-                f"Embedding batch {batch_num + 1}/{total_batches} ({len(batch)} texts) with Azure OpenAI..."
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            response = await client.embeddings.create(
+                model=deployment_name,  # Azure OpenAI uses deployment name
+                input=batch,
             )
-            
-            try:
-                response = client.embeddings.create(
-                    model=deployment_name,  # Azure OpenAI uses deployment name
-                    input=batch,
-                )
-                
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
-                
-            except Exception as e:
-                logger.error(f"Azure OpenAI embedding error: {e}")
-                raise
+            return [item.embedding for item in response.data]
+        
+        all_embeddings = await self._embed_in_batches(
+            texts, batch_size, embed_batch, config, node_id,
+            provider="azure_openai", api_key=api_key, provider_label="Azure OpenAI",
+        )
         
         # Get model info for dimension
         dimension = len(all_embeddings[0]) if all_embeddings else 0
@@ -334,6 +507,7 @@ class EmbedNode(BaseNode):
         """Create embeddings using Cohere."""
         model = config.get("cohere_model", "embed-english-v3.0")
         input_type = config.get("cohere_input_type", "search_document")
+        batch_size = min(config.get("batch_size", 96), 96)  # Cohere accepts up to 96 texts per call
         
         await self.stream_progress(node_id, 0.2, f"Creating embeddings with Cohere ({model})...")
         
@@ -346,23 +520,30 @@ class EmbedNode(BaseNode):
             if not api_key:
                 raise ValueError("Cohere API key not configured")
             
-            client = cohere.Client(api_key=api_key)
-            await self.stream_progress(node_id, 0.5, f"Sending {len(texts)} texts to Cohere...")
-            response = client.embed(
-                texts=texts,
-                model=model,
-                input_type=input_type,
+            client = get_cohere_client(api_key)
+            
+            async def embed_batch(batch: List[str]) -> List[List[float]]:
+                response = await client.embed(
+                    texts=batch,
+                    model=model,
+                    input_type=input_type,
+                )
+                return list(response.embeddings)
+            
+            embeddings = await self._embed_in_batches(
+                texts, batch_size, embed_batch, config, node_id,
+                provider="cohere", api_key=api_key, provider_label="Cohere",
             )
             
             # Get model info for dimension
             model_info = get_model_pricing("cohere", model)
-            dimension = model_info.dimension if model_info else (len(response.embeddings[0]) if response.embeddings else 0)
+            dimension = model_info.dimension if model_info else (len(embeddings[0]) if embeddings else 0)
             
             result = {
-                "embeddings": response.embeddings,
+                "embeddings": embeddings,
                 "provider": "cohere",
                 "model": model,
-                "count": len(response.embeddings),
+                "count": len(embeddings),
                 "dimension": dimension,
             }
             
@@ -370,7 +551,7 @@ class EmbedNode(BaseNode):
             if "chunks" in inputs:
                 result["chunks"] = inputs["chunks"]
             
-            await self.stream_progress(node_id, 1.0, f"Created {len(response.embeddings)} embeddings")
+            await self.stream_progress(node_id, 1.0, f"Created {len(embeddings)} embeddings")
             
             return result
         except ImportError:
@@ -423,6 +604,34 @@ class EmbedNode(BaseNode):
                     "minimum": 1,
                     "maximum": 1000,
                 },
+                "max_concurrent_batches": {
+                    "type": "integer",
+                    "title": "Concurrent Batches",
+                    "description": "Maximum embedding batches in flight at once (defaults to server setting)",
+                    "default": 4,
+                    "minimum": 1,
+                    "maximum": 64,
+                },
+                "requests_per_minute": {
+                    "type": "integer",
+                    "title": "Requests per Minute",
+                    "description": "Provider request budget for this API key (0 = unlimited)",
+                    "default": 3000,
+                    "minimum": 0,
+                },
+                "tokens_per_minute": {
+                    "type": "integer",
+                    "title": "Tokens per Minute",
+                    "description": "Provider token budget for this API key (0 = unlimited)",
+                    "default": 1000000,
+                    "minimum": 0,
+                },
+                "use_embedding_cache": {
+                    "type": "boolean",
+                    "title": "Use Embedding Cache",
+                    "description": "Reuse embeddings of identical text instead of calling the provider again",
+                    "default": True,
+                },
                 # HuggingFace config
                 "hf_model": {
                     "type": "string",
@@ -604,34 +813,21 @@ class EmbedNode(BaseNode):
                 "Get your API key from https://www.voyageai.com/"
             )
         
-        client = voyageai.Client(api_key=api_key)
-        
-        # Process in batches
-        all_embeddings = []
-        total_batches = (len(texts) + batch_size - 1) // batch_size
+        client = get_voyage_client(api_key)
         
-        for batch_num, i in enumerate(range(0, len(texts), batch_size)):
-            batch = texts[i : i + batch_size]
-            progress = 0.3 + (batch_num / total_batches) * 0.6
-            
-            await self.stream_progress(
-                node_id,
-                progress,
-                f"Embedding batch {batch_num + 1}/{total_batches} ({len(batch)} texts)..."
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            response = await client.embed(
+                texts=batch,
+                model=model,
+                input_type=input_type,
             )
-            
-            try:
-                response = client.embed(
-                    texts=batch,
-                    model=model,
-                    input_type=input_type,
-                )
-                
-                all_embeddings.extend(response.embeddings)
-                
-            except Exception as e:
-                logger.error(f"Voyage AI embedding error: {e}")
-                raise
+            return list(response.embeddings)
+        
+        all_embeddings = await self._embed_in_batches(
+            texts, batch_size, embed_batch, config, node_id,
+            provider="voyage_ai", api_key=api_key, provider_label="Voyage AI",
+            progress_start=0.3, progress_span=0.6,
+        )
         
         # Get model info for dimension
         model_info = get_model_pricing("voyage_ai", model)
@@ -686,34 +882,25 @@ class EmbedNode(BaseNode):
                 "Get your API key from https://aistudio.google.com/app/apikey"
             )
         
-        client = genai.Client(api_key=api_key)
-        
-        all_embeddings = []
-        total_batches = (len(texts) + batch_size - 1) // batch_size
+        client = get_gemini_client(api_key)
         
-        for batch_num, i in enumerate(range(0, len(texts), batch_size)):
-            batch = texts[i : i + batch_size]
-            await self.stream_progress(
-                node_id,
-                0.3 + (batch_num / total_batches) * 0.6,
-                f"Processing batch {batch_num + 1}/{total_batches}...",
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            response = await client.aio.models.embed_content(
+                model=model,
+                contents=batch,
+                config=types.EmbedContentConfig(
+                    task_type=task_type,
+                    output_dimensionality=output_dimensionality,
+                ),
             )
-            
-            try:
-                result = client.models.embed_content(
-                    model=model,
-                    contents=batch,
-                    config=types.EmbedContentConfig(
-                        task_type=task_type,
-                        output_dimensionality=output_dimensionality,
-                    ),
-                )
-                # Extract embedding values
-                batch_embeddings = [list(emb.values) for emb in result.embeddings]
-                all_embeddings.extend(batch_embeddings)
-            except Exception as e:
-                logger.error(f"Gemini embedding error: {e}")
-                raise
+            # Extract embedding values
+            return [list(emb.values) for emb in response.embeddings]
+        
+        all_embeddings = await self._embed_in_batches(
+            texts, batch_size, embed_batch, config, node_id,
+            provider="gemini", api_key=api_key, provider_label="Gemini",
+            progress_start=0.3, progress_span=0.6,
+        )
         
         model_info = get_model_pricing("gemini", model)
         dimension = output_dimensionality if model_info else 768
@@ -774,6 +961,101 @@ class EmbedNode(BaseNode):
         # HuggingFace is free or has different pricing
         return 0.0
     
+    async def _embed_in_batches(
+        self,
+        texts: List[str],
+        batch_size: int,
+        embed_batch: Callable[[List[str]], Awaitable[List[List[float]]]],
+        config: Dict[str, Any],
+        node_id: str,
+        provider: str,
+        api_key: Optional[str],
+        provider_label: str,
+        progress_start: float = 0.2,
+        progress_span: float = 0.7,
+    ) -> List[List[float]]:
+        """
+        Embed texts in batches, dispatching batches concurrently.
+        
+        Up to ``max_concurrent_batches`` requests are in flight at once, each
+        admitted by the shared RPM/TPM limiter for this provider and API key.
+        Failed batches are retried with exponential backoff; a rate limit
+        response pauses the limiter for every batch using the same key.
+        Requests are hedged when hedged requests are enabled.
+        Embeddings are returned in the original text order.
+        """
+        batch_size = max(int(batch_size or 1), 1)
+        batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+        total_batches = len(batches)
+        if not batches:
+            return []
+        
+        max_concurrency = config.get("max_concurrent_batches") or settings.embedding_max_concurrency
+        rpm = config.get("requests_per_minute", settings.embedding_requests_per_minute)
+        tpm = config.get("tokens_per_minute", settings.embedding_tokens_per_minute)
+        limiter = get_rate_limiter(f"embed:{provider}", api_key, rpm=rpm, tpm=tpm)
+        semaphore = asyncio.Semaphore(max(int(max_concurrency), 1))
+        
+        results: List[Optional[List[List[float]]]] = [None] * total_batches
+        completed = 0
+        
+        async def run_batch(index: int, batch: List[str]) -> None:
+            nonlocal completed
+            tokens = estimate_tokens_from_texts(batch)
+            
+            async def attempt() -> List[List[float]]:
+                await limiter.acquire(tokens)
+                try:
+                    # Slow batches get one duplicate request (see core/hedging.py)
+                    return await hedged(f"embed:{provider}", lambda: embed_batch(batch))
+                except Exception as e:
+                    if is_rate_limit_error(e):
+                        limiter.pause(get_retry_after(e) or 1.0)
+                    classified_error = classify_provider_error(e, provider_label)
+                    logger.warning(
+                        f"{provider_label} embedding batch {index + 1}/{total_batches} failed: "
+                        f"{type(classified_error).__name__}: {e}"
+                    )
+                    raise classified_error from e
+            
+            async with semaphore:
+                embeddings = await retry_with_backoff(
+                    attempt,
+                    max_retries=settings.embedding_max_retries,
+                    initial_delay=1.0,
+                    max_delay=30.0,
+                )
+            
+            if len(embeddings) != len(batch):
+                raise ValueError(
+                    f"{provider_label} returned {len(embeddings)} embeddings for a batch of {len(batch)} texts"
+                )
+            results[index] = embeddings
+            completed += 1
+            await self.stream_progress(
+                node_id,
+                progress_start + (completed / total_batches) * progress_span,
+                f"Embedded batch {completed}/{total_batches} with {provider_label}...",
+            )
+        
+        await self.stream_progress(
+            node_id,
+            progress_start,
+            f"Embedding {len(texts)} texts in {total_batches} batch(es) with {provider_label}...",
+        )
+        
+        tasks = [asyncio.create_task(run_batch(i, batch)) for i, batch in enumerate(batches)]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.error(f"{provider_label} embedding error: {e}")
+            raise
+        
+        return [embedding for batch_embeddings in results for embedding in batch_embeddings]
+
     async def _get_finetuned_model(self, model_id: str, provider: str) -> Dict[str, Any]:
         """Get fine-tuned model from registry."""
         try:
@@ -853,6 +1135,10 @@ class EmbedNode(BaseNode):
                 "type": "integer",
                 "description": "Embedding dimension",
             },
+            "cache_hits": {
+                "type": "integer",
+                "description": "Number of embeddings served from the embedding cache",
+            },
         }
 
 
@@ -6,7 +6,7 @@ This node loads and parses structured data files (CSV, Excel, JSON, Parquet).
 
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
@@ -19,6 +19,30 @@ logger = get_logger(__name__)
 UPLOAD_DIR = Path("uploads")
 
 
+def _parse_table(path: str, file_format: str, options: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Parse a CSV, Excel or Parquet file with pandas; returns the records and their schema."""
+    import pandas as pd
+    
+    if file_format == "csv":
+        df = pd.read_csv(path, **options)
+    elif file_format == "excel":
+        df = pd.read_excel(path, **options)
+    else:
+        df = pd.read_parquet(path, **options)
+    
+    # Convert to list of dicts
+    data = df.to_dict(orient="records")
+    
+    # Generate schema
+    schema = {
+        "columns": list(df.columns),
+        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+        "row_count": len(df),
+        "column_count": len(df.columns),
+    }
+    return data, schema
+
+
 class DataLoaderNode(BaseNode):
     """
     Data Loader Node.
@@ -31,6 +55,20 @@ class DataLoaderNode(BaseNode):
     name = "Data Loader"
     description = "Load and parse structured data files (CSV, Excel, JSON, Parquet)."
     category = "input"
+    pure = True
+
+    def memoization_key_extra(self, inputs: Dict[str, Any], config: Dict[str, Any]) -> Any:
+        """Key memoized results on the data file's size and mtime."""
+        data_path = inputs.get("data_path") or inputs.get("text")
+        file_id = config.get("file_id")
+        candidates = [Path(data_path)] if isinstance(data_path, (str, Path)) and data_path else []
+        if file_id and not candidates:
+            candidates = [UPLOAD_DIR / f"{file_id}{ext}" for ext in (".csv", ".xlsx", ".json", ".parquet")]
+        for candidate in candidates:
+            if candidate.is_file():
+                stat = candidate.stat()
+                return [str(candidate), stat.st_size, stat.st_mtime_ns]
+        return None
 
     async def execute(
         self,
@@ -111,7 +149,7 @@ class DataLoaderNode(BaseNode):
     async def _load_csv(self, file_path: Path, node_id: str, config: Dict[str, Any]) -> tuple[Any, Dict[str, Any]]:
         """Load CSV file."""
         try:
-            import pandas as pd
+            import pandas  # noqa: F401
         except ImportError:
             raise ImportError(
                 "CSV loading requires pandas. Install with: pip install pandas"
@@ -125,25 +163,12 @@ class DataLoaderNode(BaseNode):
             header = config.get("header", 0)  # 0 = first row, None = no header
             nrows = config.get("nrows", None)  # Limit rows
             
-            df = pd.read_csv(
-                file_path,
-                delimiter=delimiter,
-                header=header,
-                nrows=nrows,
+            # Parsing runs in the compute pool
+            data, schema = await self.run_cpu_bound(
+                _parse_table, str(file_path), "csv", {"delimiter": delimiter, "header": header, "nrows": nrows}
             )
             
-            await self.stream_progress(node_id, 0.7, f"Parsed {len(df)} rows, {len(df.columns)} columns")
-            
-            # Convert to list of dicts
-            data = df.to_dict(orient="records")
-            
-            # Generate schema
-            schema = {
-                "columns": list(df.columns),
-                "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
-                "row_count": len(df),
-                "column_count": len(df.columns),
-            }
+            await self.stream_progress(node_id, 0.7, f"Parsed {schema['row_count']} rows, {schema['column_count']} columns")
             
             return data, schema
             
@@ -154,7 +179,7 @@ class DataLoaderNode(BaseNode):
     async def _load_excel(self, file_path: Path, node_id: str, config: Dict[str, Any]) -> tuple[Any, Dict[str, Any]]:
         """Load Excel file."""
         try:
-            import pandas as pd
+            import pandas  # noqa: F401
         except ImportError:
             raise ImportError("Excel loading requires pandas and openpyxl. Install with: pip install pandas openpyxl")
         
@@ -166,26 +191,12 @@ class DataLoaderNode(BaseNode):
             header = config.get("header", 0)
             nrows = config.get("nrows", None)
             
-            df = pd.read_excel(
-                file_path,
-                sheet_name=sheet_name,
-                header=header,
-                nrows=nrows,
+            data, schema = await self.run_cpu_bound(
+                _parse_table, str(file_path), "excel", {"sheet_name": sheet_name, "header": header, "nrows": nrows}
             )
+            schema["sheet_name"] = sheet_name
             
-            await self.stream_progress(node_id, 0.7, f"Parsed {len(df)} rows, {len(df.columns)} columns")
-            
-            # Convert to list of dicts
-            data = df.to_dict(orient="records")
-            
-            # Generate schema
-            schema = {
-                "columns": list(df.columns),
-                "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
-                "row_count": len(df),
-                "column_count": len(df.columns),
-                "sheet_name": sheet_name,
-            }
+            await self.stream_progress(node_id, 0.7, f"Parsed {schema['row_count']} rows, {schema['column_count']} columns")
             
             return data, schema
             
@@ -235,27 +246,16 @@ class DataLoaderNode(BaseNode):
     async def _load_parquet(self, file_path: Path, node_id: str) -> tuple[Any, Dict[str, Any]]:
         """Load Parquet file."""
         try:
-            import pandas as pd
+            import pandas  # noqa: F401
         except ImportError:
             raise ImportError("Parquet loading requires pandas and pyarrow. Install with: pip install pandas pyarrow")
         
         try:
             await self.stream_progress(node_id, 0.6, "Reading Parquet file...")
             
-            df = pd.read_parquet(file_path)
-            
-            await self.stream_progress(node_id, 0.7, f"Parsed {len(df)} rows, {len(df.columns)} columns")
+            data, schema = await self.run_cpu_bound(_parse_table, str(file_path), "parquet", {})
             
-            # Convert to list of dicts
-            data = df.to_dict(orient="records")
-            
-            # Generate schema
-            schema = {
-                "columns": list(df.columns),
-                "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
-                "row_count": len(df),
-                "column_count": len(df.columns),
-            }
+            await self.stream_progress(node_id, 0.7, f"Parsed {schema['row_count']} rows, {schema['column_count']} columns")
             
             return data, schema
             
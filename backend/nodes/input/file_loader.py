@@ -9,13 +9,15 @@ This node loads and processes uploaded files of various types:
 - Data: CSV, XLSX, JSON, Parquet
 """
 
+import asyncio
 import base64
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
+from backend.core.record_stream import RecordStream
 from backend.nodes.base import BaseNode
 from backend.utils.logger import get_logger
 
@@ -25,6 +27,32 @@ logger = get_logger(__name__)
 from backend.config import settings
 UPLOAD_DIR = settings.uploads_dir if hasattr(settings, 'uploads_dir') else Path("uploads")
 
+# Characters per record when streaming plain text
+_TEXT_BLOCK_CHARS = 64 * 1024
+# PDF pages extracted per compute pool task
+_PDF_PAGES_PER_TASK = 8
+
+
+def _pdf_page_texts(path: str, start: int, stop: int) -> Tuple[List[str], int]:
+    """Extract the text of pages [start, stop) of a PDF; also returns its page count."""
+    try:
+        import PyPDF2
+    except ImportError:
+        import pdfplumber
+        
+        with pdfplumber.open(path) as pdf:
+            return [page.extract_text() or "" for page in pdf.pages[start:stop]], len(pdf.pages)
+    with open(path, "rb") as f:
+        pages = PyPDF2.PdfReader(f).pages
+        return [pages[i].extract_text() or "" for i in range(start, min(stop, len(pages)))], len(pages)
+
+
+def _docx_paragraphs(path: str) -> List[str]:
+    """Return the non-empty paragraphs of a DOCX file."""
+    from docx import Document
+    
+    return [para.text for para in Document(path).paragraphs if para.text.strip()]
+
 
 class FileLoaderNode(BaseNode):
     """
@@ -38,6 +66,18 @@ class FileLoaderNode(BaseNode):
     name = "File Upload"
     description = "Load and process uploaded files (Documents, Images, Audio, Video, Data)."
     category = "input"
+    pure = True
+    emits_streams = True
+
+    def memoization_key_extra(self, inputs: Dict[str, Any], config: Dict[str, Any]) -> Any:
+        """Key memoized results on the uploaded file's size and mtime."""
+        file_id = config.get("file_id")
+        if not file_id:
+            return None
+        for candidate in UPLOAD_DIR.glob(f"{file_id}.*"):
+            stat = candidate.stat()
+            return [candidate.name, stat.st_size, stat.st_mtime_ns]
+        return None
 
     async def execute(
         self,
@@ -103,6 +143,8 @@ class FileLoaderNode(BaseNode):
         
         # Process based on file category
         if file_category == "document":
+            if config.get("_stream_output"):
+                return self._stream_document(file_path, file_id, node_id)
             return await self._process_document(file_path, file_id, node_id, config)
         elif file_category == "image":
             return await self._process_image(file_path, file_id, node_id, config)
@@ -182,6 +224,62 @@ class FileLoaderNode(BaseNode):
         await self.stream_progress(node_id, 1.0, f"Document loaded: {len(text)} characters")
         return result
     
+    def _stream_document(self, file_path: Path, file_id: str, node_id: str) -> Dict[str, Any]:
+        """Return the document text as a stream of pages/blocks (streaming edge)."""
+        summary: Dict[str, Any] = {"length": 0}
+        
+        async def pieces() -> AsyncIterator[str]:
+            async for piece in self._iter_document_text(file_path, node_id):
+                summary["length"] += len(piece)
+                yield piece
+            await self.stream_progress(node_id, 1.0, f"Document streamed: {summary['length']} characters")
+        
+        return {
+            "text_stream": RecordStream(pieces(), "text_stream", summary=summary),
+            "metadata": {
+                "source": "file_upload",
+                "file_id": file_id,
+                "filename": file_path.name,
+                "file_type": file_path.suffix,
+                "file_category": "document",
+            },
+        }
+    
+    async def _iter_document_text(self, file_path: Path, node_id: str) -> AsyncIterator[str]:
+        """
+        Yield document text piece by piece (pages for PDF); the pieces
+        concatenate to the text ``_process_document`` would return.
+        Extracted text is cached next to the file as it is produced.
+        """
+        text_file = file_path.with_suffix(".txt")
+        ext = file_path.suffix.lower()
+        if text_file.exists() or ext in [".txt", ".md"]:
+            source = text_file if text_file.exists() else file_path
+            with open(source, "r", encoding="utf-8") as f:
+                while True:
+                    block = await asyncio.to_thread(f.read, _TEXT_BLOCK_CHARS)
+                    if not block:
+                        return
+                    yield block
+        
+        if ext == ".pdf":
+            parts = self._iter_pdf_pages(file_path, node_id)
+        elif ext in [".docx", ".doc"]:
+            parts = self._iter_docx_paragraphs(file_path, node_id)
+        else:
+            raise ValueError(f"Unsupported document type: {ext}")
+        
+        tmp_file = text_file.with_suffix(".txt.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as cache:
+            first = True
+            async for part in parts:
+                piece = part if first else "\n\n" + part
+                first = False
+                cache.write(piece)
+                yield piece
+        os.replace(tmp_file, text_file)
+        logger.info(f"Cached extracted text to {text_file}")
+    
     async def _process_image(
         self, file_path: Path, file_id: str, node_id: str, config: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -306,46 +404,38 @@ class FileLoaderNode(BaseNode):
 
     async def _extract_pdf(self, file_path: Path, node_id: str) -> str:
         """Extract text from PDF file."""
+        return "\n\n".join([page async for page in self._iter_pdf_pages(file_path, node_id)])
+
+    async def _iter_pdf_pages(self, file_path: Path, node_id: str) -> AsyncIterator[str]:
+        """Yield the text of each non-empty PDF page (extracted in the compute pool)."""
         try:
-            import PyPDF2
+            import PyPDF2  # noqa: F401
         except ImportError:
             try:
-                import pdfplumber
+                import pdfplumber  # noqa: F401
             except ImportError:
                 raise ImportError(
                     "PDF extraction requires either PyPDF2 or pdfplumber. "
                     "Install with: pip install PyPDF2 or pip install pdfplumber"
                 )
-            else:
-                # Use pdfplumber
-                text_parts = []
-                with pdfplumber.open(file_path) as pdf:
-                    total_pages = len(pdf.pages)
-                    for i, page in enumerate(pdf.pages):
-                        progress = 0.4 + (i / total_pages) * 0.3
-                        await self.stream_progress(node_id, progress, f"Extracting page {i+1}/{total_pages}")
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_parts.append(page_text)
-                return "\n\n".join(text_parts)
-        else:
-            # Use PyPDF2
-            text_parts = []
-            with open(file_path, "rb") as f:
-                pdf_reader = PyPDF2.PdfReader(f)
-                total_pages = len(pdf_reader.pages)
-                for i, page in enumerate(pdf_reader.pages):
-                    progress = 0.4 + (i / total_pages) * 0.3
-                    await self.stream_progress(node_id, progress, f"Extracting page {i+1}/{total_pages}")
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-            return "\n\n".join(text_parts)
+        
+        start, total_pages = 0, None
+        while total_pages is None or start < total_pages:
+            if total_pages:
+                progress = 0.4 + (start / total_pages) * 0.3
+                await self.stream_progress(node_id, progress, f"Extracting page {start+1}/{total_pages}")
+            texts, total_pages = await self.run_cpu_bound(
+                _pdf_page_texts, str(file_path), start, start + _PDF_PAGES_PER_TASK
+            )
+            for text in texts:
+                if text:
+                    yield text
+            start += _PDF_PAGES_PER_TASK
 
     async def _extract_docx(self, file_path: Path, node_id: str) -> str:
         """Extract text from DOCX file."""
         try:
-            from docx import Document
+            import docx  # noqa: F401
         except ImportError:
             raise ImportError(
                 "DOCX extraction requires python-docx. "
@@ -353,11 +443,16 @@ class FileLoaderNode(BaseNode):
             )
         
         await self.stream_progress(node_id, 0.5, "Reading DOCX file...")
-        doc = Document(file_path)
-        paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
+        paragraphs = await self.run_cpu_bound(_docx_paragraphs, str(file_path))
         await self.stream_progress(node_id, 0.6, f"Extracted {len(paragraphs)} paragraphs")
         return "\n\n".join(paragraphs)
 
+    async def _iter_docx_paragraphs(self, file_path: Path, node_id: str) -> AsyncIterator[str]:
+        """Yield the non-empty paragraphs of a DOCX file."""
+        text = await self._extract_docx(file_path, node_id)
+        for paragraph in text.split("\n\n") if text else []:
+            yield paragraph
+
     def get_schema(self) -> Dict[str, Any]:
         """Return JSON schema for file loader configuration."""
         return {
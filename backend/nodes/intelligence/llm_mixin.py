@@ -4,9 +4,12 @@ LLM Configuration Mixin for AI-Native Nodes
 This mixin provides consistent LLM configuration patterns across all AI-native nodes.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from backend.core.client_pool import get_anthropic_client, get_openai_client
+from backend.core.llm_response_cache import cached_llm_call, is_cacheable, llm_cache_key
 from backend.core.secret_resolver import resolve_api_key
 from backend.utils.model_pricing import get_available_models, ModelType, calculate_llm_cost
+from backend.utils.prompt_caching import anthropic_text_block, is_cacheable_prefix
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -124,6 +127,12 @@ class LLMConfigMixin:
                 "title": "Temperature",
                 "description": "Sampling temperature for response randomness",
             },
+            "cache_response": {
+                "type": "boolean",
+                "default": False,
+                "title": "Cache Responses",
+                "description": "Reuse the response to an identical prompt even above temperature 0 (always on at temperature 0)",
+            },
         }
 
     def _resolve_llm_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
@@ -156,23 +165,65 @@ class LLMConfigMixin:
             "provider": provider,
             "model": model,
             "api_key": api_key,
-            "temperature": temperature
+            "temperature": temperature,
+            "cache_response": config.get("cache_response", False),
         }
 
-    async def _call_llm(self, prompt: str, llm_config: Dict[str, Any], max_tokens: int = 2000) -> str:
-        """Call LLM with consistent pattern across providers."""
+    async def _call_llm(
+        self,
+        prompt: str,
+        llm_config: Dict[str, Any],
+        max_tokens: int = 2000,
+        context: Optional[str] = None,
+    ) -> str:
+        """Call LLM with consistent pattern across providers.
+
+        Deterministic calls (temperature 0, or ``cache_response``) are
+        answered from the LLM response cache when the same prompt was sent
+        before.
+
+        ``context`` is text shared by several calls (e.g. a transcript). It
+        is sent ahead of the prompt so the provider can serve it from its
+        prompt cache on later calls.
+        """
+        cache_key = None
+        if is_cacheable(llm_config["temperature"], llm_config.get("cache_response", False)):
+            cache_key = llm_cache_key(
+                llm_config["provider"],
+                llm_config["model"],
+                [{"role": "user", "content": [context, prompt] if context else prompt}],
+                {"temperature": llm_config["temperature"], "max_tokens": max_tokens},
+            )
+
+        async def request() -> Dict[str, Any]:
+            text = await self._request_llm(prompt, llm_config, max_tokens, context)
+            sent = f"{context}\n\n{prompt}" if context else prompt
+            return {"response": text, "cost": self._estimate_llm_cost(sent, text or "", llm_config)}
+
+        response, _ = await cached_llm_call(cache_key, request)
+        return response["response"]
+
+    async def _request_llm(
+        self,
+        prompt: str,
+        llm_config: Dict[str, Any],
+        max_tokens: int,
+        context: Optional[str] = None,
+    ) -> str:
+        """Send a prompt to the configured provider, shared context first."""
         provider = llm_config["provider"]
         model = llm_config["model"]
         api_key = llm_config["api_key"]
         temperature = llm_config["temperature"]
+        # OpenAI and Gemini cache a repeated prefix automatically
+        text = f"{context}\n\n{prompt}" if context else prompt
         
         if provider == "openai":
-            import openai
-            client = openai.AsyncOpenAI(api_key=api_key)
+            client = get_openai_client(api_key)
             
             response = await client.chat.completions.create(
                 model=model,
-                messages=[{"role": "user", "content": prompt}],
+                messages=[{"role": "user", "content": text}],
                 temperature=temperature,
                 max_tokens=max_tokens
             )
@@ -180,14 +231,21 @@ class LLMConfigMixin:
             return response.choices[0].message.content
             
         elif provider == "anthropic":
-            import anthropic
-            client = anthropic.AsyncAnthropic(api_key=api_key)
+            client = get_anthropic_client(api_key)
+            
+            content: Any = prompt
+            if context:
+                # Anthropic caches only up to an explicit breakpoint
+                content = [
+                    anthropic_text_block(context, cache=is_cacheable_prefix(context)),
+                    anthropic_text_block(prompt),
+                ]
             
             response = await client.messages.create(
                 model=model,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                messages=[{"role": "user", "content": prompt}]
+                messages=[{"role": "user", "content": content}]
             )
             
             return response.content[0].text
@@ -199,7 +257,7 @@ class LLMConfigMixin:
                 
                 model_obj = genai.GenerativeModel(model)
                 response = await model_obj.generate_content_async(
-                    prompt,
+                    text,
                     generation_config=genai.types.GenerationConfig(
                         temperature=temperature,
                         max_output_tokens=max_tokens,
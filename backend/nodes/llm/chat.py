@@ -10,13 +10,20 @@ Also supports built-in conversation memory.
 """
 
 import re
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 import uuid
 
-from openai import OpenAI
-
 from backend.config import settings
+from backend.core.client_pool import (
+    get_anthropic_client,
+    get_azure_openai_client,
+    get_gemini_client,
+    get_openai_client,
+)
+from backend.core.context_packer import context_budget, count_tokens, pack_context
+from backend.core.hedging import hedged
+from backend.core.llm_response_cache import get_llm_response_cache, is_cacheable, llm_cache_key
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
 from backend.core.secret_resolver import resolve_api_key
@@ -25,9 +32,17 @@ from backend.utils.logger import get_logger
 from backend.core.errors import external_service_error, APIError, ErrorCodes
 from backend.utils.model_pricing import (
     calculate_llm_cost,
+    calculate_llm_cost_with_cache,
     get_available_models,
     ModelType,
 )
+from backend.utils.prompt_caching import (
+    anthropic_cache_tokens,
+    anthropic_text_block,
+    gemini_usage,
+    is_cacheable_prefix,
+    openai_cached_tokens,
+)
 from backend.utils.retry import (
     retry_with_backoff,
     RetryableError,
@@ -42,6 +57,9 @@ logger = get_logger(__name__)
 # Key: session_id, Value: List of messages
 _chat_memory: Dict[str, List[Dict[str, Any]]] = {}
 
+# First Azure OpenAI API version that accepts stream_options
+_AZURE_STREAM_USAGE_API_VERSION = "2024-09-01"
+
 
 class ChatNode(BaseNode):
     """
@@ -126,6 +144,93 @@ class ChatNode(BaseNode):
         
         return rendered
 
+    def _render_prompt_parts(
+        self,
+        template: str,
+        inputs: Dict[str, Any],
+    ) -> Tuple[str, str]:
+        """
+        Render a template as (document prefix, remainder).
+        
+        The prefix runs through the last {context} or {results} placeholder,
+        so documents placed before the question form a prefix that providers
+        can cache. Without such a placeholder the prefix is empty.
+        """
+        ends = [template.rfind(p) + len(p) for p in ("{context}", "{results}") if p in template]
+        if not ends:
+            return "", self._render_template(template, inputs)
+        split = max(ends)
+        return self._render_template(template[:split], inputs), self._render_template(template[split:], inputs)
+
+    def _pack_context(
+        self,
+        template_inputs: Dict[str, Any],
+        config: Dict[str, Any],
+        provider: str,
+        model: str,
+        max_tokens: int,
+        system_prompt: str,
+        template: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fit retrieved results into the prompt's token budget before rendering.
+        
+        Replaces the ``context`` (or ``results``) list in ``template_inputs``
+        with its packed selection and returns the packed/dropped counts, or
+        None when nothing was packed.
+        """
+        if not settings.enable_context_packing or not config.get("pack_context", True):
+            return None
+        if "{context}" not in template and "{results}" not in template:
+            return None
+        key = "context" if isinstance(template_inputs.get("context"), list) else "results"
+        items = template_inputs.get(key)
+        if not isinstance(items, list) or not items:
+            return None
+        
+        prompt_tokens = count_tokens(system_prompt, model) + count_tokens(
+            self._render_template(template, {**template_inputs, "context": "", "results": ""}), model
+        )
+        budget = context_budget(provider, model, max_tokens, prompt_tokens, config.get("context_token_budget"))
+        packed = pack_context(items, budget, model)
+        template_inputs[key] = packed.items
+        return packed.stats()
+
+    def _response_cache_key(
+        self,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        params: Dict[str, Any],
+        config: Dict[str, Any],
+    ) -> Optional[str]:
+        """
+        Return the response cache key of a deterministic request, or None.
+        
+        Requests are cached at temperature 0 or with ``cache_response``
+        enabled. Conversations with memory are not cached, since every turn
+        must be recorded in the session.
+        """
+        if config.get("use_memory", False):
+            return None
+        if not is_cacheable(params.get("temperature"), config.get("cache_response", False)):
+            return None
+        return llm_cache_key(provider, model, messages, params)
+
+    async def _replay_cached_response(self, node_id: str, cached: Dict[str, Any]) -> Dict[str, Any]:
+        """Stream a cached response in pieces, like a live one, and return it at no cost."""
+        await self.stream_progress(node_id, 0.5, "Using cached response...")
+        text = cached.get("response", "")
+        words = re.split(r"(?<=\s)", text)
+        step = max(1, len(words) // 10)
+        for end in range(step, len(words), step):
+            await self.stream_output(node_id, "".join(words[:end]), partial=True)
+        await self.stream_output(node_id, text, partial=False)
+        await self.stream_progress(node_id, 1.0, "Chat completed (cached response)")
+        cached["cost"] = 0.0
+        cached["cache_hit"] = True
+        return cached
+
     async def _chat_openai(
         self,
         inputs: Dict[str, Any],
@@ -185,6 +290,10 @@ class ChatNode(BaseNode):
         if "query" not in template_inputs:
             template_inputs["query"] = config.get("query", "")
         
+        context_packing = self._pack_context(
+            template_inputs, config, "openai", model, max_tokens, system_prompt, user_prompt_template
+        )
+        
         # Render template
         user_prompt = self._render_template(user_prompt_template, template_inputs)
         
@@ -193,7 +302,7 @@ class ChatNode(BaseNode):
         api_key = resolve_api_key(config, "openai_api_key", user_id=user_id)
         if not api_key:
             raise ValueError("OpenAI API key not found. Please configure it in the node settings or environment variables.")
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         
         messages = []
         if system_prompt:
@@ -209,6 +318,13 @@ class ChatNode(BaseNode):
         
         messages.append({"role": "user", "content": user_prompt})
         
+        cache_key = self._response_cache_key(
+            "openai", model, messages, {"temperature": temperature, "max_tokens": max_tokens}, config
+        )
+        cached = get_llm_response_cache().get(cache_key) if cache_key else None
+        if cached is not None:
+            return await self._replay_cached_response(node_id, cached)
+        
         await self.stream_progress(node_id, 0.3, "Sending request to OpenAI...")
         
         try:
@@ -221,6 +337,8 @@ class ChatNode(BaseNode):
                         "messages": messages,
                         "temperature": temperature,
                         "stream": True,  # Enable streaming
+                        # Usage (including cached prompt tokens) arrives in the last chunk
+                        "stream_options": {"include_usage": True},
                     }
                     
                     # Use max_completion_tokens for newer models, max_tokens for others
@@ -229,7 +347,13 @@ class ChatNode(BaseNode):
                     else:
                         request_params["max_tokens"] = max_tokens
                     
-                    return client.chat.completions.create(**request_params)
+                    # Deterministic requests are hedged on time to first response
+                    return await hedged(
+                        f"chat:openai:{model}",
+                        lambda: client.chat.completions.create(**request_params),
+                        idempotent=temperature == 0,
+                        discard=lambda stream: stream.close(),
+                    )
                 except Exception as e:
                     # Classify the error and raise appropriate retry exception
                     classified_error = classify_openai_error(e)
@@ -248,10 +372,11 @@ class ChatNode(BaseNode):
             result_chunks = []
             result = ""
             usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+            cached_tokens = 0
             
             await self.stream_progress(node_id, 0.5, "Receiving response...")
             
-            for chunk in stream:
+            async for chunk in stream:
                 if chunk.choices and chunk.choices[0].delta.content:
                     content = chunk.choices[0].delta.content
                     result_chunks.append(content)
@@ -268,6 +393,7 @@ class ChatNode(BaseNode):
                         "completion_tokens": chunk.usage.completion_tokens or 0,
                         "total_tokens": chunk.usage.total_tokens or 0,
                     }
+                    cached_tokens = openai_cached_tokens(chunk.usage)
             
             # Final output
             await self.stream_output(node_id, result, partial=False)
@@ -281,8 +407,10 @@ class ChatNode(BaseNode):
                     "total_tokens": (len(user_prompt) + len(result)) // 4,
                 }
             
-            # Calculate cost based on model using centralized pricing
-            cost = calculate_llm_cost("openai", model, usage["prompt_tokens"], usage["completion_tokens"])
+            # Calculate cost based on model using centralized pricing (cached prompt prefix at the cached rate)
+            cost = calculate_llm_cost_with_cache(
+                "openai", model, usage["prompt_tokens"], usage["completion_tokens"], cached_tokens=cached_tokens
+            )
             
             # Store in memory if enabled
             if use_memory:
@@ -313,8 +441,10 @@ class ChatNode(BaseNode):
                     "input": usage["prompt_tokens"],
                     "output": usage["completion_tokens"],
                     "total": usage["total_tokens"],
+                    "cached_input": cached_tokens,
                 },
                 "cost": cost,
+                "context_packing": context_packing,
                 "memory_used": use_memory,
                 "session_id": session_id if use_memory else None,
             }
@@ -324,6 +454,9 @@ class ChatNode(BaseNode):
                 result_data["finetuned_model_id"] = finetuned_model_id
                 result_data["is_finetuned"] = True
             
+            if cache_key:
+                get_llm_response_cache().put(cache_key, result_data)
+            
             return result_data
         except Exception as e:
             logger.error(f"OpenAI chat error: {e}")
@@ -371,7 +504,7 @@ class ChatNode(BaseNode):
         user_id = config.get("_user_id")
         api_key = resolve_api_key(config, "azure_openai_api_key", user_id=user_id) or config.get("azure_api_key")
         endpoint = config.get("azure_openai_endpoint") or config.get("azure_endpoint")
-        api_version = config.get("azure_openai_api_version", "2024-02-15-preview")
+        api_version = config.get("azure_openai_api_version", "2024-10-21")
         deployment_name = config.get("azure_openai_deployment") or config.get("azure_deployment")
         
         if not api_key or not endpoint or not deployment_name:
@@ -407,18 +540,18 @@ class ChatNode(BaseNode):
         if "query" not in template_inputs:
             template_inputs["query"] = config.get("query", "")
         
+        # Azure deployments serve OpenAI models, so OpenAI context windows apply
+        context_packing = self._pack_context(
+            template_inputs, config, "openai", model, max_tokens, system_prompt, user_prompt_template
+        )
+        
         # Render template
         user_prompt = self._render_template(user_prompt_template, template_inputs)
         
-        # Create Azure OpenAI client
+        # Get shared Azure OpenAI client
         # Azure OpenAI uses the same OpenAI SDK but with different base URL and API key
         # The base_url should be the endpoint, and deployment name is used as the model parameter
-        client = OpenAI(
-            api_key=api_key,
-            base_url=f"{endpoint.rstrip('/')}/openai/deployments",
-            default_headers={"api-key": api_key},
-            default_query={"api-version": api_version},
-        )
+        client = get_azure_openai_client(api_key, endpoint, api_version)
         
         messages = []
         if system_prompt:
@@ -433,18 +566,34 @@ class ChatNode(BaseNode):
         
         messages.append({"role": "user", "content": user_prompt})
         
+        cache_key = self._response_cache_key(
+            "azure_openai",
+            deployment_name,
+            messages,
+            {"temperature": temperature, "max_tokens": max_tokens, "endpoint": endpoint},
+            config,
+        )
+        cached = get_llm_response_cache().get(cache_key) if cache_key else None
+        if cached is not None:
+            return await self._replay_cached_response(node_id, cached)
+        
         await self.stream_progress(node_id, 0.3, "Sending request to Azure OpenAI...")
         
         try:
             # Use streaming for real-time updates
             # For Azure OpenAI, the model parameter should be the deployment name
             # The base_url already includes the deployment path, but model is still required
-            stream = client.chat.completions.create(
+            stream_params = {}
+            if api_version[:10] >= _AZURE_STREAM_USAGE_API_VERSION:
+                # Usage (including cached prompt tokens) arrives in the last chunk
+                stream_params["stream_options"] = {"include_usage": True}
+            stream = await client.chat.completions.create(
                 model=deployment_name,  # Azure OpenAI uses deployment name as model
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens,
                 stream=True,
+                **stream_params,
             )
             
             # Collect streaming response
@@ -454,7 +603,8 @@ class ChatNode(BaseNode):
             
             await self.stream_progress(node_id, 0.5, "Receiving response...")
             
-            for chunk in stream:
+            cached_tokens = 0
+            async for chunk in stream:
                 if chunk.choices and len(chunk.choices) > 0:
                     delta = chunk.choices[0].delta
                     if delta and delta.content:
@@ -476,6 +626,7 @@ class ChatNode(BaseNode):
                         "completion_tokens": chunk.usage.completion_tokens or 0,
                         "total_tokens": chunk.usage.total_tokens or 0,
                     }
+                    cached_tokens = openai_cached_tokens(chunk.usage)
             
             # Save to memory if enabled
             if use_memory:
@@ -488,11 +639,13 @@ class ChatNode(BaseNode):
                     _chat_memory[session_id] = _chat_memory[session_id][-memory_limit * 2:]
             
             # Calculate cost (use OpenAI pricing as Azure OpenAI is similar)
-            cost = calculate_llm_cost("openai", model, usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+            cost = calculate_llm_cost_with_cache(
+                "openai", model, usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0), cached_tokens=cached_tokens
+            )
             
             await self.stream_progress(node_id, 1.0, "Response complete!")
             
-            return {
+            result_data = {
                 "output": result,
                 "response": result,
                 "text": result,
@@ -500,8 +653,18 @@ class ChatNode(BaseNode):
                 "model": model,
                 "deployment": deployment_name,
                 "usage": usage,
+                "tokens_used": {
+                    "input": usage["prompt_tokens"],
+                    "output": usage["completion_tokens"],
+                    "total": usage["total_tokens"],
+                    "cached_input": cached_tokens,
+                },
                 "cost": cost,
+                "context_packing": context_packing,
             }
+            if cache_key:
+                get_llm_response_cache().put(cache_key, result_data)
+            return result_data
         except Exception as e:
             logger.error(f"Azure OpenAI chat error: {e}")
             raise
@@ -512,13 +675,6 @@ class ChatNode(BaseNode):
         config: Dict[str, Any],
     ) -> Dict[str, Any]:
         """Generate response using Anthropic Claude with streaming support."""
-        try:
-            from anthropic import Anthropic
-        except ImportError:
-            raise ValueError(
-                "anthropic not installed. Install it with: pip install anthropic"
-            )
-        
         # Resolve API key from vault, config, or settings
         user_id = config.get("_user_id")
         api_key = resolve_api_key(config, "anthropic_api_key", user_id=user_id)
@@ -548,10 +704,34 @@ class ChatNode(BaseNode):
         if "query" not in template_inputs:
             template_inputs["query"] = config.get("query", "")
         
-        # Render template
-        user_prompt = self._render_template(user_prompt_template, template_inputs)
+        context_packing = self._pack_context(
+            template_inputs, config, "anthropic", model, max_tokens, system_prompt, user_prompt_template
+        )
+        
+        # Render template; documents before the question can be cached as a prefix
+        context_prefix, question = self._render_prompt_parts(user_prompt_template, template_inputs)
+        user_prompt = context_prefix + question
+        
+        # Cache breakpoints: after the system prompt, and after pinned documents when enabled
+        system = None
+        if system_prompt:
+            system = [anthropic_text_block(system_prompt, cache=is_cacheable_prefix(system_prompt))]
+        user_content: Any = user_prompt
+        if config.get("cache_context", False) and question and is_cacheable_prefix(context_prefix):
+            user_content = [anthropic_text_block(context_prefix, cache=True), anthropic_text_block(question)]
+        
+        client = get_anthropic_client(api_key)
         
-        client = Anthropic(api_key=api_key)
+        cache_key = self._response_cache_key(
+            "anthropic",
+            model,
+            [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+            {"temperature": temperature, "max_tokens": max_tokens},
+            config,
+        )
+        cached = get_llm_response_cache().get(cache_key) if cache_key else None
+        if cached is not None:
+            return await self._replay_cached_response(node_id, cached)
         
         await self.stream_progress(node_id, 0.3, "Sending request to Anthropic...")
         
@@ -559,15 +739,17 @@ class ChatNode(BaseNode):
             # Create a retry-wrapped function for the Anthropic API call
             async def make_anthropic_request():
                 try:
-                    return client.messages.stream(
-                        model=model,
-                        max_tokens=max_tokens,
-                        temperature=temperature,
-                        system=system_prompt if system_prompt else None,
-                        messages=[
-                            {"role": "user", "content": user_prompt}
+                    request_params = {
+                        "model": model,
+                        "max_tokens": max_tokens,
+                        "temperature": temperature,
+                        "messages": [
+                            {"role": "user", "content": user_content}
                         ],
-                    )
+                    }
+                    if system:
+                        request_params["system"] = system
+                    return client.messages.stream(**request_params)
                 except Exception as e:
                     # Classify the error and raise appropriate retry exception
                     classified_error = classify_anthropic_error(e)
@@ -583,13 +765,13 @@ class ChatNode(BaseNode):
             )
             
             # Use streaming for real-time updates
-            with stream_context as stream:
+            async with stream_context as stream:
                 result_chunks = []
                 result = ""
                 
                 await self.stream_progress(node_id, 0.5, "Receiving response...")
                 
-                for text in stream.text_stream:
+                async for text in stream.text_stream:
                     result_chunks.append(text)
                     result += text
                     
@@ -598,29 +780,46 @@ class ChatNode(BaseNode):
                         await self.stream_output(node_id, result, partial=True)
                 
                 # Get final message with usage
-                message = stream.get_final_message()
+                message = await stream.get_final_message()
                 usage = message.usage
             
             # Final output
             await self.stream_output(node_id, result, partial=False)
             await self.stream_progress(node_id, 0.9, "Response complete")
             
+            # input_tokens excludes the prompt tokens read from or written to the cache
+            cache_read_tokens, cache_write_tokens = anthropic_cache_tokens(usage)
+            input_tokens = usage.input_tokens + cache_read_tokens + cache_write_tokens
+            
             # Calculate cost using centralized pricing
-            cost = calculate_llm_cost("anthropic", model, usage.input_tokens, usage.output_tokens)
+            cost = calculate_llm_cost_with_cache(
+                "anthropic",
+                model,
+                input_tokens,
+                usage.output_tokens,
+                cached_tokens=cache_read_tokens,
+                cache_write_tokens=cache_write_tokens,
+            )
             
             await self.stream_progress(node_id, 1.0, "Chat completed")
             
-            return {
+            result_data = {
                 "response": result,
                 "provider": "anthropic",
                 "model": model,
                 "tokens_used": {
-                    "input": usage.input_tokens,
+                    "input": input_tokens,
                     "output": usage.output_tokens,
-                    "total": usage.input_tokens + usage.output_tokens,
+                    "total": input_tokens + usage.output_tokens,
+                    "cached_input": cache_read_tokens,
+                    "cache_write": cache_write_tokens,
                 },
                 "cost": cost,
+                "context_packing": context_packing,
             }
+            if cache_key:
+                get_llm_response_cache().put(cache_key, result_data)
+            return result_data
         except Exception as e:
             logger.error(f"Anthropic chat error: {e}")
             error_message = str(e).lower()
@@ -698,10 +897,14 @@ class ChatNode(BaseNode):
         if "query" not in template_inputs:
             template_inputs["query"] = config.get("query", "")
         
+        context_packing = self._pack_context(
+            template_inputs, config, "gemini", model, max_tokens, system_prompt, user_prompt_template
+        )
+        
         # Render template
         user_prompt = self._render_template(user_prompt_template, template_inputs)
         
-        client = genai.Client(api_key=api_key)
+        client = get_gemini_client(api_key)
         
         await self.stream_progress(node_id, 0.3, "Sending request to Gemini...")
         
@@ -765,11 +968,25 @@ class ChatNode(BaseNode):
             
             generate_config = types.GenerateContentConfig(**gen_config)
             
+            # Grounded responses (URL Context, File Search) depend on live content
+            cache_key = None
+            if not tools:
+                cache_key = self._response_cache_key(
+                    "gemini", model, messages, {"temperature": temperature, "max_tokens": max_tokens}, config
+                )
+            cached = get_llm_response_cache().get(cache_key) if cache_key else None
+            if cached is not None:
+                return await self._replay_cached_response(node_id, cached)
+            
             # Generate response
-            response = client.models.generate_content(
-                model=model,
-                contents=messages,
-                config=generate_config,
+            response = await hedged(
+                f"chat:gemini:{model}",
+                lambda: client.aio.models.generate_content(
+                    model=model,
+                    contents=messages,
+                    config=generate_config,
+                ),
+                idempotent=temperature == 0,
             )
             
             result = response.text if hasattr(response, 'text') else str(response)
@@ -794,12 +1011,18 @@ class ChatNode(BaseNode):
                                 citation_info["uri"] = getattr(rc, 'uri', None)
                             citations.append(citation_info)
             
-            # Estimate token usage (Gemini API doesn't always return usage)
-            estimated_input_tokens = len(user_prompt) // 4
-            estimated_output_tokens = len(result) // 4
+            # Use reported usage (implicitly cached prefix included); estimate when it is missing
+            tokens_used = gemini_usage(response) or {
+                "input": len(user_prompt) // 4,
+                "output": len(result) // 4,
+                "cached_input": 0,
+            }
+            tokens_used["total"] = tokens_used["input"] + tokens_used["output"]
             
             # Calculate cost
-            cost = calculate_llm_cost("gemini", model, estimated_input_tokens, estimated_output_tokens)
+            cost = calculate_llm_cost_with_cache(
+                "gemini", model, tokens_used["input"], tokens_used["output"], cached_tokens=tokens_used["cached_input"]
+            )
             
             await self.stream_progress(node_id, 1.0, "Chat completed")
             
@@ -807,12 +1030,9 @@ class ChatNode(BaseNode):
                 "response": result,
                 "provider": "gemini",
                 "model": model,
-                "tokens_used": {
-                    "input": estimated_input_tokens,
-                    "output": estimated_output_tokens,
-                    "total": estimated_input_tokens + estimated_output_tokens,
-                },
+                "tokens_used": tokens_used,
                 "cost": cost,
+                "context_packing": context_packing,
             }
             
             if file_search_used:
@@ -820,6 +1040,9 @@ class ChatNode(BaseNode):
                 if citations:
                     response_data["citations"] = citations
             
+            if cache_key:
+                get_llm_response_cache().put(cache_key, response_data)
+            
             return response_data
         except Exception as e:
             logger.error(f"Gemini chat error: {e}")
@@ -956,6 +1179,30 @@ class ChatNode(BaseNode):
                     "minimum": 0.0,
                     "maximum": 2.0,
                 },
+                "cache_response": {
+                    "type": "boolean",
+                    "title": "Cache Responses",
+                    "description": "Reuse the response to an identical request even above temperature 0 (always on at temperature 0)",
+                    "default": False,
+                },
+                "pack_context": {
+                    "type": "boolean",
+                    "title": "Pack Context",
+                    "description": "Order retrieved results by score, drop near-duplicates and fit them to the token budget",
+                    "default": True,
+                },
+                "context_token_budget": {
+                    "type": "integer",
+                    "title": "Context Token Budget",
+                    "description": "Maximum tokens of retrieved context in the prompt (empty = server default, 0 = limited only by the model's context window)",
+                    "minimum": 0,
+                },
+                "cache_context": {
+                    "type": "boolean",
+                    "title": "Cache Context",
+                    "description": "Mark the documents before the question as a provider prompt-cache prefix (Anthropic); use for pinned documents reused across queries",
+                    "default": False,
+                },
                 "max_tokens": {
                     "type": "integer",
                     "title": "Max Tokens",
@@ -1114,8 +1361,8 @@ class ChatNode(BaseNode):
                 "azure_openai_api_version": {
                     "type": "string",
                     "title": "API Version",
-                    "description": "Azure OpenAI API version",
-                    "default": "2024-02-15-preview",
+                    "description": "Azure OpenAI API version (2024-09-01-preview or later reports cached prompt tokens)",
+                    "default": "2024-10-21",
                 },
                 "azure_openai_model": {
                     "type": "string",
@@ -8,6 +8,7 @@ import base64
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from backend.core.client_pool import get_openai_client
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
 from backend.core.secret_resolver import resolve_api_key
@@ -87,7 +88,6 @@ class VisionNode(BaseNode):
         
         # Call OpenAI Vision API
         try:
-            from openai import AsyncOpenAI
             import os
             
             user_id = config.get("_user_id")
@@ -95,7 +95,7 @@ class VisionNode(BaseNode):
             if not api_key:
                 raise ValueError("OpenAI API key not found. Please configure it in the node settings or set OPENAI_API_KEY environment variable")
             
-            client = AsyncOpenAI(api_key=api_key)
+            client = get_openai_client(api_key)
             
             # Determine image format from data
             image_format = "png"  # Default
@@ -22,12 +22,18 @@ from typing import Any, Dict, List, Optional
 import json
 import hashlib
 
+from backend.core.model_residency import get_model_manager
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
 from backend.nodes.base import BaseNode
 from backend.utils.logger import get_logger
 from backend.core.cache import get_cache
 from backend.core.secret_resolver import resolve_api_key
+from backend.core.client_pool import (
+    get_anthropic_client,
+    get_azure_openai_client,
+    get_openai_client,
+)
 
 logger = get_logger(__name__)
 
@@ -422,20 +428,22 @@ class AdvancedNLPNode(BaseNode):
             raise ValueError(f"Unsupported provider for translation: {provider}")
 
     # HuggingFace Implementations
+    async def _load_pipeline(self, task: str, model_name: str, **options: Any) -> Any:
+        """Get a shared HuggingFace pipeline, loading it once per process."""
+        try:
+            return await get_model_manager().aget("transformers", model_name, task=task, **options)
+        except ImportError:
+            raise ValueError("transformers not installed. Install with: pip install transformers torch")
+
     async def _summarize_huggingface(
         self, text: str, config: Dict[str, Any], node_id: str, max_length: int, min_length: int
     ) -> Dict[str, Any]:
         """Summarize using HuggingFace."""
-        try:
-            from transformers import pipeline
-        except ImportError:
-            raise ValueError("transformers not installed. Install with: pip install transformers torch")
-        
         model_name = config.get("hf_model", "facebook/bart-large-cnn")
         
         await self.stream_progress(node_id, 0.4, f"Loading model {model_name}...")
         
-        summarizer = pipeline("summarization", model=model_name)
+        summarizer = await self._load_pipeline("summarization", model_name)
         
         await self.stream_progress(node_id, 0.6, "Generating summary...")
         
@@ -456,16 +464,11 @@ class AdvancedNLPNode(BaseNode):
 
     async def _ner_huggingface(self, text: str, config: Dict[str, Any], node_id: str) -> Dict[str, Any]:
         """Extract named entities using HuggingFace."""
-        try:
-            from transformers import pipeline
-        except ImportError:
-            raise ValueError("transformers not installed. Install with: pip install transformers torch")
-        
         model_name = config.get("hf_model", "dbmdz/bert-large-cased-finetuned-conll03-english")
         
         await self.stream_progress(node_id, 0.4, f"Loading model {model_name}...")
         
-        ner = pipeline("ner", model=model_name, aggregation_strategy="simple")
+        ner = await self._load_pipeline("ner", model_name, aggregation_strategy="simple")
         
         await self.stream_progress(node_id, 0.6, "Extracting entities...")
         
@@ -500,23 +503,19 @@ class AdvancedNLPNode(BaseNode):
         self, text: str, categories: List[str], config: Dict[str, Any], node_id: str
     ) -> Dict[str, Any]:
         """Classify text using HuggingFace."""
-        try:
-            from transformers import pipeline
-        except ImportError:
-            raise ValueError("transformers not installed. Install with: pip install transformers torch")
-        
         model_name = config.get("hf_model", "distilbert-base-uncased-finetuned-sst-2-english")
         
         await self.stream_progress(node_id, 0.4, f"Loading model {model_name}...")
         
-        classifier = pipeline("text-classification", model=model_name)
+        # If custom categories, use zero-shot classification
+        if categories:
+            classifier = await self._load_pipeline("zero-shot-classification", "facebook/bart-large-mnli")
+        else:
+            classifier = await self._load_pipeline("text-classification", model_name)
         
         await self.stream_progress(node_id, 0.6, "Classifying text...")
         
-        # If custom categories, use zero-shot classification
         if categories:
-            from transformers import pipeline as pl
-            classifier = pl("zero-shot-classification", model="facebook/bart-large-mnli")
             result = classifier(text, categories)
             label = result["labels"][0]
             score = result["scores"][0]
@@ -547,16 +546,11 @@ class AdvancedNLPNode(BaseNode):
 
     async def _sentiment_huggingface(self, text: str, config: Dict[str, Any], node_id: str) -> Dict[str, Any]:
         """Analyze sentiment using HuggingFace."""
-        try:
-            from transformers import pipeline
-        except ImportError:
-            raise ValueError("transformers not installed. Install with: pip install transformers torch")
-        
         model_name = config.get("hf_model", "cardiffnlp/twitter-roberta-base-sentiment-latest")
         
         await self.stream_progress(node_id, 0.4, f"Loading model {model_name}...")
         
-        sentiment = pipeline("sentiment-analysis", model=model_name)
+        sentiment = await self._load_pipeline("sentiment-analysis", model_name)
         
         await self.stream_progress(node_id, 0.6, "Analyzing sentiment...")
         
@@ -589,16 +583,11 @@ class AdvancedNLPNode(BaseNode):
         self, text: str, question: str, config: Dict[str, Any], node_id: str
     ) -> Dict[str, Any]:
         """Answer question using HuggingFace."""
-        try:
-            from transformers import pipeline
-        except ImportError:
-            raise ValueError("transformers not installed. Install with: pip install transformers torch")
-        
         model_name = config.get("hf_model", "distilbert-base-cased-distilled-squad")
         
         await self.stream_progress(node_id, 0.4, f"Loading model {model_name}...")
         
-        qa = pipeline("question-answering", model=model_name)
+        qa = await self._load_pipeline("question-answering", model_name)
         
         await self.stream_progress(node_id, 0.6, "Answering question...")
         
@@ -622,17 +611,12 @@ class AdvancedNLPNode(BaseNode):
         self, text: str, source_lang: str, target_lang: str, config: Dict[str, Any], node_id: str
     ) -> Dict[str, Any]:
         """Translate text using HuggingFace."""
-        try:
-            from transformers import pipeline
-        except ImportError:
-            raise ValueError("transformers not installed. Install with: pip install transformers torch")
-        
         # Map language codes to model names
         model_name = config.get("hf_model", "Helsinki-NLP/opus-mt-en-de")
         
         await self.stream_progress(node_id, 0.4, f"Loading model {model_name}...")
         
-        translator = pipeline("translation", model=model_name)
+        translator = await self._load_pipeline("translation", model_name)
         
         await self.stream_progress(node_id, 0.6, "Translating...")
         
@@ -656,20 +640,19 @@ class AdvancedNLPNode(BaseNode):
         self, text: str, config: Dict[str, Any], node_id: str, max_length: int, min_length: int
     ) -> Dict[str, Any]:
         """Summarize using OpenAI."""
-        from openai import OpenAI
         from backend.config import settings
 
         user_id = config.get("_user_id")
         api_key = resolve_api_key(config, "openai_api_key", user_id=user_id) or settings.openai_api_key
         model = config.get("openai_model", "gpt-4o-mini")
 
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
 
         await self.stream_progress(node_id, 0.5, "Generating summary with OpenAI...")
 
         prompt = f"Summarize the following text in approximately {max_length} words:\n\n{text}"
 
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
@@ -702,14 +685,13 @@ class AdvancedNLPNode(BaseNode):
 
     async def _ner_openai(self, text: str, config: Dict[str, Any], node_id: str) -> Dict[str, Any]:
         """Extract named entities using OpenAI."""
-        from openai import OpenAI
         from backend.config import settings
 
         user_id = config.get("_user_id")
         api_key = resolve_api_key(config, "openai_api_key", user_id=user_id) or settings.openai_api_key
         model = config.get("openai_model", "gpt-4o-mini")
 
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
 
         await self.stream_progress(node_id, 0.5, "Extracting entities with OpenAI...")
 
@@ -723,7 +705,7 @@ Text: {text}
 
 Return only valid JSON."""
 
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.1,
@@ -768,14 +750,13 @@ Return only valid JSON."""
         self, text: str, categories: List[str], config: Dict[str, Any], node_id: str
     ) -> Dict[str, Any]:
         """Classify text using OpenAI."""
-        from openai import OpenAI
         from backend.config import settings
         
         user_id = config.get("_user_id")
         api_key = resolve_api_key(config, "openai_api_key", user_id=user_id) or settings.openai_api_key
         model = config.get("openai_model", "gpt-4o-mini")
         
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         
         await self.stream_progress(node_id, 0.5, "Classifying with OpenAI...")
         
@@ -789,7 +770,7 @@ Return a JSON object with:
 - "score": confidence score (0-1)
 - "reasoning": brief explanation"""
         
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
@@ -826,14 +807,13 @@ Return a JSON object with:
         self, text: str, extraction_schema: Dict[str, Any], config: Dict[str, Any], node_id: str
     ) -> Dict[str, Any]:
         """Extract structured information using OpenAI."""
-        from openai import OpenAI
         from backend.config import settings
         
         user_id = config.get("_user_id")
         api_key = resolve_api_key(config, "openai_api_key", user_id=user_id) or settings.openai_api_key
         model = config.get("openai_model", "gpt-4o-mini")
         
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         
         await self.stream_progress(node_id, 0.5, "Extracting information with OpenAI...")
         
@@ -847,7 +827,7 @@ Text: {text}
 
 Return a JSON object matching the schema."""
         
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.1,
@@ -880,14 +860,13 @@ Return a JSON object matching the schema."""
 
     async def _sentiment_openai(self, text: str, config: Dict[str, Any], node_id: str) -> Dict[str, Any]:
         """Analyze sentiment using OpenAI."""
-        from openai import OpenAI
         from backend.config import settings
         
         user_id = config.get("_user_id")
         api_key = resolve_api_key(config, "openai_api_key", user_id=user_id) or settings.openai_api_key
         model = config.get("openai_model", "gpt-4o-mini")
         
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         
         await self.stream_progress(node_id, 0.5, "Analyzing sentiment with OpenAI...")
         
@@ -898,7 +877,7 @@ Return a JSON object matching the schema."""
 
 Text: {text}"""
         
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
@@ -934,14 +913,13 @@ Text: {text}"""
         self, text: str, question: str, config: Dict[str, Any], node_id: str
     ) -> Dict[str, Any]:
         """Answer question using OpenAI."""
-        from openai import OpenAI
         from backend.config import settings
         
         user_id = config.get("_user_id")
         api_key = resolve_api_key(config, "openai_api_key", user_id=user_id) or settings.openai_api_key
         model = config.get("openai_model", "gpt-4o-mini")
         
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         
         await self.stream_progress(node_id, 0.5, "Answering question with OpenAI...")
         
@@ -953,7 +931,7 @@ Question: {question}
 
 Answer:"""
         
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
@@ -987,14 +965,13 @@ Answer:"""
         self, text: str, source_lang: str, target_lang: str, config: Dict[str, Any], node_id: str
     ) -> Dict[str, Any]:
         """Translate text using OpenAI."""
-        from openai import OpenAI
         from backend.config import settings
 
         user_id = config.get("_user_id")
         api_key = resolve_api_key(config, "openai_api_key", user_id=user_id) or settings.openai_api_key
         model = config.get("openai_model", "gpt-4o-mini")
 
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
 
         await self.stream_progress(node_id, 0.5, "Translating with OpenAI...")
 
@@ -1015,7 +992,7 @@ Answer:"""
 
         prompt = f"Translate the following text from {source_lang_name} to {target_lang_name}:\n\n{text}"
 
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
@@ -1061,13 +1038,13 @@ Answer:"""
         api_key = resolve_api_key(config, "anthropic_api_key", user_id=user_id) or settings.anthropic_api_key
         model = config.get("anthropic_model", "claude-sonnet-4-5-20250929")
         
-        client = anthropic.Anthropic(api_key=api_key)
+        client = get_anthropic_client(api_key)
         
         await self.stream_progress(node_id, 0.5, "Generating summary with Anthropic...")
         
         prompt = f"Summarize the following text in approximately {max_length} words:\n\n{text}"
         
-        message = client.messages.create(
+        message = await client.messages.create(
             model=model,
             max_tokens=1024,
             messages=[{"role": "user", "content": prompt}],
@@ -1099,7 +1076,7 @@ Answer:"""
         api_key = resolve_api_key(config, "anthropic_api_key", user_id=user_id) or settings.anthropic_api_key
         model = config.get("anthropic_model", "claude-sonnet-4-5-20250929")
         
-        client = anthropic.Anthropic(api_key=api_key)
+        client = get_anthropic_client(api_key)
         
         await self.stream_progress(node_id, 0.5, "Extracting entities with Anthropic...")
         
@@ -1113,7 +1090,7 @@ Text: {text}
 
 Return only valid JSON."""
         
-        message = client.messages.create(
+        message = await client.messages.create(
             model=model,
             max_tokens=1024,
             messages=[{"role": "user", "content": prompt}],
@@ -1156,7 +1133,7 @@ Return only valid JSON."""
         api_key = resolve_api_key(config, "anthropic_api_key", user_id=user_id) or settings.anthropic_api_key
         model = config.get("anthropic_model", "claude-sonnet-4-5-20250929")
         
-        client = anthropic.Anthropic(api_key=api_key)
+        client = get_anthropic_client(api_key)
         
         await self.stream_progress(node_id, 0.5, "Classifying with Anthropic...")
         
@@ -1170,7 +1147,7 @@ Return a JSON object with:
 - "score": confidence score (0-1)
 - "reasoning": brief explanation"""
         
-        message = client.messages.create(
+        message = await client.messages.create(
             model=model,
             max_tokens=1024,
             messages=[{"role": "user", "content": prompt}],
@@ -1205,7 +1182,7 @@ Return a JSON object with:
         api_key = resolve_api_key(config, "anthropic_api_key", user_id=user_id) or settings.anthropic_api_key
         model = config.get("anthropic_model", "claude-sonnet-4-5-20250929")
         
-        client = anthropic.Anthropic(api_key=api_key)
+        client = get_anthropic_client(api_key)
         
         await self.stream_progress(node_id, 0.5, "Extracting information with Anthropic...")
         
@@ -1219,7 +1196,7 @@ Text: {text}
 
 Return a JSON object matching the schema."""
         
-        message = client.messages.create(
+        message = await client.messages.create(
             model=model,
             max_tokens=2048,
             messages=[{"role": "user", "content": prompt}],
@@ -1252,7 +1229,7 @@ Return a JSON object matching the schema."""
         api_key = resolve_api_key(config, "anthropic_api_key", user_id=user_id) or settings.anthropic_api_key
         model = config.get("anthropic_model", "claude-sonnet-4-5-20250929")
         
-        client = anthropic.Anthropic(api_key=api_key)
+        client = get_anthropic_client(api_key)
         
         await self.stream_progress(node_id, 0.5, "Answering question with Anthropic...")
         
@@ -1264,7 +1241,7 @@ Question: {question}
 
 Answer:"""
         
-        message = client.messages.create(
+        message = await client.messages.create(
             model=model,
             max_tokens=1024,
             messages=[{"role": "user", "content": prompt}],
@@ -1289,7 +1266,6 @@ Answer:"""
     ) -> Dict[str, Any]:
         """Summarize using Azure Cognitive Services (via Azure OpenAI or Text Analytics)."""
         # Azure Text Analytics doesn't have summarization, use Azure OpenAI instead
-        from openai import OpenAI
         from backend.config import settings
         
         api_key = resolve_api_key(config, "azure_openai_api_key", user_id=user_id) or config.get("azure_api_key")
@@ -1303,18 +1279,13 @@ Answer:"""
                 "Set azure_openai_api_key, azure_openai_endpoint, and azure_openai_deployment."
             )
         
-        client = OpenAI(
-            api_key=api_key,
-            base_url=f"{endpoint.rstrip('/')}/openai/deployments",
-            default_headers={"api-key": api_key},
-            default_query={"api-version": api_version},
-        )
+        client = get_azure_openai_client(api_key, endpoint, api_version)
         
         await self.stream_progress(node_id, 0.5, "Generating summary with Azure OpenAI...")
         
         prompt = f"Summarize the following text in approximately {max_length} words:\n\n{text}"
         
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=deployment_name,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
@@ -1394,7 +1365,6 @@ Answer:"""
     ) -> Dict[str, Any]:
         """Classify text using Azure Cognitive Services (via Azure OpenAI)."""
         # Azure Text Analytics doesn't have custom classification, use Azure OpenAI
-        from openai import OpenAI
         from backend.config import settings
         
         api_key = resolve_api_key(config, "azure_openai_api_key", user_id=user_id) or config.get("azure_api_key")
@@ -1408,12 +1378,7 @@ Answer:"""
                 "Set azure_openai_api_key, azure_openai_endpoint, and azure_openai_deployment."
             )
         
-        client = OpenAI(
-            api_key=api_key,
-            base_url=f"{endpoint.rstrip('/')}/openai/deployments",
-            default_headers={"api-key": api_key},
-            default_query={"api-version": api_version},
-        )
+        client = get_azure_openai_client(api_key, endpoint, api_version)
         
         await self.stream_progress(node_id, 0.5, "Classifying with Azure OpenAI...")
         
@@ -1427,7 +1392,7 @@ Return a JSON object with:
 - "score": confidence score (0-1)
 - "reasoning": brief explanation"""
         
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=deployment_name,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
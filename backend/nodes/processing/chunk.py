@@ -8,16 +8,36 @@ This node supports multiple text splitting strategies:
 - (More strategies can be added later)
 """
 
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
+from backend.core.record_stream import RecordStream, collect
 from backend.nodes.base import BaseNode
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _split_recursive(text: str, chunk_size: int, chunk_overlap: int, separators: Optional[List[str]]) -> List[str]:
+    """Split text with LangChain's RecursiveCharacterTextSplitter."""
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=separators,
+        length_function=len,
+    ).split_text(text)
+
+
+def _split_sentences(text: str) -> List[str]:
+    """Split text into sentences with NLTK."""
+    from nltk.tokenize import sent_tokenize
+    
+    return sent_tokenize(text)
+
+
 class ChunkNode(BaseNode):
     """
     Generic Chunk Node.
@@ -30,6 +50,9 @@ class ChunkNode(BaseNode):
     name = "Chunk"
     description = "Split text into chunks using various strategies (Recursive, Fixed Size, Semantic, etc.)"
     category = "processing"
+    pure = True
+    accepts_streams = True
+    emits_streams = True
 
     async def execute(
         self,
@@ -52,6 +75,14 @@ class ChunkNode(BaseNode):
             }
         
         strategy = config.get("strategy", "recursive")
+        
+        # Streaming edge: chunk text as it arrives
+        text_stream = inputs.get("text_stream")
+        if isinstance(text_stream, RecordStream):
+            if strategy in ("recursive", "fixed_size"):
+                return await self._chunk_stream(text_stream, strategy, config, node_id)
+            inputs = {**inputs, "text": "".join(await collect(text_stream))}
+        
         text = inputs.get("text", "")
         
         if not text:
@@ -74,15 +105,113 @@ class ChunkNode(BaseNode):
         
         return result
 
+    def _splitter(self, strategy: str, config: Dict[str, Any]) -> Callable[[str], List[str]]:
+        """Return the split function of a window-safe strategy (recursive or fixed_size)."""
+        chunk_size = config.get("chunk_size", 512)
+        chunk_overlap = config.get("chunk_overlap", 50)
+        if strategy == "recursive":
+            try:
+                from langchain.text_splitter import RecursiveCharacterTextSplitter
+            except ImportError:
+                raise ValueError(
+                    "langchain not installed. Install it with: pip install langchain"
+                )
+            separators = config.get("separators", [])
+            return RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                separators=separators if separators else None,
+                length_function=len,
+            ).split_text
+        
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be greater than 0")
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be less than chunk_size")
+        step = chunk_size - chunk_overlap
+        return lambda text: [text[start:start + chunk_size] for start in range(0, len(text), step)]
+
+    async def _chunk_stream(
+        self,
+        text_stream: RecordStream,
+        strategy: str,
+        config: Dict[str, Any],
+        node_id: str,
+    ) -> Dict[str, Any]:
+        """
+        Chunk streamed text window by window.
+        
+        Each window is split and all but its last chunk are emitted; the last
+        chunk is carried over and re-split together with the following text,
+        so chunk boundaries follow those of splitting the whole text.
+        Emits a ``chunk_stream`` when streaming further downstream, otherwise
+        returns the collected chunks.
+        """
+        split = self._splitter(strategy, config)
+        chunk_size = config.get("chunk_size", 512)
+        chunk_overlap = config.get("chunk_overlap", 50)
+        window = max(chunk_size * 16, 16384)
+        summary: Dict[str, Any] = {"count": 0, "total_chars": 0}
+        
+        async def chunks() -> AsyncIterator[str]:
+            buffer = ""
+            async for piece in text_stream:
+                summary["total_chars"] += len(piece)
+                buffer += piece
+                if len(buffer) < window:
+                    continue
+                pieces = split(buffer)
+                if strategy == "fixed_size":
+                    # Only chunks that end inside the window are final
+                    step = chunk_size - chunk_overlap
+                    done = (len(buffer) - chunk_size) // step + 1
+                    emit, buffer = pieces[:done], buffer[done * step:]
+                else:
+                    if len(pieces) < 2:
+                        continue
+                    emit = pieces[:-1]
+                    tail_start = buffer.rfind(pieces[-1])
+                    buffer = buffer[tail_start:] if tail_start >= 0 else pieces[-1]
+                for chunk in emit:
+                    summary["count"] += 1
+                    yield chunk
+                await self.stream_progress(node_id, 0.5, f"Created {summary['count']} chunks...")
+            for chunk in split(buffer) if buffer else []:
+                summary["count"] += 1
+                yield chunk
+        
+        await self.stream_progress(node_id, 0.1, f"Streaming {strategy} chunking...")
+        result: Dict[str, Any] = {
+            "strategy": strategy,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+        }
+        if config.get("_stream_output"):
+            result["chunk_stream"] = RecordStream(chunks(), "chunk_stream", summary=summary)
+            return result
+        
+        chunk_list = await collect(chunks())
+        result.update({
+            "chunks": chunk_list,
+            "count": len(chunk_list),
+            "avg_chunk_size": int(sum(len(chunk) for chunk in chunk_list) / len(chunk_list)) if chunk_list else 0,
+            "metadata": {
+                "total_chars": summary["total_chars"],
+                "total_chunks": len(chunk_list),
+            },
+        })
+        await self.stream_progress(node_id, 1.0, f"Created {len(chunk_list)} chunks")
+        return result
+
     async def _chunk_recursive(
         self,
         text: str,
         config: Dict[str, Any],
         node_id: str,
     ) -> Dict[str, Any]:
-        """Chunk text using LangChain's RecursiveCharacterTextSplitter."""
+        """Chunk text using LangChain's RecursiveCharacterTextSplitter (in the compute pool)."""
         try:
-            from langchain.text_splitter import RecursiveCharacterTextSplitter
+            import langchain.text_splitter  # noqa: F401
         except ImportError:
             raise ValueError(
                 "langchain not installed. Install it with: pip install langchain"
@@ -95,18 +224,12 @@ class ChunkNode(BaseNode):
         
         await self.stream_progress(node_id, 0.3, f"Configuring splitter (size: {chunk_size}, overlap: {chunk_overlap})")
         
-        # Create splitter
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            separators=separators if separators else None,
-            length_function=len,
-        )
-        
         await self.stream_progress(node_id, 0.5, "Splitting text...")
         
         # Split text
-        chunks = splitter.split_text(text)
+        chunks = await self.run_cpu_bound(
+            _split_recursive, text, chunk_size, chunk_overlap, separators if separators else None
+        )
         
         # Calculate statistics
         avg_chunk_size = sum(len(chunk) for chunk in chunks) / len(chunks) if chunks else 0
@@ -184,7 +307,6 @@ class ChunkNode(BaseNode):
         """Chunk text using semantic/sentence-based splitting."""
         try:
             import nltk
-            from nltk.tokenize import sent_tokenize
             
             # Download punkt if not available
             try:
@@ -205,7 +327,7 @@ class ChunkNode(BaseNode):
         await self.stream_progress(node_id, 0.3, "Tokenizing sentences...")
         
         # Split into sentences
-        sentences = sent_tokenize(text)
+        sentences = await self.run_cpu_bound(_split_sentences, text)
         
         await self.stream_progress(node_id, 0.4, f"Found {len(sentences)} sentences, grouping into chunks...")
         
@@ -26,6 +26,7 @@ class DataToTextNode(BaseNode):
     name = "Data to Text"
     description = "Convert structured data (CSV, Excel, JSON) to natural language text for embedding."
     category = "processing"
+    pure = True
 
     async def execute(
         self,
@@ -7,7 +7,7 @@ Supports Tesseract OCR.
 
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
@@ -17,6 +17,18 @@ from backend.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _tesseract_ocr(image_path: str, language: str) -> Tuple[str, float]:
+    """Run Tesseract on an image; returns the text and the average word confidence (0-100)."""
+    import pytesseract
+    from PIL import Image
+    
+    with Image.open(image_path) as img:
+        text = pytesseract.image_to_string(img, lang=language)
+        data = pytesseract.image_to_data(img, lang=language, output_type=pytesseract.Output.DICT)
+    confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
+    return text, sum(confidences) / len(confidences) if confidences else 0.0
+
+
 class OCRNode(BaseNode):
     """
     OCR Node.
@@ -92,8 +104,8 @@ class OCRNode(BaseNode):
     async def _ocr_tesseract(self, image_path: Path, language: str, node_id: str) -> tuple[str, float]:
         """Extract text using Tesseract OCR."""
         try:
-            import pytesseract
-            from PIL import Image
+            import pytesseract  # noqa: F401
+            from PIL import Image  # noqa: F401
         except ImportError:
             raise ImportError(
                 "Tesseract OCR requires pytesseract and Pillow. "
@@ -102,22 +114,13 @@ class OCRNode(BaseNode):
             )
         
         try:
-            # Open image
-            await self.stream_progress(node_id, 0.6, "Loading image...")
-            with Image.open(image_path) as img:
-                # Run OCR
-                await self.stream_progress(node_id, 0.7, "Extracting text...")
-                text = pytesseract.image_to_string(img, lang=language)
-                
-                # Get confidence scores
-                await self.stream_progress(node_id, 0.8, "Calculating confidence...")
-                data = pytesseract.image_to_data(img, lang=language, output_type=pytesseract.Output.DICT)
-                
-                # Calculate average confidence
-                confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-                avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-                
-                return text.strip(), avg_confidence / 100.0  # Normalize to 0-1
+            # Tesseract runs as a subprocess, so a compute pool thread is enough
+            await self.stream_progress(node_id, 0.7, "Extracting text...")
+            text, avg_confidence = await self.run_cpu_bound(
+                _tesseract_ocr, str(image_path), language, executor="thread"
+            )
+            
+            return text.strip(), avg_confidence / 100.0  # Normalize to 0-1
         except Exception as e:
             logger.error(f"Tesseract OCR failed: {e}")
             raise ValueError(f"OCR extraction failed: {str(e)}")
@@ -8,6 +8,8 @@ import os
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from backend.core.client_pool import get_openai_client
+from backend.core.model_residency import get_model_manager
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
 from backend.core.secret_resolver import resolve_api_key
@@ -101,7 +103,6 @@ class TranscribeNode(BaseNode):
     ) -> tuple[str, Optional[list]]:
         """Transcribe using OpenAI Whisper API."""
         try:
-            from openai import AsyncOpenAI
             import os
             
             user_id = config.get("_user_id")
@@ -109,7 +110,7 @@ class TranscribeNode(BaseNode):
             if not api_key:
                 raise ValueError("OpenAI API key not found. Please configure it in the node settings or set OPENAI_API_KEY environment variable")
             
-            client = AsyncOpenAI(api_key=api_key)
+            client = get_openai_client(api_key)
             
             await self.stream_progress(node_id, 0.6, "Uploading audio to OpenAI...")
             
@@ -161,19 +162,17 @@ class TranscribeNode(BaseNode):
         self, audio_path: Path, model: str, language: Optional[str], node_id: str
     ) -> tuple[str, Optional[list]]:
         """Transcribe using local Whisper model."""
-        try:
-            import whisper
-        except ImportError:
-            raise ImportError(
-                "Local Whisper requires openai-whisper. "
-                "Install with: pip install openai-whisper"
-            )
-        
         try:
             await self.stream_progress(node_id, 0.6, f"Loading Whisper model: {model}...")
             
-            # Load model (this might take time on first run)
-            whisper_model = whisper.load_model(model)
+            # Load model once per process (this might take time on first run)
+            try:
+                whisper_model = await get_model_manager().aget("whisper", model)
+            except ImportError:
+                raise ImportError(
+                    "Local Whisper requires openai-whisper. "
+                    "Install with: pip install openai-whisper"
+                )
             
             await self.stream_progress(node_id, 0.7, "Transcribing audio...")
             
@@ -199,6 +198,8 @@ class TranscribeNode(BaseNode):
             
             return transcript, segments
             
+        except ImportError:
+            raise
         except Exception as e:
             logger.error(f"Local Whisper transcription failed: {e}")
             raise ValueError(f"Transcription failed: {str(e)}")
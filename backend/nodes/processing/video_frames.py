@@ -6,7 +6,7 @@ This node extracts frames from video files for processing.
 
 import base64
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
@@ -16,6 +16,22 @@ from backend.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _read_frame(cap: Any, frame_idx: int, frame_file: Optional[str], encode: bool) -> Tuple[bool, Optional[bytes]]:
+    """Seek to and decode one frame; optionally save it and return it JPEG-encoded."""
+    import cv2
+    
+    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+    ret, frame = cap.read()
+    if not ret:
+        return False, None
+    if frame_file:
+        cv2.imwrite(frame_file, frame)
+    if not encode:
+        return True, None
+    _, buffer = cv2.imencode('.jpg', frame)
+    return True, buffer.tobytes()
+
+
 class VideoFramesNode(BaseNode):
     """
     Video Frame Extractor Node.
@@ -116,8 +132,8 @@ class VideoFramesNode(BaseNode):
         try:
             await self.stream_progress(node_id, 0.6, "Opening video file...")
             
-            # Open video
-            cap = cv2.VideoCapture(str(video_path))
+            # Open video (OpenCV releases the GIL, so decoding runs in compute pool threads)
+            cap = await self.run_cpu_bound(cv2.VideoCapture, str(video_path), executor="thread")
             
             if not cap.isOpened():
                 raise ValueError(f"Failed to open video file: {video_path}")
@@ -158,10 +174,17 @@ class VideoFramesNode(BaseNode):
             
             await self.stream_progress(node_id, 0.7, f"Extracting {len(frame_indices)} frames...")
             
+            output_path = Path(output_dir) if output_dir else None
+            if output_path:
+                output_path.mkdir(parents=True, exist_ok=True)
+            
             # Extract frames
             for i, frame_idx in enumerate(frame_indices):
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = cap.read()
+                frame_file = output_path / f"frame_{frame_idx:06d}.jpg" if output_path else None
+                ret, jpeg = await self.run_cpu_bound(
+                    _read_frame, cap, frame_idx, str(frame_file) if frame_file else None, include_base64,
+                    executor="thread",
+                )
                 
                 if not ret:
                     continue
@@ -174,12 +197,8 @@ class VideoFramesNode(BaseNode):
                     "timestamp": timestamp,
                 }
                 
-                # Optionally save frame to file
-                if output_dir:
-                    output_path = Path(output_dir)
-                    output_path.mkdir(parents=True, exist_ok=True)
-                    frame_file = output_path / f"frame_{frame_idx:06d}.jpg"
-                    cv2.imwrite(str(frame_file), frame)
+                # Frame saved to file
+                if frame_file:
                     frame_data["file_path"] = str(frame_file)
                 
                 # Optionally include base64
@@ -188,10 +207,7 @@ class VideoFramesNode(BaseNode):
                         node_id, 0.7 + (i / len(frame_indices)) * 0.2,
                         f"Encoding frame {i+1}/{len(frame_indices)}..."
                     )
-                    # Encode frame as JPEG
-                    import numpy as np
-                    _, buffer = cv2.imencode('.jpg', frame)
-                    frame_base64 = base64.b64encode(buffer).decode('utf-8')
+                    frame_base64 = base64.b64encode(jpeg).decode('utf-8')
                     frame_data["base64"] = frame_base64
                     frame_data["data_url"] = f"data:image/jpeg;base64,{frame_base64}"
                 
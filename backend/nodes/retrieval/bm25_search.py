@@ -9,15 +9,11 @@ BM25 complements vector search:
 - BM25: Keyword matching (handles exact terms, technical terms, names)
 """
 
+import asyncio
+from contextlib import ExitStack
 from typing import Any, Dict, List, Optional
-import re
-from collections import defaultdict
-
-try:
-    from rank_bm25 import BM25Okapi
-except ImportError:
-    BM25Okapi = None
 
+from backend.core.bm25_index import BM25Index, build_postings, get_bm25_index_store
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
 from backend.nodes.base import BaseNode
@@ -25,20 +21,6 @@ from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# In-memory storage for BM25 indexes (similar to FAISS indexes)
-# Key: index_id, Value: BM25Okapi instance
-_bm25_indexes: Dict[str, BM25Okapi] = {}
-# Key: index_id, Value: List of documents (for result retrieval)
-_bm25_documents: Dict[str, List[Dict[str, Any]]] = {}
-
-
-def _tokenize(text: str) -> List[str]:
-    """Tokenize text into words (simple whitespace-based tokenization)."""
-    # Convert to lowercase and split on whitespace
-    # Remove punctuation and keep alphanumeric tokens
-    tokens = re.findall(r'\b\w+\b', text.lower())
-    return tokens
-
 
 class BM25SearchNode(BaseNode):
     """
@@ -82,13 +64,6 @@ class BM25SearchNode(BaseNode):
         
         await self.stream_progress(node_id, 0.1, "Starting BM25 search...")
         
-        # Check if rank-bm25 is installed
-        if BM25Okapi is None:
-            raise ImportError(
-                "rank-bm25 package is not installed.\n"
-                "Please install it with: pip install rank-bm25"
-            )
-        
         # Get documents to search
         # Option 1: From inputs (if documents are passed directly)
         documents = inputs.get("documents") or inputs.get("chunks") or []
@@ -119,105 +94,74 @@ class BM25SearchNode(BaseNode):
         
         await self.stream_progress(node_id, 0.3, f"Searching {len(documents) if documents else 'indexed'} documents...")
         
-        # Get or create BM25 index
-        if index_id and index_id in _bm25_indexes:
-            # Use existing index
-            bm25 = _bm25_indexes[index_id]
-            indexed_documents = _bm25_documents.get(index_id, [])
-            await self.stream_progress(node_id, 0.5, f"Using indexed BM25 index: {index_id}")
-        elif documents:
-            # Create new index from documents
-            await self.stream_progress(node_id, 0.4, f"Indexing {len(documents)} documents...")
+        # Stored indexes are memory-mapped from disk. A lease keeps one open while
+        # this query reads it, even if a rebuild replaces it in the meantime.
+        store = get_bm25_index_store()
+        with ExitStack() as leases:
+            # Get or create BM25 index
+            bm25 = leases.enter_context(store.lease(index_id)) if index_id else None
+            if bm25 is not None:
+                # Use existing index
+                await self.stream_progress(node_id, 0.5, f"Using indexed BM25 index: {index_id}")
+            elif documents:
+                # Create new index from documents
+                await self.stream_progress(node_id, 0.4, f"Indexing {len(documents)} documents...")
             
-            # Extract text from documents
-            document_texts = []
-            indexed_documents = []
+                # Extract text from documents
+                document_texts = []
+                indexed_documents = []
             
-            for doc in documents:
-                if isinstance(doc, str):
-                    text = doc
-                    doc_meta = {"text": text}
-                elif isinstance(doc, dict):
-                    text = doc.get("text") or doc.get("content") or str(doc)
-                    doc_meta = doc.copy()
-                else:
-                    text = str(doc)
-                    doc_meta = {"text": text}
+                for doc in documents:
+                    if isinstance(doc, str):
+                        text = doc
+                        doc_meta = {"text": text}
+                    elif isinstance(doc, dict):
+                        text = doc.get("text") or doc.get("content") or str(doc)
+                        doc_meta = doc.copy()
+                    else:
+                        text = str(doc)
+                        doc_meta = {"text": text}
                 
-                document_texts.append(text)
-                indexed_documents.append(doc_meta)
-            
-            # Tokenize documents
-            tokenized_docs = [_tokenize(text) for text in document_texts]
+                    document_texts.append(text)
+                    indexed_documents.append(doc_meta)
             
-            # Create BM25 index
-            bm25 = BM25Okapi(tokenized_docs)
+                # Create BM25 index (tokenizing and weighting run in the compute pool)
+                postings = await self.run_cpu_bound(build_postings, document_texts)
+                bm25 = BM25Index.from_postings(postings, document_texts, indexed_documents)
             
-            # Store index if index_id provided
-            if index_id:
-                _bm25_indexes[index_id] = bm25
-                _bm25_documents[index_id] = indexed_documents
-                await self.stream_progress(node_id, 0.5, f"Indexed and stored BM25 index: {index_id}")
+                # Store index if index_id provided
+                if index_id:
+                    await asyncio.to_thread(store.put, index_id, bm25)
+                    # Read through a lease too; a concurrent rebuild may already have replaced it
+                    bm25 = leases.enter_context(store.lease(index_id)) or bm25
+                    await self.stream_progress(node_id, 0.5, f"Indexed and stored BM25 index: {index_id}")
+                else:
+                    await self.stream_progress(node_id, 0.5, "BM25 index created (not stored)")
             else:
-                await self.stream_progress(node_id, 0.5, "BM25 index created (not stored)")
-        else:
-            raise ValueError(
-                "No documents or valid index_id provided.\n"
-                "Please provide documents to search or a valid index_id."
-            )
-        
-        # Tokenize query
-        tokenized_query = _tokenize(query)
-        
-        if not tokenized_query:
-            logger.warning("Query tokenized to empty list, returning empty results")
-            await self.stream_progress(node_id, 1.0, "No valid query terms found")
-            return {
-                "results": [],
-                "query": query,
-                "results_count": 0,
-                "provider": "bm25",
-            }
-        
-        await self.stream_progress(node_id, 0.6, f"Searching with query: {query[:50]}...")
-        
-        # Get BM25 scores
-        scores = bm25.get_scores(tokenized_query)
-        
-        # Create results with scores
-        results_with_scores = [
-            {
-                "document": doc,
-                "score": float(score),
-                "index": idx,
-            }
-            for idx, (doc, score) in enumerate(zip(indexed_documents, scores))
-        ]
+                raise ValueError(
+                    "No documents or valid index_id provided.\n"
+                    "Please provide documents to search or a valid index_id."
+                )
         
-        # Filter by score threshold and sort by score
-        filtered_results = [
-            r for r in results_with_scores
-            if r["score"] >= score_threshold
-        ]
-        filtered_results.sort(key=lambda x: x["score"], reverse=True)
+            await self.stream_progress(node_id, 0.6, f"Searching with query: {query[:50]}...")
         
-        # Take top_k
-        top_results = filtered_results[:top_k]
+            # Score only documents in the query terms' posting lists
+            top_results = bm25.search(query, top_k=top_k, score_threshold=score_threshold)
         
-        await self.stream_progress(node_id, 0.9, f"Found {len(top_results)} results")
+            await self.stream_progress(node_id, 0.9, f"Found {len(top_results)} results")
         
-        # Format results (similar to vector search output format)
-        formatted_results = []
-        for result in top_results:
-            doc = result["document"]
-            text = doc.get("text") or doc.get("content") or str(doc)
+            # Format results (similar to vector search output format)
+            formatted_results = []
+            for doc_index, score in top_results:
+                doc = bm25.documents.get(doc_index, {})
+                text = doc.get("text") or doc.get("content") or str(doc)
             
-            formatted_results.append({
-                "text": text,
-                "score": result["score"],
-                "metadata": {k: v for k, v in doc.items() if k not in ["text", "content"]},
-                "index": result["index"],
-            })
+                formatted_results.append({
+                    "text": text,
+                    "score": score,
+                    "metadata": {k: v for k, v in doc.items() if k not in ["text", "content"]},
+                    "index": doc_index,
+                })
         
         await self.stream_progress(node_id, 1.0, f"BM25 search complete: {len(formatted_results)} results")
         
@@ -248,7 +192,7 @@ class BM25SearchNode(BaseNode):
                 "index_id": {
                     "type": "string",
                     "title": "Index ID (Optional)",
-                    "description": "ID of a previously indexed BM25 index. If not provided, documents from inputs will be indexed on-the-fly.",
+                    "description": "ID of a previously indexed BM25 index (persisted to disk). If not provided, documents from inputs will be indexed on-the-fly.",
                     "default": "",
                 },
                 "top_k": {
@@ -6,6 +6,9 @@ Supports multiple reranking methods: Cohere, Cross-Encoder, and LLM-based.
 """
 
 from typing import Any, Dict, List, Optional
+from backend.core.client_pool import get_cohere_client, get_openai_client, get_voyage_client
+from backend.core.hedging import hedged
+from backend.core.model_residency import get_model_manager
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
 from backend.core.secret_resolver import resolve_api_key
@@ -171,7 +174,7 @@ class RerankNode(BaseNode):
     ) -> List[Dict[str, Any]]:
         """Rerank using Cohere API."""
         try:
-            import cohere
+            import cohere  # noqa: F401
         except ImportError:
             raise ImportError(
                 "Cohere reranking requires the cohere package. Install with: pip install cohere"
@@ -189,7 +192,7 @@ class RerankNode(BaseNode):
         
         await self.stream_progress(node_id, 0.4, "Connecting to Cohere API...")
         
-        client = cohere.Client(api_key)
+        client = get_cohere_client(api_key)
         
         # Extract texts for reranking
         texts = [r["text"] for r in results]
@@ -197,11 +200,14 @@ class RerankNode(BaseNode):
         await self.stream_progress(node_id, 0.5, "Sending to Cohere for reranking...")
         
         try:
-            response = client.rerank(
-                model=model,
-                query=query,
-                documents=texts,
-                top_n=len(texts),  # Get all reranked
+            response = await hedged(
+                f"rerank:cohere:{model}",
+                lambda: client.rerank(
+                    model=model,
+                    query=query,
+                    documents=texts,
+                    top_n=len(texts),  # Get all reranked
+                ),
             )
             
             # Map results back with rerank scores
@@ -231,20 +237,18 @@ class RerankNode(BaseNode):
         node_id: str,
     ) -> List[Dict[str, Any]]:
         """Rerank using local Cross-Encoder model."""
+        await self.stream_progress(node_id, 0.4, "Loading Cross-Encoder model...")
+        
+        # Use a good cross-encoder model for reranking (loaded once per process)
+        model_name = "cross-encoder/ms-marco-MiniLM-L-6-v2"
         try:
-            from sentence_transformers import CrossEncoder
+            model = await get_model_manager().aget("cross_encoder", model_name)
         except ImportError:
             raise ImportError(
                 "Cross-Encoder reranking requires sentence-transformers. "
                 "Install with: pip install sentence-transformers"
             )
         
-        await self.stream_progress(node_id, 0.4, "Loading Cross-Encoder model...")
-        
-        # Use a good cross-encoder model for reranking
-        model_name = "cross-encoder/ms-marco-MiniLM-L-6-v2"
-        model = CrossEncoder(model_name)
-        
         await self.stream_progress(node_id, 0.5, "Computing relevance scores...")
         
         # Prepare pairs for scoring
@@ -279,7 +283,7 @@ class RerankNode(BaseNode):
     ) -> List[Dict[str, Any]]:
         """Rerank using LLM-based relevance scoring."""
         try:
-            from openai import OpenAI
+            import openai  # noqa: F401
         except ImportError:
             raise ImportError("LLM reranking requires openai package. Install with: pip install openai")
         
@@ -291,7 +295,7 @@ class RerankNode(BaseNode):
         if not api_key:
             raise ValueError("OpenAI API key not found. Please configure it in the node settings or set OPENAI_API_KEY environment variable")
         
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         model = config.get("llm_model", "gpt-4o-mini")
         
         await self.stream_progress(node_id, 0.5, "Scoring results with LLM...")
@@ -313,14 +317,17 @@ Return ONLY a JSON array of scores, one per result, in order. Example: [0.9, 0.3
 """
         
         try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are a relevance scorer. Return only JSON arrays of scores."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.0,
-                max_tokens=500,
+            response = await hedged(
+                f"rerank:llm:{model}",
+                lambda: client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": "You are a relevance scorer. Return only JSON arrays of scores."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.0,
+                    max_tokens=500,
+                ),
             )
             
             # Parse scores
@@ -367,7 +374,7 @@ Return ONLY a JSON array of scores, one per result, in order. Example: [0.9, 0.3
     ) -> List[Dict[str, Any]]:
         """Rerank using Voyage AI API."""
         try:
-            import voyageai
+            import voyageai  # noqa: F401
         except ImportError:
             raise ImportError(
                 "Voyage AI reranking requires the voyageai package. Install with: pip install voyageai"
@@ -385,7 +392,7 @@ Return ONLY a JSON array of scores, one per result, in order. Example: [0.9, 0.3
         
         await self.stream_progress(node_id, 0.4, "Connecting to Voyage AI API...")
         
-        client = voyageai.Client(api_key=api_key)
+        client = get_voyage_client(api_key)
         
         # Extract texts for reranking
         texts = [r["text"] for r in results]
@@ -393,11 +400,14 @@ Return ONLY a JSON array of scores, one per result, in order. Example: [0.9, 0.3
         await self.stream_progress(node_id, 0.5, f"Sending {len(texts)} documents to Voyage AI for reranking...")
         
         try:
-            response = client.rerank(
-                query=query,
-                documents=texts,
-                model=model,
-                top_k=len(texts),  # Get all reranked
+            response = await hedged(
+                f"rerank:voyage_ai:{model}",
+                lambda: client.rerank(
+                    query=query,
+                    documents=texts,
+                    model=model,
+                    top_k=len(texts),  # Get all reranked
+                ),
             )
             
             # Map results back with rerank scores
@@ -2,22 +2,25 @@
 Generic Vector Search Node for NodeAI.
 
 This node supports multiple vector search providers:
-- FAISS (in-memory search)
+- FAISS (via the shared index manager)
 - Pinecone (cloud search)
 - (More providers can be added later)
 """
 
-from typing import Any, Dict, List
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-import faiss
 import numpy as np
 
 from backend.config import settings
+from backend.core.client_pool import get_openai_client
+from backend.core.embedding_cache import get_embedding_cache
+from backend.core.faiss_index_factory import search_parameters
+from backend.core.faiss_index_manager import get_faiss_index_manager
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
 from backend.core.secret_resolver import resolve_api_key
 from backend.nodes.base import BaseNode
-from backend.nodes.storage.vector_store import _faiss_indexes, _faiss_metadata
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -44,13 +47,27 @@ class VectorSearchNode(BaseNode):
         """
         Execute the vector search node.
         
-        Supports multiple providers based on config selection.
+        Supports multiple providers based on config selection. Passing a list
+        of ``queries`` (or ``query_embeddings``) switches to batched mode: all
+        queries are embedded in one provider call and searched together, and
+        the per-query outputs are returned as ``batch_results``.
         """
         node_id = config.get("_node_id", "vector_search")
         provider = config.get("provider", "faiss")
         
+        # Results already computed by a batched search (e.g. RAG evaluation)
+        precomputed = config.get("_precomputed_results")
+        if precomputed is not None:
+            await self.stream_progress(node_id, 1.0, "Using prefetched search results")
+            return precomputed
+        
         await self.stream_progress(node_id, 0.1, "Preparing search...")
         
+        queries = inputs.get("queries") or config.get("queries")
+        query_embeddings = inputs.get("query_embeddings")
+        if isinstance(queries, list) or isinstance(query_embeddings, list):
+            return await self._execute_batch(queries or [], query_embeddings, inputs, config, node_id)
+        
         # Debug: Log what we received
         logger.info(f"Vector Search - Config keys: {list(config.keys())}, Inputs keys: {list(inputs.keys())}")
         logger.info(f"Vector Search - Query from config: {config.get('query')}, Query from inputs: {inputs.get('query')}")
@@ -80,41 +97,8 @@ class VectorSearchNode(BaseNode):
         # If we have text but no embedding, embed it automatically using OpenAI
         if not query_embedding:
             await self.stream_progress(node_id, 0.2, "Embedding query text...")
-            # Try to determine embedding model from inputs
-            # Priority: explicit model in inputs > config > use dimension from vector store
-            embedding_model = inputs.get("model") or config.get("embedding_model")
-            
-            # If no model specified, try to infer from vector store dimension
-            if not embedding_model:
-                dimension = inputs.get("dimension")
-                if dimension == 1536:
-                    embedding_model = "text-embedding-3-small"
-                    logger.info(f"Inferred embedding model from dimension {dimension}: {embedding_model}")
-                elif dimension == 3072:
-                    embedding_model = "text-embedding-3-large"
-                    logger.info(f"Inferred embedding model from dimension {dimension}: {embedding_model}")
-                else:
-                    # Default fallback
-                    embedding_model = "text-embedding-3-small"
-                    logger.warning(f"Unknown dimension {dimension}, defaulting to {embedding_model}")
-            
-            logger.info(f"Auto-embedding query using model: {embedding_model} (inputs: {list(inputs.keys())})")
-            try:
-                from openai import OpenAI
-                user_id = config.get("_user_id")
-                api_key = resolve_api_key(config, "openai_api_key", user_id=user_id) or settings.openai_api_key
-                client = OpenAI(api_key=api_key)
-                response = client.embeddings.create(
-                    model=embedding_model,
-                    input=query_text
-                )
-                query_embedding = response.data[0].embedding
-                logger.info(f"Query embedded successfully (dimension: {len(query_embedding)})")
-                await self.stream_progress(node_id, 0.3, "Query embedded successfully")
-            except Exception as e:
-                raise ValueError(
-                    f"Failed to auto-embed query: {e}. Connect an Embed node before this node."
-                )
+            query_embedding = (await self._embed_queries([query_text], inputs, config))[0]
+            await self.stream_progress(node_id, 0.3, "Query embedded successfully")
         else:
             await self.stream_progress(node_id, 0.3, "Using provided query embedding")
         
@@ -128,14 +112,103 @@ class VectorSearchNode(BaseNode):
         else:
             raise ValueError(f"Unsupported search provider: {provider}")
 
-    async def _search_faiss(
+    async def _execute_batch(
         self,
-        query_embedding: List[float],
+        queries: List[str],
+        query_embeddings: Optional[List[List[float]]],
         inputs: Dict[str, Any],
         config: Dict[str, Any],
         node_id: str,
     ) -> Dict[str, Any]:
-        """Search using FAISS index."""
+        """Embed and search N queries at once."""
+        provider = config.get("provider", "faiss")
+        count = len(query_embeddings) if query_embeddings else len(queries)
+        if not count:
+            raise ValueError("Either queries or query_embeddings must be a non-empty list")
+        if query_embeddings and queries and len(queries) != len(query_embeddings):
+            raise ValueError(f"Got {len(queries)} queries but {len(query_embeddings)} query embeddings")
+        
+        if not query_embeddings:
+            await self.stream_progress(node_id, 0.2, f"Embedding {count} queries...")
+            query_embeddings = await self._embed_queries(queries, inputs, config)
+        await self.stream_progress(node_id, 0.3, f"Searching {count} queries...")
+        
+        queries = queries or [""] * count
+        if provider == "faiss":
+            batch_results = await self._search_faiss_batch(query_embeddings, queries, inputs, config, node_id)
+        elif provider in ("pinecone", "azure_cognitive_search"):
+            # These providers have no multi-query API; search one query at a time
+            search = self._search_pinecone if provider == "pinecone" else self._search_azure_cognitive_search
+            batch_results = []
+            for query_text, query_embedding in zip(queries, query_embeddings):
+                batch_results.append(await search(query_embedding, query_text, inputs, config, node_id))
+        else:
+            raise ValueError(f"Unsupported search provider: {provider}")
+        
+        await self.stream_progress(node_id, 1.0, f"Batched search completed for {count} queries")
+        return {
+            "batch_results": batch_results,
+            "provider": provider,
+            "top_k": config.get("top_k", 5),
+            "query_count": count,
+        }
+
+    async def _embed_queries(
+        self,
+        texts: List[str],
+        inputs: Dict[str, Any],
+        config: Dict[str, Any],
+    ) -> List[List[float]]:
+        """Embed query texts with OpenAI in one call, serving repeats from the embedding cache."""
+        # Try to determine embedding model from inputs
+        # Priority: explicit model in inputs > config > use dimension from vector store
+        embedding_model = inputs.get("model") or config.get("embedding_model")
+        
+        # If no model specified, try to infer from vector store dimension
+        if not embedding_model:
+            dimension = inputs.get("dimension")
+            if dimension == 1536:
+                embedding_model = "text-embedding-3-small"
+                logger.info(f"Inferred embedding model from dimension {dimension}: {embedding_model}")
+            elif dimension == 3072:
+                embedding_model = "text-embedding-3-large"
+                logger.info(f"Inferred embedding model from dimension {dimension}: {embedding_model}")
+            else:
+                # Default fallback
+                embedding_model = "text-embedding-3-small"
+                logger.warning(f"Unknown dimension {dimension}, defaulting to {embedding_model}")
+        
+        logger.info(f"Auto-embedding {len(texts)} quer{'y' if len(texts) == 1 else 'ies'} using model: {embedding_model} (inputs: {list(inputs.keys())})")
+        try:
+            user_id = config.get("_user_id")
+            api_key = resolve_api_key(config, "openai_api_key", user_id=user_id) or settings.openai_api_key
+            cache = get_embedding_cache() if settings.enable_embedding_cache else None
+            embeddings = cache.get_many("openai", embedding_model, None, texts) if cache else [None] * len(texts)
+            missing = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+            if missing:
+                client = get_openai_client(api_key)
+                response = await client.embeddings.create(
+                    model=embedding_model,
+                    input=missing,
+                )
+                fetched = {text: item.embedding for text, item in zip(missing, response.data)}
+                embeddings = [embedding if embedding is not None else fetched[text] for text, embedding in zip(texts, embeddings)]
+                if cache:
+                    cache.put_many("openai", embedding_model, None, missing, [fetched[text] for text in missing])
+            logger.info(f"Queries embedded successfully (dimension: {len(embeddings[0])})")
+            return embeddings
+        except Exception as e:
+            raise ValueError(
+                f"Failed to auto-embed query: {e}. Connect an Embed node before this node."
+            )
+
+    async def _resolve_faiss_index(
+        self,
+        inputs: Dict[str, Any],
+        config: Dict[str, Any],
+        node_id: str,
+    ) -> Tuple[str, Optional[str]]:
+        """Return (index_id, index_path) for the configured index or knowledge base."""
         # Check if using Knowledge Base mode
         kb_id = config.get("knowledge_base_id")
         kb_version = config.get("knowledge_base_version")
@@ -168,98 +241,103 @@ class VectorSearchNode(BaseNode):
         
         await self.stream_progress(node_id, 0.4, f"Loading FAISS index: {index_id}...")
         
-        # Try to load from disk if not in memory
-        if index_id not in _faiss_indexes:
-            # Check if it's a KB vector store and try to load from disk
-            if kb_id and version:
-                if version.vector_store_path:
-                    import os
-                    if os.path.exists(version.vector_store_path):
-                        await self.stream_progress(node_id, 0.45, f"Loading index from disk: {version.vector_store_path}...")
-                        try:
-                            index = faiss.read_index(version.vector_store_path)
-                            _faiss_indexes[index_id] = index
-                            # Load metadata if available
-                            metadata_path = version.vector_store_path.replace(".faiss", "_metadata.json")
-                            if os.path.exists(metadata_path):
-                                import json
-                                with open(metadata_path, "r") as f:
-                                    _faiss_metadata[index_id] = json.load(f)
-                            else:
-                                _faiss_metadata[index_id] = []
-                            logger.info(f"Loaded FAISS index from disk: {version.vector_store_path}")
-                        except Exception as e:
-                            logger.error(f"Failed to load index from disk: {e}")
-                            raise ValueError(f"FAISS index '{index_id}' not found in memory and failed to load from disk: {e}")
-                    else:
-                        raise ValueError(f"FAISS index file not found: {version.vector_store_path}")
-                else:
-                    raise ValueError(f"FAISS index '{index_id}' not found and no file path available")
-            else:
-                raise ValueError(f"FAISS index '{index_id}' not found")
+        # KB vector stores are loaded lazily from their persisted file
+        index_path = None
+        if kb_id and version:
+            if not version.vector_store_path:
+                raise ValueError(f"FAISS index '{index_id}' not found and no file path available")
+            if not Path(version.vector_store_path).exists():
+                raise ValueError(f"FAISS index file not found: {version.vector_store_path}")
+            index_path = version.vector_store_path
         
-        index = _faiss_indexes[index_id]
-        metadata = _faiss_metadata.get(index_id, [])
-        
-        await self.stream_progress(node_id, 0.5, f"Index loaded: {index.ntotal} vectors available")
-        
-        # Convert query to numpy array
-        query_vector = np.array([query_embedding], dtype=np.float32)
+        return index_id, index_path
+
+    async def _search_faiss(
+        self,
+        query_embedding: List[float],
+        inputs: Dict[str, Any],
+        config: Dict[str, Any],
+        node_id: str,
+    ) -> Dict[str, Any]:
+        """Search using FAISS index."""
+        query = inputs.get("query", "") or config.get("query", "")
+        result = (await self._search_faiss_batch([query_embedding], [query], inputs, config, node_id))[0]
+        await self.stream_progress(node_id, 1.0, "Search completed")
+        return result
+
+    async def _search_faiss_batch(
+        self,
+        query_embeddings: List[List[float]],
+        queries: List[str],
+        inputs: Dict[str, Any],
+        config: Dict[str, Any],
+        node_id: str,
+    ) -> List[Dict[str, Any]]:
+        """Search FAISS with an (N, d) query matrix in one call; returns one output per query."""
+        index_id, index_path = await self._resolve_faiss_index(inputs, config, node_id)
         
         # Get top-k
         top_k = config.get("top_k", 5)
         score_threshold = config.get("score_threshold", 0.0)
         
-        await self.stream_progress(node_id, 0.6, f"Searching for top {top_k} results...")
-        
-        # Search
-        distances, indices = index.search(query_vector, top_k)
+        # Convert queries to an (N, d) numpy array
+        query_vectors = np.array(query_embeddings, dtype=np.float32)
         
-        # Build results
-        results = []
-        all_scores = []  # Track all scores for debugging
-        for i, (distance, idx) in enumerate(zip(distances[0], indices[0])):
-            if idx == -1:  # Invalid index
-                continue
-            
-            # Convert distance to similarity score (for L2 distance, lower is better)
-            # For cosine similarity, you'd use 1 - distance
-            score = 1.0 / (1.0 + distance)  # Convert distance to similarity
-            all_scores.append(score)
+        outputs = []
+        with get_faiss_index_manager().lease(index_id, path=index_path) as handle:
+            index = handle.index
+            metadata = handle.metadata
             
-            if score < score_threshold:
-                logger.info(f"Vector Search - Filtered result {i}: score={score:.4f} < threshold={score_threshold}")
-                continue
+            await self.stream_progress(node_id, 0.5, f"Index loaded: {index.ntotal} vectors available")
+            await self.stream_progress(node_id, 0.6, f"Searching for top {top_k} results...")
             
-            # Get metadata
-            meta = metadata[idx] if idx < len(metadata) else {}
+            # Search (nprobe/efSearch are passed per call; unset uses the index default).
+            # The lock waits out a write in progress, so results and metadata match.
+            params = search_parameters(index, nprobe=config.get("nprobe"), ef_search=config.get("ef_search"))
+            with handle.lock:
+                distances, indices = index.search(query_vectors, top_k, params=params)
+                matched = [[metadata.get(int(idx), {}) for idx in query_indices] for query_indices in indices]
             
-            results.append({
-                "text": meta.get("text", ""),
-                "score": float(score),
-                "distance": float(distance),
-                "index": int(idx),
-                "metadata": meta,
-            })
-        
-        # Debug: Log search summary
-        logger.info(f"Vector Search - Found {len(results)} results (filtered from {len(all_scores)} candidates)")
-        if all_scores:
-            logger.info(f"Vector Search - Score range: min={min(all_scores):.4f}, max={max(all_scores):.4f}, threshold={score_threshold}")
-        
-        await self.stream_progress(node_id, 0.9, f"Found {len(results)} results")
-        
-        result = {
-            "results": results,
-            "provider": "faiss",
-            "query": inputs.get("query", "") or config.get("query", ""),
-            "top_k": top_k,
-            "results_count": len(results),
-        }
-        
-        await self.stream_progress(node_id, 1.0, "Search completed")
-        
-        return result
+            for query, query_distances, query_indices, query_matched in zip(queries, distances, indices, matched):
+                # Build results
+                results = []
+                all_scores = []  # Track all scores for debugging
+                for i, (distance, idx, meta) in enumerate(zip(query_distances, query_indices, query_matched)):
+                    if idx == -1:  # Invalid index
+                        continue
+                    
+                    # Convert distance to similarity score (for L2 distance, lower is better)
+                    # For cosine similarity, you'd use 1 - distance
+                    score = 1.0 / (1.0 + distance)  # Convert distance to similarity
+                    all_scores.append(score)
+                    
+                    if score < score_threshold:
+                        logger.info(f"Vector Search - Filtered result {i}: score={score:.4f} < threshold={score_threshold}")
+                        continue
+                    
+                    results.append({
+                        "text": meta.get("text", ""),
+                        "score": float(score),
+                        "distance": float(distance),
+                        "index": int(idx),
+                        "metadata": meta,
+                    })
+                
+                # Debug: Log search summary
+                logger.info(f"Vector Search - Found {len(results)} results (filtered from {len(all_scores)} candidates)")
+                if all_scores:
+                    logger.info(f"Vector Search - Score range: min={min(all_scores):.4f}, max={max(all_scores):.4f}, threshold={score_threshold}")
+                
+                outputs.append({
+                    "results": results,
+                    "provider": "faiss",
+                    "query": query,
+                    "top_k": top_k,
+                    "results_count": len(results),
+                })
+        
+        await self.stream_progress(node_id, 0.9, f"Found results for {len(outputs)} quer{'y' if len(outputs) == 1 else 'ies'}")
+        return outputs
 
     async def _search_pinecone(
         self,
@@ -446,6 +524,19 @@ class VectorSearchNode(BaseNode):
                     "minimum": 0.0,
                     "maximum": 1.0,
                 },
+                # FAISS search tuning
+                "nprobe": {
+                    "type": "integer",
+                    "title": "nprobe",
+                    "description": "IVF lists to scan per query (higher = better recall, slower). Leave empty to use the value tuned at build time",
+                    "minimum": 1,
+                },
+                "ef_search": {
+                    "type": "integer",
+                    "title": "efSearch",
+                    "description": "HNSW candidate list size per query (higher = better recall, slower). Leave empty to use the value tuned at build time",
+                    "minimum": 1,
+                },
                 # Knowledge Base mode
                 "knowledge_base_id": {
                     "type": "string",
@@ -534,6 +625,16 @@ class VectorSearchNode(BaseNode):
                 "description": "Query embedding vector (from Embed node)",
                 "required": False,
             },
+            "queries": {
+                "type": "array",
+                "description": "Batch of query texts (batched mode, embedded in one call)",
+                "required": False,
+            },
+            "query_embeddings": {
+                "type": "array",
+                "description": "Batch of query embedding vectors (batched mode)",
+                "required": False,
+            },
         }
 
     def get_output_schema(self) -> Dict[str, Any]:
@@ -563,6 +664,10 @@ class VectorSearchNode(BaseNode):
                 "type": "integer",
                 "description": "Number of results returned",
             },
+            "batch_results": {
+                "type": "array",
+                "description": "Per-query outputs in batched mode, each with results, query and results_count",
+            },
         }
 
 
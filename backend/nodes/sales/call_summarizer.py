@@ -136,18 +136,24 @@ class CallSummarizerNode(BaseNode, LLMConfigMixin):
         
         return recommendations
 
-    async def _generate_llm_summary(self, transcript: str, call_type: str, llm_config: Dict[str, Any]) -> str:
-        """Generate call summary using LLM"""
+    def _transcript_context(self, transcript: str) -> str:
+        """Transcript text shared by all LLM analysis calls.
+
+        It is sent ahead of each instruction so the provider can serve the
+        repeated transcript from its prompt cache.
+        """
         # Truncate transcript if too long
         transcript_preview = transcript[:6000] if len(transcript) > 6000 else transcript
         if len(transcript) > 6000:
             transcript_preview += "\n\n[Transcript truncated for length...]"
         
-        prompt = f"""Summarize this {call_type} sales call transcript in 2-3 sentences.
+        return f"Sales call transcript:\n{transcript_preview}"
+
+    async def _generate_llm_summary(self, transcript: str, call_type: str, llm_config: Dict[str, Any]) -> str:
+        """Generate call summary using LLM"""
+        prompt = f"""Summarize the {call_type} sales call transcript above in 2-3 sentences.
 
 Call Type: {call_type}
-Transcript:
-{transcript_preview}
 
 Provide a concise summary focusing on:
 - Main topics discussed
@@ -155,19 +161,14 @@ Provide a concise summary focusing on:
 - Solution fit and interest level
 - Overall call outcome"""
         
-        llm_response = await self._call_llm(prompt, llm_config, max_tokens=300)
+        llm_response = await self._call_llm(
+            prompt, llm_config, max_tokens=300, context=self._transcript_context(transcript)
+        )
         return llm_response.strip()
 
     async def _extract_llm_key_points(self, transcript: str, call_type: str, llm_config: Dict[str, Any]) -> List[str]:
         """Extract key points using LLM"""
-        transcript_preview = transcript[:6000] if len(transcript) > 6000 else transcript
-        if len(transcript) > 6000:
-            transcript_preview += "\n\n[Transcript truncated for length...]"
-        
-        prompt = f"""Extract 5-7 key discussion points from this {call_type} sales call.
-
-Transcript:
-{transcript_preview}
+        prompt = f"""Extract 5-7 key discussion points from the {call_type} sales call above.
 
 Return as a JSON array of strings, each point being a brief sentence.
 Example: ["Client needs automation for data processing", "Budget range: $10k-$25k", ...]"""
@@ -175,7 +176,9 @@ Example: ["Client needs automation for data processing", "Budget range: $10k-$25
         try:
             import json
             import re
-            llm_response = await self._call_llm(prompt, llm_config, max_tokens=500)
+            llm_response = await self._call_llm(
+                prompt, llm_config, max_tokens=500, context=self._transcript_context(transcript)
+            )
             
             # Try to parse JSON array
             json_match = re.search(r'\[.*\]', llm_response, re.DOTALL)
@@ -190,14 +193,7 @@ Example: ["Client needs automation for data processing", "Budget range: $10k-$25
 
     async def _identify_llm_next_steps(self, transcript: str, call_type: str, llm_config: Dict[str, Any]) -> List[Dict[str, str]]:
         """Identify next steps using LLM"""
-        transcript_preview = transcript[:6000] if len(transcript) > 6000 else transcript
-        if len(transcript) > 6000:
-            transcript_preview += "\n\n[Transcript truncated for length...]"
-        
-        prompt = f"""Identify 3-5 next steps and action items from this {call_type} sales call.
-
-Transcript:
-{transcript_preview}
+        prompt = f"""Identify 3-5 next steps and action items from the {call_type} sales call above.
 
 Return as a JSON array of objects, each with:
 - "action": Brief action description
@@ -210,7 +206,9 @@ Example: [{{"action": "Send product demo", "owner": "Sales Rep", "deadline": "Wi
         try:
             import json
             import re
-            llm_response = await self._call_llm(prompt, llm_config, max_tokens=500)
+            llm_response = await self._call_llm(
+                prompt, llm_config, max_tokens=500, context=self._transcript_context(transcript)
+            )
             
             # Try to parse JSON array
             json_match = re.search(r'\[.*\]', llm_response, re.DOTALL)
@@ -224,14 +222,7 @@ Example: [{{"action": "Send product demo", "owner": "Sales Rep", "deadline": "Wi
 
     async def _analyze_llm_sentiment(self, transcript: str, llm_config: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze call sentiment using LLM"""
-        transcript_preview = transcript[:6000] if len(transcript) > 6000 else transcript
-        if len(transcript) > 6000:
-            transcript_preview += "\n\n[Transcript truncated for length...]"
-        
-        prompt = f"""Analyze the sentiment and interest level from this sales call transcript.
-
-Transcript:
-{transcript_preview}
+        prompt = f"""Analyze the sentiment and interest level from the sales call transcript above.
 
 Return as a JSON object with:
 - "overall_sentiment": "positive" | "neutral" | "negative"
@@ -245,7 +236,9 @@ Example: {{"overall_sentiment": "positive", "prospect_interest_level": "high", "
         try:
             import json
             import re
-            llm_response = await self._call_llm(prompt, llm_config, max_tokens=400)
+            llm_response = await self._call_llm(
+                prompt, llm_config, max_tokens=400, context=self._transcript_context(transcript)
+            )
             
             # Try to parse JSON object
             json_match = re.search(r'\{.*\}', llm_response, re.DOTALL)
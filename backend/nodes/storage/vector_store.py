@@ -2,11 +2,12 @@
 Generic Vector Store Node for NodeAI.
 
 This node supports multiple vector storage providers:
-- FAISS (in-memory)
+- FAISS (managed, memory-mapped)
 - Pinecone (cloud)
 - (Chroma, Weaviate, etc. can be added later)
 """
 
+import asyncio
 import uuid
 from pathlib import Path
 from typing import Any, Dict, List
@@ -15,19 +16,25 @@ import faiss
 import numpy as np
 
 from backend.config import settings
+from backend.core.client_pool import get_gemini_client
+from backend.core.faiss_index_factory import (
+    INDEX_TYPES,
+    TRAINED_INDEX_TYPES,
+    create_index,
+    recall_latency_report,
+    set_default_search_parameter,
+    train_index,
+)
+from backend.core.faiss_index_manager import get_faiss_index_manager, stable_chunk_ids
 from backend.core.models import NodeMetadata
 from backend.core.node_registry import NodeRegistry
+from backend.core.record_stream import RecordStream
 from backend.core.secret_resolver import resolve_api_key
 from backend.nodes.base import BaseNode
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# Global in-memory storage for FAISS indexes
-# In production, you'd want to persist this or use a proper storage solution
-_faiss_indexes: Dict[str, Any] = {}
-_faiss_metadata: Dict[str, List[Dict[str, Any]]] = {}
-
 
 class VectorStoreNode(BaseNode):
     """
@@ -41,6 +48,7 @@ class VectorStoreNode(BaseNode):
     name = "Vector Store"
     description = "Store vectors using various providers (FAISS, Pinecone, Chroma, etc.)"
     category = "storage"
+    accepts_streams = True
 
     async def execute(
         self,
@@ -60,8 +68,23 @@ class VectorStoreNode(BaseNode):
             # Gemini File Search doesn't need embeddings - it processes files directly
             return await self._store_gemini_file_search(inputs, config, node_id)
         
-        # Other providers require embeddings
+        embedding_stream = inputs.get("embedding_stream")
+        if isinstance(embedding_stream, RecordStream):
+            inputs = {key: value for key, value in inputs.items() if key != "embedding_stream"}
+            if provider == "faiss":
+                return await self._store_faiss_stream(embedding_stream, inputs, config, node_id)
+            # Other providers take all vectors in one request
+            embeddings: List[List[float]] = []
+            chunks: List[str] = []
+            async for batch in embedding_stream:
+                embeddings.extend(batch["embeddings"])
+                chunks.extend(batch["chunks"])
+            inputs = {**inputs, "embeddings": embeddings, "chunks": chunks}
+        
+        # Other providers require embeddings (FAISS deletes are the exception)
         embeddings = inputs.get("embeddings")
+        if provider == "faiss" and config.get("faiss_operation") == "delete":
+            return await self._store_faiss(embeddings or [], inputs, config, node_id)
         if not embeddings:
             raise ValueError("No embeddings provided in inputs")
         
@@ -90,127 +113,288 @@ class VectorStoreNode(BaseNode):
         index_type = config.get("faiss_index_type", "flat")
         persist = config.get("faiss_persist", False)
         file_path = config.get("faiss_file_path")
+        operation = config.get("faiss_operation", "add")
+        if operation not in ("add", "upsert", "delete"):
+            raise ValueError(f"Unsupported FAISS operation: {operation}")
+        # Upserts and deletes address vectors by ID, which needs an ID map
+        use_id_map = config.get("faiss_id_map", False) or operation != "add"
         
         await self.stream_progress(node_id, 0.2, f"Creating {index_type} index...")
         
         # Get dimension from first embedding
-        dimension = len(embeddings[0])
+        dimension = len(embeddings[0]) if embeddings else None
         
         # Create or get index
+        created = False
         index_id = config.get("index_id") or str(uuid.uuid4())
-        
-        # Check if persisted index exists and can be loaded
-        index_loaded = False
-        if persist and file_path and Path(file_path).exists():
-            try:
-                await self.stream_progress(node_id, 0.2, f"Loading existing index from {file_path}...")
-                index = faiss.read_index(file_path)
-                
-                # Load metadata if it exists
-                metadata_path = file_path.replace(".faiss", "_metadata.json")
-                if Path(metadata_path).exists():
-                    import json
-                    with open(metadata_path, "r", encoding="utf-8") as f:
-                        metadata = json.load(f)
-                else:
-                    metadata = []
-                
-                # Store in memory for faster access
-                _faiss_indexes[index_id] = index
-                _faiss_metadata[index_id] = metadata
-                index_loaded = True
-                await self.stream_log(node_id, f"Loaded existing index: {index_id} ({index.ntotal} vectors)")
-            except Exception as e:
-                logger.warning(f"Failed to load existing index, creating new one: {e}")
-                index_loaded = False
-        
-        if index_id in _faiss_indexes and not index_loaded:
-            # Add to existing in-memory index
-            await self.stream_log(node_id, f"Adding to existing in-memory index: {index_id}")
-            index = _faiss_indexes[index_id]
-            metadata = _faiss_metadata.get(index_id, [])
-        elif not index_loaded:
+        manager = get_faiss_index_manager()
+        index_path = file_path if persist and file_path else None
+        
+        # A persisted index that already holds vectors is reused as-is
+        # (optimization for deployed workflows)
+        index_on_disk = bool(index_path and Path(index_path).exists())
+        if index_on_disk:
+            await self.stream_progress(node_id, 0.2, f"Loading existing index from {file_path}...")
+        elif manager.contains(index_id):
+            await self.stream_log(node_id, f"Adding to existing index: {index_id}")
+        elif dimension is None:
+            raise ValueError(f"FAISS index '{index_id}' not found")
+        else:
             # Create new index
             await self.stream_progress(node_id, 0.2, f"Creating new {index_type} index...")
-            if index_type == "flat":
-                index = faiss.IndexFlatL2(dimension)
-            elif index_type == "ivf":
-                nlist = config.get("faiss_nlist", 100)
-                quantizer = faiss.IndexFlatL2(dimension)
-                index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
-            elif index_type == "hnsw":
-                M = config.get("faiss_M", 32)
-                index = faiss.IndexHNSWFlat(dimension, M)
-            else:
-                raise ValueError(f"Unsupported FAISS index type: {index_type}")
+            index = create_index(index_type, dimension, len(embeddings), config)
+            created = True
+            if use_id_map:
+                index = faiss.IndexIDMap2(index)
             
-            _faiss_indexes[index_id] = index
-            _faiss_metadata[index_id] = []
-            metadata = []
+            manager.register(index_id, index, path=index_path)
             await self.stream_log(node_id, f"Created new index: {index_id}")
         
-        await self.stream_progress(node_id, 0.4, "Converting embeddings to vectors...")
+        deleted = 0
+        replaced = 0
+        recall_report = None
+        with manager.lease(index_id, path=index_path, writable=True) as handle:
+            index = handle.index
+            metadata = handle.metadata
+            if dimension is None:
+                dimension = index.d
+            
+            if operation == "add" and index_on_disk and index.ntotal > 0:
+                # Index already has vectors - skip adding
+                await self.stream_log(node_id, f"Using existing index with {index.ntotal} vectors (skipping addition)")
+            else:
+                if operation != "add":
+                    delete_file_ids = inputs.get("delete_file_ids") or []
+                    delete_ids = inputs.get("delete_ids") or []
+                    if delete_file_ids:
+                        deleted += handle.delete_files(delete_file_ids)
+                    if delete_ids:
+                        deleted += handle.delete([int(vector_id) for vector_id in delete_ids])
+                    if deleted:
+                        await self.stream_log(node_id, f"Deleted {deleted} vectors from index {index_id}")
+                
+                if embeddings:
+                    await self.stream_progress(node_id, 0.4, "Converting embeddings to vectors...")
+                    
+                    # Convert embeddings to numpy array
+                    vectors = np.array(embeddings, dtype=np.float32)
+                    
+                    # Store metadata (text chunks, etc.)
+                    chunks = inputs.get("chunks", [])
+                    
+                    if not chunks:
+                        logger.warning(f"No chunks found in inputs for vector store. Available keys: {list(inputs.keys())}")
+                    
+                    chunk_file_ids = inputs.get("chunk_file_ids") or []
+                    records = []
+                    existing_count = len(metadata)
+                    for i, embedding in enumerate(embeddings):
+                        chunk_text = chunks[i] if i < len(chunks) and chunks[i] else None
+                        record = {
+                            "chunk_index": existing_count + i if operation == "add" else i,
+                            "text": chunk_text,
+                        }
+                        if i < len(chunk_file_ids) and chunk_file_ids[i]:
+                            record["file_id"] = chunk_file_ids[i]
+                        records.append(record)
+                    
+                    if not index.is_trained:
+                        await self.stream_progress(node_id, 0.5, f"Training {index_type} index...")
+                        trained_on = await asyncio.to_thread(
+                            train_index, index, vectors, int(config.get("faiss_training_samples", 100000))
+                        )
+                        await self.stream_log(node_id, f"Trained {index_type} index on {trained_on} sampled vectors")
+                    
+                    await self.stream_progress(node_id, 0.6, f"Adding {len(embeddings)} vectors to index...")
+                    vector_ids = None
+                    if handle.id_mapped:
+                        chunk_ids = inputs.get("chunk_ids") or stable_chunk_ids(
+                            [record.get("file_id") for record in records],
+                            [record["text"] for record in records],
+                        )
+                        if len(chunk_ids) != len(embeddings):
+                            raise ValueError(f"Got {len(chunk_ids)} chunk_ids for {len(embeddings)} embeddings")
+                        vector_ids = np.asarray(chunk_ids, dtype=np.int64)
+                        replaced = handle.upsert(vector_ids.tolist(), vectors, records)
+                    else:
+                        handle.add(vectors, records)
+                    
+                    # Measure the approximate index against exact search while
+                    # the freshly built index holds exactly these vectors
+                    if created and index_type != "flat" and config.get("faiss_recall_report", True):
+                        await self.stream_progress(node_id, 0.7, "Measuring recall against a flat baseline...")
+                        recall_report = await asyncio.to_thread(
+                            recall_latency_report,
+                            index,
+                            vectors,
+                            vector_ids,
+                            int(config.get("faiss_recall_k", 10)),
+                            int(config.get("faiss_recall_queries", 100)),
+                            float(config.get("faiss_target_recall", 0.95)),
+                        )
+                        if recall_report["recommended"]:
+                            # Persisted with the index as the default for searches
+                            set_default_search_parameter(index, recall_report["recommended"])
+                        await self.stream_log(
+                            node_id,
+                            f"Recall report ({recall_report['parameter']}): " + ", ".join(
+                                f"{p['value']}: recall={p['recall']:.3f} {p['latency_ms']:.3f}ms"
+                                for p in recall_report["points"]
+                            ) + ("" if recall_report["target_met"] else " (target recall not reached)"),
+                        )
+            
+            # Persist if requested
+            if index_path and handle.dirty:
+                await self.stream_progress(node_id, 0.8, f"Persisting index to {file_path}...")
+                manager.persist(index_id)
+            
+            vectors_stored = index.ntotal
         
-        # Convert embeddings to numpy array
-        vectors = np.array(embeddings, dtype=np.float32)
+        # Pass through embedding model info if available (for downstream nodes)
+        result = {
+            "index_id": index_id,
+            "provider": "faiss",
+            "vectors_stored": vectors_stored,
+            "dimension": dimension,
+            "index_type": index_type,
+        }
+        if recall_report:
+            result["recall_report"] = recall_report
+        if operation != "add":
+            result["vectors_deleted"] = deleted
+            result["vectors_replaced"] = replaced
         
-        # Only add vectors if index was just created or if we're adding new ones
-        if index.ntotal == 0 or not index_loaded:
-            await self.stream_progress(node_id, 0.6, f"Adding {len(embeddings)} vectors to index...")
-            # Add vectors to index
-            index.add(vectors)
-        else:
-            # Index already has vectors - skip adding (optimization for deployed workflows)
-            await self.stream_log(node_id, f"Using existing index with {index.ntotal} vectors (skipping addition)")
-            # Don't add vectors - the index is already populated
+        # Include embedding model from inputs if available
+        if "model" in inputs:
+            result["model"] = inputs["model"]
+        if "provider" in inputs:
+            result["embedding_provider"] = inputs["provider"]
         
-        await self.stream_progress(node_id, 0.7, "Storing metadata...")
+        await self.stream_progress(node_id, 1.0, f"Stored {vectors_stored} vectors in index {index_id}")
         
-        # Store metadata (text chunks, etc.)
-        chunks = inputs.get("chunks", [])
+        return result
+
+    async def _store_faiss_stream(
+        self,
+        stream: RecordStream,
+        inputs: Dict[str, Any],
+        config: Dict[str, Any],
+        node_id: str,
+    ) -> Dict[str, Any]:
+        """
+        Store streamed embedding batches in a FAISS index as they arrive.
         
-        if not chunks:
-            logger.warning(f"No chunks found in inputs for vector store. Available keys: {list(inputs.keys())}")
+        Trained index types buffer the first ``faiss_training_samples``
+        vectors to train on; after that every batch is added as soon as it is
+        embedded, so the full embedding matrix is never held in memory.
+        """
+        index_type = config.get("faiss_index_type", "flat")
+        persist = config.get("faiss_persist", False)
+        file_path = config.get("faiss_file_path")
+        operation = config.get("faiss_operation", "add")
+        if operation not in ("add", "upsert"):
+            raise ValueError(f"FAISS operation '{operation}' cannot consume an embedding stream")
+        use_id_map = config.get("faiss_id_map", False) or operation != "add"
+        index_id = config.get("index_id") or str(uuid.uuid4())
+        manager = get_faiss_index_manager()
+        index_path = file_path if persist and file_path else None
+        
+        if operation == "add" and index_path and Path(index_path).exists():
+            # A persisted index is reused as-is; stop the upstream stages early
+            await stream.aclose()
+            return await self._store_faiss([], inputs, config, node_id)
+        
+        training_samples = int(config.get("faiss_training_samples", 100000))
+        needs_training = index_type in TRAINED_INDEX_TYPES or index_type == "hnsw_sq"
+        ready = manager.contains(index_id)
+        pending: List[Any] = []  # (vectors, chunks) held until the index exists and is trained
+        pending_count = 0
+        dimension = None
+        added = 0
+        replaced = 0
+        seen_chunk_ids: Dict[int, int] = {}
+        
+        def store(handle: Any, vectors: np.ndarray, chunks: List[str], offset: int) -> int:
+            # Runs in a worker thread; the handle's lock keeps searches and other
+            # writers from seeing the batch half-applied
+            with handle.lock:
+                existing_count = len(handle.metadata)
+                records = [
+                    {"chunk_index": existing_count + i if operation == "add" else offset + i, "text": text or None}
+                    for i, text in enumerate(chunks)
+                ]
+                if handle.id_mapped:
+                    vector_ids = stable_chunk_ids(
+                        [None] * len(records), [record["text"] for record in records], seen_chunk_ids
+                    )
+                    return handle.upsert(vector_ids, vectors, records)
+                handle.add(vectors, records)
+                return 0
+        
+        async def flush(batches: List[Any]) -> None:
+            nonlocal added, replaced
+            with manager.lease(index_id, path=index_path, writable=True) as handle:
+                if not handle.index.is_trained:
+                    sample = np.concatenate([vectors for vectors, _ in batches])
+                    await self.stream_progress(node_id, 0.5, f"Training {index_type} index...")
+                    trained_on = await asyncio.to_thread(train_index, handle.index, sample, training_samples)
+                    await self.stream_log(node_id, f"Trained {index_type} index on {trained_on} sampled vectors")
+                for vectors, chunks in batches:
+                    replaced += await asyncio.to_thread(store, handle, vectors, chunks, added)
+                    added += len(vectors)
+        
+        async def create() -> None:
+            nonlocal ready
+            index = create_index(index_type, dimension, pending_count, config)
+            if use_id_map:
+                index = faiss.IndexIDMap2(index)
+            manager.register(index_id, index, path=index_path)
+            ready = True
+            await self.stream_log(node_id, f"Created new index: {index_id}")
         
-        for i, embedding in enumerate(embeddings):
-            chunk_text = chunks[i] if i < len(chunks) and chunks[i] else None
-            metadata.append({
-                "chunk_index": len(metadata),
-                "text": chunk_text,
-            })
+        await self.stream_progress(node_id, 0.2, f"Streaming vectors into {index_type} index...")
+        async for batch in stream:
+            vectors = np.asarray(batch["embeddings"], dtype=np.float32)
+            if len(vectors) == 0:
+                continue
+            dimension = dimension or vectors.shape[1]
+            if ready:
+                await flush([(vectors, batch["chunks"])])
+                continue
+            pending.append((vectors, batch["chunks"]))
+            pending_count += len(vectors)
+            if not needs_training or pending_count >= training_samples:
+                await create()
+                await flush(pending)
+                pending = []
+        
+        if pending:
+            await create()
+            await flush(pending)
+        elif not ready:
+            raise ValueError("No embeddings provided in inputs")
         
-        _faiss_metadata[index_id] = metadata
-        
-        # Persist if requested
-        if persist and file_path:
-            await self.stream_progress(node_id, 0.8, f"Persisting index to {file_path}...")
-            import os
-            import json
-            os.makedirs(os.path.dirname(file_path) if os.path.dirname(file_path) else ".", exist_ok=True)
-            faiss.write_index(index, file_path)
-            # Also save metadata to JSON file
-            metadata_path = file_path.replace(".faiss", "_metadata.json")
-            with open(metadata_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
-            logger.info(f"Saved metadata to {metadata_path}")
-            logger.info(f"FAISS index persisted to {file_path}")
+        with manager.lease(index_id, path=index_path, writable=True) as handle:
+            if index_path and handle.dirty:
+                await self.stream_progress(node_id, 0.8, f"Persisting index to {file_path}...")
+                manager.persist(index_id)
+            vectors_stored = handle.index.ntotal
+            dimension = handle.index.d
         
-        # Pass through embedding model info if available (for downstream nodes)
         result = {
             "index_id": index_id,
             "provider": "faiss",
-            "vectors_stored": index.ntotal,
+            "vectors_stored": vectors_stored,
+            "vectors_added": added,
             "dimension": dimension,
             "index_type": index_type,
         }
-        
-        # Include embedding model from inputs if available
-        if "model" in inputs:
-            result["model"] = inputs["model"]
+        if operation != "add":
+            result["vectors_replaced"] = replaced
         if "provider" in inputs:
             result["embedding_provider"] = inputs["provider"]
         
-        await self.stream_progress(node_id, 1.0, f"Stored {index.ntotal} vectors in index {index_id}")
+        await self.stream_progress(node_id, 1.0, f"Stored {vectors_stored} vectors in index {index_id}")
         
         return result
 
@@ -433,7 +617,7 @@ class VectorStoreNode(BaseNode):
         
         await self.stream_progress(node_id, 0.2, f"Preparing to upload {file_path.name} to Gemini File Search...")
         
-        client = genai.Client(api_key=api_key)
+        client = get_gemini_client(api_key)
         
         # Get or create File Search store
         store_name = config.get("gemini_store_name")
@@ -554,10 +738,60 @@ class VectorStoreNode(BaseNode):
                 "faiss_index_type": {
                     "type": "string",
                     "title": "FAISS Index Type",
-                    "description": "Type of FAISS index",
-                    "enum": ["flat", "ivf", "hnsw"],
+                    "description": "Type of FAISS index (ivf/pq types are trained on a sample of the first batch; *_pq and hnsw_sq compress vectors for large corpora)",
+                    "enum": INDEX_TYPES,
                     "default": "flat",
                 },
+                "faiss_nlist": {
+                    "type": "integer",
+                    "title": "IVF Lists",
+                    "description": "Number of inverted lists for ivf types (clamped to what the training sample supports)",
+                    "default": 100,
+                    "minimum": 1,
+                },
+                "faiss_M": {
+                    "type": "integer",
+                    "title": "HNSW Neighbors",
+                    "description": "Graph neighbors per node for hnsw types",
+                    "default": 32,
+                    "minimum": 4,
+                },
+                "faiss_pq_m": {
+                    "type": "integer",
+                    "title": "PQ Sub-quantizers",
+                    "description": "Bytes per vector code for PQ types (rounded down to a divisor of the dimension)",
+                    "default": 16,
+                    "minimum": 1,
+                },
+                "faiss_pq_nbits": {
+                    "type": "integer",
+                    "title": "PQ Bits",
+                    "description": "Bits per PQ sub-quantizer code",
+                    "default": 8,
+                    "minimum": 4,
+                    "maximum": 12,
+                },
+                "faiss_training_samples": {
+                    "type": "integer",
+                    "title": "Training Samples",
+                    "description": "Maximum number of randomly sampled vectors used to train ivf/pq indexes",
+                    "default": 100000,
+                    "minimum": 1000,
+                },
+                "faiss_recall_report": {
+                    "type": "boolean",
+                    "title": "Recall Report",
+                    "description": "Measure recall and latency against a flat baseline when building an approximate index, and store the smallest nprobe/efSearch that reaches the target recall as the index default",
+                    "default": True,
+                },
+                "faiss_target_recall": {
+                    "type": "number",
+                    "title": "Target Recall",
+                    "description": "Recall@k the stored default nprobe/efSearch should reach",
+                    "default": 0.95,
+                    "minimum": 0.0,
+                    "maximum": 1.0,
+                },
                 "faiss_persist": {
                     "type": "boolean",
                     "title": "Persist to Disk",
@@ -570,6 +804,19 @@ class VectorStoreNode(BaseNode):
                     "description": "Path to save FAISS index (if persisting)",
                     "default": "./data/vectors/index.faiss",
                 },
+                "faiss_id_map": {
+                    "type": "boolean",
+                    "title": "Stable Chunk IDs",
+                    "description": "Wrap the index in an ID map keyed by (file, chunk hash) so vectors can be upserted and deleted",
+                    "default": False,
+                },
+                "faiss_operation": {
+                    "type": "string",
+                    "title": "Operation",
+                    "description": "add appends vectors; upsert replaces vectors with the same chunk ID and applies delete_ids/delete_file_ids; delete only applies deletions",
+                    "enum": ["add", "upsert", "delete"],
+                    "default": "add",
+                },
                 "index_id": {
                     "type": "string",
                     "title": "Index ID (Optional)",
@@ -706,6 +953,18 @@ class VectorStoreNode(BaseNode):
                 "type": "integer",
                 "description": "Number of vectors stored",
             },
+            "recall_report": {
+                "type": "object",
+                "description": "Recall@k and latency per nprobe/efSearch value against a flat baseline (approximate indexes only)",
+            },
+            "vectors_deleted": {
+                "type": "integer",
+                "description": "Number of vectors deleted (upsert/delete operations)",
+            },
+            "vectors_replaced": {
+                "type": "integer",
+                "description": "Number of existing vectors replaced by an upsert",
+            },
         }
 
 
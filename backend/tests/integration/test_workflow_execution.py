@@ -4,7 +4,7 @@ Integration tests for workflow execution functionality
 
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 from fastapi.testclient import TestClient
 from backend.main import app
 
@@ -69,19 +69,19 @@ class TestWorkflowExecutionAPI:
         
         # Mock the LLM API calls for execution
         with patch('backend.nodes.llm.chat.resolve_api_key', return_value="test-key"):
-            with patch('backend.nodes.llm.chat.OpenAI') as mock_openai_class:
+            with patch('backend.nodes.llm.chat.get_openai_client') as mock_openai_class:
                 # Setup mock OpenAI response
                 mock_client = Mock()
                 mock_openai_class.return_value = mock_client
                 
                 # Mock successful API response
-                mock_stream = Mock()
+                mock_stream = MagicMock()
                 mock_chunk = Mock()
                 mock_chunk.choices = [Mock()]
                 mock_chunk.choices[0].delta.content = "Hello! How can I help you?"
                 mock_chunk.usage = None
-                mock_stream.__iter__ = Mock(return_value=iter([mock_chunk]))
-                mock_client.chat.completions.create.return_value = mock_stream
+                mock_stream.__aiter__.return_value = [mock_chunk]
+                mock_client.chat.completions.create = AsyncMock(return_value=mock_stream)
                 
                 # Execute the workflow
                 execution_data = {
@@ -106,7 +106,7 @@ class TestWorkflowExecutionAPI:
         
         # Mock the LLM API calls with retry scenario
         with patch('backend.nodes.llm.chat.resolve_api_key', return_value="test-key"):
-            with patch('backend.nodes.llm.chat.OpenAI') as mock_openai_class:
+            with patch('backend.nodes.llm.chat.get_openai_client') as mock_openai_class:
                 mock_client = Mock()
                 mock_openai_class.return_value = mock_client
                 
@@ -122,15 +122,15 @@ class TestWorkflowExecutionAPI:
                         raise Exception("rate limit exceeded")
                     else:
                         # Second call succeeds
-                        mock_stream = Mock()
+                        mock_stream = MagicMock()
                         mock_chunk = Mock()
                         mock_chunk.choices = [Mock()]
                         mock_chunk.choices[0].delta.content = "Success after retry!"
                         mock_chunk.usage = None
-                        mock_stream.__iter__ = Mock(return_value=iter([mock_chunk]))
+                        mock_stream.__aiter__.return_value = [mock_chunk]
                         return mock_stream
                 
-                mock_client.chat.completions.create.side_effect = mock_api_call
+                mock_client.chat.completions.create = AsyncMock(side_effect=mock_api_call)
                 
                 # Execute workflow
                 execution_data = {
@@ -155,18 +155,18 @@ class TestWorkflowExecutionAPI:
         
         # Mock the execution
         with patch('backend.nodes.llm.chat.resolve_api_key', return_value="test-key"):
-            with patch('backend.nodes.llm.chat.OpenAI') as mock_openai_class:
+            with patch('backend.nodes.llm.chat.get_openai_client') as mock_openai_class:
                 mock_client = Mock()
                 mock_openai_class.return_value = mock_client
                 
                 # Mock successful response
-                mock_stream = Mock()
+                mock_stream = MagicMock()
                 mock_chunk = Mock()
                 mock_chunk.choices = [Mock()]
                 mock_chunk.choices[0].delta.content = "Test response"
                 mock_chunk.usage = None
-                mock_stream.__iter__ = Mock(return_value=iter([mock_chunk]))
-                mock_client.chat.completions.create.return_value = mock_stream
+                mock_stream.__aiter__.return_value = [mock_chunk]
+                mock_client.chat.completions.create = AsyncMock(return_value=mock_stream)
                 
                 # Start execution
                 execution_data = {
@@ -289,18 +289,18 @@ class TestWorkflowExecutionCore:
         
         # Mock the chat node execution
         with patch('backend.nodes.llm.chat.resolve_api_key', return_value="test-key"):
-            with patch('backend.nodes.llm.chat.OpenAI') as mock_openai_class:
+            with patch('backend.nodes.llm.chat.get_openai_client') as mock_openai_class:
                 mock_client = Mock()
                 mock_openai_class.return_value = mock_client
                 
                 # Setup mock response
-                mock_stream = Mock()
+                mock_stream = MagicMock()
                 mock_chunk = Mock()
                 mock_chunk.choices = [Mock()]
                 mock_chunk.choices[0].delta.content = "Mocked AI response"
                 mock_chunk.usage = None
-                mock_stream.__iter__ = Mock(return_value=iter([mock_chunk]))
-                mock_client.chat.completions.create.return_value = mock_stream
+                mock_stream.__aiter__.return_value = [mock_chunk]
+                mock_client.chat.completions.create = AsyncMock(return_value=mock_stream)
                 
                 # Execute workflow
                 result = await engine.execute_workflow(chat_workflow_data, {})
@@ -319,12 +319,12 @@ class TestWorkflowExecutionCore:
         
         # Mock the chat node to raise an error
         with patch('backend.nodes.llm.chat.resolve_api_key', return_value="test-key"):
-            with patch('backend.nodes.llm.chat.OpenAI') as mock_openai_class:
+            with patch('backend.nodes.llm.chat.get_openai_client') as mock_openai_class:
                 mock_client = Mock()
                 mock_openai_class.return_value = mock_client
                 
                 # Make API call fail
-                mock_client.chat.completions.create.side_effect = Exception("API Error")
+                mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
                 
                 # Execute workflow - should handle error gracefully
                 try:
@@ -410,7 +410,7 @@ class TestWorkflowExecutionPerformance:
         
         # Mock a slow API response
         with patch('backend.nodes.llm.chat.resolve_api_key', return_value="test-key"):
-            with patch('backend.nodes.llm.chat.OpenAI') as mock_openai_class:
+            with patch('backend.nodes.llm.chat.get_openai_client') as mock_openai_class:
                 mock_client = Mock()
                 mock_openai_class.return_value = mock_client
                 
@@ -418,15 +418,15 @@ class TestWorkflowExecutionPerformance:
                 def slow_mock_call(*args, **kwargs):
                     import time
                     time.sleep(0.1)  # Simulate slow response
-                    mock_stream = Mock()
+                    mock_stream = MagicMock()
                     mock_chunk = Mock()
                     mock_chunk.choices = [Mock()]
                     mock_chunk.choices[0].delta.content = "Slow response"
                     mock_chunk.usage = None
-                    mock_stream.__iter__ = Mock(return_value=iter([mock_chunk]))
+                    mock_stream.__aiter__.return_value = [mock_chunk]
                     return mock_stream
                 
-                mock_client.chat.completions.create.side_effect = slow_mock_call
+                mock_client.chat.completions.create = AsyncMock(side_effect=slow_mock_call)
                 
                 # Execute with timeout consideration
                 execution_data = {
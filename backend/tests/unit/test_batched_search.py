@@ -0,0 +1,97 @@
+"""
+Unit tests for batched multi-query vector search
+"""
+
+import faiss
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from backend.api.rag_evaluation import _prefetch_retrieval
+from backend.core.embedding_cache import EmbeddingCache
+from backend.core.faiss_index_manager import FaissIndexManager
+from backend.core.models import Edge, Node, Position, Workflow
+from backend.nodes.retrieval.search import VectorSearchNode
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = FaissIndexManager(memory_budget_bytes=10**9, cache_dir=tmp_path / "index_cache")
+    index = faiss.IndexFlatL2(2)
+    index.add(np.array([[0, 0], [10, 10], [20, 20]], dtype=np.float32))
+    manager.register("docs", index)
+    with manager.lease("docs", writable=True) as handle:
+        handle.metadata.extend({"text": t} for t in ("zero", "ten", "twenty"))
+    return manager
+
+
+@pytest.fixture
+def patched_node(manager):
+    with patch("backend.nodes.retrieval.search.get_faiss_index_manager", return_value=manager), \
+         patch.object(VectorSearchNode, "stream_progress", new=AsyncMock()):
+        yield VectorSearchNode()
+
+
+class TestBatchedSearch:
+    """Test that N queries are embedded and searched together."""
+
+    @pytest.mark.asyncio
+    async def test_query_embeddings_return_per_query_results(self, patched_node):
+        result = await patched_node.execute(
+            {"query_embeddings": [[19.0, 19.0], [1.0, 1.0]], "queries": ["a", "b"]},
+            {"provider": "faiss", "index_id": "docs", "top_k": 1},
+        )
+        assert result["query_count"] == 2
+        assert [r["results"][0]["text"] for r in result["batch_results"]] == ["twenty", "zero"]
+        assert result["batch_results"][1]["query"] == "b"
+
+    @pytest.mark.asyncio
+    async def test_queries_are_embedded_in_one_call(self, patched_node, tmp_path):
+        client = MagicMock()
+        client.embeddings.create = AsyncMock(return_value=SimpleNamespace(
+            data=[SimpleNamespace(embedding=[9.0, 9.0]), SimpleNamespace(embedding=[21.0, 21.0])]
+        ))
+        cache = EmbeddingCache(tmp_path / "embedding_cache")
+        with patch("backend.nodes.retrieval.search.get_openai_client", return_value=client), \
+             patch("backend.nodes.retrieval.search.get_embedding_cache", return_value=cache), \
+             patch("backend.nodes.retrieval.search.resolve_api_key", return_value="sk-test"):
+            result = await patched_node.execute(
+                {"queries": ["near ten", "far", "near ten"]},
+                {"provider": "faiss", "index_id": "docs", "top_k": 1},
+            )
+        client.embeddings.create.assert_awaited_once()
+        assert client.embeddings.create.call_args.kwargs["input"] == ["near ten", "far"]
+        assert [r["results"][0]["text"] for r in result["batch_results"]] == ["ten", "twenty", "ten"]
+
+    @pytest.mark.asyncio
+    async def test_precomputed_results_short_circuit(self, patched_node):
+        precomputed = {"results": [], "provider": "faiss", "query": "q", "top_k": 5, "results_count": 0}
+        assert await patched_node.execute({}, {"_precomputed_results": precomputed}) is precomputed
+
+
+@pytest.mark.asyncio
+async def test_prefetch_reads_flat_node_settings_and_user(patched_node):
+    workflow = Workflow(
+        name="rag",
+        nodes=[
+            Node(id="question", type="text_input", position=Position(x=0, y=0), data={"text": ""}),
+            Node(id="embed", type="embed", position=Position(x=0, y=0), data={"provider": "openai"}),
+            Node(
+                id="search",
+                type="vector_search",
+                position=Position(x=0, y=0),
+                data={"provider": "faiss", "index_id": "docs", "top_k": 1},
+            ),
+        ],
+        edges=[
+            Edge(id="e1", source="question", target="embed"),
+            Edge(id="e2", source="embed", target="search"),
+        ],
+    )
+    embed = AsyncMock(return_value={"embeddings": [[19.0, 19.0], [1.0, 1.0]]})
+    with patch("backend.nodes.embedding.embed.EmbedNode.execute", new=embed):
+        prefetched = await _prefetch_retrieval(workflow, "question", ["a", "b"], user_id="user-1")
+
+    assert embed.call_args.args[1]["_user_id"] == "user-1"
+    assert [r["results"][0]["text"] for r in prefetched["search"]] == ["twenty", "zero"]
@@ -0,0 +1,83 @@
+"""
+Unit tests for the CSR BM25 index
+"""
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from backend.core.bm25_index import BM25Index, BM25IndexStore, tokenize
+from backend.nodes.retrieval.bm25_search import BM25SearchNode
+
+DOCS = [
+    "FAISS builds vector indexes for similarity search",
+    "BM25 ranks documents by keyword overlap",
+    "keyword search with BM25 complements vector search",
+    "",
+    "an unrelated sentence about cooking pasta",
+]
+
+
+class TestBM25Index:
+    """Test scoring, top-k selection and persistence."""
+
+    def test_scores_match_rank_bm25(self):
+        rank_bm25 = pytest.importorskip("rank_bm25")
+        reference = rank_bm25.BM25Okapi([tokenize(doc) for doc in DOCS])
+        index = BM25Index.build(DOCS)
+        for query in ("bm25 keyword search", "vector vector", "missing"):
+            np.testing.assert_allclose(index.scores(query), reference.get_scores(tokenize(query)), atol=1e-5)
+
+    def test_search_returns_matching_docs_best_first(self):
+        index = BM25Index.build(DOCS)
+        results = index.search("keyword search", top_k=2)
+        assert [doc_id for doc_id, _ in results] == [2, 1]
+        assert results[0][1] >= results[1][1]
+        assert all(doc_id != 4 for doc_id, _ in index.search("keyword search", top_k=10, score_threshold=0.01))
+        assert index.search("nothing matches", top_k=5, score_threshold=0.01) == []
+
+    def test_zero_threshold_fills_top_k_with_zero_score_docs(self):
+        # rank_bm25 returned top_k results whatever their score
+        index = BM25Index.build(DOCS)
+        results = index.search("pasta", top_k=3)
+        assert [doc_id for doc_id, _ in results] == [4, 0, 1]
+        assert [score for _, score in results[1:]] == [0.0, 0.0]
+        assert [doc_id for doc_id, _ in index.search("nothing matches", top_k=10)] == [0, 1, 2, 3, 4]
+
+    def test_persisted_index_loads_memory_mapped(self, tmp_path):
+        store = BM25IndexStore(tmp_path)
+        store.put("docs", BM25Index.build(DOCS, [{"text": doc, "n": i} for i, doc in enumerate(DOCS)]))
+
+        loaded = BM25IndexStore(tmp_path).get("docs")
+        assert isinstance(loaded.doc_ids, np.memmap)
+        doc_id, _ = loaded.search("pasta", top_k=1)[0]
+        assert loaded.documents.get(doc_id) == {"text": DOCS[4], "n": 4}
+        assert BM25IndexStore(tmp_path).get("missing") is None
+
+    def test_replaced_index_stays_open_while_leased(self, tmp_path):
+        store = BM25IndexStore(tmp_path)
+        store.put("docs", BM25Index.build(DOCS, [{"text": doc} for doc in DOCS]))
+
+        with store.lease("docs") as reader:
+            doc_id, _ = reader.search("pasta", top_k=1)[0]
+            # A rebuild lands while the query is between search and record lookup
+            store.put("docs", BM25Index.build(DOCS[:2], [{"text": doc} for doc in DOCS[:2]]))
+            assert reader.documents.get(doc_id) == {"text": DOCS[4]}
+        assert reader.retired and len(reader.documents) == 0
+        with store.lease("docs") as current:
+            assert current.num_docs == 2
+        with store.lease("missing") as missing:
+            assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_node_reuses_stored_index(tmp_path):
+    store = BM25IndexStore(tmp_path)
+    node = BM25SearchNode()
+    with patch("backend.nodes.retrieval.bm25_search.get_bm25_index_store", return_value=store), \
+         patch.object(BM25SearchNode, "stream_progress", new=AsyncMock()), \
+         patch.object(BM25SearchNode, "stream_output", new=AsyncMock()):
+        await node.execute({"documents": DOCS}, {"query": "vector", "index_id": "kb"})
+        result = await node.execute({}, {"query": "BM25 keyword", "index_id": "kb", "top_k": 1})
+    assert result["results_count"] == 1
+    assert result["results"][0]["text"] == DOCS[1]
@@ -42,7 +42,7 @@ class TestChatNodeRetryLogic:
         """Test that OpenAI API calls retry on rate limits."""
         
         with patch('backend.nodes.llm.chat.resolve_api_key', return_value="test-key"):
-            with patch('backend.nodes.llm.chat.OpenAI') as mock_openai_class:
+            with patch('backend.nodes.llm.chat.get_openai_client') as mock_openai_class:
                 # Create mock client and stream
                 mock_client = Mock()
                 mock_openai_class.return_value = mock_client
@@ -59,15 +59,15 @@ class TestChatNodeRetryLogic:
                         raise Exception("rate limit exceeded")
                     else:
                         # Second call succeeds
-                        mock_stream = Mock()
+                        mock_stream = MagicMock()
                         mock_chunk = Mock()
                         mock_chunk.choices = [Mock()]
                         mock_chunk.choices[0].delta.content = "Hello! I'm doing well."
                         mock_chunk.usage = None
-                        mock_stream.__iter__ = Mock(return_value=iter([mock_chunk]))
+                        mock_stream.__aiter__.return_value = [mock_chunk]
                         return mock_stream
                 
-                mock_client.chat.completions.create.side_effect = mock_stream_create
+                mock_client.chat.completions.create = AsyncMock(side_effect=mock_stream_create)
                 
                 # Mock the stream_* methods
                 chat_node.stream_event = AsyncMock()
@@ -89,13 +89,13 @@ class TestChatNodeRetryLogic:
         """Test that OpenAI API calls don't retry on auth errors."""
         
         with patch('backend.nodes.llm.chat.resolve_api_key', return_value="test-key"):
-            with patch('backend.nodes.llm.chat.OpenAI') as mock_openai_class:
+            with patch('backend.nodes.llm.chat.get_openai_client') as mock_openai_class:
                 # Create mock client
                 mock_client = Mock()
                 mock_openai_class.return_value = mock_client
                 
                 # Mock API call that fails with auth error
-                mock_client.chat.completions.create.side_effect = Exception("invalid api key")
+                mock_client.chat.completions.create = AsyncMock(side_effect=Exception("invalid api key"))
                 
                 # Mock the stream_* methods
                 chat_node.stream_event = AsyncMock()
@@ -118,7 +118,7 @@ class TestChatNodeRetryLogic:
         anthropic_config["anthropic_model"] = "claude-3-5-sonnet-20241022"
         
         with patch('backend.nodes.llm.chat.resolve_api_key', return_value="test-key"):
-            with patch('backend.nodes.llm.chat.Anthropic') as mock_anthropic_class:
+            with patch('backend.nodes.llm.chat.get_anthropic_client') as mock_anthropic_class:
                 # Create mock client
                 mock_client = Mock()
                 mock_anthropic_class.return_value = mock_client
@@ -136,7 +136,8 @@ class TestChatNodeRetryLogic:
                         # Second call succeeds
                         mock_stream_context = Mock()
                         mock_stream = Mock()
-                        mock_stream.text_stream = ["Hello! ", "I'm doing well."]
+                        mock_stream.text_stream = MagicMock()
+                        mock_stream.text_stream.__aiter__.return_value = ["Hello! ", "I'm doing well."]
                         
                         # Mock get_final_message
                         mock_message = Mock()
@@ -144,10 +145,10 @@ class TestChatNodeRetryLogic:
                         mock_usage.input_tokens = 10
                         mock_usage.output_tokens = 15
                         mock_message.usage = mock_usage
-                        mock_stream.get_final_message.return_value = mock_message
+                        mock_stream.get_final_message = AsyncMock(return_value=mock_message)
                         
-                        mock_stream_context.__enter__ = Mock(return_value=mock_stream)
-                        mock_stream_context.__exit__ = Mock(return_value=None)
+                        mock_stream_context.__aenter__ = AsyncMock(return_value=mock_stream)
+                        mock_stream_context.__aexit__ = AsyncMock(return_value=None)
                         return mock_stream_context
                 
                 mock_client.messages.stream.side_effect = mock_stream_create
@@ -175,7 +176,7 @@ class TestChatNodeRetryLogic:
         anthropic_config["provider"] = "anthropic"
         
         with patch('backend.nodes.llm.chat.resolve_api_key', return_value="test-key"):
-            with patch('backend.nodes.llm.chat.Anthropic') as mock_anthropic_class:
+            with patch('backend.nodes.llm.chat.get_anthropic_client') as mock_anthropic_class:
                 # Create mock client
                 mock_client = Mock()
                 mock_anthropic_class.return_value = mock_client
@@ -296,7 +297,7 @@ class TestChatNodeIntegrationWithRetry:
         inputs = {"query": "Test"}
         
         with patch('backend.nodes.llm.chat.resolve_api_key', return_value="test-key"):
-            with patch('backend.nodes.llm.chat.OpenAI') as mock_openai_class:
+            with patch('backend.nodes.llm.chat.get_openai_client') as mock_openai_class:
                 mock_client = Mock()
                 mock_openai_class.return_value = mock_client
                 
@@ -311,15 +312,15 @@ class TestChatNodeIntegrationWithRetry:
                         raise Exception("rate limit exceeded")
                     else:
                         # Success case
-                        mock_stream = Mock()
+                        mock_stream = MagicMock()
                         mock_chunk = Mock()
                         mock_chunk.choices = [Mock()]
                         mock_chunk.choices[0].delta.content = "Success after retry"
                         mock_chunk.usage = None
-                        mock_stream.__iter__ = Mock(return_value=iter([mock_chunk]))
+                        mock_stream.__aiter__.return_value = [mock_chunk]
                         return mock_stream
                 
-                mock_client.chat.completions.create.side_effect = mock_api_call
+                mock_client.chat.completions.create = AsyncMock(side_effect=mock_api_call)
                 
                 # Mock streaming methods
                 chat_node.stream_event = AsyncMock()
@@ -0,0 +1,87 @@
+"""
+Unit tests for the shared provider client pool
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from backend.core.client_pool import ProviderClientPool
+
+
+@pytest.fixture
+def fake_factory():
+    factory = MagicMock(side_effect=lambda api_key, base_url, options: MagicMock())
+    with patch.dict("backend.core.client_pool._FACTORIES", {"openai": factory}):
+        yield factory
+
+
+class TestProviderClientPool:
+    """Test client reuse and eviction."""
+
+    def test_same_credentials_reuse_client(self, fake_factory):
+        pool = ProviderClientPool()
+        first = pool.get("openai", "sk-a")
+        second = pool.get("openai", "sk-a")
+        assert first is second
+        assert fake_factory.call_count == 1
+        assert pool.stats()["hits"] == 1
+
+    def test_different_keys_and_base_urls_are_separate(self, fake_factory):
+        pool = ProviderClientPool()
+        a = pool.get("openai", "sk-a")
+        b = pool.get("openai", "sk-b")
+        c = pool.get("openai", "sk-a", base_url="https://example.openai.azure.com/openai/deployments")
+        assert len({id(a), id(b), id(c)}) == 3
+
+    def test_lru_eviction_when_full(self, fake_factory):
+        pool = ProviderClientPool(max_size=2)
+        a = pool.get("openai", "sk-a")
+        pool.get("openai", "sk-b")
+        pool.get("openai", "sk-a")  # a is now most recently used
+        pool.get("openai", "sk-c")  # evicts b
+        assert pool.get("openai", "sk-a") is a
+        assert pool.stats()["evictions"] == 1
+        assert pool.stats()["size"] == 2
+
+    def test_idle_clients_expire(self, fake_factory):
+        pool = ProviderClientPool(idle_seconds=10)
+        with patch("backend.core.client_pool.time.monotonic", return_value=100.0):
+            a = pool.get("openai", "sk-a")
+        with patch("backend.core.client_pool.time.monotonic", return_value=200.0):
+            assert pool.get("openai", "sk-a") is not a
+
+    def test_rejects_unknown_provider_and_missing_key(self, fake_factory):
+        pool = ProviderClientPool()
+        with pytest.raises(ValueError):
+            pool.get("unknown", "key")
+        with pytest.raises(ValueError):
+            pool.get("openai", "")
+
+    @pytest.mark.asyncio
+    async def test_close_all_awaits_async_close(self, fake_factory):
+        pool = ProviderClientPool()
+        client = pool.get("openai", "sk-a")
+        closed = []
+
+        async def close():
+            closed.append(True)
+
+        client.close = close
+        await pool.close_all()
+        assert closed == [True]
+        assert pool.stats()["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_evicted_clients_are_closed(self, fake_factory):
+        pool = ProviderClientPool(max_size=1)
+        evicted = pool.get("openai", "sk-a")
+        closed = []
+
+        async def close():
+            closed.append(evicted)
+
+        evicted.close = close
+        pool.get("openai", "sk-b")  # evicts sk-a; its close waits out the grace period
+        assert closed == []
+        await pool.close_all()
+        assert closed == [evicted]
@@ -0,0 +1,91 @@
+"""
+Unit tests for the CPU-bound work offload pool
+"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from backend.core.compute_pool import ComputePool
+from backend.core.exceptions import ComputeTimeoutError
+
+
+def _describe(text, array):
+    """Runs in a worker process."""
+    return os.getpid(), text.upper(), array * 2
+
+
+def _sleep_then_return(seconds, size):
+    time.sleep(seconds)
+    return b"x" * size
+
+
+def _shm_blocks():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def pool():
+    pool = ComputePool(process_workers=1, thread_workers=2, task_timeout=30, shared_memory_min_bytes=1024)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_task_hands_large_buffers_through_shared_memory(pool):
+    text = "abc" * 10000
+    array = np.arange(100000, dtype=np.float32)
+
+    pid, upper, doubled = await pool.run(_describe, text, array)
+
+    assert pid != os.getpid()
+    assert upper == text.upper()
+    assert doubled.dtype == np.float32
+    np.testing.assert_array_equal(doubled, array * 2)
+
+
+@pytest.mark.asyncio
+async def test_timed_out_process_task_restarts_pool(pool):
+    with pytest.raises(ComputeTimeoutError):
+        await pool.run(_sleep, 30, timeout=0.5)
+
+    assert await pool.run(_sleep, 0) == 0
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="POSIX shared memory not visible")
+@pytest.mark.asyncio
+async def test_abandoned_process_task_unlinks_its_result(pool):
+    before = _shm_blocks()
+    with pytest.raises(ComputeTimeoutError):
+        await pool._run_in_process(
+            pool._process_pool(), _sleep_then_return, (0.5, 100000), {}, 0.1, "abandoned",
+            restart_on_timeout=False,
+        )
+
+    # The single worker runs this after the abandoned task has finished
+    assert await pool.run(_sleep, 0) == 0
+    for _ in range(50):
+        if not _shm_blocks() - before:
+            break
+        time.sleep(0.02)
+    assert not _shm_blocks() - before
+
+
+@pytest.mark.asyncio
+async def test_thread_fallback_without_process_workers():
+    pool = ComputePool(process_workers=0, thread_workers=1, task_timeout=30, shared_memory_min_bytes=1024)
+    try:
+        pid, upper, _ = await pool.run(_describe, "abc", np.zeros(1))
+        assert (pid, upper) == (os.getpid(), "ABC")
+
+        with pytest.raises(ComputeTimeoutError):
+            await pool.run(_sleep, 1, executor="thread", timeout=0.05)
+    finally:
+        pool.shutdown()
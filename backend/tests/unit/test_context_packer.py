@@ -0,0 +1,56 @@
+"""
+Unit tests for token-budgeted RAG context packing
+"""
+
+from backend.core.context_packer import context_budget, count_tokens, pack_context
+from backend.nodes.llm.chat import ChatNode
+
+PASSAGE = "The refund policy allows returns within thirty days of purchase with the original receipt"
+
+
+def test_orders_by_score_and_drops_near_duplicates():
+    results = [
+        {"text": "Shipping takes five business days for domestic orders", "score": 0.4},
+        {"text": PASSAGE, "score": 0.9},
+        {"text": PASSAGE + " only", "score": 0.8},
+    ]
+    packed = pack_context(results, budget=None, dedup_threshold=0.8)
+    assert [item["score"] for item in packed.items] == [0.9, 0.4]
+    assert packed.stats()["dropped_duplicates"] == 1
+
+
+def test_greedy_fill_skips_chunks_over_budget():
+    long_text = " ".join(f"word{i}" for i in range(400))
+    results = [
+        {"text": PASSAGE, "score": 0.9},
+        {"text": long_text, "score": 0.8},
+        {"text": "Support is available on weekdays", "score": 0.7},
+    ]
+    budget = count_tokens(PASSAGE) + count_tokens("Support is available on weekdays") + 20
+    packed = pack_context(results, budget=budget)
+    assert [item["score"] for item in packed.items] == [0.9, 0.7]
+    assert packed.dropped_over_budget == 1
+    assert packed.tokens <= budget
+
+
+def test_budget_respects_context_window():
+    # gpt-4o has a 128k window; a tiny configured budget wins
+    assert context_budget("openai", "gpt-4o", 500, 100, budget=1000) == 1000
+    assert context_budget("openai", "gpt-4o", 500, 100, budget=0) == 128000 - 600
+    assert context_budget("custom", "unknown-model", 500, 100, budget=0) is None
+    # claude-sonnet-4-5 has 64k of output (max_tokens) but a 200k window
+    assert context_budget("anthropic", "claude-sonnet-4-5", 500, 100, budget=0) == 200000 - 600
+
+
+def test_chat_node_packs_results_before_rendering():
+    node = ChatNode()
+    inputs = {
+        "query": "refunds?",
+        "results": [{"text": PASSAGE, "score": 0.5}, {"text": PASSAGE, "score": 0.9}],
+    }
+    stats = node._pack_context(inputs, {}, "openai", "gpt-4o", 500, "", "{context}\n\nQuestion: {query}")
+    assert stats["packed"] == 1 and stats["dropped_duplicates"] == 1
+    assert node._render_template("{context}", inputs) == f"[1] {PASSAGE}"
+
+    # Disabled per node
+    assert node._pack_context(inputs, {"pack_context": False}, "openai", "gpt-4o", 500, "", "{context}") is None
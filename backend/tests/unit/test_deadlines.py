@@ -0,0 +1,102 @@
+"""
+Unit tests for execution deadlines and hedged requests
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from backend.core.deadline import bounded_timeout, deadline_scope, remaining_time
+from backend.core.engine.node_executor import NodeExecutor
+from backend.core.exceptions import NodeTimeoutError
+from backend.core.hedging import LatencyTracker, hedged
+from backend.utils.retry import retry_with_backoff
+
+
+def test_inner_scope_cannot_extend_deadline():
+    assert remaining_time() is None
+    assert bounded_timeout(5) == 5
+    with deadline_scope(1.0):
+        with deadline_scope(10.0) as budget:
+            assert budget <= 1.0
+            assert bounded_timeout(5) <= 1.0
+        with deadline_scope(None) as budget:
+            assert budget <= 1.0
+    assert remaining_time() is None
+
+
+@pytest.mark.asyncio
+async def test_node_times_out_at_remaining_deadline():
+    class SlowNode:
+        async def execute_safe(self, inputs, config):
+            await asyncio.sleep(5)
+
+    node = SimpleNamespace(id="n1", type="slow")
+    started = time.monotonic()
+    with deadline_scope(0.05):
+        with pytest.raises(NodeTimeoutError) as error:
+            await NodeExecutor._run_with_deadline(SlowNode(), node, {}, {"timeout_ms": 10000})
+    assert time.monotonic() - started < 1
+    assert error.value.timeout_seconds <= 0.05
+
+
+@pytest.mark.asyncio
+async def test_retry_stops_when_next_attempt_would_miss_deadline():
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    with deadline_scope(0.2):
+        with pytest.raises(RuntimeError):
+            await retry_with_backoff(failing, max_retries=3, initial_delay=1.0, jitter=False)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_returns_first_answer_and_cancels_other():
+    tracker = LatencyTracker()
+    for _ in range(20):
+        tracker.record("svc", 0.01)
+    delays = [1.0, 0.0]
+    cancelled = []
+
+    async def call():
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    with patch("backend.core.hedging.get_latency_tracker", return_value=tracker), \
+            patch("backend.core.hedging.settings.enable_hedged_requests", True):
+        started = time.monotonic()
+        assert await hedged("svc", call) == 0.0
+
+    assert time.monotonic() - started < 0.5
+    assert cancelled == [1.0]
+    assert tracker.stats()["svc"]["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_request_is_not_hedged():
+    tracker = LatencyTracker()
+    for _ in range(20):
+        tracker.record("svc", 0.001)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    with patch("backend.core.hedging.get_latency_tracker", return_value=tracker), \
+            patch("backend.core.hedging.settings.enable_hedged_requests", True):
+        assert await hedged("svc", call, idempotent=False) == "ok"
+    assert len(calls) == 1
@@ -0,0 +1,116 @@
+"""
+Unit tests for concurrent batched embedding and provider rate limiting
+"""
+
+import asyncio
+import random
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from backend.core.rate_limiter import ProviderRateLimiter
+from backend.nodes.embedding.embed import EmbedNode
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+
+@pytest.fixture
+def embed_node():
+    node = EmbedNode()
+    with patch.object(EmbedNode, "stream_progress", new=AsyncMock()):
+        yield node
+
+
+def _config(**overrides):
+    config = {"requests_per_minute": 0, "tokens_per_minute": 0}
+    config.update(overrides)
+    return config
+
+
+class TestEmbedInBatches:
+    """Test EmbedNode._embed_in_batches."""
+
+    @pytest.mark.asyncio
+    async def test_preserves_order_when_batches_finish_out_of_order(self, embed_node):
+        texts = [f"text {i}" for i in range(23)]
+
+        async def embed_batch(batch):
+            await asyncio.sleep(random.random() * 0.02)
+            return [[float(text.split()[1])] for text in batch]
+
+        embeddings = await embed_node._embed_in_batches(
+            texts, 5, embed_batch, _config(max_concurrent_batches=4), "embed",
+            provider="test", api_key="order", provider_label="Test",
+        )
+
+        assert embeddings == [[float(i)] for i in range(23)]
+
+    @pytest.mark.asyncio
+    async def test_in_flight_limit(self, embed_node):
+        running = 0
+        max_running = 0
+
+        async def embed_batch(batch):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [[0.0] for _ in batch]
+
+        await embed_node._embed_in_batches(
+            ["x"] * 40, 2, embed_batch, _config(max_concurrent_batches=3), "embed",
+            provider="test", api_key="limit", provider_label="Test",
+        )
+
+        assert max_running == 3
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_batch_is_retried(self, embed_node):
+        calls = {"count": 0}
+
+        async def embed_batch(batch):
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise _RateLimitError("rate limit exceeded")
+            return [[1.0] for _ in batch]
+
+        with patch("backend.utils.retry.asyncio.sleep", new=AsyncMock()), \
+             patch("backend.core.rate_limiter.asyncio.sleep", new=AsyncMock()):
+            embeddings = await embed_node._embed_in_batches(
+                ["a", "b"], 2, embed_batch, _config(), "embed",
+                provider="test", api_key="retry", provider_label="Test",
+            )
+
+        assert embeddings == [[1.0], [1.0]]
+        assert calls["count"] == 2
+
+
+class TestProviderRateLimiter:
+    """Test the sliding-window RPM/TPM limiter."""
+
+    def test_rpm_budget(self):
+        limiter = ProviderRateLimiter(rpm=2)
+        limiter._requests.extend([(100.0, 0), (101.0, 0)])
+        assert limiter._delay_for(0, 110.0) == pytest.approx(50.0)
+        assert limiter._delay_for(0, 161.0) == 0.0
+
+    def test_tpm_budget(self):
+        limiter = ProviderRateLimiter(tpm=1000)
+        limiter._requests.extend([(100.0, 600), (105.0, 300)])
+        limiter._tokens_in_window = 900
+        # 200 more tokens needs the first request (600 tokens) to expire
+        assert limiter._delay_for(200, 110.0) == pytest.approx(50.0)
+        assert limiter._delay_for(100, 110.0) == 0.0
+
+    def test_oversized_request_admitted_on_empty_window(self):
+        limiter = ProviderRateLimiter(tpm=100)
+        assert limiter._delay_for(10_000, 0.0) == 0.0
+
+    def test_pause_delays_all_callers(self):
+        limiter = ProviderRateLimiter()
+        with patch("backend.core.rate_limiter.time.monotonic", return_value=50.0):
+            limiter.pause(5.0)
+        assert limiter._delay_for(0, 52.0) == pytest.approx(3.0)
@@ -0,0 +1,140 @@
+"""
+Unit tests for the content-addressed embedding cache
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from backend.core.embedding_cache import EmbeddingCache
+from backend.nodes.embedding.embed import EmbedNode
+
+
+class TestEmbeddingCache:
+    """Test the memory and disk tiers."""
+
+    def test_roundtrip_and_persistence(self, tmp_path):
+        cache = EmbeddingCache(tmp_path)
+        cache.put_many("openai", "m", None, ["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+        assert cache.get_many("openai", "m", None, ["b", "c", "a"]) == [[3.0, 4.0], None, [1.0, 2.0]]
+        cache.flush()
+
+        # A fresh instance reads the memory-mapped disk tier
+        reloaded = EmbeddingCache(tmp_path)
+        assert reloaded.get_many("openai", "m", None, ["a", "b"]) == [[1.0, 2.0], [3.0, 4.0]]
+        assert reloaded.stats()["hits"] == 2
+
+    def test_key_includes_model_and_dimension(self, tmp_path):
+        cache = EmbeddingCache(tmp_path)
+        cache.put_many("openai", "m", None, ["a"], [[1.0]])
+        assert cache.get_many("openai", "other", None, ["a"]) == [None]
+        assert cache.get_many("openai", "m", 256, ["a"]) == [None]
+        assert cache.get_many("cohere", "m", None, ["a"]) == [None]
+
+    def test_memory_tier_is_bounded(self, tmp_path):
+        cache = EmbeddingCache(tmp_path, memory_items=2)
+        cache.put_many("openai", "m", None, ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+        cache.flush()
+        assert cache.stats()["memory_items"] == 2
+        # Evicted entries are still served from disk
+        assert cache.get_many("openai", "m", None, ["a"]) == [[1.0]]
+
+    def test_torn_write_is_ignored_on_load(self, tmp_path):
+        cache = EmbeddingCache(tmp_path)
+        cache.put_many("openai", "m", None, ["a"], [[1.0, 2.0]])
+        cache.flush()
+        segment_dir = next(p for p in tmp_path.iterdir() if p.is_dir())
+        with open(segment_dir / "vectors.f32", "ab") as f:
+            f.write(b"\x00" * 6)
+
+        reloaded = EmbeddingCache(tmp_path)
+        assert reloaded.get_many("openai", "m", None, ["a"]) == [[1.0, 2.0]]
+        reloaded.put_many("openai", "m", None, ["b"], [[5.0, 6.0]])
+        reloaded.flush()
+        assert EmbeddingCache(tmp_path).get_many("openai", "m", None, ["b"]) == [[5.0, 6.0]]
+
+    def test_processes_sharing_a_segment_stay_aligned(self, tmp_path):
+        # Two instances stand in for two processes appending to the same files
+        first, second = EmbeddingCache(tmp_path), EmbeddingCache(tmp_path)
+        first.put_many("openai", "m", None, ["x"], [[1.0]])
+        first.flush()
+        second.put_many("openai", "m", None, ["y"], [[2.0]])
+        second.flush()
+        first.put_many("openai", "m", None, ["z"], [[3.0]])
+        first.flush()
+
+        second.clear_memory()
+        assert second.get_many("openai", "m", None, ["z", "y", "x"]) == [[3.0], [2.0], [1.0]]
+        assert EmbeddingCache(tmp_path).get_many("openai", "m", None, ["x", "y", "z"]) == [[1.0], [2.0], [3.0]]
+
+    def test_lookup_misses_refresh_the_segment_once(self, tmp_path):
+        cache = EmbeddingCache(tmp_path)
+        cache.put_many("openai", "m", None, ["a"], [[1.0]])
+        cache.flush()
+        cache.clear_memory()
+        segment = next(iter(cache._segments.values()))
+
+        with patch.object(segment, "_refresh", wraps=segment._refresh) as refresh:
+            assert cache.get_many("openai", "m", None, ["a", "b", "c", "d"]) == [[1.0], None, None, None]
+        assert refresh.call_count == 1
+
+
+class TestEmbedNodeCache:
+    """Test that EmbedNode only sends cache misses to the provider."""
+
+    @pytest.mark.asyncio
+    async def test_only_misses_are_embedded(self, tmp_path):
+        cache = EmbeddingCache(tmp_path)
+        cache.put_many("openai", "text-embedding-3-small", None, ["cached"], [[9.0]])
+        provider_calls = []
+
+        async def fake_openai(texts, inputs, config, node_id):
+            provider_calls.append(list(texts))
+            return {
+                "embeddings": [[float(len(t))] for t in texts],
+                "provider": "openai",
+                "model": "text-embedding-3-small",
+                "count": len(texts),
+                "dimension": 1,
+                "cost": 0.01 * len(texts),
+            }
+
+        node = EmbedNode()
+        with patch("backend.nodes.embedding.embed.get_embedding_cache", return_value=cache), \
+             patch.object(EmbedNode, "_embed_openai", side_effect=fake_openai), \
+             patch.object(EmbedNode, "stream_progress", new=AsyncMock()), \
+             patch.object(EmbedNode, "stream_log", new=AsyncMock()):
+            result = await node.execute(
+                {"chunks": ["cached", "new", "new", "other"]},
+                {"provider": "openai"},
+            )
+            assert provider_calls == [["new", "other"]]
+            assert result["embeddings"] == [[9.0], [3.0], [3.0], [5.0]]
+            assert result["cache_hits"] == 1
+            assert result["cost"] == pytest.approx(0.02)
+
+            # Second run is served entirely from the cache
+            result = await node.execute({"chunks": ["new", "other"]}, {"provider": "openai"})
+            assert len(provider_calls) == 1
+            assert result["cost"] == 0.0
+            assert result["embeddings"] == [[3.0], [5.0]]
+
+
+@pytest.mark.asyncio
+async def test_executor_does_not_bill_full_cache_hits(tmp_path):
+    from datetime import datetime
+
+    from backend.core.engine.node_executor import NodeExecutor
+    from backend.core.models import Execution, ExecutionStatus, Node, Position
+
+    texts = ["alpha " * 2000, "beta " * 2000]
+    cache = EmbeddingCache(tmp_path)
+    cache.put_many("openai", "text-embedding-3-small", None, texts, [[1.0], [2.0]])
+    node = Node(id="embed", type="embed", position=Position(x=0, y=0), data={"provider": "openai"})
+    execution = Execution(id="e", workflow_id="wf", status=ExecutionStatus.RUNNING, started_at=datetime.now())
+
+    with patch("backend.nodes.embedding.embed.get_embedding_cache", return_value=cache), \
+         patch("backend.core.engine.node_executor.settings.enable_node_memoization", False):
+        result = await NodeExecutor.execute_node(node, {"chunks": texts}, execution, "e", node_class=EmbedNode)
+
+    assert result.output["cache_hits"] == 2
+    assert result.cost == 0.0
@@ -0,0 +1,111 @@
+"""
+Unit tests for the parallel DAG scheduler in WorkflowEngine
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import backend.nodes  # noqa: F401  (registers node types)
+from backend.core.engine.engine import WorkflowEngine
+from backend.core.engine.workflow_validator import WorkflowValidator
+from backend.core.models import Edge, Node, NodeResult, NodeStatus, Position, Workflow
+
+
+def _workflow(node_ids, edges):
+    """Build a workflow of text_input nodes connected by (source, target) edges."""
+    return Workflow(
+        id="scheduler-test",
+        name="Scheduler Test",
+        nodes=[
+            Node(id=node_id, type="text_input", position=Position(x=0, y=0), data={"text": node_id})
+            for node_id in node_ids
+        ],
+        edges=[
+            Edge(id=f"{source}-{target}", source=source, target=target)
+            for source, target in edges
+        ],
+    )
+
+
+class _RecordingExecutor:
+    """Fake NodeExecutor.execute_node that records concurrency and ordering."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.started = []
+        self.finished = []
+
+    async def __call__(self, node, inputs, execution, execution_id, user_id=None, span=None, **kwargs):
+        started_at = datetime.now()
+        self.started.append(node.id)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        self.finished.append(node.id)
+        return NodeResult(
+            node_id=node.id,
+            status=NodeStatus.COMPLETED,
+            output={"text": node.id},
+            cost=0.0,
+            duration_ms=int(self.delay * 1000),
+            started_at=started_at,
+            completed_at=datetime.now(),
+        )
+
+
+@pytest.fixture
+def recording_executor():
+    executor = _RecordingExecutor()
+    with patch("backend.core.engine.engine.NodeExecutor.execute_node", new=executor), \
+         patch("backend.core.engine.engine.CostTracker.record_execution_costs", new=AsyncMock()):
+        yield executor
+
+
+class TestDependencyGraph:
+    """Test WorkflowValidator.build_dependency_graph."""
+
+    def test_duplicate_edges_counted_once(self):
+        workflow = _workflow(["a", "b"], [("a", "b"), ("a", "b")])
+        predecessors, successors = WorkflowValidator.build_dependency_graph(workflow)
+        assert predecessors["b"] == {"a"}
+        assert successors["a"] == ["b"]
+        assert predecessors["a"] == set()
+
+
+class TestParallelScheduler:
+    """Test that independent branches run concurrently."""
+
+    @pytest.mark.asyncio
+    async def test_independent_branches_overlap(self, recording_executor):
+        # a -> (b, c) -> d : b and c are independent
+        workflow = _workflow(["a", "b", "c", "d"], [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")])
+
+        execution = await WorkflowEngine().execute(workflow, execution_id="sched-1")
+
+        assert recording_executor.max_running == 2
+        assert recording_executor.started[0] == "a"
+        assert recording_executor.started[-1] == "d"
+        assert set(execution.results) == {"a", "b", "c", "d"}
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self, recording_executor):
+        workflow = _workflow(["a", "b", "c", "d"], [])
+
+        await WorkflowEngine().execute(workflow, execution_id="sched-2", max_concurrency=1)
+
+        assert recording_executor.max_running == 1
+        assert recording_executor.finished == ["a", "b", "c", "d"]
+
+    @pytest.mark.asyncio
+    async def test_downstream_waits_for_all_sources(self, recording_executor):
+        workflow = _workflow(["a", "b", "c"], [("a", "c"), ("b", "c")])
+
+        await WorkflowEngine().execute(workflow, execution_id="sched-3")
+
+        assert recording_executor.finished.index("c") == 2
@@ -0,0 +1,136 @@
+"""
+Unit tests for compiled workflow execution plans
+"""
+
+import pytest
+from unittest.mock import patch
+
+import backend.nodes  # noqa: F401  (registers node types)
+from backend.core.engine.data_collector import DataCollector
+from backend.core.engine.execution_plan import (
+    MERGE_NONE,
+    MERGE_SMART,
+    ExecutionPlanCache,
+    compile_plan,
+    workflow_content_hash,
+)
+from backend.core.exceptions import CircularDependencyError, WorkflowValidationError
+from backend.core.models import Edge, Node, Position, Workflow
+from backend.core.node_registry import NodeRegistry
+
+
+def _workflow(node_ids, edges, workflow_id="plan-test", data=None):
+    return Workflow(
+        id=workflow_id,
+        name="Plan Test",
+        nodes=[
+            Node(id=node_id, type="text_input", position=Position(x=0, y=0), data=(data or {}).get(node_id, {"text": node_id}))
+            for node_id in node_ids
+        ],
+        edges=[
+            Edge(id=f"{source}-{target}-{i}", source=source, target=target)
+            for i, (source, target) in enumerate(edges)
+        ],
+    )
+
+
+class TestCompilePlan:
+    def test_plan_contents(self):
+        workflow = _workflow(["a", "b", "c"], [("a", "c"), ("b", "c"), ("a", "c")])
+
+        plan = compile_plan(workflow)
+
+        assert plan.execution_order[-1] == "c"
+        assert plan.sources["c"] == ["a", "b"]
+        assert plan.direct_sources["c"] == frozenset({"a", "b"})
+        assert plan.predecessors["c"] == {"a", "b"}
+        assert plan.successors["a"] == ["c"]
+        assert plan.merge_strategies == {"a": MERGE_NONE, "b": MERGE_NONE, "c": MERGE_SMART}
+        assert plan.node_classes["a"] is NodeRegistry.get("text_input")
+        assert plan.get_node(workflow, "b").id == "b"
+
+    def test_invalid_workflows_raise(self):
+        with pytest.raises(CircularDependencyError):
+            compile_plan(_workflow(["a", "b"], [("a", "b"), ("b", "a")]))
+        with pytest.raises(WorkflowValidationError):
+            compile_plan(_workflow(["a"], [("a", "missing")]))
+
+    def test_hash_ignores_node_config(self):
+        first = _workflow(["a", "b"], [("a", "b")])
+        second = _workflow(["a", "b"], [("a", "b")], data={"a": {"text": "other query"}})
+        rewired = _workflow(["a", "b"], [("b", "a")])
+
+        assert workflow_content_hash(first) == workflow_content_hash(second)
+        assert workflow_content_hash(first) != workflow_content_hash(rewired)
+
+
+class TestPlanCache:
+    def test_compiled_once_per_structure(self):
+        cache = ExecutionPlanCache(max_size=4)
+        workflow = _workflow(["a", "b"], [("a", "b")])
+
+        with patch(
+            "backend.core.engine.execution_plan.WorkflowValidator.validate_workflow"
+        ) as validate:
+            first = cache.get(workflow)
+            second = cache.get(_workflow(["a", "b"], [("a", "b")], data={"a": {"text": "x"}}))
+
+        assert first is second
+        assert validate.call_count == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_lru_bound_and_invalidate(self):
+        cache = ExecutionPlanCache(max_size=2)
+        for workflow_id in ["w1", "w2", "w3"]:
+            cache.get(_workflow(["a"], [], workflow_id=workflow_id))
+
+        assert cache.stats()["size"] == 2
+        assert cache.invalidate("w1") == 0
+        assert cache.invalidate("w3") == 1
+
+    def test_invalid_workflow_not_cached(self):
+        cache = ExecutionPlanCache(max_size=2)
+        with pytest.raises(CircularDependencyError):
+            cache.get(_workflow(["a", "b"], [("a", "b"), ("b", "a")]))
+        assert cache.stats()["size"] == 0
+
+
+class TestPlannedInputCollection:
+    @pytest.mark.asyncio
+    async def test_same_inputs_with_and_without_plan(self):
+        workflow = _workflow(["a", "b", "c"], [("a", "c"), ("b", "c")])
+        plan = compile_plan(workflow)
+        outputs = {"a": {"text": "alpha"}, "b": {"text": "beta"}}
+
+        planned = await DataCollector.collect_node_inputs(workflow, "c", outputs, plan=plan)
+        scanned = await DataCollector.collect_node_inputs(workflow, "c", outputs)
+
+        assert planned == scanned
+        assert await DataCollector.collect_node_inputs(workflow, "a", outputs, plan=plan) == {}
+
+
+class TestSmartMergeSources:
+    def _source_data(self, workflow):
+        outputs = {
+            "vs": {"query": "vq", "results": [{"text": "doc", "score": 0.9}]},
+            "upstream": {"text": "indirect"},
+            "typed": {"text": "typed"},
+        }
+        return {
+            node.id: {"outputs": outputs[node.id], "node_type": node.type, "node_label": "", "node": node}
+            for node in workflow.nodes
+            if node.id in outputs
+        }
+
+    def test_direct_sources_win_over_earlier_sources(self):
+        workflow = _workflow(["upstream", "vs", "typed", "chat"], [("upstream", "vs"), ("vs", "chat"), ("typed", "chat")])
+        workflow.nodes[1].type = "vector_search"
+        source_data = self._source_data(workflow)
+
+        for direct_sources in (None, compile_plan(workflow).direct_sources["chat"]):
+            inputs = DataCollector.smart_merge_sources(
+                source_data, "chat", workflow, "chat", direct_sources=direct_sources
+            )
+            # Both vs and typed set "query"; the indirect upstream source must not win
+            assert inputs["query"] == "typed"
+            assert inputs["text"] == "typed"
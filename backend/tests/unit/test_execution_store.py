@@ -0,0 +1,74 @@
+"""
+Unit tests for the persistent execution store
+"""
+
+from datetime import datetime, timedelta
+
+from backend.core.execution_store import ExecutionStore
+from backend.core.models import Execution, ExecutionStatus, NodeResult, NodeStatus
+
+
+def _execution(execution_id, workflow_id="wf", minutes=0, status=ExecutionStatus.COMPLETED):
+    started_at = datetime(2026, 1, 1) + timedelta(minutes=minutes)
+    return Execution(
+        id=execution_id,
+        workflow_id=workflow_id,
+        status=status,
+        started_at=started_at,
+        completed_at=started_at + timedelta(seconds=1) if status != ExecutionStatus.RUNNING else None,
+        results={"n1": NodeResult(
+            node_id="n1", status=NodeStatus.COMPLETED, started_at=started_at, output={"text": execution_id}
+        )},
+    )
+
+
+def test_survives_reopen(tmp_path):
+    store = ExecutionStore(tmp_path / "executions.db")
+    store.put(_execution("e1"), user_id="u1")
+    store.close()
+
+    reopened = ExecutionStore(tmp_path / "executions.db")
+    execution = reopened.get("e1")
+
+    assert execution.results["n1"].output == {"text": "e1"}
+    assert "e1" in reopened
+    assert reopened.get("missing") is None
+
+
+def test_list_paginates_most_recent_first(tmp_path):
+    store = ExecutionStore(tmp_path / "executions.db")
+    for i in range(5):
+        store.put(_execution(f"e{i}", workflow_id="a" if i % 2 else "b", minutes=i), user_id=f"u{i % 2}")
+
+    page, total = store.list(limit=2, offset=1)
+    assert total == 5
+    assert [execution.id for execution in page] == ["e3", "e2"]
+
+    by_workflow, total = store.list(limit=10, workflow_id="a")
+    assert total == 2
+    assert [execution.id for execution in by_workflow] == ["e3", "e1"]
+
+    assert store.list(limit=10, user_id="u0")[1] == 3
+
+
+def test_hot_cache_bounded_but_keeps_running(tmp_path):
+    store = ExecutionStore(tmp_path / "executions.db", hot_size=2)
+    store.put(_execution("running", status=ExecutionStatus.RUNNING))
+    for i in range(4):
+        store.put(_execution(f"e{i}", minutes=i))
+
+    assert store.stats()["hot_items"] == 3
+    assert store.get("running").status == ExecutionStatus.RUNNING
+    # Evicted executions are read back from disk
+    assert store.get("e0").id == "e0"
+
+
+def test_prunes_oldest_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.core.execution_store._PRUNE_INTERVAL", 1)
+    store = ExecutionStore(tmp_path / "executions.db", max_rows=3)
+    for i in range(5):
+        store.put(_execution(f"e{i}", minutes=i))
+
+    assert store.stats()["rows"] == 3
+    assert store.get("e0") is None
+    assert [execution.id for execution in store.list(limit=10)[0]] == ["e4", "e3", "e2"]
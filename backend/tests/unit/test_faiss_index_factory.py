@@ -0,0 +1,102 @@
+"""
+Unit tests for FAISS index construction, training and recall reports
+"""
+
+import faiss
+import numpy as np
+import pytest
+
+from backend.core.faiss_index_factory import (
+    create_index,
+    index_factory_string,
+    recall_latency_report,
+    search_parameters,
+    train_index,
+)
+
+
+def _vectors(n: int, d: int = 16) -> np.ndarray:
+    return np.random.default_rng(0).random((n, d), dtype=np.float32)
+
+
+class TestIndexFactoryString:
+    """Test parameter clamping and fallbacks."""
+
+    def test_small_corpus_falls_back_to_flat(self):
+        assert index_factory_string("ivf_pq", 16, 500, {}) == "Flat"
+
+    def test_nlist_and_nbits_are_clamped_to_training_set(self):
+        description = index_factory_string("ivf_pq", 24, 2000, {"faiss_nlist": 1000, "faiss_pq_m": 16})
+        # 2000 // 39 = 51 lists, log2(51) -> 5 bits, 12 is the largest divisor of 24 <= 16
+        assert description == "IVF51,PQ12x5"
+
+    def test_training_sample_limits_nlist(self):
+        assert index_factory_string("ivf", 16, 10**6, {"faiss_nlist": 4096, "faiss_training_samples": 3900}) == "IVF100,Flat"
+
+    def test_unknown_type_raises(self):
+        with pytest.raises(ValueError, match="Unsupported"):
+            index_factory_string("lsh", 16, 10, {})
+
+
+class TestTrainingAndReport:
+    """Test sample-based training and the recall-vs-latency sweep."""
+
+    @pytest.mark.parametrize("index_type,parameter", [("opq_ivf_pq", "nprobe"), ("hnsw_sq", "efSearch")])
+    def test_report_against_flat_baseline(self, index_type, parameter):
+        vectors = _vectors(2000)
+        index = faiss.IndexIDMap2(create_index(index_type, 16, len(vectors), {"faiss_nlist": 16, "faiss_pq_m": 8}))
+        assert train_index(index, vectors, max_samples=1500) in (0, 1500)
+        ids = np.arange(len(vectors), dtype=np.int64) + 1000
+        index.add_with_ids(vectors, ids)
+
+        report = recall_latency_report(index, vectors, ids, k=5, num_queries=20)
+        assert report["parameter"] == parameter
+        recalls = [point["recall"] for point in report["points"]]
+        assert all(0.0 <= r <= 1.0 for r in recalls)
+        # Searching more lists / candidates never hurts recall much
+        assert recalls[-1] >= recalls[0]
+        assert report["recommended"] in [point["value"] for point in report["points"]]
+
+    def test_unreachable_target_recommends_cheapest_near_best(self):
+        vectors = _vectors(2000)
+        index = create_index("ivf", 16, len(vectors), {"faiss_nlist": 16})
+        train_index(index, vectors)
+        index.add(vectors)
+
+        report = recall_latency_report(index, vectors, k=5, num_queries=20, target_recall=1.01)
+        assert report["target_met"] is False
+        best = max(point["recall"] for point in report["points"])
+        near_best = [point["value"] for point in report["points"] if point["recall"] >= best - 0.01]
+        assert report["recommended"] == near_best[0]
+        assert recall_latency_report(index, vectors, k=5, num_queries=20, target_recall=0.0)["target_met"] is True
+
+    def test_search_parameters_match_index_structure(self):
+        vectors = _vectors(2000)
+        ivf = create_index("ivf", 16, len(vectors), {"faiss_nlist": 8})
+        train_index(ivf, vectors)
+        assert isinstance(search_parameters(ivf, nprobe=4), faiss.SearchParametersIVF)
+        assert search_parameters(ivf, ef_search=64) is None
+        assert search_parameters(faiss.IndexFlatL2(16), nprobe=4) is None
+
+
+@pytest.mark.asyncio
+async def test_vector_store_trains_and_reports(tmp_path):
+    from unittest.mock import AsyncMock, patch
+
+    from backend.core.faiss_index_manager import FaissIndexManager
+    from backend.nodes.storage.vector_store import VectorStoreNode
+
+    manager = FaissIndexManager(memory_budget_bytes=10**9, cache_dir=tmp_path)
+    node = VectorStoreNode()
+    with patch("backend.nodes.storage.vector_store.get_faiss_index_manager", return_value=manager), \
+         patch.object(VectorStoreNode, "stream_progress", new=AsyncMock()), \
+         patch.object(VectorStoreNode, "stream_log", new=AsyncMock()):
+        result = await node.execute(
+            {"embeddings": _vectors(2000).tolist(), "chunks": [str(i) for i in range(2000)]},
+            {"provider": "faiss", "index_id": "big", "faiss_index_type": "ivf", "faiss_nlist": 16},
+        )
+    assert result["vectors_stored"] == 2000
+    assert result["recall_report"]["parameter"] == "nprobe"
+    with manager.lease("big") as handle:
+        # The recommended nprobe is stored on the index as its default
+        assert faiss.extract_index_ivf(handle.index).nprobe == result["recall_report"]["recommended"]
@@ -0,0 +1,233 @@
+"""
+Unit tests for the FAISS index manager and binary metadata sidecar
+"""
+
+import json
+import threading
+import time
+
+import faiss
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from backend.core.faiss_index_manager import (
+    FaissIndexManager,
+    IndexMetadata,
+    metadata_path_for,
+    stable_chunk_ids,
+)
+from backend.nodes.storage.vector_store import VectorStoreNode
+
+
+def _flat_index(n: int, d: int = 8) -> faiss.IndexFlatL2:
+    index = faiss.IndexFlatL2(d)
+    index.add(np.random.rand(n, d).astype(np.float32))
+    return index
+
+
+class TestIndexMetadata:
+    """Test the binary metadata sidecar."""
+
+    def test_roundtrip_and_incremental_save(self, tmp_path):
+        path = str(tmp_path / "idx.meta")
+        metadata = IndexMetadata()
+        metadata.extend([{"chunk_index": 0, "text": "hello"}, {"chunk_index": 1, "text": "wörld"}])
+        metadata.save(path)
+
+        metadata.append({"chunk_index": 2, "text": None})
+        metadata.save()
+
+        reloaded = IndexMetadata(path)
+        assert len(reloaded) == 3
+        assert reloaded[1] == {"chunk_index": 1, "text": "wörld"}
+        assert reloaded[2]["text"] is None
+        assert reloaded.get(5, {}) == {}
+        reloaded.close()
+
+    def test_legacy_json_is_read_and_migrated(self, tmp_path):
+        index_path = str(tmp_path / "kb.faiss")
+        with open(tmp_path / "kb_metadata.json", "w", encoding="utf-8") as f:
+            json.dump([{"chunk_index": 0, "text": "legacy"}], f, indent=2)
+
+        metadata = IndexMetadata(metadata_path_for(index_path))
+        assert metadata[0]["text"] == "legacy"
+        metadata.save()
+        assert IndexMetadata(metadata_path_for(index_path))[0]["text"] == "legacy"
+
+
+    def test_records_keyed_by_id_survive_removal_and_save(self, tmp_path):
+        path = str(tmp_path / "idx.meta")
+        metadata = IndexMetadata()
+        metadata.append({"text": "a", "file_id": "f1"}, 1001)
+        metadata.append({"text": "b", "file_id": "f2"}, 2002)
+        metadata.save(path)
+
+        metadata.append({"text": "c", "file_id": "f1"}, 3003)
+        assert sorted(metadata.ids_for_files(["f1"])) == [1001, 3003]
+        metadata.remove([1001])
+        metadata.save()
+
+        reloaded = IndexMetadata(path)
+        assert len(reloaded) == 2
+        assert reloaded.get(1001) is None
+        assert reloaded.get(3003)["text"] == "c"
+        assert reloaded.ids_for_files(["f2"]) == [2002]
+
+    def test_length_tracks_appends_replacements_and_removals(self, tmp_path):
+        path = str(tmp_path / "idx.meta")
+        metadata = IndexMetadata()
+        metadata.extend([{"text": str(i)} for i in range(5)])
+        metadata.save(path)
+
+        metadata.append({"text": "replaced"}, 1)
+        metadata.append({"text": "new"})
+        assert len(metadata) == 6
+        metadata.remove([1, 2, 2, 99])
+        assert len(metadata) == 4
+        metadata.append({"text": "restored"}, 2)
+        assert len(metadata) == 5
+        metadata.save()
+        assert len(metadata) == len(IndexMetadata(path)) == 5
+
+
+def test_stable_chunk_ids():
+    ids = stable_chunk_ids(["f1", "f1", "f1", "f2"], ["x", "y", "x", "x"])
+    assert len(set(ids)) == 4
+    assert ids == stable_chunk_ids(["f1", "f1", "f1", "f2"], ["x", "y", "x", "x"])
+    assert all(0 <= i < 2**63 for i in ids)
+
+
+class TestFaissIndexManager:
+    """Test lazy loading, leases and eviction."""
+
+    def test_lease_loads_mmapped_index_from_disk(self, tmp_path):
+        path = str(tmp_path / "a.faiss")
+        faiss.write_index(_flat_index(10), path)
+        manager = FaissIndexManager(memory_budget_bytes=10**9, cache_dir=tmp_path / "cache")
+
+        with manager.lease("a", path=path) as handle:
+            assert handle.index.ntotal == 10
+            assert handle.mmapped
+
+        # Writers get a mutable copy
+        with manager.lease("a", writable=True) as handle:
+            assert not handle.mmapped
+            handle.index.add(np.zeros((1, 8), dtype=np.float32))
+            assert handle.index.ntotal == 11
+
+    def test_missing_index_raises(self, tmp_path):
+        manager = FaissIndexManager(memory_budget_bytes=10**9, cache_dir=tmp_path)
+        with pytest.raises(ValueError, match="not found"):
+            with manager.lease("missing"):
+                pass
+
+    def test_lru_eviction_skips_leased_and_spills_dirty(self, tmp_path):
+        # Each index is 100 * 8 * 4 = 3200 bytes; the budget fits two
+        manager = FaissIndexManager(memory_budget_bytes=7000, cache_dir=tmp_path / "cache")
+        for name in ("a", "b"):
+            manager.register(name, _flat_index(100))
+
+        with manager.lease("a") as pinned:
+            pinned.metadata.append({"text": "kept"})
+            pinned.mark_dirty()
+            manager.register("c", _flat_index(100))
+            with manager.lease("c"):
+                pass
+            # "a" is leased, so the least recently used unleased index goes
+            assert manager.stats()["resident_indexes"] == 2
+            assert manager.stats()["evictions"] == 1
+
+        # Evicted in-memory indexes were spilled and reload transparently
+        with manager.lease("b") as handle:
+            assert handle.index.ntotal == 100
+
+        manager.register("d", _flat_index(100))
+        with manager.lease("d"):
+            pass
+        with manager.lease("a") as handle:
+            assert handle.metadata[0]["text"] == "kept"
+
+    def test_replaced_metadata_stays_open_while_leased(self, tmp_path):
+        path = str(tmp_path / "a.faiss")
+        faiss.write_index(_flat_index(2), path)
+        metadata = IndexMetadata()
+        metadata.extend([{"text": "first"}, {"text": "second"}])
+        metadata.save(metadata_path_for(path))
+        manager = FaissIndexManager(memory_budget_bytes=10**9, cache_dir=tmp_path / "cache")
+
+        with manager.lease("a", path=path) as reader:
+            # A writer reloads the mmapped copy, then the index is replaced outright
+            with manager.lease("a", writable=True):
+                pass
+            manager.register("a", _flat_index(2))
+            assert reader.metadata[1]["text"] == "second"
+        assert len(reader.metadata) == 0
+
+    def test_readers_wait_for_a_write_in_another_thread(self, tmp_path):
+        manager = FaissIndexManager(memory_budget_bytes=10**9, cache_dir=tmp_path / "cache")
+        manager.register("kb", faiss.IndexIDMap2(faiss.IndexFlatL2(2)))
+        appending = threading.Event()
+        append = IndexMetadata.append
+
+        def slow_append(metadata, record, vector_id=None):
+            appending.set()
+            time.sleep(0.01)
+            return append(metadata, record, vector_id)
+
+        with manager.lease("kb", writable=True) as handle, patch.object(IndexMetadata, "append", slow_append):
+            vectors = np.random.rand(5, 2).astype(np.float32)
+            writer = threading.Thread(target=handle.upsert, args=(list(range(5)), vectors, [{"text": "t"}] * 5))
+            writer.start()
+            appending.wait()
+            # Vectors are already in the index; metadata is still being written
+            with handle.lock:
+                assert handle.index.ntotal == len(handle.metadata) == 5
+            writer.join()
+
+    def test_upsert_and_delete_on_id_mapped_index(self, tmp_path):
+        manager = FaissIndexManager(memory_budget_bytes=10**9, cache_dir=tmp_path / "cache")
+        path = str(tmp_path / "kb.faiss")
+        manager.register("kb", faiss.IndexIDMap2(faiss.IndexFlatL2(2)), path=path)
+
+        with manager.lease("kb", writable=True) as handle:
+            vectors = np.array([[0, 0], [1, 1], [5, 5]], dtype=np.float32)
+            records = [{"text": t, "file_id": f} for t, f in (("a", "f1"), ("b", "f1"), ("c", "f2"))]
+            assert handle.upsert([10, 11, 12], vectors, records) == 0
+            assert handle.upsert([12], np.array([[9, 9]], dtype=np.float32), [{"text": "c2", "file_id": "f2"}]) == 1
+            assert handle.delete_files(["f1"]) == 2
+        manager.persist("kb")
+
+        reader = FaissIndexManager(memory_budget_bytes=10**9, cache_dir=tmp_path / "cache2")
+        with reader.lease("kb", path=path) as handle:
+            assert handle.index.ntotal == 1
+            _, ids = handle.index.search(np.array([[9, 9]], dtype=np.float32), 1)
+            assert handle.metadata.get(int(ids[0][0]))["text"] == "c2"
+
+
+class TestVectorStoreUpserts:
+    """Test upsert/delete operations on VectorStoreNode."""
+
+    @pytest.mark.asyncio
+    async def test_reingest_replaces_file_vectors(self, tmp_path):
+        manager = FaissIndexManager(memory_budget_bytes=10**9, cache_dir=tmp_path / "cache")
+        config = {"provider": "faiss", "index_id": "kb", "faiss_operation": "upsert"}
+        node = VectorStoreNode()
+        with patch("backend.nodes.storage.vector_store.get_faiss_index_manager", return_value=manager), \
+             patch.object(VectorStoreNode, "stream_progress", new=AsyncMock()), \
+             patch.object(VectorStoreNode, "stream_log", new=AsyncMock()):
+            await node.execute(
+                {"embeddings": [[0.0, 0.0], [1.0, 1.0]], "chunks": ["a", "b"], "chunk_file_ids": ["f1", "f2"]},
+                config,
+            )
+            # Re-embedding an unchanged chunk replaces it instead of duplicating it
+            result = await node.execute(
+                {"embeddings": [[0.0, 0.0]], "chunks": ["a"], "chunk_file_ids": ["f1"]},
+                config,
+            )
+            assert result["vectors_stored"] == 2
+            assert result["vectors_replaced"] == 1
+
+            result = await node.execute({"delete_file_ids": ["f2"]}, {**config, "faiss_operation": "delete"})
+            assert result["vectors_deleted"] == 1
+            assert result["vectors_stored"] == 1
@@ -0,0 +1,144 @@
+"""
+Unit tests for the execution job queue and the worker event channel
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from backend.core.event_channel import SQLiteEventChannel
+from backend.core.job_queue import JOB_COMPLETED, JOB_FAILED, JOB_QUEUED, SQLiteJobQueue
+from backend.core.streaming import StreamEvent, StreamEventType
+from backend.worker import ExecutionWorker
+
+
+def test_enqueue_claim_complete(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "queue.db")
+    first = queue.enqueue("exec-1", {"workflow": {"id": "wf"}})
+    queue.enqueue("exec-2", {})
+
+    job = queue.claim("worker-a", lease_seconds=60)
+    assert job.id == first
+    assert job.execution_id == "exec-1"
+    assert job.payload == {"workflow": {"id": "wf"}}
+    assert job.attempts == 1
+
+    queue.complete(job.id, "worker-a")
+    assert queue.stats()[JOB_COMPLETED] == 1
+    assert queue.stats()[JOB_QUEUED] == 1
+
+
+def test_leased_job_is_reclaimed_only_after_expiry(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "queue.db")
+    queue.enqueue("exec-1", {})
+
+    with patch("backend.core.job_queue.time.time", return_value=1000.0):
+        job = queue.claim("worker-a", lease_seconds=30)
+        assert queue.claim("worker-b", lease_seconds=30) is None
+
+    with patch("backend.core.job_queue.time.time", return_value=1031.0):
+        retried = queue.claim("worker-b", lease_seconds=30)
+        assert retried.id == job.id
+        assert retried.attempts == 2
+        # The lease now belongs to worker-b
+        assert not queue.heartbeat(job.id, "worker-a", lease_seconds=30)
+        assert queue.heartbeat(job.id, "worker-b", lease_seconds=30)
+
+
+def test_expired_job_fails_after_max_attempts(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "queue.db", max_attempts=1)
+    queue.enqueue("exec-1", {"started_at": "2024-01-01T00:00:00"})
+
+    with patch("backend.core.job_queue.time.time", return_value=1000.0):
+        queue.claim("worker-a", lease_seconds=30)
+
+    with patch("backend.core.job_queue.time.time", return_value=1031.0):
+        assert queue.claim("worker-b", lease_seconds=30) is None
+        reaped = queue.reap_expired()
+
+    assert [job.execution_id for job in reaped] == ["exec-1"]
+    assert queue.stats()[JOB_FAILED] == 1
+    assert queue.reap_expired() == []
+
+
+def _claimed_job(worker):
+    worker.queue.enqueue("exec-1", {
+        "workflow": {"id": "wf", "name": "wf", "nodes": [], "edges": []},
+        "started_at": "2024-01-01T00:00:00",
+    })
+    return worker.queue.claim(worker.worker_id, worker.lease_seconds)
+
+
+@pytest.mark.asyncio
+async def test_worker_cancels_execution_when_lease_is_lost(tmp_path):
+    worker = ExecutionWorker(SQLiteJobQueue(tmp_path / "queue.db"), concurrency=1, worker_id="worker-a")
+    worker.lease_seconds = 0.15
+    job = _claimed_job(worker)
+    cancelled = asyncio.Event()
+
+    async def run_execution(**kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with patch("backend.worker.run_execution", new=run_execution), \
+         patch.object(worker.queue, "heartbeat", return_value=False):
+        await asyncio.wait_for(worker._run_job(job), timeout=2)
+
+    assert cancelled.is_set()
+    # The job belongs to whichever worker retries it; this one neither completes nor fails it
+    assert worker.queue.stats()[JOB_COMPLETED] == 0
+    assert worker.queue.stats()[JOB_FAILED] == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_failed_heartbeats(tmp_path):
+    worker = ExecutionWorker(SQLiteJobQueue(tmp_path / "queue.db"), concurrency=1, worker_id="worker-a")
+    worker.lease_seconds = 0.3
+    job = _claimed_job(worker)
+    renew = worker.queue.heartbeat
+    calls = []
+
+    def flaky_heartbeat(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise ConnectionError("database is locked")
+        return renew(*args)
+
+    async def run_execution(**kwargs):
+        await asyncio.sleep(0.5)
+
+    with patch("backend.worker.run_execution", new=run_execution), \
+         patch.object(worker.queue, "heartbeat", side_effect=flaky_heartbeat):
+        await asyncio.wait_for(worker._run_job(job), timeout=2)
+
+    assert len(calls) >= 2
+    assert worker.queue.stats()[JOB_COMPLETED] == 1
+
+
+def test_event_channel_batches_and_coalesces_progress(tmp_path):
+    channel = SQLiteEventChannel(tmp_path / "queue.db")
+
+    def event(event_type, **data):
+        return StreamEvent(event_type=event_type, node_id="n1", execution_id="exec-1", data=data)
+
+    channel.publish(event(StreamEventType.NODE_STARTED))
+    for i in range(10):
+        channel.publish(event(StreamEventType.NODE_PROGRESS, progress=i / 10))
+    channel.publish(event(StreamEventType.NODE_COMPLETED))
+    channel.close("exec-1")
+
+    assert channel.flush() == 4
+    assert channel.flush() == 0
+
+    rows = channel.read_after(0)
+    assert [kind for _, _, kind, _ in rows] == ["event", "event", "event", "close"]
+    progress = StreamEvent.from_dict(json.loads(rows[1][3]))
+    assert progress.event_type == StreamEventType.NODE_PROGRESS
+    assert progress.data["progress"] == 0.9
+    assert channel.read_after(rows[-1][0]) == []
+    assert channel.latest_id() == rows[-1][0]
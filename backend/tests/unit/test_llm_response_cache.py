@@ -0,0 +1,74 @@
+"""
+Unit tests for the LLM response cache
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from backend.core.llm_response_cache import (
+    LLMResponseCache,
+    cached_llm_call,
+    is_cacheable,
+    llm_cache_key,
+    llm_cache_usage,
+)
+
+
+def test_key_normalizes_messages_but_not_params():
+    messages = [{"role": "user", "content": "What is RAG?\r\n"}]
+    same = [{"role": "user", "content": "  What is RAG?"}]
+    key = llm_cache_key("openai", "gpt-4o-mini", messages, {"temperature": 0})
+
+    assert llm_cache_key("openai", "gpt-4o-mini", same, {"temperature": 0}) == key
+    assert llm_cache_key("openai", "gpt-4o", messages, {"temperature": 0}) != key
+    assert llm_cache_key("openai", "gpt-4o-mini", messages, {"temperature": 0, "max_tokens": 10}) != key
+
+
+def test_only_deterministic_or_opted_in_calls_are_cacheable():
+    assert is_cacheable(0)
+    assert not is_cacheable(0.7)
+    assert is_cacheable(0.7, opt_in=True)
+    with patch("backend.core.llm_response_cache.settings.enable_llm_response_cache", False):
+        assert not is_cacheable(0)
+
+
+def test_entries_expire_and_respect_byte_budget():
+    cache = LLMResponseCache(max_bytes=200, ttl_seconds=10)
+    with patch("backend.core.llm_response_cache.time.monotonic", return_value=100.0):
+        cache.put("a", {"response": "x" * 60})
+        cache.put("b", {"response": "y" * 60})
+        assert cache.get("a")["response"] == "x" * 60
+        # "b" is now least recently used and is evicted
+        cache.put("c", {"response": "z" * 60})
+        assert cache.get("b") is None
+        assert not cache.put("huge", {"response": "h" * 500})
+
+    with patch("backend.core.llm_response_cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+    assert cache.stats()["items"] == 1
+
+
+def test_hits_are_counted_in_usage_scope():
+    cache = LLMResponseCache(max_bytes=1024 * 1024, ttl_seconds=60)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return {"response": "answer", "cost": 0.25}
+
+    async def run():
+        with patch("backend.core.llm_response_cache.get_llm_response_cache", return_value=cache):
+            with llm_cache_usage() as first:
+                _, cached = await cached_llm_call("key", call)
+                assert not cached
+            with llm_cache_usage() as second:
+                response, cached = await cached_llm_call("key", call)
+                assert cached and response["response"] == "answer"
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert len(calls) == 1
+    assert not first.served_from_cache
+    assert second.served_from_cache
+    assert second.saved_cost == 0.25
+    assert cache.stats()["saved_cost"] == 0.25
@@ -0,0 +1,138 @@
+"""
+Unit tests for the local model residency manager.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from backend.core.model_residency import ModelResidencyManager
+
+
+class FakeModel:
+    def __init__(self, name, nbytes):
+        self.name = name
+        self.nbytes = nbytes
+
+
+def make_manager(budget=100, sizes=None, delay=0.0):
+    sizes = sizes or {}
+    calls = []
+
+    def loader(name, **options):
+        calls.append((name, options))
+        if delay:
+            time.sleep(delay)
+        if name == "broken":
+            raise RuntimeError("cannot load")
+        return FakeModel(name, sizes.get(name, 10))
+
+    manager = ModelResidencyManager(memory_budget_bytes=budget, loaders={"fake": loader})
+    return manager, calls
+
+
+@pytest.fixture(autouse=True)
+def fake_sizes():
+    with patch("backend.core.model_residency.estimate_model_bytes", side_effect=lambda m: m.nbytes):
+        yield
+
+
+def test_model_loaded_once_and_reused():
+    manager, calls = make_manager()
+
+    first = manager.get("fake", "a")
+    second = manager.get("fake", "a")
+
+    assert first is second
+    assert len(calls) == 1
+    stats = manager.stats()
+    assert stats["loads"] == 1
+    assert stats["hits"] == 1
+
+
+def test_options_are_part_of_key():
+    manager, calls = make_manager()
+
+    manager.get("fake", "a", task="ner")
+    manager.get("fake", "a", task="summarization")
+
+    assert [c[1] for c in calls] == [{"task": "ner"}, {"task": "summarization"}]
+
+
+def test_concurrent_requests_share_one_load():
+    manager, calls = make_manager(delay=0.05)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(manager.get("fake", "a"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_lru_eviction_over_budget():
+    manager, _ = make_manager(budget=100, sizes={"a": 40, "b": 40, "c": 40})
+
+    manager.get("fake", "a")
+    manager.get("fake", "b")
+    manager.get("fake", "a")  # b is now least recently used
+    manager.get("fake", "c")
+
+    resident = {m["name"] for m in manager.stats()["resident_models"]}
+    assert resident == {"a", "c"}
+    assert manager.stats()["evictions"] == 1
+
+
+def test_model_larger_than_budget_stays_resident():
+    manager, _ = make_manager(budget=10, sizes={"big": 50})
+
+    manager.get("fake", "big")
+
+    assert [m["name"] for m in manager.stats()["resident_models"]] == ["big"]
+
+
+def test_unknown_kind_raises():
+    manager, _ = make_manager()
+
+    with pytest.raises(ValueError):
+        manager.get("missing", "a")
+
+
+def test_load_error_counted_and_not_cached():
+    manager, calls = make_manager()
+
+    with pytest.raises(RuntimeError):
+        manager.get("fake", "broken")
+    with pytest.raises(RuntimeError):
+        manager.get("fake", "broken")
+
+    assert len(calls) == 2
+    assert manager.stats()["load_errors"] == 2
+
+
+def test_preload_and_aget():
+    manager, calls = make_manager()
+
+    asyncio.run(manager.preload(["fake:a", "fake:broken", "nope:x"]))
+    model = asyncio.run(manager.aget("fake", "a"))
+
+    assert model.name == "a"
+    assert [c[0] for c in calls] == ["a", "broken"]
+    assert manager.stats()["hits"] == 1
+
+
+def test_evict():
+    manager, calls = make_manager()
+
+    manager.get("fake", "a")
+    assert manager.evict("fake", "a") is True
+    assert manager.evict("fake", "a") is False
+    manager.get("fake", "a")
+
+    assert len(calls) == 2
@@ -0,0 +1,156 @@
+"""
+Unit tests for pure node result memoization
+"""
+
+from datetime import datetime
+from typing import Any, Dict
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from backend.core.engine.engine import WorkflowEngine
+from backend.core.engine.node_executor import NodeExecutor
+from backend.core.models import Edge, Execution, ExecutionStatus, Node, NodeStatus, Position, Workflow
+from backend.core.node_registry import NodeRegistry
+from backend.core.node_memo import NodeResultCache, node_memo_key
+from backend.nodes.base import BaseNode
+
+
+class TestMemoKey:
+    def test_runtime_keys_excluded(self):
+        base = node_memo_key("chunk", {"text": "abc"}, {"chunk_size": 100, "_node_id": "n1"})
+        other_run = node_memo_key("chunk", {"text": "abc"}, {"chunk_size": 100, "_node_id": "n2", "_execution_id": "e"})
+        assert base == other_run
+
+    def test_inputs_config_and_extra_change_key(self):
+        base = node_memo_key("chunk", {"text": "abc"}, {"chunk_size": 100})
+        assert base != node_memo_key("chunk", {"text": "abd"}, {"chunk_size": 100})
+        assert base != node_memo_key("chunk", {"text": "abc"}, {"chunk_size": 200})
+        assert base != node_memo_key("embed", {"text": "abc"}, {"chunk_size": 100})
+        assert base != node_memo_key("chunk", {"text": "abc"}, {"chunk_size": 100}, extra=[1, 2])
+
+
+class TestNodeResultCache:
+    def test_returns_private_copies(self, tmp_path):
+        cache = NodeResultCache(tmp_path, max_memory_bytes=1 << 20, max_disk_bytes=1 << 20)
+        value = {"chunks": ["a", "b"]}
+        cache.put("k", value)
+        value["chunks"].append("c")
+
+        first = cache.get("k")
+        first["chunks"].append("d")
+
+        assert cache.get("k") == {"chunks": ["a", "b"]}
+        assert cache.get("missing") is None
+        assert cache.stats()["hits"] == 2
+
+    def test_spills_to_disk_and_reloads(self, tmp_path):
+        cache = NodeResultCache(tmp_path, max_memory_bytes=300, max_disk_bytes=1 << 20)
+        cache.put("a", {"text": "x" * 200})
+        cache.put("b", {"text": "y" * 200})
+
+        stats = cache.stats()
+        assert stats["memory_items"] == 1
+        assert stats["disk_items"] == 1
+        assert (tmp_path / "a.pkl").exists()
+
+        # A new process finds spilled results on disk
+        reopened = NodeResultCache(tmp_path, max_memory_bytes=300, max_disk_bytes=1 << 20)
+        assert reopened.get("a") == {"text": "x" * 200}
+
+    def test_disk_budget_evicts_oldest(self, tmp_path):
+        cache = NodeResultCache(tmp_path, max_memory_bytes=0, max_disk_bytes=500)
+        for key in ["a", "b", "c"]:
+            cache.put(key, {"text": key * 200})
+
+        assert cache.get("a") is None
+        assert cache.get("c") == {"text": "c" * 200}
+        assert cache.stats()["disk_bytes"] <= 500
+
+
+class _CountingNode(BaseNode):
+    node_type = "memo_test"
+    pure = True
+    calls = 0
+
+    async def execute(self, inputs: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+        type(self).calls += 1
+        return {"output": inputs.get("text", "").upper(), "cost": 0.5}
+
+    def get_schema(self) -> Dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+
+def _execution() -> Execution:
+    return Execution(
+        id="memo-exec",
+        workflow_id="memo-wf",
+        status=ExecutionStatus.RUNNING,
+        started_at=datetime.now(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_executor_reuses_pure_node_results(tmp_path):
+    cache = NodeResultCache(tmp_path, max_memory_bytes=1 << 20, max_disk_bytes=1 << 20)
+    node = Node(id="n1", type="memo_test", position=Position(x=0, y=0), data={"mode": "upper"})
+    _CountingNode.calls = 0
+
+    with patch("backend.core.engine.node_executor.get_node_result_cache", return_value=cache):
+        first = await NodeExecutor.execute_node(node, {"text": "hi"}, _execution(), "e1", node_class=_CountingNode)
+        execution = _execution()
+        second = await NodeExecutor.execute_node(node, {"text": "hi"}, execution, "e2", node_class=_CountingNode)
+        third = await NodeExecutor.execute_node(node, {"text": "other"}, _execution(), "e3", node_class=_CountingNode)
+
+    assert _CountingNode.calls == 2
+    assert first.cost == 0.5
+    assert second.status == NodeStatus.COMPLETED
+    assert second.cost == 0.0
+    assert second.output["output"] == "HI"
+    assert second.memoized is True and not first.memoized
+    assert "_memoized" not in second.output
+    assert "cache_hit" in [step.action for step in execution.trace]
+    assert third.output["output"] == "OTHER"
+
+
+@pytest.mark.asyncio
+async def test_skip_hint_is_not_memoized(tmp_path):
+    cache = NodeResultCache(tmp_path, max_memory_bytes=1 << 20, max_disk_bytes=1 << 20)
+    node = Node(id="n1", type="memo_test", position=Position(x=0, y=0), data={"_skip_if_store_exists": True})
+    _CountingNode.calls = 0
+
+    with patch("backend.core.engine.node_executor.get_node_result_cache", return_value=cache):
+        await NodeExecutor.execute_node(node, {"text": "hi"}, _execution(), "e1", node_class=_CountingNode)
+        await NodeExecutor.execute_node(node, {"text": "hi"}, _execution(), "e2", node_class=_CountingNode)
+
+    assert _CountingNode.calls == 2
+    assert cache.stats()["memory_items"] == 0
+
+
+@pytest.mark.asyncio
+async def test_chained_pure_nodes_hit_on_repeat_runs(tmp_path):
+    cache = NodeResultCache(tmp_path, max_memory_bytes=1 << 20, max_disk_bytes=1 << 20)
+    workflow = Workflow(
+        id="memo-chain",
+        name="Memo Chain",
+        nodes=[
+            Node(id="a", type="memo_test", position=Position(x=0, y=0), data={"mode": "upper"}),
+            Node(id="b", type="memo_test", position=Position(x=0, y=0), data={"mode": "upper"}),
+        ],
+        edges=[Edge(id="a-b", source="a", target="b")],
+    )
+    _CountingNode.calls = 0
+
+    NodeRegistry.register("memo_test", _CountingNode)
+    try:
+        with patch("backend.core.engine.node_executor.get_node_result_cache", return_value=cache), \
+             patch("backend.core.engine.node_executor.settings.enable_node_memoization", True), \
+             patch("backend.core.engine.engine.CostTracker.record_execution_costs", new=AsyncMock()):
+            await WorkflowEngine().execute(workflow, execution_id="memo-chain-1")
+            second = await WorkflowEngine().execute(workflow, execution_id="memo-chain-2")
+    finally:
+        NodeRegistry._nodes.pop("memo_test", None)
+
+    # The downstream node's inputs are unchanged by the upstream memo hit
+    assert _CountingNode.calls == 2
+    assert second.results["a"].memoized and second.results["b"].memoized
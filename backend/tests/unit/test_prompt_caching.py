@@ -0,0 +1,105 @@
+"""
+Unit tests for provider prompt caching helpers and cache-aware LLM cost
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.nodes.llm.chat import ChatNode
+from backend.utils.model_pricing import calculate_llm_cost, calculate_llm_cost_with_cache
+from backend.utils.prompt_caching import (
+    anthropic_cache_tokens,
+    anthropic_text_block,
+    gemini_usage,
+    openai_cached_tokens,
+)
+
+
+def test_usage_parsers_read_cached_tokens():
+    openai_usage = SimpleNamespace(prompt_tokens=2000, prompt_tokens_details=SimpleNamespace(cached_tokens=1536))
+    assert openai_cached_tokens(openai_usage) == 1536
+    # LangChain reports usage as plain dicts
+    assert openai_cached_tokens({"prompt_tokens": 10, "prompt_tokens_details": {"cached_tokens": 0}}) == 0
+    assert openai_cached_tokens(SimpleNamespace(prompt_tokens=10)) == 0
+
+    anthropic_usage = SimpleNamespace(input_tokens=20, cache_read_input_tokens=1800, cache_creation_input_tokens=None)
+    assert anthropic_cache_tokens(anthropic_usage) == (1800, 0)
+
+    response = SimpleNamespace(
+        usage_metadata=SimpleNamespace(prompt_token_count=3000, candidates_token_count=50, cached_content_token_count=2048)
+    )
+    assert gemini_usage(response) == {"input": 3000, "output": 50, "cached_input": 2048}
+    assert gemini_usage(SimpleNamespace()) is None
+
+
+def test_anthropic_text_block_marks_breakpoint():
+    assert anthropic_text_block("docs") == {"type": "text", "text": "docs"}
+    assert anthropic_text_block("docs", cache=True)["cache_control"] == {"type": "ephemeral"}
+
+
+def test_cost_with_cache_bills_cached_tokens_at_reduced_rate():
+    full = calculate_llm_cost("openai", "gpt-4o", 2000, 100)
+    assert calculate_llm_cost_with_cache("openai", "gpt-4o", 2000, 100) == pytest.approx(full)
+    assert calculate_llm_cost_with_cache("openai", "gpt-4o", 2000, 100, cached_tokens=1000) < full
+
+    base = calculate_llm_cost("anthropic", "claude-sonnet-4-5", 2000, 0)
+    # Cache writes cost more than regular input, cache reads much less
+    assert calculate_llm_cost_with_cache("anthropic", "claude-sonnet-4-5", 2000, 0, cache_write_tokens=2000) > base
+    assert calculate_llm_cost_with_cache("anthropic", "claude-sonnet-4-5", 2000, 0, cached_tokens=2000) < base / 5
+
+
+def test_render_prompt_parts_puts_documents_in_prefix():
+    node = ChatNode()
+    prefix, rest = node._render_prompt_parts("Context:\n{context}\n\nQuestion: {query}", {"context": "doc", "query": "why?"})
+    assert (prefix, rest) == ("Context:\ndoc", "\n\nQuestion: why?")
+
+    prefix, rest = node._render_prompt_parts("{query}", {"query": "hi"})
+    assert (prefix, rest) == ("", "hi")
+
+
+class _Stream:
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("api_version,cached", [("2024-10-21", 1536), ("2024-02-15-preview", 0)])
+async def test_azure_reports_cached_prompt_tokens(api_version, cached):
+    usage = SimpleNamespace(
+        prompt_tokens=2000,
+        completion_tokens=10,
+        total_tokens=2010,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1536),
+    )
+    chunks = [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="hi"))], usage=None),
+        SimpleNamespace(choices=[], usage=usage if api_version >= "2024-09-01" else None),
+    ]
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(return_value=_Stream(chunks))
+    node = ChatNode()
+    config = {
+        "azure_openai_api_key": "key",
+        "azure_openai_endpoint": "https://example.openai.azure.com",
+        "azure_openai_deployment": "gpt-4o",
+        "azure_openai_api_version": api_version,
+    }
+    with patch("backend.nodes.llm.chat.get_azure_openai_client", return_value=client), \
+         patch.object(ChatNode, "stream_event", new=AsyncMock()), \
+         patch.object(ChatNode, "stream_progress", new=AsyncMock()):
+        result = await node._chat_azure_openai({"query": "q"}, config)
+
+    sent_stream_options = "stream_options" in client.chat.completions.create.call_args.kwargs
+    assert sent_stream_options == (cached > 0)
+    assert result["tokens_used"]["cached_input"] == cached
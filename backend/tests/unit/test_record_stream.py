@@ -0,0 +1,203 @@
+"""
+Unit tests for streaming edges between nodes
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+import backend.nodes  # noqa: F401  (registers node types)
+from backend.core.engine.engine import WorkflowEngine
+from backend.core.engine.execution_plan import compile_plan
+from backend.core.faiss_index_manager import get_faiss_index_manager
+from backend.core.models import Edge, Node, NodeStatus, Position, Workflow
+from backend.core.node_registry import NodeRegistry
+from backend.core.record_stream import RecordStream, collect, describe_streams, has_streams, rebatch
+from backend.nodes.base import BaseNode
+from backend.nodes.processing.chunk import ChunkNode
+from backend.nodes.storage.vector_store import VectorStoreNode
+
+
+async def _numbers(count, produced=None):
+    for i in range(count):
+        if produced is not None:
+            produced.append(i)
+        yield i
+
+
+class TestRecordStream:
+    @pytest.mark.asyncio
+    async def test_source_runs_bounded_ahead(self):
+        produced = []
+        stream = RecordStream(_numbers(100, produced), "numbers", buffer_size=2)
+        iterator = stream.__aiter__()
+
+        assert await iterator.__anext__() == 0
+        await asyncio.sleep(0.01)
+        # One record consumed, at most buffer_size queued and one waiting to be put
+        assert len(produced) <= 4
+
+        assert [i async for i in iterator] == list(range(1, 100))
+        assert stream.records == 100
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_consumer(self):
+        async def failing():
+            yield 1
+            raise RuntimeError("extraction failed")
+
+        stream = RecordStream(failing(), "pages")
+        with pytest.raises(RuntimeError, match="extraction failed"):
+            await collect(stream)
+        assert stream.describe()["error"] == "extraction failed"
+
+    @pytest.mark.asyncio
+    async def test_single_consumer(self):
+        stream = RecordStream(_numbers(3), "numbers")
+        assert await collect(stream) == [0, 1, 2]
+        with pytest.raises(RuntimeError):
+            stream.__aiter__()
+
+    @pytest.mark.asyncio
+    async def test_describe_and_rebatch(self):
+        stream = RecordStream(_numbers(5), "numbers", summary={"cost": 0.25})
+        output = {"numbers": stream, "provider": "test"}
+
+        assert has_streams(output)
+        assert [batch async for batch in rebatch(stream, 2)] == [[0, 1], [2, 3], [4]]
+
+        described = describe_streams(output)
+        assert described["provider"] == "test"
+        assert described["numbers"]["records"] == 5
+        assert described["numbers"]["cost"] == 0.25
+        assert not has_streams(described)
+
+
+async def _pieces(text, size):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+class TestChunkStream:
+    @pytest.mark.asyncio
+    async def test_fixed_size_matches_whole_text(self):
+        text = "".join(f"sentence {i} of the document. " for i in range(3000))
+        config = {"strategy": "fixed_size", "chunk_size": 500, "chunk_overlap": 120}
+        node = ChunkNode()
+
+        whole = await node.execute({"text": text}, config)
+        streamed = await node.execute({"text_stream": RecordStream(_pieces(text, 7000), "text_stream")}, config)
+
+        assert streamed["chunks"] == whole["chunks"]
+
+    @pytest.mark.asyncio
+    async def test_emits_chunk_stream(self):
+        text = "x" * 50000
+        config = {"strategy": "fixed_size", "chunk_size": 1000, "chunk_overlap": 0, "_stream_output": True}
+
+        result = await ChunkNode().execute({"text_stream": RecordStream(_pieces(text, 4096), "text_stream")}, config)
+        chunks = await collect(result["chunk_stream"])
+
+        assert len(chunks) == 50
+        assert result["chunk_stream"].describe()["count"] == 50
+
+
+def _workflow(types, edges, data=None, workflow_id="stream-test"):
+    return Workflow(
+        id=workflow_id,
+        name="Stream Test",
+        nodes=[
+            Node(id=node_id, type=node_type, position=Position(x=0, y=0), data=(data or {}).get(node_id, {}))
+            for node_id, node_type in types
+        ],
+        edges=[Edge(id=f"{source}-{target}", source=source, target=target) for source, target in edges],
+    )
+
+
+class TestStreamingPlan:
+    def test_streaming_nodes_need_single_accepting_consumer(self):
+        workflow = _workflow(
+            [("load", "file_loader"), ("chunk", "chunk"), ("embed", "embed"), ("store", "vector_store"), ("out", "vector_search")],
+            [("load", "chunk"), ("chunk", "embed"), ("embed", "store"), ("chunk", "out")],
+        )
+
+        with patch("backend.core.engine.execution_plan.WorkflowValidator.validate_workflow"):
+            with patch("backend.core.engine.execution_plan.settings.enable_streaming_edges", True):
+                plan = compile_plan(workflow)
+            with patch("backend.core.engine.execution_plan.settings.enable_streaming_edges", False):
+                disabled = compile_plan(workflow)
+
+        assert plan.streaming_nodes == frozenset({"load", "embed"})
+        assert disabled.streaming_nodes == frozenset()
+
+
+@pytest.mark.asyncio
+async def test_vector_store_consumes_embedding_stream():
+    async def batches():
+        rng = np.random.default_rng(0)
+        for batch in range(3):
+            yield {
+                "chunks": [f"chunk {batch}-{i}" for i in range(4)],
+                "embeddings": rng.random((4, 8)).tolist(),
+            }
+
+    index_id = "stream-test-index"
+    config = {"provider": "faiss", "faiss_index_type": "flat", "index_id": index_id}
+    result = await VectorStoreNode().execute(
+        {"embedding_stream": RecordStream(batches(), "embedding_stream")}, config
+    )
+
+    assert result["vectors_stored"] == 12
+    assert result["dimension"] == 8
+    with get_faiss_index_manager().lease(index_id) as handle:
+        assert handle.metadata.get(11)["text"] == "chunk 2-3"
+    get_faiss_index_manager().drop(index_id)
+
+
+class _ChunkSink(BaseNode):
+    """Test consumer that drains a chunk stream."""
+
+    node_type = "test_chunk_sink"
+    accepts_streams = True
+
+    async def execute(self, inputs, config):
+        chunks = await collect(inputs["chunk_stream"])
+        return {"count": len(chunks)}
+
+    def get_schema(self):
+        return {"type": "object", "properties": {}}
+
+
+@pytest.mark.asyncio
+async def test_engine_drains_chained_streams(tmp_path):
+    text = "".join(f"sentence {i} of the document. " for i in range(400))
+    (tmp_path / "doc.txt").write_text(text, encoding="utf-8")
+    chunk_config = {"strategy": "fixed_size", "chunk_size": 250, "chunk_overlap": 0}
+    expected = len((await ChunkNode().execute({"text": text}, chunk_config))["chunks"])
+    workflow = _workflow(
+        [("load", "file_loader"), ("chunk", "chunk"), ("sink", "test_chunk_sink")],
+        [("load", "chunk"), ("chunk", "sink")],
+        data={
+            "load": {"file_id": "doc"},
+            "chunk": chunk_config,
+        },
+        workflow_id="stream-chain-test",
+    )
+
+    NodeRegistry.register("test_chunk_sink", _ChunkSink)
+    try:
+        with patch("backend.core.engine.execution_plan.settings.enable_streaming_edges", True), \
+             patch("backend.nodes.input.file_loader.UPLOAD_DIR", tmp_path), \
+             patch("backend.core.engine.engine.CostTracker.record_execution_costs", new=AsyncMock()):
+            execution = await WorkflowEngine().execute(workflow, execution_id="stream-chain-1")
+    finally:
+        NodeRegistry._nodes.pop("test_chunk_sink", None)
+
+    # file_loader's stream is read by chunk's stream, which only the sink drains
+    assert expected > 1
+    assert execution.results["sink"].output["count"] == expected
+    assert execution.results["load"].status == NodeStatus.COMPLETED
+    assert execution.results["load"].output["text_stream"]["length"] == len(text)
+    assert execution.results["chunk"].output["chunk_stream"]["count"] == expected
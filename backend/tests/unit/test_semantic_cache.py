@@ -0,0 +1,113 @@
+"""
+Unit tests for the semantic response cache of deployed workflow queries
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import faiss
+import numpy as np
+import pytest
+
+from backend.core.semantic_cache import SemanticQuery, SemanticResponseCache, semantic_query_for
+
+
+def _query(vector, fingerprint="v1", scope="default", text="q"):
+    embedding = np.asarray([vector], dtype=np.float32)
+    faiss.normalize_L2(embedding)
+    return SemanticQuery(workflow_id="wf", scope=scope, fingerprint=fingerprint, query=text, embedding=embedding)
+
+
+def test_similar_query_hits_and_dissimilar_misses():
+    cache = SemanticResponseCache(threshold=0.9, max_entries=10, ttl_seconds=60)
+    assert cache.lookup(_query([1.0, 0.0, 0.0])) == (None, None)
+
+    cache.store(_query([1.0, 0.0, 0.0]), {"chat": {"output": {"response": "answer"}}})
+    results, similarity = cache.lookup(_query([0.98, 0.1, 0.0]))
+    assert results == {"chat": {"output": {"response": "answer"}}}
+    assert similarity > 0.9
+
+    results, similarity = cache.lookup(_query([0.0, 1.0, 0.0]))
+    assert results is None and similarity < 0.5
+
+    stats = cache.stats("wf")
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+    assert sum(bucket["count"] for bucket in stats["similarity_histogram"]) == 2
+
+
+def test_partitions_and_fingerprint_invalidation():
+    cache = SemanticResponseCache(threshold=0.9, max_entries=10, ttl_seconds=60)
+    cache.store(_query([1.0, 0.0]), {"answer": 1})
+
+    # Other inputs (e.g. a different file) never share answers
+    assert cache.lookup(_query([1.0, 0.0], scope="other"))[0] is None
+    # A redeploy or knowledge base update changes the fingerprint
+    assert cache.lookup(_query([1.0, 0.0], fingerprint="v2"))[0] is None
+    assert cache.lookup(_query([1.0, 0.0]))[0] is None
+    assert cache.stats("wf")["invalidations"] == 1
+
+    cache.store(_query([1.0, 0.0]), {"answer": 2})
+    assert cache.invalidate("wf") == 1
+    assert cache.lookup(_query([1.0, 0.0]))[0] is None
+
+
+def test_expired_and_evicted_entries_are_not_served():
+    cache = SemanticResponseCache(threshold=0.9, max_entries=2, ttl_seconds=10)
+    with patch("backend.core.semantic_cache.time.monotonic", return_value=100.0):
+        cache.store(_query([1.0, 0.0, 0.0]), {"answer": "x"})
+        cache.store(_query([0.0, 1.0, 0.0]), {"answer": "y"})
+        cache.store(_query([0.0, 0.0, 1.0]), {"answer": "z"})
+        # The least recently used entry was evicted
+        assert cache.lookup(_query([1.0, 0.0, 0.0]))[0] is None
+        assert cache.lookup(_query([0.0, 1.0, 0.0]))[0] == {"answer": "y"}
+
+    with patch("backend.core.semantic_cache.time.monotonic", return_value=111.0):
+        assert cache.lookup(_query([0.0, 1.0, 0.0]))[0] is None
+    assert cache.stats("wf")["entries"] == 0
+
+
+def test_entry_cap_spans_partitions_and_empty_partitions_are_dropped():
+    cache = SemanticResponseCache(threshold=0.9, max_entries=2, ttl_seconds=10)
+    with patch("backend.core.semantic_cache.time.monotonic", return_value=100.0):
+        for scope in ("a", "b", "c"):
+            cache.store(_query([1.0, 0.0], scope=scope), {"answer": scope})
+        # The cap is global: the oldest scope lost its only entry, and its index
+        assert cache.stats("wf")["entries"] == 2
+        assert len(cache._partitions) == 2
+        assert cache.lookup(_query([1.0, 0.0], scope="a"))[0] is None
+        assert cache.lookup(_query([1.0, 0.0], scope="b"))[0] == {"answer": "b"}
+
+    with patch("backend.core.semantic_cache.time.monotonic", return_value=111.0):
+        assert cache.lookup(_query([1.0, 0.0], scope="b"))[0] is None
+    assert len(cache._partitions) == 1
+    assert len(cache._lru) == 1
+
+
+@pytest.mark.asyncio
+async def test_session_inputs_do_not_partition_the_cache():
+    workflow = SimpleNamespace(id="wf", nodes=[])
+    with patch("backend.core.semantic_cache.settings.enable_semantic_cache", True), \
+         patch("backend.core.semantic_cache._embed_query", new=AsyncMock(return_value=[1.0, 0.0])), \
+         patch("backend.core.semantic_cache.deployment_fingerprint", return_value="v1"):
+        first = await semantic_query_for(workflow, {"query": "hours?", "session_id": "s1", "file_id": "f"})
+        second = await semantic_query_for(workflow, {"query": "hours?", "session_id": "s2", "file_id": "f"})
+        other_file = await semantic_query_for(workflow, {"query": "hours?", "session_id": "s1", "file_id": "g"})
+
+    assert first.scope == second.scope
+    assert first.scope != other_file.scope
+
+
+@pytest.mark.asyncio
+async def test_workflows_with_memory_bypass_the_cache():
+    chat = SimpleNamespace(data={"config": {"use_memory": True}})
+    plain = SimpleNamespace(data={"provider": "openai"})
+    embed = AsyncMock(return_value=[1.0, 0.0])
+    with patch("backend.core.semantic_cache.settings.enable_semantic_cache", True), \
+         patch("backend.core.semantic_cache._embed_query", new=embed), \
+         patch("backend.core.semantic_cache.deployment_fingerprint", return_value="v1"):
+        # An answer shaped by one session's history must not reach another session
+        assert await semantic_query_for(SimpleNamespace(id="wf", nodes=[plain, chat]), {"query": "q", "session_id": "s"}) is None
+        # Query inputs fill node settings the node leaves unset
+        assert await semantic_query_for(SimpleNamespace(id="wf", nodes=[plain]), {"query": "q", "use_memory": True}) is None
+        assert await semantic_query_for(SimpleNamespace(id="wf", nodes=[plain]), {"query": "q"}) is not None
+    embed.assert_awaited_once()
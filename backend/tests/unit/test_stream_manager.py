@@ -0,0 +1,99 @@
+"""
+Unit tests for execution event streams
+"""
+
+import asyncio
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from backend.core.streaming import StreamEvent, StreamEventType, stream_manager
+
+
+def _event(execution_id, event_type=StreamEventType.LOG, node_id="n1", **data):
+    return StreamEvent(event_type=event_type, node_id=node_id, execution_id=execution_id, data=data)
+
+
+async def _read_all(execution_id):
+    return [event async for event in stream_manager.subscribe(execution_id)]
+
+
+async def _read_buffered(execution_id):
+    """Subscribe after events were published, then end the stream."""
+    reader = asyncio.create_task(_read_all(execution_id))
+    await asyncio.sleep(0)
+    await stream_manager.remove_stream(execution_id)
+    return await reader
+
+
+@pytest.mark.asyncio
+async def test_subscribers_each_receive_all_events():
+    execution_id = str(uuid.uuid4())
+    await stream_manager.create_stream(execution_id)
+    readers = [asyncio.create_task(_read_all(execution_id)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    for i in range(3):
+        await stream_manager.publish(_event(execution_id, message=f"step {i}"))
+    await stream_manager.remove_stream(execution_id)
+
+    for events in await asyncio.gather(*readers):
+        assert [event.data["message"] for event in events] == ["step 0", "step 1", "step 2"]
+
+
+@pytest.mark.asyncio
+async def test_lagging_subscriber_gets_latest_progress_per_node():
+    execution_id = str(uuid.uuid4())
+    await stream_manager.create_stream(execution_id)
+
+    await stream_manager.publish(_event(execution_id, StreamEventType.NODE_STARTED))
+    for i in range(100):
+        await stream_manager.publish(_event(execution_id, StreamEventType.NODE_PROGRESS, progress=i / 100))
+        await stream_manager.publish(_event(execution_id, StreamEventType.NODE_PROGRESS, node_id="n2", progress=i / 100))
+    await stream_manager.publish(_event(execution_id, StreamEventType.NODE_COMPLETED))
+
+    events = await _read_buffered(execution_id)
+
+    assert [(event.event_type, event.node_id) for event in events] == [
+        (StreamEventType.NODE_STARTED, "n1"),
+        (StreamEventType.NODE_PROGRESS, "n1"),
+        (StreamEventType.NODE_PROGRESS, "n2"),
+        (StreamEventType.NODE_COMPLETED, "n1"),
+    ]
+    assert events[1].data["progress"] == 0.99
+
+
+@pytest.mark.asyncio
+async def test_buffer_is_bounded():
+    execution_id = str(uuid.uuid4())
+    with patch("backend.core.streaming.settings.stream_buffer_size", 5):
+        await stream_manager.create_stream(execution_id)
+
+    for i in range(20):
+        await stream_manager.publish(_event(execution_id, message=str(i)))
+
+    events = await _read_buffered(execution_id)
+    assert [event.data["message"] for event in events] == ["15", "16", "17", "18", "19"]
+
+
+@pytest.mark.asyncio
+async def test_closed_stream_replays_after_last_event_id():
+    execution_id = str(uuid.uuid4())
+    await stream_manager.create_stream(execution_id)
+    for i in range(4):
+        await stream_manager.publish(_event(execution_id, message=str(i)))
+    await stream_manager.close_stream(execution_id)
+
+    # A client connecting after completion replays everything and ends
+    events = await _read_all(execution_id)
+    assert [event.id for event in events] == [1, 2, 3, 4]
+    assert events[0].to_sse().startswith("id: 1\n")
+
+    # A reconnecting client only gets what it missed
+    resumed = [event async for event in stream_manager.subscribe(execution_id, last_event_id=2)]
+    assert [event.data["message"] for event in resumed] == ["2", "3"]
+    assert stream_manager.has_stream(execution_id)
+
+    await stream_manager.remove_stream(execution_id)
+    assert not stream_manager.has_stream(execution_id)
@@ -0,0 +1,62 @@
+"""
+Unit tests for write-behind batching of cost and usage records
+"""
+
+import time
+
+from backend.core.write_behind import WriteBehindBuffer
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_writes_in_batches_on_size_and_interval():
+    batches = []
+    buffer = WriteBehindBuffer("test", batches.append, batch_size=3, flush_interval=0.2, max_pending=100, max_retries=1)
+    for i in range(4):
+        buffer.submit(i)
+
+    # A full batch is written right away, the rest after the interval
+    assert _wait_for(lambda: len(batches) == 2)
+    assert batches == [[0, 1, 2], [3]]
+    assert buffer.stats()["written"] == 4
+    buffer.stop()
+
+
+def test_failed_batch_is_retried_and_partial_write_retries_the_rest():
+    attempts = []
+
+    def write(batch):
+        attempts.append(list(batch))
+        if len(attempts) == 1:
+            raise ConnectionError("database unavailable")
+        if len(attempts) == 2:
+            return batch[1:]  # Only the first record was written
+        return None
+
+    buffer = WriteBehindBuffer("test", write, batch_size=10, flush_interval=0.01, max_pending=100, max_retries=3)
+    buffer.submit("a")
+    buffer.submit("b")
+    assert _wait_for(lambda: buffer.stats()["written"] == 2)
+    assert attempts == [["a", "b"], ["a", "b"], ["b"]]
+    assert buffer.stats()["failed_flushes"] == 2
+    buffer.stop()
+
+
+def test_bounded_buffer_drops_and_stop_flushes():
+    written = []
+    buffer = WriteBehindBuffer("test", written.extend, batch_size=5, flush_interval=60, max_pending=5, max_retries=0)
+    # Hold the writer back so the buffer fills up
+    with buffer._flush_lock:
+        accepted = [buffer.submit(i) for i in range(7)]
+        assert buffer.snapshot() == [0, 1, 2, 3, 4]
+    assert accepted == [True] * 5 + [False] * 2
+    assert buffer.stats()["dropped"] == 2
+
+    buffer.stop()
+    assert sorted(written) == [0, 1, 2, 3, 4]
+    assert buffer.stats()["pending"] == 0
@@ -857,6 +857,44 @@ def calculate_llm_cost(
     return round(total_cost, 6)
 
 
+def calculate_llm_cost_with_cache(
+    provider: str,
+    model_id: str,
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0,
+    cache_write_tokens: int = 0,
+) -> float:
+    """
+    Calculate LLM cost when part of the prompt was read from or written to the provider's prompt cache.
+
+    Args:
+        provider: Provider name
+        model_id: Model identifier
+        input_tokens: All prompt tokens, including cached and cache-write tokens
+        output_tokens: Number of output tokens
+        cached_tokens: Prompt tokens read from the cache (billed at the cached input rate)
+        cache_write_tokens: Prompt tokens written to the cache (Anthropic; billed at the 5-minute write rate)
+
+    Returns:
+        Cost in USD
+    """
+    is_anthropic = provider.lower() == "anthropic"
+    uncached_tokens = max(0, input_tokens - cached_tokens - cache_write_tokens)
+    cost = calculate_llm_cost(provider, model_id, uncached_tokens, output_tokens)
+    if cached_tokens:
+        cost += calculate_llm_cost(
+            provider, model_id, cached_tokens, 0, use_cached_input=True, cache_type="hit" if is_anthropic else None
+        )
+    if cache_write_tokens:
+        # Providers without write pricing bill cache writes as regular input
+        write_cost = calculate_llm_cost(
+            provider, model_id, cache_write_tokens, 0, use_cached_input=is_anthropic, cache_type="5m" if is_anthropic else None
+        )
+        cost += write_cost or calculate_llm_cost(provider, model_id, cache_write_tokens, 0)
+    return round(cost, 6)
+
+
 def calculate_llm_cost_from_texts(
     provider: str,
     model_id: str,
@@ -0,0 +1,78 @@
+"""
+Provider-side prompt caching.
+
+Providers bill a prompt prefix they have processed recently at a reduced
+rate and answer sooner. OpenAI and Gemini cache long prefixes
+automatically; Anthropic caches up to explicit ``cache_control``
+breakpoints. Only an identical prefix is reused, so prompts put the stable
+parts first (system prompt, tool definitions, pinned documents) and the
+per-request parts last.
+
+These helpers mark Anthropic breakpoints and read cached-token counts from
+each provider's usage report.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from backend.config import settings
+
+
+def _field(obj: Any, name: str) -> Any:
+    """Read a field from an SDK object or a plain dict."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _count(value: Any) -> int:
+    """Token count of a usage field (0 when missing)."""
+    return int(value) if isinstance(value, (int, float)) else 0
+
+
+def is_cacheable_prefix(text: Optional[str]) -> bool:
+    """Return whether a prompt prefix is long enough to be worth a cache breakpoint."""
+    if not settings.enable_prompt_caching or not text:
+        return False
+    # Rough: 1 token ≈ 4 chars
+    return len(text) // 4 >= settings.prompt_cache_min_tokens
+
+
+def anthropic_text_block(text: str, cache: bool = False) -> Dict[str, Any]:
+    """Return an Anthropic text content block, marked as a cache breakpoint if requested."""
+    block: Dict[str, Any] = {"type": "text", "text": text}
+    if cache:
+        block["cache_control"] = {"type": "ephemeral"}
+    return block
+
+
+def openai_cached_tokens(usage: Any) -> int:
+    """Prompt tokens served from the cache, from an OpenAI usage report (also Azure and LangChain dicts)."""
+    details = _field(usage, "prompt_tokens_details")
+    return _count(_field(details, "cached_tokens"))
+
+
+def anthropic_cache_tokens(usage: Any) -> Tuple[int, int]:
+    """
+    Return (cache read, cache write) tokens of an Anthropic usage report.
+
+    Anthropic's ``input_tokens`` excludes both; the whole prompt is their sum.
+    """
+    return (
+        _count(_field(usage, "cache_read_input_tokens")),
+        _count(_field(usage, "cache_creation_input_tokens")),
+    )
+
+
+def gemini_usage(response: Any) -> Optional[Dict[str, int]]:
+    """Return prompt, output and cached token counts of a Gemini response, or None without usage."""
+    metadata = _field(response, "usage_metadata")
+    prompt_tokens = _count(_field(metadata, "prompt_token_count"))
+    if not prompt_tokens:
+        return None
+    return {
+        "input": prompt_tokens,
+        "output": _count(_field(metadata, "candidates_token_count")),
+        "cached_input": _count(_field(metadata, "cached_content_token_count")),
+    }
@@ -11,6 +11,7 @@ import time
 from typing import Callable, TypeVar, Optional, Union, Any
 from functools import wraps
 
+from backend.core.deadline import remaining_time
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -51,7 +52,8 @@ async def retry_with_backoff(
         Result of function call
     
     Raises:
-        Last exception if all retries fail
+        Last exception if all retries fail (or the next retry would start
+        after the current execution deadline, see core/deadline.py)
         NonRetryableError: Immediately if non-retryable error occurs
     
     Example:
@@ -95,6 +97,15 @@ async def retry_with_backoff(
             if jitter:
                 delay = delay * (0.5 + random.random() * 0.5)
             
+            # Don't wait for a retry that would start after the deadline
+            remaining = remaining_time()
+            if remaining is not None and delay >= remaining:
+                logger.warning(
+                    f"Attempt {attempt + 1} failed for {func.__name__}: {e}. "
+                    f"Not retrying: {remaining:.2f}s left before the deadline"
+                )
+                break
+            
             logger.warning(
                 f"Attempt {attempt + 1} failed for {func.__name__}: {e}. "
                 f"Retrying in {delay:.2f}s..."
@@ -332,4 +343,74 @@ def classify_anthropic_error(error) -> Union[RetryableError, NonRetryableError]:
         return NonRetryableError(f"Anthropic request error: {error}")
     else:
         # Default to retryable for unknown Anthropic errors
-        return RetryableError(f"Anthropic error: {error}")
\ No newline at end of file
+        return RetryableError(f"Anthropic error: {error}")
+
+
+def classify_provider_error(error, provider: str = "Provider") -> Union[RetryableError, NonRetryableError]:
+    """
+    Classify an error from any provider SDK as retryable or non-retryable.
+    
+    Uses the HTTP status code when the SDK exposes one (OpenAI, Anthropic,
+    Cohere and Voyage AI errors carry ``status_code``; google-genai errors
+    carry ``code``) and falls back to message patterns otherwise.
+    
+    Args:
+        error: Exception raised by the provider SDK
+        provider: Provider name used in the error message
+    
+    Returns:
+        RetryableError or NonRetryableError instance
+    """
+    status_code = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status_code, int):
+        classified = classify_http_error(status_code, str(error))
+        return type(classified)(f"{provider} error: {classified}")
+    
+    error_str = str(error).lower()
+    
+    if "rate limit" in error_str or "rate_limit" in error_str or "resource_exhausted" in error_str:
+        return RetryableError(f"{provider} rate limit: {error}")
+    elif "timeout" in error_str or "connection" in error_str:
+        return RetryableError(f"{provider} connection issue: {error}")
+    elif "invalid api key" in error_str or "unauthorized" in error_str:
+        return NonRetryableError(f"{provider} authentication error: {error}")
+    elif "invalid request" in error_str or "bad request" in error_str:
+        return NonRetryableError(f"{provider} request error: {error}")
+    else:
+        return RetryableError(f"{provider} error: {error}")
+
+
+def is_rate_limit_error(error) -> bool:
+    """Return True if the error is a provider rate limit (HTTP 429) response."""
+    status_code = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status_code == 429:
+        return True
+    error_str = str(error).lower()
+    return "rate limit" in error_str or "rate_limit" in error_str or "resource_exhausted" in error_str
+
+
+def get_retry_after(error) -> Optional[float]:
+    """
+    Extract the Retry-After delay (seconds) from a provider error, if present.
+    
+    Args:
+        error: Exception raised by the provider SDK
+    
+    Returns:
+        Delay in seconds, or None if the response carried no usable header
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    
+    for header in ("retry-after-ms", "retry-after"):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            continue
+        return seconds / 1000.0 if header == "retry-after-ms" else seconds
+    return None
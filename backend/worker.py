@@ -0,0 +1,211 @@
+"""
+Execution worker processes for the job-queue execution mode.
+
+With ``EXECUTION_MODE=queue`` the API only enqueues executions. Workers
+claim them from the job queue, run them with the workflow engine, store
+the results in the execution store and send their stream events back to
+the API through the event channel. Run any number of workers, independently
+of the API:
+
+    python -m backend.worker [--processes N] [--concurrency N]
+
+Each process runs up to ``--concurrency`` executions at once. A worker
+holds a lease on each job it runs and renews it periodically; if the
+process dies, the lease expires and another worker retries the job.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import uuid
+from datetime import datetime
+from typing import Optional, Set
+
+from backend.config import settings
+from backend.core.compute_pool import shutdown_compute_pool
+from backend.core.event_channel import get_event_channel
+from backend.core.execution_runner import mark_execution_failed, run_execution
+from backend.core.job_queue import Job, JobQueue, get_job_queue
+from backend.core.models import Workflow
+from backend.core.streaming import stream_manager
+from backend.core.write_behind import shutdown_write_behind
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ExecutionWorker:
+    """Claims execution jobs and runs them, up to ``concurrency`` at a time."""
+
+    def __init__(self, queue: JobQueue, concurrency: int, worker_id: Optional[str] = None):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = settings.job_lease_seconds
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Process jobs until ``stop`` is set, then wait for running jobs."""
+        slots = asyncio.Semaphore(self.concurrency)
+        poll_interval = settings.worker_poll_interval_ms / 1000
+        logger.info(f"Execution worker {self.worker_id} started (concurrency {self.concurrency})")
+
+        while not stop.is_set():
+            await slots.acquire()
+            try:
+                await self._reap_expired()
+                job = await asyncio.to_thread(self.queue.claim, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.error(f"Failed to claim a job: {e}", exc_info=True)
+                job = None
+            if job is None:
+                slots.release()
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._run_job(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+        if self._tasks:
+            logger.info(f"Worker {self.worker_id} waiting for {len(self._tasks)} running execution(s)")
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _reap_expired(self) -> None:
+        """Record executions whose jobs were abandoned by dead workers too often."""
+        for job in await asyncio.to_thread(self.queue.reap_expired):
+            logger.error(f"Execution {job.execution_id} failed: worker lease expired on attempt {job.attempts}")
+            await asyncio.to_thread(
+                mark_execution_failed,
+                job.execution_id,
+                job.payload.get("workflow", {}).get("id") or "unknown",
+                datetime.fromisoformat(job.payload["started_at"]),
+                "Execution worker stopped responding",
+                job.payload.get("user_id"),
+            )
+            await stream_manager.close_stream(job.execution_id)
+
+    async def _heartbeat(self, job: Job, execution: asyncio.Task) -> None:
+        """
+        Renew the lease on a job while it runs.
+
+        A failed renewal is retried until the lease would have expired. Once
+        the lease is lost, another worker may retry the job, so the execution
+        is cancelled here instead of running twice.
+        """
+        renewed_at = time.monotonic()
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                renewed = await asyncio.to_thread(self.queue.heartbeat, job.id, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                if time.monotonic() - renewed_at < self.lease_seconds:
+                    logger.warning(f"Failed to renew the lease on job {job.id}, retrying: {e}")
+                    continue
+                logger.error(f"Could not renew the lease on job {job.id} before it expired: {e}")
+                renewed = False
+            if not renewed:
+                logger.warning(f"Lost the lease on job {job.id} (execution {job.execution_id}); cancelling it")
+                execution.cancel()
+                return
+            renewed_at = time.monotonic()
+
+    async def _run_job(self, job: Job) -> None:
+        heartbeat: Optional[asyncio.Task] = None
+        try:
+            payload = job.payload
+            logger.info(f"Worker {self.worker_id} running execution {job.execution_id} (attempt {job.attempts})")
+            execution = asyncio.create_task(run_execution(
+                workflow=Workflow.model_validate(payload["workflow"]),
+                execution_id=job.execution_id,
+                started_at=datetime.fromisoformat(payload["started_at"]),
+                user_id=payload.get("user_id"),
+                use_intelligent_routing=payload.get("use_intelligent_routing"),
+            ))
+            heartbeat = asyncio.create_task(self._heartbeat(job, execution))
+            try:
+                await execution
+            except asyncio.CancelledError:
+                if not heartbeat.done():
+                    raise  # The worker itself is being cancelled
+                # The lease was lost: the job is no longer ours to complete or fail
+                logger.warning(f"Execution {job.execution_id} cancelled after losing the lease on job {job.id}")
+                return
+            await asyncio.to_thread(self.queue.complete, job.id, self.worker_id)
+        except Exception as e:
+            logger.error(f"Job {job.id} (execution {job.execution_id}) failed: {e}", exc_info=True)
+            await asyncio.to_thread(self.queue.fail, job.id, self.worker_id, str(e))
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+
+
+async def _serve(concurrency: int) -> None:
+    """Run one worker in the current process until SIGTERM/SIGINT."""
+    import backend.nodes  # noqa: F401  (registers node types)
+    from backend.core.database import initialize_database
+
+    settings.ensure_directories_exist()
+    try:
+        initialize_database(settings)
+    except Exception as e:
+        logger.warning(f"Database initialization failed in worker: {e}")
+
+    # Send this process's stream events to the API
+    channel = get_event_channel()
+    stream_manager.set_channel(channel)
+    flusher = asyncio.create_task(channel.run_flusher(settings.stream_relay_interval_ms / 1000))
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        await ExecutionWorker(get_job_queue(), concurrency).run(stop)
+    finally:
+        flusher.cancel()
+        await asyncio.gather(flusher, return_exceptions=True)
+        await asyncio.to_thread(shutdown_write_behind)
+        shutdown_compute_pool()
+
+
+def _worker_process(concurrency: int) -> None:
+    asyncio.run(_serve(concurrency))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run workflow execution workers")
+    parser.add_argument("--processes", type=int, default=settings.worker_processes, help="Worker processes")
+    parser.add_argument("--concurrency", type=int, default=settings.worker_concurrency, help="Executions per process")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _worker_process(args.concurrency)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_worker_process, args=(args.concurrency,), name=f"execution-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"Started {len(processes)} execution worker processes")
+
+    # Children receive the terminal's SIGINT themselves; forward SIGTERM
+    signal.signal(signal.SIGTERM, lambda *_: [process.terminate() for process in processes])
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -50,16 +50,25 @@ class StreamClient {
   private reconnectAttempts = 0;
   private maxReconnectAttempts = 5;
   private reconnectDelay = 1000;
+  private executionId: string | null = null;
+  private lastEventId: string | null = null;
 
   /**
    * Connect to SSE stream for an execution.
    */
   connect(executionId: string): void {
     if (this.eventSource) {
-      this.disconnect();
+      this.eventSource.close();
+      this.eventSource = null;
+    }
+    if (executionId !== this.executionId) {
+      this.executionId = executionId;
+      this.lastEventId = null;
     }
 
-    const url = `${API_BASE_URL}/api/v1/executions/${executionId}/stream`;
+    // Resume after the last received event instead of replaying the whole stream
+    const resume = this.lastEventId ? `?last_event_id=${encodeURIComponent(this.lastEventId)}` : '';
+    const url = `${API_BASE_URL}/api/v1/executions/${executionId}/stream${resume}`;
     
     try {
       this.eventSource = new EventSource(url);
@@ -71,6 +80,9 @@ class StreamClient {
       };
 
       this.eventSource.onmessage = (e) => {
+        if (e.lastEventId) {
+          this.lastEventId = e.lastEventId;
+        }
         try {
           const event: StreamEvent = JSON.parse(e.data);
           this.handleEvent(event);
@@ -197,6 +209,8 @@ class StreamClient {
       this.eventSource = null;
     }
     this.isConnected = false;
+    this.executionId = null;
+    this.lastEventId = null;
     this.handlers.clear();
   }
 